@@ -11,6 +11,7 @@ from emergency_agents.container import container
 from emergency_agents.utils.normalize import normalize_disaster_name
 from emergency_agents.utils.merge import upsert_by_key
 from emergency_agents.agents.memory_commit import prepare_memory_node
+from emergency_agents.rag.pipe import aquery_rag
 
 logger = logging.getLogger(__name__)
 
@@ -64,10 +65,11 @@ class RiskPredictorAgentNode(LLMAgentNode[RiskPrediction]):
         rag_pipeline = container.rag_pipeline
 
         kg_predictions = kg_service.predict_secondary_disasters(primary_type, magnitude)
-        rag_cases = rag_pipeline.query(
+        rag_cases = await aquery_rag(
+            rag_pipeline,
             question=f"{primary_type} 次生灾害 {affected_area}",
             domain="案例",
-            top_k=3
+            top_k=3,
         )
 
         # 构建上下文变量
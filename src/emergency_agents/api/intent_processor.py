@@ -14,6 +14,7 @@ import structlog
 import websockets
 
 from emergency_agents.constants import RESCUE_DEMO_INCIDENT_ID
+from emergency_agents.graph.progress import EventSink, emit_event
 from emergency_agents.intent.pipeline import intent_pipeline
 from emergency_agents.intent.registry import IntentHandlerRegistry
 from emergency_agents.intent.handlers.device_control import DeviceControlHandler, RobotDogControlHandler
@@ -49,6 +50,18 @@ class Mem0Metrics:
     inc_add_failure: Callable[[str], None]
 
 
+def _mem0_add_recorder(mem0_metrics: Mem0Metrics) -> Callable[[Optional[str]], None]:
+    """把写后队列的落库结果映射到 mem0 写入指标。"""
+
+    def _record(error: Optional[str]) -> None:
+        if error is None:
+            mem0_metrics.inc_add_success()
+        else:
+            mem0_metrics.inc_add_failure(error)
+
+    return _record
+
+
 @dataclass(slots=True)
 class IntentProcessResult:
     """意图处理结果。"""
@@ -335,17 +348,13 @@ async def _handle_robotdog_control(
     history_records.append(saved)
 
     if status == "dispatched":
-        try:
-            mem.add(
-                content=f"意图: {intent_type}, 槽位: {json.dumps(slots_payload, ensure_ascii=False)}",
-                user_id=user_id,
-                run_id=thread_id,
-                metadata={"incident_id": incident_id, "intent_type": intent_type, "channel": channel},
-            )
-            mem0_metrics.inc_add_success()
-        except Exception as exc:  # noqa: BLE001
-            mem0_metrics.inc_add_failure(exc.__class__.__name__)
-            raise
+        mem.submit_add(
+            content=f"意图: {intent_type}, 槽位: {json.dumps(slots_payload, ensure_ascii=False)}",
+            user_id=user_id,
+            run_id=thread_id,
+            metadata={"incident_id": incident_id, "intent_type": intent_type, "channel": channel},
+            on_done=_mem0_add_recorder(mem0_metrics),
+        )
 
     audit_log.append(
         {
@@ -607,11 +616,23 @@ async def process_intent_core(
     context_service: ContextService | None = None,
     enable_mem0: bool = True,
     stream_sink: Callable[[str], Awaitable[None]] | None = None,
+    event_sink: EventSink | None = None,
 ) -> IntentProcessResult:
-    """统一意图处理核心逻辑。"""
+    """统一意图处理核心逻辑。
+
+    event_sink 用于流式接口分阶段推送：intent（识别结果）、slots（槽位）、
+    progress（子图节点进度）、delta（LLM 增量文本），最终结果由调用方推送。
+    """
     if not message or not message.strip():
         raise ValueError("message不能为空")
 
+    if stream_sink is None and event_sink is not None:
+        async def _delta_to_event(delta: str) -> None:
+            if delta:
+                await emit_event(event_sink, "delta", {"text": delta})
+
+        stream_sink = _delta_to_event
+
     cleaned_message = message.strip()
     logger.info(
         "intent_message_received",
@@ -646,7 +667,7 @@ async def process_intent_core(
     if enable_mem0 and not skip_mem0_for_device:
         try:
             t0 = time.perf_counter()
-            memory_hits = mem.search(
+            memory_hits = await mem.asearch(
                 query=cleaned_message,
                 user_id=user_id,
                 run_id=thread_id,
@@ -661,6 +682,10 @@ async def process_intent_core(
                 duration_ms=int(duration * 1000),
                 hits_count=len(memory_hits),
             )
+        except asyncio.TimeoutError:
+            # 检索超时只影响上下文丰富度，按空结果继续，避免拖慢整轮意图处理
+            mem0_metrics.inc_search_failure("timeout")
+            logger.warning("mem0_search_timeout", thread_id=thread_id)
         except Exception as exc:  # noqa: BLE001
             reason = exc.__class__.__name__
             mem0_metrics.inc_search_failure(reason)
@@ -857,6 +882,19 @@ async def process_intent_core(
     except Exception as exc:  # noqa: BLE001
         logger.warning("robotdog_video_autofill_failed", error=str(exc))
 
+    await emit_event(
+        event_sink,
+        "intent",
+        {
+            "intent_type": intent.get("intent_type"),
+            "confidence": intent.get("confidence"),
+            "router_next": router_next,
+            "validation_status": validation_status,
+            "missing_fields": list(graph_state.get("missing_fields") or []),
+            "elapsed_ms": elapsed_ms,
+        },
+    )
+
     async def _persist_assistant_message(content: str, intent_type: Optional[str]) -> MessageRecord:
         return await manager.save_message(
             user_id=user_id,
@@ -1092,6 +1130,11 @@ async def process_intent_core(
         )
 
     slots_payload = intent.get("slots") or {}
+    await emit_event(
+        event_sink,
+        "slots",
+        {"intent_type": intent.get("intent_type"), "router_next": router_next, "slots": slots_payload},
+    )
 
     if router_next == "device_control_robotdog":
         logger.info(
@@ -1242,6 +1285,8 @@ async def process_intent_core(
     }
     if stream_sink is not None:
         handler_state["stream_sink"] = stream_sink
+    if event_sink is not None:
+        handler_state["event_sink"] = event_sink
 
     handler_result = await handler.handle(slots_instance or slots_payload, handler_state)
 
@@ -1276,22 +1321,19 @@ async def process_intent_core(
     skip_mem_for_device = intent_type_raw in {"device-status-query", "device_status_query", "system-data-query"}
 
     if not skip_mem_for_device:
-        try:
-            intent_type_encoded = _encode_intent_for_mem0(intent_type_raw)
-            mem.add(
-                content=f"意图: {intent_type_raw}, 槽位: {json.dumps(slots_payload, ensure_ascii=False)}",
-                user_id=user_id,
-                run_id=thread_id,
-                metadata={
-                    "incident_id": incident_id,
-                    "intent_type": intent_type_encoded,
-                    "intent_type_raw": intent_type_raw,
-                },
-            )
-            mem0_metrics.inc_add_success()
-        except Exception as exc:  # noqa: BLE001
-            mem0_metrics.inc_add_failure(exc.__class__.__name__)
-            raise
+        # 写后队列：mem0 的事实抽取与图写入在后台完成，响应不等待落库
+        intent_type_encoded = _encode_intent_for_mem0(intent_type_raw)
+        mem.submit_add(
+            content=f"意图: {intent_type_raw}, 槽位: {json.dumps(slots_payload, ensure_ascii=False)}",
+            user_id=user_id,
+            run_id=thread_id,
+            metadata={
+                "incident_id": incident_id,
+                "intent_type": intent_type_encoded,
+                "intent_type_raw": intent_type_raw,
+            },
+            on_done=_mem0_add_recorder(mem0_metrics),
+        )
     else:
         logger.info(
             "mem0_add_skipped_for_device_query",
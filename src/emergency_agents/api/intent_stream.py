@@ -0,0 +1,95 @@
+# Copyright 2025 msq
+"""意图处理流式输出：把 process_intent_core 的分阶段事件转成 NDJSON / SSE 字节流。"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal, Optional
+
+import structlog
+
+from emergency_agents.graph.progress import EventSink
+
+logger = structlog.get_logger(__name__)
+
+StreamFormat = Literal["ndjson", "sse"]
+
+# 客户端断开后仍需跑完的处理任务（持久化/mem0 写入不能被中途取消），持有引用防止被 GC
+_BACKGROUND_TASKS: set[asyncio.Task[None]] = set()
+
+
+def _encode(event: str, data: Dict[str, Any], fmt: StreamFormat) -> bytes:
+    body = json.dumps(data, ensure_ascii=False, default=str)
+    if fmt == "sse":
+        return f"event: {event}\ndata: {body}\n\n".encode("utf-8")
+    return (json.dumps({"event": event, "data": data}, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class IntentEventStream:
+    """单次请求的事件通道。
+
+    - ``sink`` 交给 process_intent_core，事件进入内存队列；
+    - ``iter_bytes`` 在后台任务中运行处理协程，边处理边把事件编码输出；
+    - 处理协程的返回值经 ``finalize`` 转换后作为 final 事件，异常转为 error 事件；
+    - 默认客户端断开后处理任务继续跑完（保证持久化）；传 ``cancel_on_disconnect=True`` 时在响应生成器
+      关闭时取消处理任务，释放仍在途的 LLM 请求，此时需要落库的步骤由处理协程自行用 asyncio.shield 保护。
+    """
+
+    def __init__(self, *, fmt: StreamFormat = "ndjson") -> None:
+        self._fmt = fmt
+        self._queue: asyncio.Queue[Optional[tuple[str, Dict[str, Any]]]] = asyncio.Queue()
+        self._started = time.perf_counter()
+
+    @property
+    def media_type(self) -> str:
+        return "text/event-stream" if self._fmt == "sse" else "application/x-ndjson"
+
+    @property
+    def sink(self) -> EventSink:
+        return self._put
+
+    async def _put(self, event: str, data: Dict[str, Any]) -> None:
+        payload = dict(data)
+        payload.setdefault("t_ms", int((time.perf_counter() - self._started) * 1000))
+        await self._queue.put((event, payload))
+
+    async def _run(
+        self,
+        work: Callable[[], Awaitable[Any]],
+        finalize: Callable[[Any], Dict[str, Any]],
+    ) -> None:
+        try:
+            result = await work()
+            await self._put("final", finalize(result))
+        except Exception as exc:  # noqa: BLE001
+            logger.error("intent_stream_failed", error=str(exc), exc_info=True)
+            await self._put("error", {"detail": str(exc)})
+        finally:
+            await self._queue.put(None)
+
+    async def iter_bytes(
+        self,
+        work: Callable[[], Awaitable[Any]],
+        finalize: Callable[[Any], Dict[str, Any]],
+        *,
+        cancel_on_disconnect: bool = False,
+    ) -> AsyncIterator[bytes]:
+        task = asyncio.get_running_loop().create_task(self._run(work, finalize), name="intent-stream")
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+        try:
+            await self._put("accepted", {})
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                event, data = item
+                yield _encode(event, data, self._fmt)
+        finally:
+            if cancel_on_disconnect and not task.done():
+                logger.info("intent_stream_cancelled_on_disconnect")
+                task.cancel()
+
+
+__all__ = ["IntentEventStream", "StreamFormat"]
@@ -6,12 +6,14 @@ import inspect
 import uuid
 import asyncio
 from contextlib import suppress
+from dataclasses import asdict
 from datetime import datetime
 from enum import Enum
 from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Literal
 
 import structlog
 from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, Request
+from fastapi.responses import StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 from pydantic import BaseModel, Field
@@ -51,6 +53,7 @@ from emergency_agents.memory.conversation_manager import (
 from emergency_agents.memory.mem0_facade import Mem0Config, MemoryFacade, DisabledMemoryFacade
 from emergency_agents.llm.client import get_openai_client
 from emergency_agents.llm.factory import LLMClientFactory
+from emergency_agents.llm.deadline import DeadlineExceededError, request_deadline
 from emergency_agents.rag.pipe import RagPipeline, RagChunk, DisabledRagPipeline
 from emergency_agents.graph.kg_service import KGService, KGConfig, DisabledKGService
 from emergency_agents.db.dao import (
@@ -72,6 +75,8 @@ from emergency_agents.context.service import ContextService
 from emergency_agents.utils.branding import mask_payload
 from emergency_agents.intent.validator import validate_and_prompt_node, set_default_robotdog_id
 from emergency_agents.intent.router import configure_scout_adapter
+from emergency_agents.video.vision_monitor import BatchVisionMonitor
+from emergency_agents.api.intent_stream import IntentEventStream, StreamFormat
 from emergency_agents.api.intent_processor import (
     IntentProcessResult,
     Mem0Metrics,
@@ -242,20 +247,6 @@ else:
     _mem = DisabledMemoryFacade()
     structlog.get_logger(__name__).warning("mem0_feature_disabled_startup")
 
-# rag pipeline singleton
-if _cfg.enable_rag:
-    _rag = RagPipeline(
-        qdrant_url=_cfg.qdrant_url or "http://192.168.1.40:6333",
-        qdrant_api_key=_cfg.qdrant_api_key,
-        embedding_model=_cfg.embedding_model,
-        embedding_dim=_cfg.embedding_dim,
-        openai_base_url=_cfg.openai_base_url,
-        openai_api_key=_cfg.openai_api_key,
-        llm_model=_cfg.llm_model,
-    )
-else:
-    _rag = DisabledRagPipeline()
-
 # kg service singleton
 if _cfg.enable_kg:
     _kg = KGService(
@@ -311,6 +302,7 @@ _llm_async_clients = {
     "intent": _llm_factory.get_async("intent"),
     "strategic": _llm_factory.get_async("strategic"),
 }
+container.register("async_llm_client", _llm_async_clients["intent"])
 app.state.llm_clients = _llm_clients
 app.state.rescue_draft_service = _rescue_draft_service
 _llm_client_default = _llm_clients["default"]
@@ -334,6 +326,9 @@ _amap_client = AmapClient(
     base_url=_cfg.amap_base_url or "https://restapi.amap.com",
     connect_timeout=_cfg.amap_connect_timeout,
     read_timeout=_cfg.amap_read_timeout,
+    cache_ttl=_cfg.amap_cache_ttl_seconds,
+    cache_max_entries=_cfg.amap_cache_max_entries,
+    coordinate_precision=_cfg.amap_coordinate_precision,
 )
 
 _orchestrator_client = OrchestratorClient()
@@ -346,6 +341,11 @@ _risk_refresh_task: asyncio.Task[None] | None = None
 _risk_predictor: RiskPredictor | None = None
 _risk_predict_task: asyncio.Task[None] | None = None
 
+# 多路视频批量监控（VIDEO_MONITOR_DEVICE_IDS 配置时在 startup 启动）
+_vision_monitor_task: asyncio.Task[None] | None = None
+_vision_monitor_stop: asyncio.Event | None = None
+_vision_observations: Dict[str, Dict[str, Any]] = {}
+
 app.include_router(rescue_api.router)
 app.include_router(sitrep_api.router, prefix="/sitrep", tags=["sitrep"])
 app.include_router(reports_api.router)
@@ -608,9 +608,12 @@ async def startup_event():
         vllm_url=_cfg.video_vllm_url,
         vllm_api_key=_cfg.video_vllm_api_key,
         vllm_model=_cfg.video_vllm_model,
+        video_frame_max_side=_cfg.video_frame_max_side,
+        video_frame_jpeg_quality=_cfg.video_frame_jpeg_quality,
     )
     _intent_registry.attach_rescue_draft_service(_rescue_draft_service)
     logger.info("api_intent_registry_initialized")
+    _start_vision_monitor()
 
     # 配置侦察适配器依赖注入（用于router.py中的设备查询和LLM选择）
     configure_scout_adapter(
@@ -800,6 +803,72 @@ async def startup_event():
     logger.info("api_graph_ready", graph="recon")
 
 
+def _shared_vision_monitor() -> Optional[BatchVisionMonitor]:
+    """复用视频分析处理器的读取池/编码器/视觉分析器构造批量监控器；未注册视频分析时返回 None。"""
+    from emergency_agents.intent.handlers.video_analysis import VideoAnalysisHandler
+
+    if _intent_registry is None:
+        return None
+    try:
+        handler = _intent_registry.get("video-analysis")
+    except Exception:
+        return None
+    if not isinstance(handler, VideoAnalysisHandler):
+        return None
+    return handler.shared_monitor(
+        batch_size=_cfg.video_monitor_batch_size,
+        max_concurrency=_cfg.video_monitor_max_concurrency,
+    )
+
+
+async def _record_vision_observation(event: str, data: Dict[str, Any]) -> None:
+    _vision_observations[str(data["device_id"])] = data
+
+
+def _start_vision_monitor() -> None:
+    global _vision_monitor_task
+    global _vision_monitor_stop
+    if not _cfg.video_monitor_device_ids:
+        return
+    monitor = _shared_vision_monitor()
+    if monitor is None:
+        logger.warning("vision_monitor_disabled", reason="video_analysis_handler_missing")
+        return
+    _vision_monitor_stop = asyncio.Event()
+    _vision_monitor_task = asyncio.create_task(
+        monitor.run(
+            _cfg.video_monitor_device_ids,
+            interval_seconds=_cfg.video_monitor_interval_seconds,
+            stop=_vision_monitor_stop,
+            sink=_record_vision_observation,
+        )
+    )
+    logger.info(
+        "vision_monitor_started",
+        devices=list(_cfg.video_monitor_device_ids),
+        interval_seconds=_cfg.video_monitor_interval_seconds,
+    )
+
+
+async def _stop_vision_monitor() -> None:
+    global _vision_monitor_task
+    global _vision_monitor_stop
+    if _vision_monitor_task is None:
+        return
+    if _vision_monitor_stop is not None:
+        _vision_monitor_stop.set()
+    try:
+        await asyncio.wait_for(_vision_monitor_task, timeout=10.0)
+    except asyncio.TimeoutError:
+        _vision_monitor_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _vision_monitor_task
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("vision_monitor_stopped_with_error", error=str(exc))
+    _vision_monitor_task = None
+    _vision_monitor_stop = None
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     global _graph_app
@@ -816,10 +885,14 @@ async def shutdown_event():
     global _risk_predict_task
     global _recon_sync_pool
     await voice_chat_handler.stop_background_tasks()
+    await _stop_vision_monitor()
     await _asr.stop_health_check()
     await _adapter_client.aclose()
     await _amap_client.close()
+    await _rag.aclose()
+    await _mem.aclose()  # 刷完 mem0 写后队列
     _orchestrator_client.close()
+    await container.aclose()  # 共享 httpx/OpenAI/视觉分析客户端
     logger.info("api_shutdown_services_stopped")
     for close_cb in _graph_closers:
         await close_cb()
@@ -919,6 +992,12 @@ class ConversationHistoryRequest(BaseModel):
     limit: int = Field(20, ge=1, le=100)
 
 
+class VideoMonitorRequest(BaseModel):
+    """多路视频批量分析请求。"""
+
+    device_ids: Optional[List[str]] = Field(None, description="设备ID列表，缺省为 VIDEO_MONITOR_DEVICE_IDS")
+
+
 class AssistAnswerRequest(BaseModel):
     """智能回答请求。"""
     user_id: str
@@ -1013,14 +1092,14 @@ async def healthz():
 @app.post("/memory/add")
 async def memory_add(content: str, user_id: str, run_id: Optional[str] = None, agent_id: Optional[str] = None):
     """新增记忆记录。"""
-    _mem.add(content=content, user_id=user_id, run_id=run_id, agent_id=agent_id)
+    await asyncio.to_thread(_mem.add, content=content, user_id=user_id, run_id=run_id, agent_id=agent_id)
     return {"ok": True}
 
 
 @app.get("/memory/search")
 async def memory_search(query: str, user_id: str, run_id: Optional[str] = None, agent_id: Optional[str] = None, top_k: int = 5):
     """检索记忆记录。"""
-    res = _mem.search(query=query, user_id=user_id, run_id=run_id, agent_id=agent_id, top_k=top_k)
+    res = await _mem.asearch(query=query, user_id=user_id, run_id=run_id, agent_id=agent_id, top_k=top_k)
     return {"results": res}
 
 
@@ -1034,7 +1113,7 @@ async def rag_index(req: RagIndexRequest):
 @app.post("/rag/query")
 async def rag_query(req: RagQueryRequest):
     """执行 RAG 相似度检索。"""
-    chunks: List[RagChunk] = _rag.query(req.question, req.domain.value, req.top_k)
+    chunks: List[RagChunk] = await _rag.aquery(req.question, req.domain.value, req.top_k)
     return {"trace_id": str(uuid.uuid4()), "results": [
         {"text": c.text, "source": c.source, "loc": c.loc} for c in chunks
     ]}
@@ -1091,7 +1170,7 @@ async def assist_answer(req: AssistAnswerRequest):
             # 1) 检索 RAG 片段
             rag_chunks: List[RagChunk] = []
             if _cfg.enable_rag:
-                rag_chunks = _rag.query(req.question, req.domain.value, req.top_k)
+                rag_chunks = await _rag.aquery(req.question, req.domain.value, req.top_k)
             else:
                 logger.info(
                     "assist_rag_disabled",
@@ -1101,7 +1180,7 @@ async def assist_answer(req: AssistAnswerRequest):
 
             # 2) 检索 Mem0 记忆
             if _cfg.enable_mem0:
-                mem_results = _mem.search(query=req.question, user_id=req.user_id, run_id=req.run_id, top_k=req.top_k)
+                mem_results = await _mem.asearch(query=req.question, user_id=req.user_id, run_id=req.run_id, top_k=req.top_k)
             else:
                 mem_results = []
                 logger.info(
@@ -1126,7 +1205,9 @@ async def assist_answer(req: AssistAnswerRequest):
                 {"role": "system", "content": "你是救援应急大脑，请基于给定证据回答，并在末尾列出引用。"},
                 {"role": "user", "content": f"问题: {req.question}\n\n证据:\n{context}"},
             ]
-            resp = client.chat.completions.create(model=_cfg.llm_model, messages=messages, temperature=0)
+            resp = await asyncio.to_thread(
+                client.chat.completions.create, model=_cfg.llm_model, messages=messages, temperature=0
+            )
             answer = resp.choices[0].message.content if getattr(resp, 'choices', None) else ""
             return {
                 "trace_id": trace_id,
@@ -1141,6 +1222,28 @@ async def assist_answer(req: AssistAnswerRequest):
             raise
 
 
+@app.post("/video/monitor/analyze")
+async def video_monitor_analyze(req: VideoMonitorRequest):
+    """对多路视频各采样一帧：画面未变化或命中缓存的跳过推理，其余按批量多图请求分析。"""
+    monitor = _shared_vision_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="视频分析未启用")
+    device_ids = req.device_ids or list(_cfg.video_monitor_device_ids)
+    if not device_ids:
+        raise HTTPException(status_code=400, detail="未指定设备且未配置 VIDEO_MONITOR_DEVICE_IDS")
+    observations = await monitor.analyze_once(device_ids)
+    return {"observations": [observation.to_event() for observation in observations]}
+
+
+@app.get("/video/monitor/observations")
+async def video_monitor_observations():
+    """后台监控最近一轮的各路结果。"""
+    return {
+        "running": _vision_monitor_task is not None and not _vision_monitor_task.done(),
+        "observations": list(_vision_observations.values()),
+    }
+
+
 # Intent Processing (Refactored)
 from emergency_agents.intent.pipeline import intent_pipeline
 
@@ -1162,7 +1265,9 @@ async def intent_process(req: IntentProcessRequest):
 
     try:
         # 2. Pipeline Execution (Simple Linear Flow)
-        result_data = await intent_pipeline.process(req.message, context=context)
+        # 整个请求共享一份剩余时间预算，分类/校验等嵌套 LLM 调用据此收紧单次超时
+        with request_deadline(_cfg.api_request_deadline_seconds):
+            result_data = await intent_pipeline.process(req.message, context=context)
         
         # 3. Response Formatting
         # 模拟旧 API 的响应结构以保持前端兼容性
@@ -1177,11 +1282,59 @@ async def intent_process(req: IntentProcessRequest):
             "audit_log": [], 
         }
 
+    except DeadlineExceededError as exc:
+        logger.warning("intent_process_deadline_exceeded", operation=exc.operation)
+        raise HTTPException(status_code=504, detail=str(exc))
     except Exception as exc:
         logger.error(f"Intent process failed: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@app.post("/intent/process/stream")
+async def intent_process_stream(req: IntentProcessRequest, request: Request) -> StreamingResponse:
+    """流式意图处理：分阶段推送 intent / slots / progress / delta / final 事件。
+
+    默认输出 NDJSON；请求头 Accept 含 text/event-stream 时输出 SSE。
+    """
+    manager = _require_conversation_manager()
+    registry = _require_intent_registry()
+    metadata = dict(req.metadata or {})
+    if req.incident_id:
+        metadata.setdefault("incident_id", req.incident_id)
+
+    fmt: StreamFormat = "sse" if "text/event-stream" in request.headers.get("accept", "") else "ndjson"
+    stream = IntentEventStream(fmt=fmt)
+
+    async def _work() -> IntentProcessResult:
+        with request_deadline(_cfg.api_request_deadline_seconds):
+            return await process_intent_core(
+                user_id=req.user_id,
+                thread_id=req.thread_id,
+                message=req.message,
+                metadata=metadata,
+                manager=manager,
+                registry=registry,
+                voice_control_graph=_voice_control_graph,
+                dialogue_graph=_dialogue_graph,
+                mem=_mem,
+                build_history=_build_history,
+                mem0_metrics=_mem0_metrics_factory(),
+                channel=req.channel,
+                context_service=_context_service,
+                enable_mem0=_cfg.enable_mem0,
+                event_sink=stream.sink,
+            )
+
+    def _finalize(result: IntentProcessResult) -> Dict[str, Any]:
+        return mask_payload(asdict(result))
+
+    return StreamingResponse(
+        stream.iter_bytes(_work, _finalize),
+        media_type=stream.media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/conversations/history")
 async def conversation_history(req: ConversationHistoryRequest):
     """查询指定会话历史记录。"""
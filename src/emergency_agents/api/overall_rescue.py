@@ -298,7 +298,8 @@ async def generate_overall_rescue_plan(req: OverallPlanRequest, request: Request
     ]
 
     try:
-        completion = client.chat.completions.create(
+        completion = await asyncio.to_thread(
+            client.chat.completions.create,
             model="glm-4.6",
             temperature=0.2,
             response_format={"type": "json_object"},
@@ -21,24 +21,28 @@
 - Pydantic: 强类型请求/响应模型
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Response, Query
+from fastapi import APIRouter, HTTPException, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from psycopg_pool import AsyncConnectionPool
 from psycopg.rows import DictRow, dict_row
-from openai import OpenAI
-import httpx
+from openai import AsyncOpenAI, OpenAI
 import structlog
 import uuid
 import os
 import json
 
 from emergency_agents.config import AppConfig
+from emergency_agents.container import container
 from emergency_agents.logging import get_trace_id
+from emergency_agents.api.intent_stream import IntentEventStream
 from emergency_agents.api.recon_priority import GeoPoint
 from emergency_agents.db.dao import IncidentSnapshotRepository
 from emergency_agents.db.models import IncidentSnapshotCreateInput
+from emergency_agents.graph.progress import EventSink
 
 # 导入我们刚实现的模块
 from emergency_agents.planner.weather_assessor import (
@@ -86,6 +90,9 @@ router = APIRouter(prefix="/ai/recon", tags=["ai-recon"])
 # 由 main.py 在应用启动时注入（同 recon_priority 的做法）
 _pg_pool_async: Optional[AsyncConnectionPool[DictRow]] = None
 
+# 方案入库任务：流式请求被取消后仍需跑完，持有引用防止被 GC
+_PERSIST_TASKS: set[asyncio.Future[Dict[str, Any]]] = set()
+
 
 # ============ 灾害侦察半径配置（公里） ============
 
@@ -176,7 +183,9 @@ class BatchWeatherPlanMarkdownResponse(BaseModel):
 
 @router.post("/batch-weather-plan")
 async def create_batch_weather_plan(
-    format: str = Query("json", description="返回格式：json(默认，纯文本)|md(Markdown格式)")
+    request: Request,
+    format: str = Query("json", description="返回格式：json(默认，纯文本)|md(Markdown格式)"),
+    stream: bool = Query(False, description="是否流式输出：各章节生成完成即推送（NDJSON，Accept 含 text/event-stream 时为 SSE）"),
 ) -> Response:
     """
     生成侦察方案（支持JSON纯文本或Markdown格式）
@@ -190,6 +199,8 @@ async def create_batch_weather_plan(
     - format: 返回格式选择
       - "json" (默认): 返回纯文本格式（已移除Markdown格式符号）
       - "md": 返回原始Markdown格式（供结构化提取使用）
+    - stream: 为 true 时流式返回事件（header / section / footer / final），
+      final 事件的数据与非流式响应体相同
 
     工作流程：
     1. 计算灾害侦察半径（基于disaster_type）
@@ -301,7 +312,7 @@ async def create_batch_weather_plan(
         )
 
     # Step 5: 调用LLM评估设备天气适应性（永不抛出异常，确保指挥员能看到结果）
-    cfg = AppConfig.load_from_env()
+    cfg = container.config
 
     device_infos: List[DeviceInfo] = [
         DeviceInfo(
@@ -435,7 +446,9 @@ async def create_batch_weather_plan(
         ]
 
         # 调用规则引擎进行智能分配
-        allocation_result = smart_allocate(
+        # 分配为纯CPU计算，放到线程中执行，避免大规模目标时阻塞事件循环
+        allocation_result = await asyncio.to_thread(
+            smart_allocate,
             devices=devices_dict,
             targets=targets_dict,
             disaster_type=req.disaster_type,
@@ -454,122 +467,94 @@ async def create_batch_weather_plan(
                    trace_id=trace_id)
 
         # 创建分组Markdown生成器（默认使用更快的 glm-4-flash，可通过 RECON_LLM_MODEL 覆盖）
-        markdown_generator = GroupedMarkdownGenerator(llm_client, llm_model)
-
-        # 调用并行生成（内部会自动分组为air/land/sea，并行调用LLM）
-        markdown_text = markdown_generator.generate(
-            allocation=allocation_result,
-            devices=devices_dict,
-            targets=targets_dict,
-            disaster_info=disaster_info,
-            command_center={"lon": req.epicenter.lon, "lat": req.epicenter.lat},
-            trace_id=trace_id
+        # 章节通过异步客户端在事件循环内并发生成，不再占用线程阻塞整个请求处理
+        markdown_generator = GroupedMarkdownGenerator(
+            llm_client,
+            llm_model,
+            async_llm_client=_get_async_llm_client(cfg),
         )
 
-        logger.info("分组Markdown报告生成完成",
-                   total_length=len(markdown_text),
-                   trace_id=trace_id)
-
-        # 生成方案ID
-        plan_id = str(uuid.uuid4())
-
-        # 如果请求Markdown格式，直接返回
-        if format == "md":
-            logger.info("返回Markdown格式数据", plan_id=plan_id, trace_id=trace_id)
-            # 保存到数据库（使用Markdown原文）
-            try:
-                async with _pg_pool_async.connection() as conn:
-                    async with conn.cursor() as cur:
-                        await cur.execute(
-                            """
-                            INSERT INTO recon_plans (
-                                plan_id, incident_id, plan_type, plan_subtype,
-                                plan_title, plan_content, plan_data,
-                                disaster_type, disaster_location, severity,
-                                device_count, target_count,
-                                llm_model, status, created_by
-                            ) VALUES (
-                                %s, %s, %s, %s,
-                                %s, %s, %s,
-                                %s, %s, %s,
-                                %s, %s,
-                                %s, %s, %s
-                            )
-                            """,
-                            (
-                                plan_id,
-                                None,
-                                "recon",
-                                "batch_weather",
-                                f"{req.disaster_type}侦察方案(MD)",
-                                markdown_text,
-                                json.dumps({"format": "markdown"}, ensure_ascii=False),
-                                req.disaster_type,
-                                json.dumps({"lon": req.epicenter.lon, "lat": req.epicenter.lat}),
-                                req.severity,
-                                len(devices_dict),
-                                len(targets_dict),
-                                llm_model,
-                                "draft",
-                                "system"
-                            )
-                        )
-                        await conn.commit()
-                logger.info("Markdown方案已保存到数据库", plan_id=plan_id, trace_id=trace_id)
-            except Exception as e:
-                logger.warning("数据库保存失败（不影响业务）", error=str(e), trace_id=trace_id)
-
-            return {
-                "code": 200,
-                "data": markdown_text,
-                "plan_id": plan_id
-            }
-
-        # 否则转换Markdown为纯文本（移除格式符号）
-        import re
-        plain_text = markdown_text
-
-        # 移除标题符号 (##, ###)
-        plain_text = re.sub(r'^#{1,6}\s+', '', plain_text, flags=re.MULTILINE)
+        async def _render(event_sink: Optional[EventSink] = None) -> Dict[str, Any]:
+            # 并发生成air/land/sea章节，每个章节完成即经 event_sink 推送
+            markdown_text = await markdown_generator.agenerate(
+                allocation=allocation_result,
+                devices=devices_dict,
+                targets=targets_dict,
+                disaster_info=disaster_info,
+                command_center={"lon": req.epicenter.lon, "lat": req.epicenter.lat},
+                trace_id=trace_id,
+                event_sink=event_sink,
+            )
 
-        # 移除加粗符号 (**)
-        plain_text = re.sub(r'\*\*(.*?)\*\*', r'\1', plain_text)
+            logger.info("分组Markdown报告生成完成",
+                       total_length=len(markdown_text),
+                       trace_id=trace_id)
 
-        # 移除斜体符号 (*)
-        plain_text = re.sub(r'\*(.*?)\*', r'\1', plain_text)
+            # 方案已生成：入库不随客户端断开而取消（流式断开只取消上面的章节生成）
+            persist = asyncio.ensure_future(
+                _finalize_batch_plan(
+                    markdown_text,
+                    fmt=format,
+                    req=req,
+                    device_count=len(devices_dict),
+                    target_count=len(targets_dict),
+                    llm_model=llm_model,
+                    trace_id=trace_id,
+                )
+            )
+            _PERSIST_TASKS.add(persist)
+            persist.add_done_callback(_PERSIST_TASKS.discard)
+            return await asyncio.shield(persist)
+
+        if stream:
+            # 流式输出：header → section（按完成顺序）→ footer → final（与非流式响应体相同）
+            events = IntentEventStream(
+                fmt="sse" if "text/event-stream" in request.headers.get("accept", "") else "ndjson"
+            )
+            return StreamingResponse(
+                # 客户端断开即取消章节生成（释放在途 LLM 请求）；已开始的方案入库由 _render 内 shield 保护，照常完成
+                events.iter_bytes(lambda: _render(events.sink), lambda result: result, cancel_on_disconnect=True),
+                media_type=events.media_type,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
 
-        # 移除代码块标记 (```)
-        plain_text = re.sub(r'```.*?\n', '', plain_text)
-        plain_text = re.sub(r'```', '', plain_text)
+        return await _render()
 
-        # 移除行内代码标记 (`)
-        plain_text = re.sub(r'`(.*?)`', r'\1', plain_text)
+    # ============ 增援分析（已注释）============
+    # 用户需求：跳过增援分析，即使设备不足也直接用现有设备生成方案
+    # else:
+    #     # 设备不足：生成增援请求
+    #     logger.info("设备不足，开始增援需求分析", suitable=len(suitable_devices), required=len(targets), trace_id=trace_id)
+    #     reinforcement_sources = await _fetch_reinforcement_sources(_pg_pool_async)
+    #     if not reinforcement_sources:
+    #         raise HTTPException(status_code=503, detail="当前无可用侦察设备，且数据库中无增援来源配置")
+    #     device_summaries: List[DeviceSummary] = [...]
+    #     disaster_scenario = DisasterScenario(...)
+    #     reinforcement_req = analyze_reinforcement_need(...)
+    #     return BatchWeatherPlanResponse(reinforcement_request=reinforcement_req)
 
-        # 移除链接格式 [text](url) -> text
-        plain_text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', plain_text)
 
-        logger.info("Markdown转纯文本完成",
-                   original_length=len(markdown_text),
-                   plain_length=len(plain_text),
-                   trace_id=trace_id)
+# ============ 方案输出 ============
 
-        # 准备完整响应数据（plan_id已在前面生成）
-        response_data = {
-            "plan_id": plan_id,
-            "plan_content": plain_text,
-            "plan_type": "recon",
-            "plan_subtype": "batch_weather",
-            "disaster_type": req.disaster_type,
-            "epicenter": {"lon": req.epicenter.lon, "lat": req.epicenter.lat},
-            "severity": req.severity,
-            "device_count": len(devices_dict),
-            "target_count": len(targets_dict),
-            "llm_model": llm_model,
-            "generated_at": datetime.utcnow().isoformat(),
-            "trace_id": trace_id
-        }
 
-        # 保存到PostgreSQL数据库（失败不阻塞）
+async def _finalize_batch_plan(
+    markdown_text: str,
+    *,
+    fmt: str,
+    req: BatchWeatherPlanRequest,
+    device_count: int,
+    target_count: int,
+    llm_model: str,
+    trace_id: str,
+) -> Dict[str, Any]:
+    """按请求格式转换侦察方案并保存到数据库（保存失败不影响返回）。"""
+    # 生成方案ID
+    plan_id = str(uuid.uuid4())
+
+    # 如果请求Markdown格式，直接返回
+    if fmt == "md":
+        logger.info("返回Markdown格式数据", plan_id=plan_id, trace_id=trace_id)
+        # 保存到数据库（使用Markdown原文）
         try:
             async with _pg_pool_async.connection() as conn:
                 async with conn.cursor() as cur:
@@ -591,52 +576,132 @@ async def create_batch_weather_plan(
                         """,
                         (
                             plan_id,
-                            None,  # incident_id（可选，后续关联）
+                            None,
                             "recon",
                             "batch_weather",
-                            f"{req.disaster_type}侦察方案",
-                            plain_text,
-                            json.dumps(response_data, ensure_ascii=False),
+                            f"{req.disaster_type}侦察方案(MD)",
+                            markdown_text,
+                            json.dumps({"format": "markdown"}, ensure_ascii=False),
                             req.disaster_type,
                             json.dumps({"lon": req.epicenter.lon, "lat": req.epicenter.lat}),
                             req.severity,
-                            len(devices_dict),
-                            len(targets_dict),
+                            device_count,
+                            target_count,
                             llm_model,
                             "draft",
                             "system"
                         )
                     )
                     await conn.commit()
-
-            logger.info("侦察方案已保存到数据库",
-                       plan_id=plan_id,
-                       trace_id=trace_id)
-
+            logger.info("Markdown方案已保存到数据库", plan_id=plan_id, trace_id=trace_id)
         except Exception as e:
-            logger.warning("数据库保存失败（不影响业务）",
-                          error=str(e),
-                          trace_id=trace_id)
+            logger.warning("数据库保存失败（不影响业务）", error=str(e), trace_id=trace_id)
 
-        # 返回标准JSON格式
         return {
             "code": 200,
-            "data": plain_text,
+            "data": markdown_text,
             "plan_id": plan_id
         }
 
-    # ============ 增援分析（已注释）============
-    # 用户需求：跳过增援分析，即使设备不足也直接用现有设备生成方案
-    # else:
-    #     # 设备不足：生成增援请求
-    #     logger.info("设备不足，开始增援需求分析", suitable=len(suitable_devices), required=len(targets), trace_id=trace_id)
-    #     reinforcement_sources = await _fetch_reinforcement_sources(_pg_pool_async)
-    #     if not reinforcement_sources:
-    #         raise HTTPException(status_code=503, detail="当前无可用侦察设备，且数据库中无增援来源配置")
-    #     device_summaries: List[DeviceSummary] = [...]
-    #     disaster_scenario = DisasterScenario(...)
-    #     reinforcement_req = analyze_reinforcement_need(...)
-    #     return BatchWeatherPlanResponse(reinforcement_request=reinforcement_req)
+    # 否则转换Markdown为纯文本（移除格式符号）
+    import re
+    plain_text = markdown_text
+
+    # 移除标题符号 (##, ###)
+    plain_text = re.sub(r'^#{1,6}\s+', '', plain_text, flags=re.MULTILINE)
+
+    # 移除加粗符号 (**)
+    plain_text = re.sub(r'\*\*(.*?)\*\*', r'\1', plain_text)
+
+    # 移除斜体符号 (*)
+    plain_text = re.sub(r'\*(.*?)\*', r'\1', plain_text)
+
+    # 移除代码块标记 (```)
+    plain_text = re.sub(r'```.*?\n', '', plain_text)
+    plain_text = re.sub(r'```', '', plain_text)
+
+    # 移除行内代码标记 (`)
+    plain_text = re.sub(r'`(.*?)`', r'\1', plain_text)
+
+    # 移除链接格式 [text](url) -> text
+    plain_text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', plain_text)
+
+    logger.info("Markdown转纯文本完成",
+               original_length=len(markdown_text),
+               plain_length=len(plain_text),
+               trace_id=trace_id)
+
+    # 准备完整响应数据（plan_id已在前面生成）
+    response_data = {
+        "plan_id": plan_id,
+        "plan_content": plain_text,
+        "plan_type": "recon",
+        "plan_subtype": "batch_weather",
+        "disaster_type": req.disaster_type,
+        "epicenter": {"lon": req.epicenter.lon, "lat": req.epicenter.lat},
+        "severity": req.severity,
+        "device_count": device_count,
+        "target_count": target_count,
+        "llm_model": llm_model,
+        "generated_at": datetime.utcnow().isoformat(),
+        "trace_id": trace_id
+    }
+
+    # 保存到PostgreSQL数据库（失败不阻塞）
+    try:
+        async with _pg_pool_async.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO recon_plans (
+                        plan_id, incident_id, plan_type, plan_subtype,
+                        plan_title, plan_content, plan_data,
+                        disaster_type, disaster_location, severity,
+                        device_count, target_count,
+                        llm_model, status, created_by
+                    ) VALUES (
+                        %s, %s, %s, %s,
+                        %s, %s, %s,
+                        %s, %s, %s,
+                        %s, %s,
+                        %s, %s, %s
+                    )
+                    """,
+                    (
+                        plan_id,
+                        None,  # incident_id（可选，后续关联）
+                        "recon",
+                        "batch_weather",
+                        f"{req.disaster_type}侦察方案",
+                        plain_text,
+                        json.dumps(response_data, ensure_ascii=False),
+                        req.disaster_type,
+                        json.dumps({"lon": req.epicenter.lon, "lat": req.epicenter.lat}),
+                        req.severity,
+                        device_count,
+                        target_count,
+                        llm_model,
+                        "draft",
+                        "system"
+                    )
+                )
+                await conn.commit()
+
+        logger.info("侦察方案已保存到数据库",
+                   plan_id=plan_id,
+                   trace_id=trace_id)
+
+    except Exception as e:
+        logger.warning("数据库保存失败（不影响业务）",
+                      error=str(e),
+                      trace_id=trace_id)
+
+    # 返回标准JSON格式
+    return {
+        "code": 200,
+        "data": plain_text,
+        "plan_id": plan_id
+    }
 
 
 # ============ 数据库查询函数 ============
@@ -817,17 +882,28 @@ def _get_llm_client(cfg: AppConfig) -> OpenAI:
             detail="RECON_LLM_BASE_URL或RECON_LLM_API_KEY未配置，无法调用侦察LLM",
         )
 
-    # 使用同步的 httpx.Client（而非 AsyncClient）
-    http_client = httpx.Client(
-        timeout=httpx.Timeout(cfg.llm_request_timeout_seconds),
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    # 复用容器内共享的 OpenAI 客户端与长连接池，避免每个请求重新建连/握手
+    return container.openai_client(
+        base_url=cfg.recon_llm_base_url,
+        api_key=cfg.recon_llm_api_key,
+        timeout=cfg.llm_request_timeout_seconds,
+        trust_env=True,
     )
 
-    return OpenAI(
+
+def _get_async_llm_client(cfg: AppConfig) -> AsyncOpenAI:
+    """获取LLM客户端 - 异步版本（与同步版共享配置，连接池由容器统一管理）"""
+    if not cfg.recon_llm_base_url or not cfg.recon_llm_api_key:
+        raise HTTPException(
+            status_code=503,
+            detail="RECON_LLM_BASE_URL或RECON_LLM_API_KEY未配置，无法调用侦察LLM",
+        )
+
+    return container.async_openai_client(
         base_url=cfg.recon_llm_base_url,
         api_key=cfg.recon_llm_api_key,
-        http_client=http_client,
         timeout=cfg.llm_request_timeout_seconds,
+        trust_env=True,
     )
 
 
@@ -1250,8 +1326,13 @@ async def format_plan_markdown(
 
     try:
         # 获取LLM配置
-        cfg = AppConfig.load_from_env()
-        client = OpenAI(api_key=cfg.openai_api_key, base_url=cfg.openai_base_url)
+        cfg = container.config
+        client = container.openai_client(
+            base_url=cfg.openai_base_url,
+            api_key=cfg.openai_api_key,
+            timeout=cfg.llm_request_timeout_seconds,
+            trust_env=True,
+        )
         llm_model = os.getenv("RECON_LLM_MODEL", "glm-4-flash")
 
         logger.info(
@@ -1262,7 +1343,8 @@ async def format_plan_markdown(
         )
 
         # 调用LLM生成Markdown
-        response = client.chat.completions.create(
+        response = await asyncio.to_thread(
+            client.chat.completions.create,
             model=llm_model,  # 更快模型，可通过 RECON_LLM_MODEL 配置
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,  # 保持一致性，但允许适当的语言变化
@@ -1423,8 +1505,7 @@ async def extract_recon_tasks(
 
     try:
         # 初始化提取器
-        config = AppConfig.load_from_env()
-        extractor = ReconPlanExtractor(config)
+        extractor = ReconPlanExtractor(container.config)
 
         # 提取所有任务
         tasks: List[TaskExtract] = extractor.extract_all_tasks(
@@ -11,12 +11,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, Optional, Tuple, Set, Iterable
 
 import json
 from datetime import datetime, timedelta, timezone
 
-import httpx
 import structlog
 from fastapi import APIRouter, HTTPException, Request
 from openai import OpenAI
@@ -25,7 +25,7 @@ from psycopg import errors
 from psycopg.rows import DictRow, dict_row
 from psycopg_pool import AsyncConnectionPool
 
-from emergency_agents.config import AppConfig
+from emergency_agents.container import container
 from emergency_agents.db.dao import IncidentDAO
 
 
@@ -225,7 +225,7 @@ async def generate_recon_priority_plan(
 ) -> ReconPriorityPlanResponse:
     """生成“全新侦察方案”（优先目标约束，固定 glm-4.6）。"""
 
-    cfg = AppConfig.load_from_env()
+    cfg = container.config
     if _pg_pool_async is None:
         raise HTTPException(status_code=503, detail="pg pool unavailable")
 
@@ -320,12 +320,9 @@ async def generate_recon_priority_plan(
         " choose=false 必须给 rationale；choose=true 必须包含所有执行参数并与 weather 合理匹配；不得添加未定义字段；不得输出自然语言解释。"
     )
 
-    timeout = httpx.Timeout(connect=5.0, read=cfg.llm_request_timeout_seconds, write=cfg.llm_request_timeout_seconds)
-    http_client = httpx.Client(trust_env=False, timeout=timeout)
-    client = OpenAI(
+    client = container.openai_client(
         base_url=recon_base_url,
         api_key=recon_api_key,
-        http_client=http_client,
         timeout=cfg.llm_request_timeout_seconds,
     )
     messages = [
@@ -334,7 +331,8 @@ async def generate_recon_priority_plan(
     ]
 
     try:
-        completion = client.chat.completions.create(
+        completion = await asyncio.to_thread(
+            client.chat.completions.create,
             model="glm-4.6",
             temperature=0.2,
             response_format={"type": "json_object"},
@@ -404,7 +402,8 @@ async def generate_recon_priority_plan(
     chosen_count = sum(1 for a in parsed if a.choose)
     if chosen_count == 0:
         logger.info("recon_priority_no_suitable_equipment", incident_id=req.incident_id)
-        recs = _recommend_equipment_when_none(
+        recs = await asyncio.to_thread(
+            _recommend_equipment_when_none,
             client=client,
             hazard=req.hazard_scenario,
             targets=targets,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime
 import os
@@ -12,10 +13,11 @@ from pydantic import BaseModel, Field, NonNegativeFloat, NonNegativeInt, Positiv
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
-from emergency_agents.config import AppConfig
+from emergency_agents.container import container
 from emergency_agents.llm.client import get_openai_client
 from emergency_agents.llm.prompts.rescue_assessment import build_rescue_assessment_prompt
 from emergency_agents.llm.prompts.post_rescue_assessment import build_post_rescue_assessment_prompt
+from emergency_agents.rag.pipe import aquery_rag
 
 logger = structlog.get_logger(__name__)
 
@@ -247,7 +249,7 @@ async def generate_rescue_assessment(payload: RescueAssessmentInput) -> RescueAs
     8. 返回完整报告信息
     """
     total_start = time.perf_counter()
-    cfg = AppConfig.load_from_env()
+    cfg = container.config  # 进程级缓存配置，避免每个请求重复解析 .env
     disaster_type = payload.basic.disaster_type.value
     fallback_location = "四川茂县"
     location = payload.basic.location.strip() if payload.basic.location else ""
@@ -383,7 +385,8 @@ async def generate_rescue_assessment(payload: RescueAssessmentInput) -> RescueAs
             domain="规范",
         )
 
-        spec_chunks = _rag_pipeline.query(
+        spec_chunks = await aquery_rag(
+            _rag_pipeline,
             question=spec_query,
             domain="规范",
             top_k=3
@@ -474,7 +477,7 @@ async def generate_rescue_assessment(payload: RescueAssessmentInput) -> RescueAs
         data_sources_count=len(data_sources),
     )
 
-    llm_client = get_openai_client(cfg)
+    llm_client = get_openai_client(cfg, scope="reports")  # 报告生成走后台优先级，不挤占语音/救援
     primary_model = os.getenv("RESCUE_REPORT_MODEL", DEFAULT_REPORT_MODEL)
     fallback_model = os.getenv("RESCUE_REPORT_FALLBACK_MODEL", DEFAULT_REPORT_FALLBACK_MODEL)
     llm_start = time.perf_counter()
@@ -500,7 +503,7 @@ async def generate_rescue_assessment(payload: RescueAssessmentInput) -> RescueAs
         )
 
     try:
-        completion = _call_llm(primary_model, 8000)
+        completion = await asyncio.to_thread(_call_llm, primary_model, 8000)
         used_model = primary_model
     except Exception as exc:
         errmsg = str(exc).lower()
@@ -510,7 +513,7 @@ async def generate_rescue_assessment(payload: RescueAssessmentInput) -> RescueAs
                 primary=primary_model,
                 fallback=fallback_model,
             )
-            completion = _call_llm(fallback_model, 6000)
+            completion = await asyncio.to_thread(_call_llm, fallback_model, 6000)
             used_model = fallback_model
         else:
             llm_elapsed_ms = int((time.perf_counter() - llm_start) * 1000)
@@ -1035,7 +1038,7 @@ async def generate_post_rescue_assessment(
     6. 计算置信度评分
     """
     total_start = time.perf_counter()
-    cfg = AppConfig.load_from_env()
+    cfg = container.config
 
     disaster_name = payload.disaster_overview.disaster_name
     disaster_type = payload.disaster_overview.disaster_type.value
@@ -1174,8 +1177,9 @@ async def generate_post_rescue_assessment(
             query=query_text,
         )
 
-        # RagPipeline.query的参数是question(str)、domain和top_k
-        rag_results = _rag_pipeline.query(
+        # RagPipeline.aquery的参数是question(str)、domain和top_k
+        rag_results = await aquery_rag(
+            _rag_pipeline,
             question=query_text,
             domain="规范",
             top_k=3
@@ -1220,7 +1224,7 @@ async def generate_post_rescue_assessment(
     )
 
     # ============ LLM生成报告 ============
-    llm_client = get_openai_client(cfg)
+    llm_client = get_openai_client(cfg, scope="reports")  # 报告生成走后台优先级，不挤占语音/救援
     primary_model = os.getenv("RESCUE_REPORT_MODEL", DEFAULT_REPORT_MODEL)
     fallback_model = os.getenv("RESCUE_REPORT_FALLBACK_MODEL", DEFAULT_REPORT_FALLBACK_MODEL)
     llm_start = time.perf_counter()
@@ -1246,7 +1250,7 @@ async def generate_post_rescue_assessment(
         )
 
     try:
-        completion = _call_llm(primary_model, 10000)
+        completion = await asyncio.to_thread(_call_llm, primary_model, 10000)
         used_model = primary_model
     except Exception as exc:
         errmsg = str(exc).lower()
@@ -1256,7 +1260,7 @@ async def generate_post_rescue_assessment(
                 primary=primary_model,
                 fallback=fallback_model,
             )
-            completion = _call_llm(fallback_model, 7000)
+            completion = await asyncio.to_thread(_call_llm, fallback_model, 7000)
             used_model = fallback_model
         else:
             llm_elapsed_ms = int((time.perf_counter() - llm_start) * 1000)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -199,7 +200,8 @@ async def generate_action_plan_from_description(payload: ActionPlanRequest) -> C
     )
 
     try:
-        completion = llm_client.chat.completions.create(
+        completion = await asyncio.to_thread(
+            llm_client.chat.completions.create,
             model=cfg.llm_model or "glm-4-flash",
             temperature=0.2,
             max_tokens=800,
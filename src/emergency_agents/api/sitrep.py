@@ -38,6 +38,10 @@ class SITREPGenerateRequest(BaseModel):
         None,
         description="用户ID，可选（默认使用'system'）",
     )
+    incremental: bool = Field(
+        False,
+        description="增量模式：基于上一版快照只查询变更数据并更新摘要，无变化时直接复用上一版报告",
+    )
 
 
 class SITREPMetricsResponse(BaseModel):
@@ -135,6 +139,7 @@ async def generate_sitrep(
     流程：
     1. 初始化State（report_id, user_id, thread_id, triggered_at）
     2. 调用graph.invoke()执行完整流程（durability="sync"）
+       incremental=true 时基于上一版快照增量生成，无变化时返回上一版报告（snapshot_id 不变）
     3. 返回最终报告
 
     性能要求：
@@ -153,6 +158,7 @@ async def generate_sitrep(
         report_id=report_id,
         incident_id=request.incident_id,
         time_range_hours=request.time_range_hours,
+        incremental=request.incremental,
         user_id=user_id,
     )
 
@@ -164,6 +170,7 @@ async def generate_sitrep(
             "thread_id": thread_id,
             "triggered_at": datetime.now(timezone.utc),
             "time_range_hours": request.time_range_hours,
+            "incremental": request.incremental,
         }
 
         # 如果指定了incident_id，添加到State
@@ -4,13 +4,15 @@ import asyncio
 import base64
 import json
 import os
-from typing import Any, Callable, Optional, List, Dict, Mapping
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Mapping
 
 import structlog
 from fastapi import WebSocket, WebSocketDisconnect
 
 from emergency_agents.config import AppConfig
+from emergency_agents.voice.asr.base import ASRResult
 from emergency_agents.voice.asr.service import ASRService
+from emergency_agents.voice.asr.streaming import StreamingUtterance
 from emergency_agents.voice.health.checker import HealthChecker
 from emergency_agents.voice.intent_handler import IntentHandler
 from emergency_agents.voice.tts_client import TTSClient
@@ -38,6 +40,8 @@ class VoiceChatSession:
         # 前端可能发送的 OPUS/PCM 音频缓存（统一在 16k PCM 处理）
         self.opus_packets: list[bytes] = []
         self.raw_chunks: list[bytes] = []
+        # 当前句的流式识别（VAD 检测到说话时打开，说话结束时收尾）
+        self.utterance: Optional[StreamingUtterance] = None
         # 是否处于录音态（收到 start 进入，收到 stop 退出）
         self.is_recording: bool = False
         # 累计收到的字节数（排查链路问题用）
@@ -84,6 +88,8 @@ class VoiceChatHandler:
             self.tts_client = None
         self.intent_handler = intent_handler or IntentHandler(self._config)
         self.vad_detector = VADDetector()
+        # 流式识别：说话期间即向 ASR 转发音频，VAD 结束后只等最终结果；关闭时退回整句识别
+        self._asr_streaming: bool = os.getenv("VOICE_ASR_STREAMING", "true").strip().lower() in {"1", "true", "yes", "on"}
         self.health_checker.register_service("voice_asr", self._check_asr_health)
         if self.tts_client is not None:
             # 仅当TTS启用时纳入健康检查
@@ -93,6 +99,7 @@ class VoiceChatHandler:
             "voice_chat_handler_initialized",
             vad_enabled=True,
             tts_enabled=self._tts_enabled,
+            asr_streaming=self._asr_streaming,
         )
 
         # 统一意图管线依赖（启动后由 main.py 注入）
@@ -145,6 +152,8 @@ class VoiceChatHandler:
             # 仅在启用TTS时关闭客户端连接，避免对None调用
             await self.tts_client.close()
         await self.health_checker.stop()
+        # 停止 VAD 批量推理线程（join 会阻塞，放到线程中执行）
+        await asyncio.to_thread(self.vad_detector.close)
         logger.info("voice_chat_background_tasks_stopped")
 
     async def handle_connection(self, websocket: WebSocket) -> None:
@@ -195,7 +204,7 @@ class VoiceChatHandler:
 
         - 从内存移除会话
         - 停止录音并清空缓冲
-        - 重置 VAD 会话状态
+        - 释放 VAD 会话状态
         - 尝试关闭 WebSocket（忽略已关闭异常）
         """
         session = self.sessions.pop(session_id, None)
@@ -204,6 +213,7 @@ class VoiceChatHandler:
 
         try:
             session.is_recording = False
+            self._abort_utterance(session)
             session.opus_packets.clear()
             session.raw_chunks.clear()
         except Exception:
@@ -211,7 +221,7 @@ class VoiceChatHandler:
             pass
 
         try:
-            self.vad_detector.reset_session(session_id)
+            self.vad_detector.remove_session(session_id)
         except Exception as e:
             logger.warning("vad_session_reset_failed", session_id=session_id, error=str(e))
 
@@ -234,13 +244,19 @@ class VoiceChatHandler:
             if msg_type == "start":
                 session.is_recording = True
                 session.opus_packets.clear()
+                self._abort_utterance(session)
                 self.vad_detector.reset_session(session.session_id)
                 logger.info("recording_started", session_id=session.session_id)
                 await session.send_json({"type": "recording_started", "message": "开始录音"})
             elif msg_type == "stop":
                 session.is_recording = False
                 logger.info("recording_manually_stopped", session_id=session.session_id)
-                if len(session.opus_packets) > 0 or len(session.raw_chunks) > 0:
+                if session.utterance is not None:
+                    self._finish_utterance(session)
+                    session.opus_packets.clear()
+                    session.raw_chunks.clear()
+                    self.vad_detector.reset_session(session.session_id)
+                elif len(session.opus_packets) > 0 or len(session.raw_chunks) > 0:
                     # 聚合当前缓存并后台处理，避免阻塞
                     audio_payload = b"".join(session.raw_chunks) if session.raw_chunks else b""
                     if not audio_payload and session.opus_packets:
@@ -295,12 +311,23 @@ class VoiceChatHandler:
             return
         try:
             # 默认按 PCM 直传处理，避免浏览器 webm/opus 容器不兼容问题
-            client_have_voice, client_voice_stop = self.vad_detector.process_pcm_chunk(
+            client_have_voice, client_voice_stop = await self.vad_detector.aprocess_pcm_chunk(
                 session.session_id, audio_bytes
             )
             session.raw_chunks.append(audio_bytes)
             session.bytes_received_total += len(audio_bytes)
 
+            if session.utterance is not None:
+                session.utterance.feed(audio_bytes)
+            elif client_have_voice and self._asr_streaming:
+                # 说话开始：打开流式识别，并补发检测到人声之前已缓存的音频
+                session.utterance = StreamingUtterance(
+                    self.asr_service,
+                    on_partial=self._partial_sink(session),
+                )
+                for chunk in session.raw_chunks:
+                    session.utterance.feed(chunk)
+
             if client_have_voice:
                 await session.send_json({"type": "vad", "is_speaking": True})
 
@@ -308,6 +335,7 @@ class VoiceChatHandler:
                 # 二次确认：过短语音直接丢弃，避免无效调用
                 if len(session.opus_packets) < 15 and len(session.raw_chunks) == 0:
                     logger.info("speech_too_short", session_id=session.session_id)
+                    self._abort_utterance(session)
                     session.opus_packets.clear()
                     session.raw_chunks.clear()
                     self.vad_detector.reset_session(session.session_id)
@@ -315,6 +343,14 @@ class VoiceChatHandler:
 
                 await session.send_json({"type": "vad", "is_speaking": False, "finalized": True})
 
+                if session.utterance is not None:
+                    # 音频已随说随送，此处只需收尾取最终结果
+                    self._finish_utterance(session)
+                    session.opus_packets.clear()
+                    session.raw_chunks.clear()
+                    self.vad_detector.reset_session(session.session_id)
+                    return
+
                 # 将当前音频数据打包后丢给后台任务，避免阻塞 receive 循环
                 audio_payload = b"".join(session.raw_chunks) if session.raw_chunks else b""
                 if not audio_payload and session.opus_packets:
@@ -342,6 +378,33 @@ class VoiceChatHandler:
         except Exception as e:
             logger.error("handle_audio_failed", session_id=session.session_id, error=str(e))
 
+    def _partial_sink(self, session: VoiceChatSession) -> Callable[[ASRResult], Awaitable[None]]:
+        async def _send_partial(partial: ASRResult) -> None:
+            await session.send_json({
+                "type": "stt",
+                "text": partial.text,
+                "is_final": False,
+                "provider": partial.provider,
+                "latency_ms": partial.latency_ms,
+            })
+
+        return _send_partial
+
+    def _finish_utterance(self, session: VoiceChatSession) -> None:
+        """结束当前句的流式识别，后台等待最终结果并进入意图处理。"""
+        utterance = session.utterance
+        session.utterance = None
+        if utterance is None:
+            return
+        utterance.end()
+        asyncio.create_task(self._process_transcript(session.session_id, utterance.result))
+
+    def _abort_utterance(self, session: VoiceChatSession) -> None:
+        utterance = session.utterance
+        session.utterance = None
+        if utterance is not None:
+            utterance.abort()
+
     async def _process_audio_payload(self, session_id: str, audio_data: bytes) -> None:
         """后台执行完整的 ASR → LLM → TTS 流程，避免阻塞主循环。
 
@@ -349,12 +412,20 @@ class VoiceChatHandler:
         - session_id: 会话标识，用于在发送阶段获取会话与安全检查
         - audio_data: 已合并好的 16k PCM 数据
         """
+        await self._process_transcript(session_id, lambda: self.asr_service.recognize(audio_data))
+
+    async def _process_transcript(
+        self,
+        session_id: str,
+        recognize: Callable[[], Awaitable[Optional[ASRResult]]],
+    ) -> None:
+        """获取识别结果（整句识别或流式收尾）后下发 stt，并进入意图处理。"""
         session = self.sessions.get(session_id)
         if session is None:
             return
         try:
             try:
-                asr_result = await self.asr_service.recognize(audio_data)
+                asr_result = await recognize()
             except Exception as asr_error:
                 root_cause = getattr(asr_error, "__cause__", None) or getattr(asr_error, "__context__", None)
                 logger.error(
@@ -368,6 +439,8 @@ class VoiceChatHandler:
                 )
                 await session.send_json({"type": "error", "message": f"ASR失败: {asr_error}"})
                 return
+            if asr_result is None:
+                return
 
             text = asr_result.text
             await session.send_json({
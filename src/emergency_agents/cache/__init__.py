@@ -1,5 +1,6 @@
 """缓存模块"""
 
 from .redis_client import redis_client, RedisClient
+from .embedding_cache import EmbeddingCache, get_embedding_cache
 
-__all__ = ["redis_client", "RedisClient"]
+__all__ = ["redis_client", "RedisClient", "EmbeddingCache", "get_embedding_cache"]
@@ -0,0 +1,209 @@
+"""
+向量嵌入缓存
+
+功能：
+- 以 (模型, 文本) 的 SHA-256 作为键，避免重复调用远端嵌入接口
+- 进程内 LRU 一级缓存 + 可选 Redis 二级缓存（复用 RedisClient 连接池）
+- RAG 检索与 Mem0 记忆检索共享同一实例
+- Prometheus 命中率指标：embedding_cache_requests_total{subsystem,result}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+logger = structlog.get_logger(__name__)
+
+_EMBEDDING_CACHE_REQUESTS = Counter(
+    "embedding_cache_requests_total",
+    "嵌入缓存查询次数",
+    ["subsystem", "result"],
+)
+_EMBEDDING_CACHE_ENTRIES = Gauge("embedding_cache_entries", "进程内嵌入缓存条目数")
+
+
+class EmbeddingCache:
+    """两级嵌入缓存（进程内 LRU + 可选 Redis）"""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        redis: Optional[Any] = None,
+        redis_ttl: int = 7 * 24 * 3600,
+        key_prefix: str = "embedding:",
+    ) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._entries: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis
+        self._redis_ttl = redis_ttl
+        self._key_prefix = key_prefix
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """按模型与原文计算内容哈希键；同一文本在不同模型下互不复用。"""
+        digest = hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, model: str, text: str, *, subsystem: str = "default") -> Optional[List[float]]:
+        """
+        读取缓存
+
+        参数：
+            model: 嵌入模型名
+            text: 原始文本
+            subsystem: 调用方标识（rag/mem0），用于指标分组
+
+        返回：
+            向量（副本），未命中返回None
+        """
+        key = self.make_key(model, text)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        if cached is not None:
+            self._record(subsystem, "memory_hit")
+            return list(cached)
+
+        if self._redis is not None:
+            remote = self._redis.get(key, prefix=self._prefix())
+            if isinstance(remote, list) and remote:
+                vector = [float(value) for value in remote]
+                self._store_local(key, vector)
+                self._record(subsystem, "redis_hit")
+                return vector
+
+        self._record(subsystem, "miss")
+        return None
+
+    def set(self, model: str, text: str, vector: Sequence[float]) -> None:
+        """写入缓存（进程内 + Redis）"""
+        key = self.make_key(model, text)
+        self._store_local(key, vector)
+        if self._redis is not None:
+            self._redis.set(key, list(vector), ttl=self._redis_ttl, prefix=self._prefix())
+
+    async def aget(self, model: str, text: str, *, subsystem: str = "default") -> Optional[List[float]]:
+        """异步读取；命中进程内缓存时不切线程，仅 Redis 访问放到线程池"""
+        if self._redis is None:
+            return self.get(model, text, subsystem=subsystem)
+        return await asyncio.to_thread(self.get, model, text, subsystem=subsystem)
+
+    async def aset(self, model: str, text: str, vector: Sequence[float]) -> None:
+        """异步写入"""
+        if self._redis is None:
+            self.set(model, text, vector)
+            return
+        await asyncio.to_thread(self.set, model, text, vector)
+
+    def stats(self) -> dict[str, float]:
+        """返回进程内累计命中统计"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": float(len(self._entries)),
+                "hits": float(self._hits),
+                "misses": float(self._misses),
+                "hit_rate": (self._hits / total) if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        """清空进程内缓存（Redis 层依赖 TTL 过期）"""
+        with self._lock:
+            self._entries.clear()
+        _EMBEDDING_CACHE_ENTRIES.set(0)
+
+    def _prefix(self) -> str:
+        return f"emergency:{self._key_prefix}"
+
+    def _store_local(self, key: str, vector: Sequence[float]) -> None:
+        with self._lock:
+            self._entries[key] = tuple(float(value) for value in vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        _EMBEDDING_CACHE_ENTRIES.set(size)
+
+    def _record(self, subsystem: str, result: str) -> None:
+        with self._lock:
+            if result == "miss":
+                self._misses += 1
+            else:
+                self._hits += 1
+        _EMBEDDING_CACHE_REQUESTS.labels(subsystem=subsystem, result=result).inc()
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    获取进程级共享嵌入缓存
+
+    环境变量：
+        EMBEDDING_CACHE_MAX_ENTRIES: 进程内条目上限（默认4096）
+        EMBEDDING_CACHE_REDIS: 是否启用Redis二级缓存（默认false）
+        EMBEDDING_CACHE_TTL_SECONDS: Redis过期时间（默认7天）
+    """
+    global _shared_cache
+    if _shared_cache is not None:
+        return _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            redis = None
+            if os.getenv("EMBEDDING_CACHE_REDIS", "false").strip().lower() in {"1", "true", "yes", "on"}:
+                from emergency_agents.cache.redis_client import redis_client
+
+                redis = redis_client if redis_client.get_client() is not None else None
+                if redis is None:
+                    logger.warning("embedding_cache_redis_unavailable")
+            _shared_cache = EmbeddingCache(
+                max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "4096")),
+                redis=redis,
+                redis_ttl=int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            )
+            logger.info(
+                "embedding_cache_initialized",
+                redis_enabled=redis is not None,
+            )
+    return _shared_cache
+
+
+class CachedMem0Embedder:
+    """
+    Mem0 嵌入器代理
+
+    拦截 embed()，其余属性（embed_batch/config 等）透传给原始嵌入器。
+    """
+
+    def __init__(self, inner: Any, cache: EmbeddingCache, model: str) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._model = model
+
+    def embed(self, text: Any, memory_action: Optional[str] = None) -> Any:
+        if not isinstance(text, str):
+            return self._inner.embed(text, memory_action)
+        cached = self._cache.get(self._model, text, subsystem="mem0")
+        if cached is not None:
+            return cached
+        vector = self._inner.embed(text, memory_action)
+        self._cache.set(self._model, text, vector)
+        return vector
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
@@ -76,6 +76,12 @@ class AppConfig:
     video_vllm_url: str
     video_vllm_api_key: str
     video_vllm_model: str
+    video_frame_max_side: int
+    video_frame_jpeg_quality: int
+    video_monitor_device_ids: tuple[str, ...]
+    video_monitor_interval_seconds: float
+    video_monitor_batch_size: int
+    video_monitor_max_concurrency: int
     llm_model: str
     intent_llm_model: str
     embedding_model: str
@@ -94,6 +100,9 @@ class AppConfig:
     amap_base_url: str
     amap_connect_timeout: float
     amap_read_timeout: float
+    amap_cache_ttl_seconds: float
+    amap_cache_max_entries: int
+    amap_coordinate_precision: int
     video_stream_map: dict[str, object]
     kg_api_url: str | None
     kg_api_key: str | None
@@ -105,6 +114,16 @@ class AppConfig:
     llm_recovery_seconds: int
     llm_max_concurrency: int
     llm_request_timeout_seconds: float
+    llm_routing_policy: str
+    llm_latency_ewma_alpha: float
+    llm_concurrency_min: int
+    llm_concurrency_max: int
+    llm_scope_priorities: dict[str, int]
+    llm_hedge_enabled: bool
+    llm_hedge_quantile: float
+    llm_hedge_min_delay_seconds: float
+    llm_hedge_max_delay_seconds: float
+    api_request_deadline_seconds: float
     adapter_base_url: str | None
     adapter_timeout: float
     default_robotdog_id: str | None
@@ -119,6 +138,13 @@ class AppConfig:
     intent_provider_timeout: float
     intent_confidence_threshold: float
     intent_margin_threshold: float
+    intent_fast_path_enabled: bool
+    intent_fast_path_min_confidence: float
+    intent_cache_enabled: bool
+    intent_cache_ttl_seconds: int
+    intent_cache_redis: bool
+    intent_cache_similarity: float
+    intent_cache_opt_out: tuple[str, ...]
     risk_cache_ttl_seconds: float
     risk_refresh_interval_seconds: float
     enable_mem0: bool
@@ -245,12 +271,31 @@ class AppConfig:
             except Exception as exc:
                 _logger.warning("llm_endpoint_groups_parse_failed", error=str(exc))
 
+        # 作用域优先级覆盖，如 {"reports": 2, "voice": 0}；数值越小越优先
+        scope_priorities: dict[str, int] = {}
+        priorities_env = os.getenv("LLM_SCOPE_PRIORITIES")
+        if priorities_env:
+            try:
+                raw_priorities = json.loads(priorities_env)
+                if isinstance(raw_priorities, dict):
+                    scope_priorities = {str(key): int(value) for key, value in raw_priorities.items()}
+            except (ValueError, TypeError) as exc:
+                _logger.warning("llm_scope_priorities_parse_failed", error=str(exc))
+
         return AppConfig(
             openai_base_url=os.getenv("OPENAI_BASE_URL", "http://192.168.1.40:8000/v1"),
             openai_api_key=os.getenv("OPENAI_API_KEY", "dummy"),
             video_vllm_url=video_vllm_url,
             video_vllm_api_key=video_vllm_api_key,
             video_vllm_model=video_vllm_model,
+            video_frame_max_side=int(os.getenv("VIDEO_FRAME_MAX_SIDE", "1280")),
+            video_frame_jpeg_quality=int(os.getenv("VIDEO_FRAME_JPEG_QUALITY", "85")),
+            video_monitor_device_ids=tuple(
+                item.strip() for item in os.getenv("VIDEO_MONITOR_DEVICE_IDS", "").split(",") if item.strip()
+            ),
+            video_monitor_interval_seconds=float(os.getenv("VIDEO_MONITOR_INTERVAL_SECONDS", "5")),
+            video_monitor_batch_size=int(os.getenv("VIDEO_MONITOR_BATCH_SIZE", "4")),
+            video_monitor_max_concurrency=int(os.getenv("VIDEO_MONITOR_MAX_CONCURRENCY", "2")),
             llm_model=os.getenv("LLM_MODEL", "qwen2.5-7b-instruct"),
             intent_llm_model=intent_llm_model,
             embedding_model=os.getenv("EMBEDDING_MODEL", "bge-large-zh-v1.5"),
@@ -269,6 +314,9 @@ class AppConfig:
             amap_base_url=os.getenv("AMAP_API_URL", "https://restapi.amap.com"),
             amap_connect_timeout=float(os.getenv("AMAP_API_CONNECT_TIMEOUT", "10")),
             amap_read_timeout=float(os.getenv("AMAP_API_READ_TIMEOUT", "10")),
+            amap_cache_ttl_seconds=float(os.getenv("AMAP_CACHE_TTL_SECONDS", "300")),
+            amap_cache_max_entries=int(os.getenv("AMAP_CACHE_MAX_ENTRIES", "2048")),
+            amap_coordinate_precision=int(os.getenv("AMAP_COORDINATE_PRECISION", "4")),
             video_stream_map=stream_map,
             kg_api_url=kg_api_url,
             kg_api_key=os.getenv("KG_API_KEY"),
@@ -280,6 +328,16 @@ class AppConfig:
             llm_recovery_seconds=int(os.getenv("LLM_RECOVERY_SECONDS", "60")),
             llm_max_concurrency=llm_max_concurrency,
             llm_request_timeout_seconds=llm_request_timeout_seconds,
+            llm_routing_policy=os.getenv("LLM_ROUTING_POLICY", "weighted").strip().lower(),
+            llm_latency_ewma_alpha=float(os.getenv("LLM_LATENCY_EWMA_ALPHA", "0.3")),
+            llm_concurrency_min=int(os.getenv("LLM_CONCURRENCY_MIN", "1")),
+            llm_concurrency_max=int(os.getenv("LLM_CONCURRENCY_MAX", "32")),
+            llm_scope_priorities=scope_priorities,
+            llm_hedge_enabled=_bool_env("LLM_HEDGE_ENABLED", False),
+            llm_hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+            llm_hedge_min_delay_seconds=float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.3")),
+            llm_hedge_max_delay_seconds=float(os.getenv("LLM_HEDGE_MAX_DELAY_SECONDS", "5")),
+            api_request_deadline_seconds=float(os.getenv("API_REQUEST_DEADLINE_SECONDS", "90")),
             adapter_base_url=os.getenv("ADAPTER_HUB_BASE_URL"),
             adapter_timeout=float(os.getenv("ADAPTER_HUB_TIMEOUT", "5")),
             default_robotdog_id=os.getenv("DEFAULT_ROBOTDOG_ID"),
@@ -294,6 +352,15 @@ class AppConfig:
             intent_provider_timeout=float(os.getenv("INTENT_PROVIDER_TIMEOUT", "1.5")),
             intent_confidence_threshold=float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.65")),
             intent_margin_threshold=float(os.getenv("INTENT_MARGIN_THRESHOLD", "0.20")),
+            intent_fast_path_enabled=_bool_env("INTENT_FAST_PATH_ENABLED", True),
+            intent_fast_path_min_confidence=float(os.getenv("INTENT_FAST_PATH_MIN_CONFIDENCE", "0.85")),
+            intent_cache_enabled=_bool_env("INTENT_CACHE_ENABLED", True),
+            intent_cache_ttl_seconds=int(os.getenv("INTENT_CACHE_TTL_SECONDS", "600")),
+            intent_cache_redis=_bool_env("INTENT_CACHE_REDIS", False),
+            intent_cache_similarity=float(os.getenv("INTENT_CACHE_SIMILARITY", "0")),
+            intent_cache_opt_out=tuple(
+                item.strip() for item in os.getenv("INTENT_CACHE_OPT_OUT", "").split(",") if item.strip()
+            ),
             risk_cache_ttl_seconds=float(os.getenv("RISK_CACHE_TTL_SECONDS", "120")),
             risk_refresh_interval_seconds=float(os.getenv("RISK_REFRESH_INTERVAL_SECONDS", "60")),
             enable_mem0=_bool_env("ENABLE_MEM0", False),
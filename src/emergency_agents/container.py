@@ -1,23 +1,47 @@
 # Copyright 2025 msq
 from __future__ import annotations
 
-from typing import Any, Optional
+import hashlib
+import importlib.util
+import inspect
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
 import logging
 
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_core.language_models import BaseChatModel
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
 logger = logging.getLogger(__name__)
 
+# 安装了 h2 才启用 HTTP/2（TLS 连接经 ALPN 协商，明文 http 仍为 HTTP/1.1）
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 共享连接池规格：保持长连接，避免每个请求重新握手
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+Factory = Callable[[], Any]
+Closer = Callable[[Any], Any]
+
 
 class ServiceContainer:
-    """简单的服务容器，用于解耦 main.py 的依赖注入。"""
+    """简单的服务容器，用于解耦 main.py 的依赖注入。
+
+    除直接注册的服务实例外，还负责应用级共享客户端（httpx / OpenAI / 视觉分析器等）：
+    首次使用时按工厂懒加载并缓存，进程内复用连接池，shutdown 时统一 ``aclose()``。
+    """
 
     _instance: Optional[ServiceContainer] = None
-    
+
     def __init__(self):
         self._services: dict[str, Any] = {}
         self._config: Any = None
+        self._factories: dict[str, tuple[Factory, Optional[Closer]]] = {}
+        self._closers: dict[str, Closer] = {}
+        self._lock = threading.RLock()
 
     @classmethod
     def get_instance(cls) -> ServiceContainer:
@@ -30,26 +54,160 @@ class ServiceContainer:
         self._services[name] = service
         logger.info(f"Service registered: {name}")
 
+    def register_factory(self, name: str, factory: Factory, *, closer: Optional[Closer] = None) -> None:
+        """注册懒加载工厂：首次 get 时才构造，closer 在 aclose() 时调用。"""
+        with self._lock:
+            self._factories[name] = (factory, closer)
+
     def get(self, name: str) -> Any:
         """获取服务实例。"""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+        if name in self._factories:
+            factory, closer = self._factories[name]
+            return self.get_or_create(name, factory, closer=closer)
         if name not in self._services:
             raise KeyError(f"Service not found: {name}")
-        return self._services[name]
+        return service
+
+    def get_or_create(self, name: str, factory: Factory, *, closer: Optional[Closer] = None) -> Any:
+        """按名称复用共享资源，不存在时用 factory 构造并登记关闭回调（线程安全）。"""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+        with self._lock:
+            service = self._services.get(name)
+            if service is None:
+                service = factory()
+                self._services[name] = service
+                if closer is not None:
+                    self._closers[name] = closer
+                logger.info(f"Shared resource created: {name}")
+        return service
 
     def set_config(self, config: Any) -> None:
         self._config = config
 
     @property
     def config(self) -> Any:
+        """应用配置；未显式设置时从环境变量解析一次并缓存，避免每个请求重复解析 dotenv。"""
         if self._config is None:
-            raise RuntimeError("Config not initialized")
+            with self._lock:
+                if self._config is None:
+                    from emergency_agents.config import AppConfig
+
+                    self._config = AppConfig.load_from_env()
         return self._config
 
+    def http_client(self, *, timeout: float, trust_env: bool = False) -> httpx.Client:
+        """共享同步 httpx 客户端（长连接池，可用时启用 HTTP/2），按超时与代理设置区分。"""
+        name = f"http_client:{float(timeout)}:{int(trust_env)}"
+        return self.get_or_create(
+            name,
+            lambda: httpx.Client(
+                timeout=httpx.Timeout(timeout, connect=min(5.0, timeout)),
+                limits=_HTTP_LIMITS,
+                http2=_HTTP2_AVAILABLE,
+                trust_env=trust_env,
+            ),
+            closer=lambda client: client.close(),
+        )
+
+    def async_http_client(
+        self,
+        *,
+        timeout: float,
+        trust_env: bool = False,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.AsyncClient:
+        """共享异步 httpx 客户端；headers 不同（如鉴权）时各自持有连接池。"""
+        header_key = _digest(repr(sorted((headers or {}).items())))
+        name = f"async_http_client:{float(timeout)}:{int(trust_env)}:{header_key}"
+        return self.get_or_create(
+            name,
+            lambda: httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout, connect=min(5.0, timeout)),
+                limits=_HTTP_LIMITS,
+                http2=_HTTP2_AVAILABLE,
+                trust_env=trust_env,
+                headers=headers,
+            ),
+            closer=lambda client: client.aclose(),
+        )
+
+    def openai_client(
+        self,
+        *,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        timeout: float,
+        trust_env: bool = False,
+    ) -> "OpenAI":
+        """按 (base_url, api_key, timeout) 复用的同步 OpenAI 客户端，底层共享 httpx 连接池。"""
+        from openai import OpenAI
+
+        name = f"openai_client:{base_url}:{_digest(api_key or '')}:{float(timeout)}:{int(trust_env)}"
+        # 连接池归容器所有，OpenAI 客户端本身无需单独关闭
+        return self.get_or_create(
+            name,
+            lambda: OpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                http_client=self.http_client(timeout=timeout, trust_env=trust_env),
+                timeout=timeout,
+            ),
+        )
+
+    def async_openai_client(
+        self,
+        *,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        timeout: float,
+        trust_env: bool = False,
+    ) -> "AsyncOpenAI":
+        """异步版 openai_client，底层共享异步 httpx 连接池（供不阻塞事件循环的 LLM 调用使用）。"""
+        from openai import AsyncOpenAI
+
+        name = f"async_openai_client:{base_url}:{_digest(api_key or '')}:{float(timeout)}:{int(trust_env)}"
+        return self.get_or_create(
+            name,
+            lambda: AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                http_client=self.async_http_client(timeout=timeout, trust_env=trust_env),
+                timeout=timeout,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """按创建逆序关闭所有登记了 closer 的共享资源，单个失败不影响其余资源。"""
+        with self._lock:
+            pending = [(name, closer, self._services.pop(name, None)) for name, closer in self._closers.items()]
+            self._closers.clear()
+        for name, closer, service in reversed(pending):
+            if service is None:
+                continue
+            try:
+                result = closer(service)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f"Shared resource close failed: {name}")
+        if pending:
+            logger.info(f"Shared resources closed: {len(pending)}")
+
     @property
     def llm_client(self) -> BaseChatModel:
         """获取标准的 LangChain ChatModel 实例 (Lazy load preferred but simplified here)."""
         return self.get("llm_client")
-    
+
+    @property
+    def async_llm_client(self) -> Any:
+        """意图链路使用的异步 Failover 客户端（未注册时返回 None）。"""
+        return self._services.get("async_llm_client")
+
     @property
     def db_pool(self) -> Any:
         return self.get("db_pool")
@@ -57,10 +215,16 @@ class ServiceContainer:
     @property
     def kg_service(self) -> Any:
         return self.get("kg_service")
-        
+
     @property
     def rag_pipeline(self) -> Any:
         return self.get("rag_pipeline")
 
+
+def _digest(value: str) -> str:
+    """资源键中不直接出现密钥，仅保留摘要。"""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:12]
+
+
 # 全局单例访问点
 container = ServiceContainer.get_instance()
@@ -841,7 +841,8 @@ class TaskDAO:
             "       description, "
             "       status, "
             "       progress, "
-            "       updated_at "
+            "       updated_at, "
+            "       created_at "
             "  FROM operational.tasks "
             " WHERE created_at >= NOW() - make_interval(hours => %(hours)s) "
             "   AND deleted_at IS NULL "
@@ -866,6 +867,42 @@ class TaskDAO:
         )
         return result
 
+    async def list_tasks_changed_since(self, since: datetime, *, hours: int = 24) -> list[TaskSummary]:
+        """查询统计窗口内自 since 起有变更的任务（增量SITREP）。
+
+        已删除的任务以 status='deleted' 返回，便于调用方从上一版快照中移除。
+        """
+        query = (
+            "SELECT id::text AS id, "
+            "       code, "
+            "       description, "
+            "       CASE WHEN deleted_at IS NOT NULL THEN 'deleted' ELSE status::text END AS status, "
+            "       progress, "
+            "       updated_at, "
+            "       created_at "
+            "  FROM operational.tasks "
+            " WHERE created_at >= NOW() - make_interval(hours => %(hours)s) "
+            "   AND (updated_at >= %(since)s OR deleted_at >= %(since)s) "
+            " ORDER BY updated_at DESC"
+        )
+        start = time.perf_counter()
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(TaskSummary)) as cur:
+                await cur.execute(query, {"since": since, "hours": hours})
+                rows = await cur.fetchall()
+                result = list(rows)
+        duration = time.perf_counter() - start
+        DAO_CALL_LATENCY.labels("task", "list_tasks_changed_since").observe(duration)
+        DAO_CALL_TOTAL.labels("task", "list_tasks_changed_since", "success").inc()
+        logger.info(
+            "dao_task_list_tasks_changed_since",
+            duration_ms=duration * 1000,
+            since=since.isoformat(),
+            hours=hours,
+            count=len(result),
+        )
+        return result
+
     async def list_tasks_by_event(self, event_id: str, hours: int = 24) -> list[TaskSummary]:
         """按事件过滤最近N小时任务列表。
 
@@ -1245,6 +1282,46 @@ class IncidentDAO:
         )
         return result
 
+    async def list_incidents_changed_since(self, since: datetime) -> list[IncidentRecord]:
+        """查询自 since 起有变更的事件（含已关闭/已删除，增量SITREP据此增删活跃事件）。"""
+        query = (
+            "SELECT id::text AS id, "
+            "       parent_event_id::text AS parent_event_id, "
+            "       event_code, "
+            "       title, "
+            "       type::text AS type, "
+            "       priority, "
+            "       status::text AS status, "
+            "       description, "
+            "       created_by, "
+            "       updated_by, "
+            "       created_at, "
+            "       updated_at, "
+            "       deleted_at "
+            "  FROM operational.events "
+            " WHERE updated_at >= %(since)s "
+            "    OR deleted_at >= %(since)s "
+            " ORDER BY priority DESC, updated_at DESC"
+        )
+
+        start = time.perf_counter()
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(IncidentRecord)) as cur:
+                await cur.execute(query, {"since": since})
+                rows = await cur.fetchall()
+                result = list(rows)
+
+        duration = time.perf_counter() - start
+        DAO_CALL_LATENCY.labels("incident", "list_incidents_changed_since").observe(duration)
+        DAO_CALL_TOTAL.labels("incident", "list_incidents_changed_since", "success").inc()
+        logger.info(
+            "dao_incident_list_incidents_changed_since",
+            duration_ms=duration * 1000,
+            since=since.isoformat(),
+            count=len(result),
+        )
+        return result
+
     async def list_active_risk_zones(self, *, reference_time: Optional[datetime] = None) -> list[RiskZoneRecord]:
         now = reference_time or datetime.now(timezone.utc)
         query = (
@@ -1385,6 +1462,104 @@ class IncidentDAO:
 
         return results
 
+    async def find_zones_near_points(
+        self,
+        points: Sequence[tuple[float, float]],
+        *,
+        radius_meters: float,
+        reference_time: Optional[datetime] = None,
+    ) -> list[list[RiskZoneRecord]]:
+        """批量查询多个坐标附近的活跃风险区域（一次往返）。
+
+        points 为 (lng, lat) 序列；返回值与 points 一一对应，每组按严重度降序、距离升序排列。
+        通过 unnest 展开坐标数组，再以 LATERAL + ST_DWithin 逐点命中空间索引。
+        """
+        if not points:
+            return []
+        now = reference_time or datetime.now(timezone.utc)
+
+        query = (
+            "WITH pts AS ("
+            "  SELECT (p.ord - 1)::int AS idx, "
+            "         ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326)::geography AS geog "
+            "    FROM unnest(%(lngs)s::float8[], %(lats)s::float8[]) WITH ORDINALITY AS p(lng, lat, ord)"
+            ") "
+            "SELECT pts.idx, "
+            "       z.zone_id, z.zone_name, z.hazard_type, z.severity, z.description, "
+            "       z.geometry_geojson, z.properties, z.valid_from, z.valid_until, "
+            "       z.created_at, z.updated_at, z.distance_m "
+            "  FROM pts "
+            "  CROSS JOIN LATERAL ("
+            "    SELECT zone_id::text AS zone_id, "
+            "           zone_name, "
+            "           hazard_type, "
+            "           severity, "
+            "           description, "
+            "           ST_AsGeoJSON(area::geometry)::json AS geometry_geojson, "
+            "           properties, "
+            "           valid_from, "
+            "           valid_until, "
+            "           created_at, "
+            "           updated_at, "
+            "           ST_Distance(area::geography, pts.geog) AS distance_m "
+            "      FROM operational.hazard_zones "
+            "     WHERE deleted_at IS NULL "
+            "       AND (valid_until IS NULL OR valid_until >= %(now)s) "
+            "       AND ST_DWithin(area::geography, pts.geog, %(radius)s)"
+            "  ) z "
+            " ORDER BY pts.idx, z.severity DESC, z.distance_m ASC"
+        )
+
+        params = {
+            "now": now,
+            "lngs": [float(lng) for lng, _ in points],
+            "lats": [float(lat) for _, lat in points],
+            "radius": radius_meters,
+        }
+
+        start = time.perf_counter()
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(query, params)
+                rows = await cur.fetchall()
+
+        duration = time.perf_counter() - start
+        DAO_CALL_LATENCY.labels("incident", "find_zones_near_points").observe(duration)
+        DAO_CALL_TOTAL.labels("incident", "find_zones_near_points", "success").inc()
+
+        results: list[list[RiskZoneRecord]] = [[] for _ in points]
+        # 同一区域可能命中多个航点，记录只构建一次
+        zones_by_id: dict[str, RiskZoneRecord] = {}
+        for row in rows:
+            zone = zones_by_id.get(row["zone_id"])
+            if zone is None:
+                zone = RiskZoneRecord(
+                    zone_id=row["zone_id"],
+                    zone_name=row["zone_name"],
+                    hazard_type=row["hazard_type"],
+                    severity=int(row["severity"]),
+                    description=row["description"],
+                    geometry_geojson=_ensure_mapping(row["geometry_geojson"]),
+                    properties=_ensure_mapping(row["properties"]),
+                    valid_from=row["valid_from"],
+                    valid_until=row["valid_until"],
+                    created_at=row["created_at"],
+                    updated_at=row["updated_at"],
+                )
+                zones_by_id[row["zone_id"]] = zone
+            results[int(row["idx"])].append(zone)
+
+        logger.info(
+            "dao_incident_find_zones_near_points",
+            duration_ms=duration * 1000,
+            point_count=len(points),
+            radius_meters=radius_meters,
+            hit_count=len(rows),
+            zone_count=len(zones_by_id),
+        )
+
+        return results
+
 
 class IncidentRepository:
     """事件实体与关联写入接口。"""
@@ -1588,6 +1763,48 @@ class IncidentSnapshotRepository:
             )
         return record
 
+    async def get_latest_snapshot(
+        self,
+        *,
+        snapshot_type: str,
+        payload_filter: Optional[Mapping[str, Any]] = None,
+    ) -> IncidentSnapshotRecord | None:
+        """按类型读取最新一条快照；payload_filter 以 jsonb 包含（@>）匹配，如 {"scope": "all"}。"""
+        conditions = ["snapshot_type = %(snapshot_type)s"]
+        params: dict[str, Any] = {"snapshot_type": snapshot_type}
+        if payload_filter:
+            conditions.append("payload @> %(payload_filter)s::jsonb")
+            params["payload_filter"] = Jsonb(dict(payload_filter))
+        query = (
+            "SELECT snapshot_id::text AS snapshot_id, "
+            "       incident_id::text AS incident_id, "
+            "       snapshot_type, "
+            "       payload, "
+            "       generated_at, "
+            "       created_by, "
+            "       created_at "
+            "  FROM operational.incident_snapshots "
+            f" WHERE {' AND '.join(conditions)} "
+            " ORDER BY generated_at DESC "
+            " LIMIT 1"
+        )
+        start = time.perf_counter()
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(IncidentSnapshotRecord)) as cur:
+                await cur.execute(query, params)
+                record = await cur.fetchone()
+
+        duration = time.perf_counter() - start
+        DAO_CALL_LATENCY.labels("incident_snapshot", "get_latest_snapshot").observe(duration)
+        DAO_CALL_TOTAL.labels("incident_snapshot", "get_latest_snapshot", "success").inc()
+        logger.info(
+            "dao_incident_snapshot_get_latest",
+            duration_ms=duration * 1000,
+            snapshot_type=snapshot_type,
+            found=record is not None,
+        )
+        return record
+
     async def delete_snapshot(self, snapshot_id: str) -> None:
         query = "DELETE FROM operational.incident_snapshots WHERE snapshot_id = %(snapshot_id)s::uuid"
         start = time.perf_counter()
@@ -1708,6 +1925,32 @@ class RescueDAO:
             for row in rows
         ]
 
+    async def count_rescuers_changed_since(self, since: datetime) -> int:
+        """统计自 since 起状态有变更的救援力量数量（增量SITREP据此判断是否需要重算资源统计）。"""
+        start = time.perf_counter()
+        query = (
+            "SELECT COUNT(*) AS changed "
+            "  FROM operational.rescuers "
+            " WHERE updated_at >= %(since)s "
+            "    OR deleted_at >= %(since)s"
+        )
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(query, {"since": since})
+                row = await cur.fetchone()
+        changed = int(row["changed"]) if row else 0
+
+        duration = time.perf_counter() - start
+        DAO_CALL_LATENCY.labels("rescue", "count_rescuers_changed_since").observe(duration)
+        DAO_CALL_TOTAL.labels("rescue", "count_rescuers_changed_since", "success").inc()
+        logger.info(
+            "dao_rescue_count_rescuers_changed_since",
+            duration_ms=duration * 1000,
+            since=since.isoformat(),
+            changed=changed,
+        )
+        return changed
+
 
 class RescueTaskRepository:
     """战术救援任务写入接口。"""
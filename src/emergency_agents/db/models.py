@@ -86,6 +86,7 @@ class TaskSummary:
     status: str
     progress: Optional[int]
     updated_at: datetime
+    created_at: Optional[datetime] = None
 
 
 @dataclass(slots=True)
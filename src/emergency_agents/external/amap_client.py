@@ -3,10 +3,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional, TypedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Literal, Optional, TypedDict, TypeVar
 
 import httpx
+from prometheus_client import Counter, Gauge
 
 logger = logging.getLogger(__name__)
 
@@ -46,14 +48,69 @@ class GeocodeResult(TypedDict):
     level: str | None
 
 
+_CACHE_REQUESTS = Counter(
+    "amap_cache_requests_total",
+    "高德缓存查询次数",
+    ["cache", "result"],
+)
+_CACHE_EVICTIONS = Counter(
+    "amap_cache_evictions_total",
+    "高德缓存淘汰次数",
+    ["cache", "reason"],
+)
+_CACHE_ENTRIES = Gauge("amap_cache_entries", "高德缓存当前条目数", ["cache"])
+
+_T = TypeVar("_T")
+
+
 @dataclass(slots=True)
-class _CacheEntry:
-    value: RoutePlan
+class _CacheEntry(Generic[_T]):
+    value: _T
     expires_at: float
 
 
+class _LRUCache(Generic[_T]):
+    """容量受限的 LRU + TTL 缓存；仅在事件循环内使用，无需加锁。"""
+
+    def __init__(self, name: str, *, max_entries: int, ttl: float) -> None:
+        self._name = name
+        self._max_entries = max(max_entries, 1)
+        self._ttl = ttl
+        self._entries: OrderedDict[str, _CacheEntry[_T]] = OrderedDict()
+
+    def get(self, key: str) -> _T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            _CACHE_REQUESTS.labels(cache=self._name, result="miss").inc()
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._entries[key]
+            _CACHE_EVICTIONS.labels(cache=self._name, reason="expired").inc()
+            _CACHE_ENTRIES.labels(cache=self._name).set(len(self._entries))
+            _CACHE_REQUESTS.labels(cache=self._name, result="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        _CACHE_REQUESTS.labels(cache=self._name, result="hit").inc()
+        return entry.value
+
+    def set(self, key: str, value: _T) -> None:
+        self._entries[key] = _CacheEntry(value=value, expires_at=time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            _CACHE_EVICTIONS.labels(cache=self._name, reason="capacity").inc()
+        _CACHE_ENTRIES.labels(cache=self._name).set(len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class AmapClient:
-    """高德地图 Web 服务客户端，包含简易缓存与备份 key 切换。"""
+    """高德地图 Web 服务客户端，包含 LRU+TTL 缓存、请求合并与备份 key 切换。
+
+    缓存键中的坐标按 ``coordinate_precision`` 位小数量化（默认 4 位，约 11 米），
+    使邻近起终点复用同一条路线；并发的相同请求只会向上游发起一次调用。
+    """
 
     def __init__(
         self,
@@ -64,11 +121,15 @@ class AmapClient:
         connect_timeout: float = 10.0,
         read_timeout: float = 10.0,
         cache_ttl: float = 300.0,
+        cache_max_entries: int = 2048,
+        geocode_cache_ttl: float = 3600.0,
+        coordinate_precision: int = 4,
         http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self._api_key = api_key
         self._backup_key = backup_key
         self._cache_ttl = cache_ttl
+        self._coordinate_precision = max(coordinate_precision, 0)
         self._owns_client = http_client is None
         timeout = httpx.Timeout(
             timeout=max(connect_timeout, read_timeout),
@@ -82,8 +143,13 @@ class AmapClient:
             timeout=timeout,
             trust_env=False,
         )
-        self._cache: dict[str, _CacheEntry] = {}
-        self._cache_lock = asyncio.Lock()
+        self._cache: _LRUCache[RoutePlan] = _LRUCache(
+            "direction", max_entries=cache_max_entries, ttl=cache_ttl
+        )
+        self._geocode_cache: _LRUCache[GeocodeResult] = _LRUCache(
+            "geocode", max_entries=cache_max_entries, ttl=geocode_cache_ttl
+        )
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
         self._rate_lock = asyncio.Semaphore(5)
 
     async def close(self) -> None:
@@ -91,7 +157,21 @@ class AmapClient:
             await self._client.aclose()
 
     async def geocode(self, place: str) -> GeocodeResult | None:
-        """地名解析，返回第一个匹配坐标。"""
+        """地名解析，返回第一个匹配坐标；命中结果会被缓存。"""
+        normalized = " ".join(place.split())
+        cache_key = f"geocode:{normalized}"
+        cached = self._geocode_cache.get(cache_key)
+        if cached is not None:
+            logger.info("amap_geocode_cache_hit", extra={"place": normalized})
+            return dict(cached)  # type: ignore[return-value]
+
+        result = await self._single_flight("geocode", cache_key, lambda: self._fetch_geocode(normalized))
+        if result is not None:
+            self._geocode_cache.set(cache_key, result)
+            return dict(result)  # type: ignore[return-value]
+        return None
+
+    async def _fetch_geocode(self, place: str) -> GeocodeResult | None:
         params = {"address": place, "key": self._api_key}
         data = await self._request("/v3/geocode/geo", params)
         geocodes = data.get("geocodes") or []
@@ -116,15 +196,33 @@ class AmapClient:
         mode: RouteMode,
         cache_key: str | None = None,
     ) -> RoutePlan:
-        """路径规划，使用缓存避免重复调用。"""
+        """路径规划，使用缓存与请求合并避免重复调用。"""
         computed_key = cache_key or self._build_cache_key(origin, destination, mode)
-        cached = await self._get_cached(computed_key)
+        cached = self._cache.get(computed_key)
         if cached is not None:
             logger.info("amap_cache_hit", extra={"cache_key": computed_key})
             cached_plan = dict(cached)
             cached_plan["cache_hit"] = True
             return cached_plan  # type: ignore[return-value]
 
+        route = await self._single_flight(
+            "direction",
+            computed_key,
+            lambda: self._fetch_direction(origin, destination, mode),
+        )
+        to_store = dict(route)
+        to_store.pop("cache_hit", None)
+        self._cache.set(computed_key, to_store)  # type: ignore[arg-type]
+        result = dict(route)
+        result["cache_hit"] = False
+        return result  # type: ignore[return-value]
+
+    async def _fetch_direction(
+        self,
+        origin: Coordinate,
+        destination: Coordinate,
+        mode: RouteMode,
+    ) -> RoutePlan:
         params = {
             "origin": f"{origin['lng']},{origin['lat']}",
             "destination": f"{destination['lng']},{destination['lat']}",
@@ -152,11 +250,32 @@ class AmapClient:
                     polyline=step.get("polyline", ""),
                 )
             )
-
-        route["cache_hit"] = False
-        await self._set_cache(computed_key, route)
         return route
 
+    async def _single_flight(
+        self,
+        cache_name: str,
+        key: str,
+        loader: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """相同 key 的并发请求共享一次上游调用；失败时所有等待者收到同一异常。"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            _CACHE_REQUESTS.labels(cache=cache_name, result="coalesced").inc()
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[Any] = asyncio.ensure_future(loader())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done, k=key: self._release_inflight(k, done))
+        # shield：单个调用方被取消时不影响其他合并等待者
+        return await asyncio.shield(future)
+
+    def _release_inflight(self, key: str, future: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # 标记异常已被读取，避免无人等待时告警
+
     async def _request(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
         async with self._rate_lock:
             response = await self._client.get(path, params=params)
@@ -174,23 +293,9 @@ class AmapClient:
             return await self._request(path, params)
         raise AmapError("amap api error", info=str(data.get("info")))
 
-    async def _get_cached(self, key: str) -> RoutePlan | None:
-        async with self._cache_lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
-            if entry.expires_at < time.monotonic():
-                self._cache.pop(key, None)
-                return None
-            cached = dict(entry.value)
-            return cached  # type: ignore[return-value]
-
-    async def _set_cache(self, key: str, value: RoutePlan) -> None:
-        async with self._cache_lock:
-            to_store = dict(value)
-            to_store.pop("cache_hit", None)
-            self._cache[key] = _CacheEntry(value=to_store, expires_at=time.monotonic() + self._cache_ttl)  # type: ignore[arg-type]
-
-    @staticmethod
-    def _build_cache_key(origin: Coordinate, destination: Coordinate, mode: RouteMode) -> str:
-        return f"{origin['lng']:.6f},{origin['lat']:.6f}->{destination['lng']:.6f},{destination['lat']:.6f}-{mode}"
+    def _build_cache_key(self, origin: Coordinate, destination: Coordinate, mode: RouteMode) -> str:
+        precision = self._coordinate_precision
+        return (
+            f"{origin['lng']:.{precision}f},{origin['lat']:.{precision}f}"
+            f"->{destination['lng']:.{precision}f},{destination['lat']:.{precision}f}-{mode}"
+        )
@@ -135,7 +135,7 @@ async def build_dialogue_graph(
 
     cfg = AppConfig.load_from_env()
     llm_model = cfg.llm_model
-    llm_client = get_async_openai_client(cfg)
+    llm_client = get_async_openai_client(cfg, scope="voice")
     dialogue_cfg = DialogueConfig(llm_model=llm_model, system_prompt=system_prompt)
 
     logger.info("dialogue_graph_init", schema=checkpoint_schema, model=dialogue_cfg.llm_model)
@@ -0,0 +1,67 @@
+# Copyright 2025 msq
+"""子图执行进度推送：以 updates 流模式运行编译后的图，每完成一个节点上报一次事件。"""
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# 事件回调：event 名称 + 事件数据（需可 JSON 序列化）
+EventSink = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def emit_event(sink: Optional[EventSink], event: str, data: Dict[str, Any]) -> None:
+    """安全推送事件：回调失败只记日志，不影响主流程。"""
+    if sink is None:
+        return
+    try:
+        await sink(event, data)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("event_sink_emit_failed", event_name=event, error=str(exc))
+
+
+async def ainvoke_with_progress(
+    compiled: Any,
+    state: Mapping[str, Any],
+    *,
+    config: Optional[Dict[str, Any]] = None,
+    event_sink: Optional[EventSink] = None,
+    graph_name: str,
+) -> Dict[str, Any]:
+    """执行编译后的 LangGraph 图；提供 event_sink 时逐节点推送 progress 事件。
+
+    未提供 event_sink 时等价于 ``compiled.ainvoke``。流式模式同时订阅 ``values``，
+    以最后一次完整状态作为返回值，保证与 ainvoke 结果一致。
+    """
+    if event_sink is None:
+        return await compiled.ainvoke(state, config=config)
+
+    started = time.perf_counter()
+    final_state: Dict[str, Any] = dict(state)
+    async for mode, chunk in compiled.astream(state, config=config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            if isinstance(chunk, Mapping):
+                final_state = dict(chunk)
+            continue
+        if not isinstance(chunk, Mapping):
+            continue
+        for node, update in chunk.items():
+            if str(node).startswith("__"):
+                continue  # __interrupt__ 等内部事件不对外推送
+            await emit_event(
+                event_sink,
+                "progress",
+                {
+                    "graph": graph_name,
+                    "node": str(node),
+                    "status": (update or {}).get("status") if isinstance(update, Mapping) else None,
+                    "elapsed_ms": int((time.perf_counter() - started) * 1000),
+                },
+            )
+    return final_state
+
+
+__all__ = ["EventSink", "ainvoke_with_progress", "emit_event"]
@@ -7,7 +7,8 @@ import asyncio
 import math
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict, Awaitable
+import time
+from typing import Annotated, Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple, TypedDict, Awaitable
 
 try:
     from typing import Required, NotRequired
@@ -39,11 +40,12 @@ from emergency_agents.external.orchestrator_client import (
     RescueScenarioPayload,
 )
 from emergency_agents.graph.checkpoint_utils import create_async_postgres_checkpointer
+from emergency_agents.graph.progress import EventSink, ainvoke_with_progress
 from emergency_agents.graph.kg_service import KGService
 from emergency_agents.intent.schemas import RescueTaskGenerationSlots
 from emergency_agents.rag.equipment_extractor import ExtractedEquipment, extract_equipment_from_cases
 from emergency_agents.rag.evidence_builder import EquipmentRecommendation, build_equipment_recommendations
-from emergency_agents.rag.pipe import RagPipeline, RagChunk
+from emergency_agents.rag.pipe import RagPipeline, RagChunk, aquery_rag
 
 logger = structlog.get_logger(__name__)
 
@@ -107,6 +109,25 @@ class AnalysisSummary(TypedDict):
     unmatched_count: NotRequired[int]
     cache_hits: NotRequired[int]
     cache_misses: NotRequired[int]
+    branch_latency_ms: NotRequired[Dict[str, float]]
+    degraded_branches: NotRequired[List[str]]
+
+
+class BranchOutcome(TypedDict):
+    """并行分支执行结果：status ∈ {ok, error, timeout, skipped}"""
+    status: str
+    error: NotRequired[str]
+    elapsed_ms: NotRequired[float]
+
+
+def _merge_branch_status(
+    left: Optional[Dict[str, BranchOutcome]],
+    right: Optional[Dict[str, BranchOutcome]],
+) -> Dict[str, BranchOutcome]:
+    """branch_status 的 reducer：并行分支各自写入自己的键，按分支名合并。"""
+    merged: Dict[str, BranchOutcome] = dict(left or {})
+    merged.update(right or {})
+    return merged
 
 
 class RescueTacticalState(TypedDict):
@@ -146,6 +167,9 @@ class RescueTacticalState(TypedDict):
     rag_equipments: NotRequired[List[Dict[str, Any]]]
     recommendations: NotRequired[List[Dict[str, Any]]]
 
+    # 并行分支执行结果（可选，reducer 合并）
+    branch_status: NotRequired[Annotated[Dict[str, BranchOutcome], _merge_branch_status]]
+
     # 路径规划结果（可选）
     routes: NotRequired[List[RoutePlanData]]
 
@@ -161,6 +185,27 @@ class RescueTacticalState(TypedDict):
     persisted_routes: NotRequired[List[Dict[str, Any]]]
 
 
+# 由 resolve_location 扇出的并行分支；资源与知识图谱为硬依赖，案例检索允许降级
+_PARALLEL_BRANCHES: Tuple[str, ...] = ("query_resources", "kg_reasoning", "rag_analysis")
+_REQUIRED_BRANCHES: Tuple[str, ...] = ("query_resources", "kg_reasoning")
+_DEFAULT_BRANCH_TIMEOUTS: Dict[str, float] = {
+    "query_resources": 10.0,
+    "kg_reasoning": 15.0,
+}
+
+
+class _BranchFailure(Exception):
+    """分支内部的业务失败，携带面向用户的错误信息与可保留的部分结果。"""
+
+    def __init__(self, message: str, *, partial: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(message)
+        self.partial = partial or {}
+
+
+def _skipped_branch() -> BranchOutcome:
+    return BranchOutcome(status="skipped", elapsed_ms=0.0)
+
+
 # ========== @task包装函数：确保副作用操作的幂等性 ==========
 # 参考：docs/新业务逻辑md/langgraph资料/references/concept-durable-execution.md:26
 # "wrap any operations with side effects inside @tasks"
@@ -189,8 +234,8 @@ async def plan_route_task(
     """
     result = await amap_client.direction(origin=origin, destination=destination, mode=mode)
     logger.info("route_plan_task_completed",
-                origin_lng=origin.lng, origin_lat=origin.lat,
-                dest_lng=destination.lng, dest_lat=destination.lat,
+                origin_lng=origin["lng"], origin_lat=origin["lat"],
+                dest_lng=destination["lng"], dest_lat=destination["lat"],
                 success=result is not None)
     return result
 
@@ -249,13 +294,10 @@ async def query_rag_cases_task(
     RAG案例检索任务
     幂等性保证：相同问题返回相同案例
     """
-    rag_future = asyncio.to_thread(
-        rag_pipeline.query,
-        question=question,
-        domain=domain,
-        top_k=top_k,
+    chunks = await asyncio.wait_for(
+        aquery_rag(rag_pipeline, question=question, domain=domain, top_k=top_k),
+        timeout=timeout,
     )
-    chunks = await asyncio.wait_for(rag_future, timeout=timeout)
     logger.info("rag_query_completed", question=question, count=len(chunks))
     return chunks
 
@@ -325,6 +367,8 @@ class RescueTacticalGraph:
         checkpoint_schema: str = "rescue_tactical_checkpoint",
         resource_dao: RescueDAO,
         task_repository: RescueTaskRepository,
+        branch_timeouts: Optional[Dict[str, float]] = None,
+        route_concurrency: int = 8,
     ) -> None:
         self._pool = pool
         self._kg_service = kg_service
@@ -341,6 +385,13 @@ class RescueTacticalGraph:
         self._checkpoint_schema = checkpoint_schema
         self._resource_dao = resource_dao
         self._task_repository = task_repository
+        # 案例检索分支包含检索与装备抽取两次调用，默认给两倍 RAG 超时
+        self._branch_timeouts: Dict[str, float] = {
+            **_DEFAULT_BRANCH_TIMEOUTS,
+            "rag_analysis": self._rag_timeout * 2,
+            **(branch_timeouts or {}),
+        }
+        self._route_concurrency = max(route_concurrency, 1)
         self._graph = self._build_graph()
         self._checkpointer: Optional[AsyncPostgresSaver] = None
         self._checkpoint_close: Optional[Callable[[], Awaitable[None]]] = None
@@ -363,6 +414,8 @@ class RescueTacticalGraph:
         checkpoint_schema: str = "rescue_tactical_checkpoint",
         resource_dao: Optional[RescueDAO] = None,
         task_repository: Optional[RescueTaskRepository] = None,
+        branch_timeouts: Optional[Dict[str, float]] = None,
+        route_concurrency: int = 8,
     ) -> "RescueTacticalGraph":
         """异步构建战术救援子图，绑定Postgres checkpointer。"""
         logger.info("rescue_tactical_graph_init", schema=checkpoint_schema)
@@ -382,6 +435,8 @@ class RescueTacticalGraph:
             checkpoint_schema=checkpoint_schema,
             resource_dao=resource_dao,
             task_repository=task_repository,
+            branch_timeouts=branch_timeouts,
+            route_concurrency=route_concurrency,
         )
         checkpointer, close_cb = await create_async_postgres_checkpointer(
             dsn=postgres_dsn,
@@ -400,6 +455,67 @@ class RescueTacticalGraph:
             await self._checkpoint_close()
             self._checkpoint_close = None
 
+    async def _run_branch(
+        self,
+        name: str,
+        work: Coroutine[Any, Any, Dict[str, Any]],
+        *,
+        fallback: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """执行单个并行分支：统一超时、计时，并把成败写入 branch_status。"""
+        timeout = self._branch_timeouts.get(name)
+        started = time.perf_counter()
+        try:
+            update = await asyncio.wait_for(work, timeout=timeout)
+        except asyncio.TimeoutError:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.warning("rescue_branch_timeout", branch=name, timeout=timeout, elapsed_ms=elapsed_ms)
+            outcome = BranchOutcome(status="timeout", error=f"{name} 超时（{timeout}s）", elapsed_ms=elapsed_ms)
+            return {**fallback, "branch_status": {name: outcome}}
+        except _BranchFailure as exc:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            outcome = BranchOutcome(status="error", error=str(exc), elapsed_ms=elapsed_ms)
+            return {**fallback, **exc.partial, "branch_status": {name: outcome}}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info("rescue_branch_completed", branch=name, elapsed_ms=elapsed_ms)
+        return {**update, "branch_status": {name: BranchOutcome(status="ok", elapsed_ms=elapsed_ms)}}
+
+    async def _plan_routes_batch(
+        self,
+        matched: List[MatchedResource],
+        resources_by_id: Dict[str, ResourceCandidate],
+        destination: Coordinate,
+    ) -> AsyncIterator[Tuple[MatchedResource, Optional[RoutePlan], Optional[BaseException]]]:
+        """并发规划所有匹配资源到目标点的路线，按完成顺序逐条产出 (资源, 路线, 异常)。"""
+        semaphore = asyncio.Semaphore(self._route_concurrency)
+
+        async def _plan_one(
+            item: MatchedResource,
+            resource: ResourceCandidate,
+        ) -> Tuple[MatchedResource, Optional[RoutePlan], Optional[BaseException]]:
+            origin = Coordinate(lng=resource["lng"], lat=resource["lat"])
+            async with semaphore:
+                try:
+                    plan = await plan_route_task(origin, destination, "driving", self._amap_client)
+                except Exception as exc:
+                    return item, None, exc
+            return item, plan, None
+
+        pending = [
+            _plan_one(item, resources_by_id[item["resource_id"]])
+            for item in matched
+            if item["resource_id"] in resources_by_id
+        ]
+        started = time.perf_counter()
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+        logger.info(
+            "rescue_route_batch_completed",
+            count=len(pending),
+            concurrency=self._route_concurrency,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+
     def _build_graph(self) -> StateGraph:
         graph = StateGraph(RescueTacticalState)
 
@@ -431,51 +547,57 @@ class RescueTacticalGraph:
                 return {"status": "error", "error": "未找到指定地点，请提供经纬度。"}
             return {"status": "error", "error": "缺少地点信息，请提供地名或经纬度。"}
 
+        # ---- 并行分支：资源查询 / 知识图谱 / 案例检索互不依赖，由 resolve_location 扇出 ----
+        # 并行节点不能在同一超步写同一个键，因此各分支只写自己的数据键，
+        # 成败统一写入带 reducer 的 branch_status，由 join_analysis 汇总决定整体状态。
+
         async def query_resources(state: RescueTacticalState) -> Dict[str, Any]:
             if state.get("status") == "error":
-                return {}
-            records = await self._resource_dao.list_available_rescuers(limit=25)
-            resources: List[ResourceCandidate] = []
-            for record in records:
-                candidate = _rescuer_to_candidate(record)
-                if candidate is not None:
-                    resources.append(candidate)
-
-            if not resources:
-                logger.error("rescue_resources_empty")
-                return {"status": "error", "error": "当前无可用救援力量，请先录入资源。"}
-
-            return {"resources": resources}
+                return {"branch_status": {"query_resources": _skipped_branch()}}
+
+            async def _run() -> Dict[str, Any]:
+                records = await self._resource_dao.list_available_rescuers(limit=25)
+                resources: List[ResourceCandidate] = []
+                for record in records:
+                    candidate = _rescuer_to_candidate(record)
+                    if candidate is not None:
+                        resources.append(candidate)
+                if not resources:
+                    logger.error("rescue_resources_empty")
+                    raise _BranchFailure("当前无可用救援力量，请先录入资源。")
+                return {"resources": resources}
+
+            return await self._run_branch("query_resources", _run(), fallback={"resources": []})
 
         async def kg_reasoning(state: RescueTacticalState) -> Dict[str, Any]:
             if state.get("status") == "error":
-                return {}
+                return {"branch_status": {"kg_reasoning": _skipped_branch()}}
             slots = state["slots"]
             disaster_type = slots.disaster_type or "general_rescue"
-            try:
-                requirements = await asyncio.to_thread(
-                    self._kg_service.get_equipment_requirements,
-                    [disaster_type],
-                )
-            except Exception as exc:  # pragma: no cover
-                logger.exception("kg_query_failed")
-                return {"status": "error", "error": f"知识图谱查询失败：{exc}"}
 
-            if len(requirements) < 3:
-                logger.warning("kg_requirements_insufficient", count=len(requirements))
-                return {
-                    "status": "error",
-                    "error": "缺少知识图谱支撑，无法生成救援任务。",
-                    "kg_requirements": requirements,
-                }
-            return {"kg_requirements": requirements}
+            async def _run() -> Dict[str, Any]:
+                try:
+                    requirements = await asyncio.to_thread(
+                        self._kg_service.get_equipment_requirements,
+                        [disaster_type],
+                    )
+                except Exception as exc:  # pragma: no cover
+                    logger.exception("kg_query_failed")
+                    raise _BranchFailure(f"知识图谱查询失败：{exc}") from exc
+                if len(requirements) < 3:
+                    logger.warning("kg_requirements_insufficient", count=len(requirements))
+                    raise _BranchFailure(
+                        "缺少知识图谱支撑，无法生成救援任务。",
+                        partial={"kg_requirements": requirements},
+                    )
+                return {"kg_requirements": requirements}
+
+            return await self._run_branch("kg_reasoning", _run(), fallback={"kg_requirements": []})
 
         async def rag_analysis(state: RescueTacticalState) -> Dict[str, Any]:
+            """案例检索与装备抽取；装备推荐依赖 KG 结果，放到 join_analysis 中完成。"""
             if state.get("status") == "error":
-                return {}
-            kg_requirements = state.get("kg_requirements") or []
-            if not kg_requirements:
-                return {"status": "error", "error": "缺少知识图谱支撑，无法进行案例分析。"}
+                return {"branch_status": {"rag_analysis": _skipped_branch()}}
 
             slots = state["slots"]
             disaster_type = slots.disaster_type or "general_rescue"
@@ -486,53 +608,84 @@ class RescueTacticalGraph:
             else:
                 query = f"{mission} {disaster_type} 历史案例 最佳实践"
 
-            try:
-                rag_chunks: List[RagChunk] = await query_rag_cases_task(
-                    question=query,
-                    domain="案例",
-                    top_k=5,
-                    rag_pipeline=self._rag_pipeline,
-                    timeout=self._rag_timeout
-                )
-            except Exception as exc:  # pragma: no cover
-                logger.exception("rag_query_failed")
-                return {"status": "error", "error": f"历史案例检索失败：{exc}"}
-
-            if len(rag_chunks) < 2:
-                logger.warning("rag_cases_insufficient", count=len(rag_chunks))
-                summary = AnalysisSummary(
-                    kg_count=len(kg_requirements),
-                    rag_count=len(rag_chunks),
-                    matched_count=0,
-                    unmatched_count=0,
-                    cache_hits=0,
-                    cache_misses=0,
-                )
+            async def _run() -> Dict[str, Any]:
+                try:
+                    rag_chunks: List[RagChunk] = await query_rag_cases_task(
+                        question=query,
+                        domain="案例",
+                        top_k=5,
+                        rag_pipeline=self._rag_pipeline,
+                        timeout=self._rag_timeout
+                    )
+                except Exception as exc:  # pragma: no cover
+                    logger.exception("rag_query_failed")
+                    raise _BranchFailure(f"历史案例检索失败：{exc}") from exc
+
+                if len(rag_chunks) < 2:
+                    logger.warning("rag_cases_insufficient", count=len(rag_chunks))
+                    return {
+                        "rag_cases": [chunk.__dict__ for chunk in rag_chunks],
+                        "rag_equipments": [],
+                    }
+
+                try:
+                    extracted: List[ExtractedEquipment] = await extract_equipment_task(
+                        rag_chunks,
+                        self._llm_client,
+                        self._llm_model,
+                        self._rag_timeout
+                    )
+                except Exception as exc:  # pragma: no cover
+                    logger.exception("rag_equipment_extraction_failed")
+                    extracted = []
+
                 return {
                     "rag_cases": [chunk.__dict__ for chunk in rag_chunks],
-                    "analysis_summary": summary,
-                    "recommendations": [],
-                    "rag_equipments": [],
+                    "rag_equipments": [equip.__dict__ for equip in extracted],
                 }
 
-            try:
-                extracted: List[ExtractedEquipment] = await extract_equipment_task(
-                    rag_chunks,
-                    self._llm_client,
-                    self._llm_model,
-                    self._rag_timeout
-                )
-            except Exception as exc:  # pragma: no cover
-                logger.exception("rag_equipment_extraction_failed")
-                extracted = []
+            return await self._run_branch(
+                "rag_analysis",
+                _run(),
+                fallback={"rag_cases": [], "rag_equipments": []},
+            )
+
+        async def join_analysis(state: RescueTacticalState) -> Dict[str, Any]:
+            """汇合三个并行分支：资源与 KG 为硬依赖，案例检索失败时降级为仅 KG 推荐。"""
+            if state.get("status") == "error":
+                return {}
+            branch_status = state.get("branch_status") or {}
+            latency = {
+                name: outcome.get("elapsed_ms", 0.0)
+                for name, outcome in branch_status.items()
+            }
+            degraded: List[str] = []
+            for name in _REQUIRED_BRANCHES:
+                outcome = branch_status.get(name) or {}
+                if outcome.get("status") != "ok":
+                    logger.warning("rescue_branch_required_failed", branch=name, outcome=outcome)
+                    return {
+                        "status": "error",
+                        "error": outcome.get("error") or f"{name} 未完成",
+                    }
+
+            rag_outcome = branch_status.get("rag_analysis") or {}
+            if rag_outcome.get("status") != "ok":
+                degraded.append("rag_analysis")
+                logger.warning("rescue_branch_degraded", branch="rag_analysis", outcome=rag_outcome)
 
+            kg_requirements = state.get("kg_requirements") or []
+            rag_cases = state.get("rag_cases") or []
+            rag_equipments = state.get("rag_equipments") or []
             recommendations: List[EquipmentRecommendation] = []
-            if extracted:
+            if rag_equipments and len(rag_cases) >= 2:
+                slots = state["slots"]
+                disaster_type = slots.disaster_type or "general_rescue"
                 try:
                     recommendations = await build_recommendations_task(
                         kg_requirements,
-                        rag_chunks,
-                        extracted,
+                        [RagChunk(**chunk) for chunk in rag_cases],
+                        [ExtractedEquipment(**equip) for equip in rag_equipments],
                         [disaster_type],
                         self._rag_timeout
                     )
@@ -542,16 +695,16 @@ class RescueTacticalGraph:
 
             summary = AnalysisSummary(
                 kg_count=len(kg_requirements),
-                rag_count=len(rag_chunks),
+                rag_count=len(rag_cases),
                 matched_count=0,
                 unmatched_count=0,
                 cache_hits=0,
                 cache_misses=0,
+                branch_latency_ms=latency,
+                degraded_branches=degraded,
             )
-
+            logger.info("rescue_branches_joined", latency_ms=latency, degraded=degraded)
             return {
-                "rag_cases": [chunk.__dict__ for chunk in rag_chunks],
-                "rag_equipments": [equip.__dict__ for equip in extracted],
                 "recommendations": [rec.to_dict() for rec in recommendations],
                 "analysis_summary": summary,
             }
@@ -633,18 +786,10 @@ class RescueTacticalGraph:
             cache_hits = summary.get("cache_hits", 0)
             cache_misses = summary.get("cache_misses", 0)
 
-            for item in matched:
-                resource = next(
-                    (res for res in state.get("resources", []) if res["resource_id"] == item["resource_id"]),
-                    None,
-                )
-                if resource is None:
-                    continue
-                origin = Coordinate(lng=resource["lng"], lat=resource["lat"])
-                try:
-                    plan = await plan_route_task(origin, dest_coord, "driving", self._amap_client)
-                except Exception as exc:
-                    reason = f"路径规划失败: {exc}"
+            resources_by_id = {res["resource_id"]: res for res in state.get("resources", [])}
+            async for item, plan, exc in self._plan_routes_batch(matched, resources_by_id, dest_coord):
+                if exc is not None or plan is None:
+                    reason = f"路径规划失败: {exc or '无可用路线'}"
                     logger.warning("amap_direction_failed", resource_id=item["resource_id"], error=str(exc))
                     failed = dict(item)
                     failed["capability_match"] = "none"
@@ -678,6 +823,10 @@ class RescueTacticalGraph:
                     )
                 )
 
+            # 路线按完成顺序返回，这里恢复为匹配排序，保证下游选择与持久化结果稳定
+            match_order = {item["resource_id"]: idx for idx, item in enumerate(matched)}
+            routes.sort(key=lambda route: match_order.get(route.get("resource_id", ""), len(match_order)))
+            updated_matched.sort(key=lambda item: match_order[item["resource_id"]])
             summary["cache_hits"] = cache_hits
             summary["cache_misses"] = cache_misses
 
@@ -890,16 +1039,18 @@ class RescueTacticalGraph:
         graph.add_node("query_resources", query_resources)
         graph.add_node("kg_reasoning", kg_reasoning)
         graph.add_node("rag_analysis", rag_analysis)
+        graph.add_node("join_analysis", join_analysis)
         graph.add_node("match_resources", match_resources)
         graph.add_node("route_planning", route_planning)
         graph.add_node("persist_task", persist_task)
         graph.add_node("prepare_response", prepare_response)
         graph.add_node("ws_notify", ws_notify)
         graph.set_entry_point("resolve_location")
-        graph.add_edge("resolve_location", "query_resources")
-        graph.add_edge("query_resources", "kg_reasoning")
-        graph.add_edge("kg_reasoning", "rag_analysis")
-        graph.add_edge("rag_analysis", "match_resources")
+        # 扇出：三个分支在同一超步并发执行；扇入：全部完成后才进入 join_analysis
+        for branch in _PARALLEL_BRANCHES:
+            graph.add_edge("resolve_location", branch)
+        graph.add_edge(list(_PARALLEL_BRANCHES), "join_analysis")
+        graph.add_edge("join_analysis", "match_resources")
         graph.add_edge("match_resources", "route_planning")
         graph.add_edge("route_planning", "persist_task")
         graph.add_edge("persist_task", "prepare_response")
@@ -914,6 +1065,8 @@ class RescueTacticalGraph:
         self,
         state: RescueTacticalState,
         config: Optional[Dict[str, Any]] = None,
+        *,
+        event_sink: Optional[EventSink] = None,
     ) -> RescueTacticalState:
         """
         执行战术救援图
@@ -953,9 +1106,12 @@ class RescueTacticalGraph:
             has_coordinates=has_coordinates,
             simulation=bool(state.get("simulation_mode", False)),
         )
-        result: RescueTacticalState = await self._compiled.ainvoke(
+        result: RescueTacticalState = await ainvoke_with_progress(  # type: ignore[assignment]
+            self._compiled,
             state,
             config=user_config,
+            event_sink=event_sink,
+            graph_name="RescueTacticalGraph",
         )
         logger.info(
             "rescue_tactical_invoke_complete",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypedDict, Awaitable, Literal, Iterable
 
@@ -25,8 +26,11 @@ from emergency_agents.external.amap_client import AmapClient, Coordinate, RouteP
 from emergency_agents.external.device_directory import DeviceDirectory, DeviceEntry
 from emergency_agents.external.orchestrator_client import OrchestratorClient
 from emergency_agents.graph.checkpoint_utils import create_async_postgres_checkpointer
+from emergency_agents.graph.progress import EventSink, ainvoke_with_progress
 from emergency_agents.intent.schemas import ScoutTaskGenerationSlots
+from emergency_agents.planner.route_optimizer import RoadLeg, haversine_matrix, naive_order, optimize_route, tour_cost
 from emergency_agents.risk.repository import RiskDataRepository
+from emergency_agents.risk.service import RiskCacheManager
 
 logger = structlog.get_logger(__name__)
 
@@ -344,6 +348,7 @@ class ScoutTacticalGraph:
         task_repository: RescueTaskRepository,  # 新增: 任务数据仓库
         postgres_dsn: str,  # 新增: PostgreSQL连接字符串
         checkpoint_schema: str = "scout_tactical_checkpoint",  # 检查点表名
+        risk_cache_manager: Optional[RiskCacheManager] = None,  # 风险缓存(数据库不可用时的叠加降级)
     ) -> None:
         """初始化侦察战术图
 
@@ -355,6 +360,7 @@ class ScoutTacticalGraph:
             task_repository: 任务数据仓库(必需,用于持久化任务)
             postgres_dsn: PostgreSQL连接字符串(必需,用于检查点)
             checkpoint_schema: 检查点表名(可选,默认scout_tactical_checkpoint)
+            risk_cache_manager: 风险缓存(可选,批量空间查询失败时用内存索引完成风险叠加)
 
         注意: 所有依赖都是Required,启动时就会验证完整性,
               不会在运行时降级处理(符合"不做fallback"原则)
@@ -367,6 +373,7 @@ class ScoutTacticalGraph:
         self._task_repository = task_repository
         self._postgres_dsn = postgres_dsn
         self._checkpoint_schema = checkpoint_schema
+        self._risk_cache_manager = risk_cache_manager
 
         # 构建StateGraph(将在Phase 4实现)
         self._graph = self._build_graph()
@@ -572,6 +579,7 @@ class ScoutTacticalGraph:
             waypoint_risks = await risk_overlay_task(
                 waypoints=waypoints,
                 risk_repository=self._risk_repository,
+                risk_cache_manager=self._risk_cache_manager,
             )
 
             logger.info(
@@ -724,6 +732,7 @@ class ScoutTacticalGraph:
         task_repository: RescueTaskRepository,
         postgres_dsn: str,
         checkpoint_schema: str = "scout_tactical_checkpoint",
+        risk_cache_manager: Optional[RiskCacheManager] = None,
     ) -> "ScoutTacticalGraph":
         """异步构建侦察战术图,绑定PostgreSQL checkpointer
 
@@ -741,6 +750,7 @@ class ScoutTacticalGraph:
             task_repository: 任务数据仓库(必需)
             postgres_dsn: PostgreSQL连接字符串(必需)
             checkpoint_schema: 检查点表名(可选)
+            risk_cache_manager: 风险缓存(可选,风险叠加的内存索引降级)
 
         Returns:
             ScoutTacticalGraph: 已初始化并编译的图实例
@@ -770,6 +780,7 @@ class ScoutTacticalGraph:
             task_repository=task_repository,
             postgres_dsn=postgres_dsn,
             checkpoint_schema=checkpoint_schema,
+            risk_cache_manager=risk_cache_manager,
         )
 
         # 创建PostgreSQL checkpointer
@@ -795,6 +806,8 @@ class ScoutTacticalGraph:
         self,
         state: ScoutTacticalState,
         config: Optional[Dict[str, Any]] = None,
+        *,
+        event_sink: Optional[EventSink] = None,
     ) -> ScoutTacticalState:
         """执行侦察战术图 - 使用StateGraph编排8个节点
 
@@ -876,7 +889,13 @@ class ScoutTacticalGraph:
         )
 
         # 执行编译后的图
-        result = await self._compiled.ainvoke(state, config=config)
+        result = await ainvoke_with_progress(
+            self._compiled,
+            state,
+            config=config,
+            event_sink=event_sink,
+            graph_name="ScoutTacticalGraph",
+        )
 
         logger.info(
             "scout_tactical_invoke_complete",
@@ -1060,8 +1079,8 @@ async def plan_recon_route_task(
     """侦察路线规划任务 - 生成多目标巡逻航点
 
     这是一个带@task装饰器的幂等函数,用于:
-    1. 基于起点和多个目标点生成巡逻路线
-    2. 调用高德地图API计算路径
+    1. 基于起点和多个目标点求解较优访问顺序(TSP: 最近邻 + 2-opt/Or-opt)
+    2. 并发调用高德地图API计算各段路径,并按实测道路耗时修正访问顺序
     3. 生成带序号的航点列表
 
     Args:
@@ -1072,10 +1091,9 @@ async def plan_recon_route_task(
     Returns:
         ReconRoute: 完整侦察路线(包含航点、里程、时长)
 
-    幂等性保证: @task装饰器确保相同输入返回相同结果
+    幂等性保证: @task装饰器确保相同输入返回相同结果(访问顺序求解是确定性的)
 
-    实现策略: 简化版 - 按顺序访问所有目标点,返回时原路返回
-    未来优化: 使用TSP算法优化访问顺序
+    实现策略: 起点 → 优化顺序访问各目标 → 返回起点; 单段路径规划失败时按直线距离估算
     """
     logger.info(
         "recon_route_planning_started",
@@ -1092,30 +1110,21 @@ async def plan_recon_route_task(
             "total_duration_sec": 0,
         }
 
-    # 构建航点序列: 起点 → 目标1 → 目标2 → ... → 起点
-    waypoints: List[ReconWaypoint] = []
-    total_distance = 0
-    total_duration = 0
+    # 下标0为起点,1..n为目标
+    points: List[Coordinate] = [origin] + [coord for _, coord in targets]
 
-    # 添加起点(序号0)
-    waypoints.append({
-        "sequence": 0,
-        "location": origin,
-        "action": "depart",
-    })
-
-    # 逐个访问目标点
-    for idx, (target_id, target_coord) in enumerate(targets, start=1):
-        # 计算从上一点到当前目标的路径
-        prev_coord = waypoints[-1]["location"]
+    async def _fetch_leg(from_idx: int, to_idx: int) -> RoadLeg:
+        prev_coord, target_coord = points[from_idx], points[to_idx]
         try:
             route_plan = await amap_client.direction(
                 origin=prev_coord,
                 destination=target_coord,
                 mode="driving",  # 使用驾车模式(适用于UAV/UGV)
             )
-            segment_distance = route_plan.get("distance_meters", 0)
-            segment_duration = route_plan.get("duration_seconds", 0)
+            return RoadLeg(
+                distance_m=route_plan.get("distance_meters", 0),
+                duration_s=route_plan.get("duration_seconds", 0),
+            )
         except Exception as exc:
             # 路径规划失败,使用直线距离估算
             logger.warning(
@@ -1125,70 +1134,53 @@ async def plan_recon_route_task(
                 error=str(exc),
             )
             # 简化估算: 假设平均速度15m/s (54km/h)
-            import math
             dx = (target_coord["lng"] - prev_coord["lng"]) * 111320  # 经度转米
             dy = (target_coord["lat"] - prev_coord["lat"]) * 110540  # 纬度转米
             segment_distance = int(math.sqrt(dx**2 + dy**2))
-            segment_duration = segment_distance // 15
+            return RoadLeg(distance_m=segment_distance, duration_s=segment_distance // 15, estimated=True)
 
-        total_distance += segment_distance
-        total_duration += segment_duration
+    optimized = await optimize_route([(p["lng"], p["lat"]) for p in points], _fetch_leg)
 
-        # 添加目标航点
-        waypoint: ReconWaypoint = {
-            "sequence": idx,
+    # 构建航点序列: 起点 → 目标(优化顺序) → 起点
+    waypoints: List[ReconWaypoint] = [{
+        "sequence": 0,
+        "location": origin,
+        "action": "depart",
+    }]
+    for target_index in optimized.order[1:]:
+        target_id, target_coord = targets[target_index - 1]
+        waypoints.append({
+            "sequence": len(waypoints),
             "location": target_coord,
             "target_id": target_id,
             "action": "observe",  # 默认动作:观察
             "duration_sec": 120,  # 默认停留2分钟
-        }
-        waypoints.append(waypoint)
-        total_duration += 120  # 累加停留时间
-
-    # 返程:从最后一个目标回到起点
-    last_target_coord = waypoints[-1]["location"]
-    try:
-        return_route = await amap_client.direction(
-            origin=last_target_coord,
-            destination=origin,
-            mode="driving",
-        )
-        return_distance = return_route.get("distance_meters", 0)
-        return_duration = return_route.get("duration_seconds", 0)
-    except Exception as exc:
-        logger.warning(
-            "recon_route_return_failed",
-            from_coord=last_target_coord,
-            to_coord=origin,
-            error=str(exc),
-        )
-        import math
-        dx = (origin["lng"] - last_target_coord["lng"]) * 111320
-        dy = (origin["lat"] - last_target_coord["lat"]) * 110540
-        return_distance = int(math.sqrt(dx**2 + dy**2))
-        return_duration = return_distance // 15
-
-    total_distance += return_distance
-    total_duration += return_duration
-
-    # 添加返回起点的航点
+        })
     waypoints.append({
         "sequence": len(waypoints),
         "location": origin,
         "action": "return",
     })
 
+    total_distance = int(sum(leg.distance_m for leg in optimized.legs))
+    total_duration = int(sum(leg.duration_s for leg in optimized.legs)) + 120 * len(targets)  # 含停留时间
+
     result: ReconRoute = {
         "waypoints": waypoints,
         "total_distance_m": total_distance,
         "total_duration_sec": total_duration,
     }
 
+    input_order_m = tour_cost(naive_order(len(points)), haversine_matrix([(p["lng"], p["lat"]) for p in points]))
     logger.info(
         "recon_route_planning_completed",
         waypoint_count=len(waypoints),
         total_distance_m=total_distance,
         total_duration_sec=total_duration,
+        straight_line_m=round(optimized.straight_line_m, 1),
+        input_order_straight_line_m=round(input_order_m, 1),
+        refinement_rounds=optimized.refinement_rounds,
+        estimated_legs=sum(1 for leg in optimized.legs if leg.estimated),
     )
     return result
 
@@ -1327,21 +1319,27 @@ def assign_sensor_payloads_task(
     return assignments
 
 
+# 航点风险叠加的查询半径(米)
+RISK_OVERLAY_RADIUS_METERS = 500.0
+
+
 @task
 async def risk_overlay_task(
     waypoints: List[ReconWaypoint],
     risk_repository: RiskDataRepository,
+    risk_cache_manager: Optional[RiskCacheManager] = None,
 ) -> List[WaypointRisk]:
     """风险叠加任务 - 为每个航点叠加风险数据
 
     这是一个带@task装饰器的幂等函数,用于:
-    1. 遍历所有航点坐标
-    2. 查询该坐标附近的风险区域
+    1. 一次批量空间查询获取所有航点附近的风险区域(unnest + LATERAL ST_DWithin)
+    2. 数据库不可用时,使用风险缓存的内存网格索引完成叠加
     3. 评估航点的综合风险等级
 
     Args:
         waypoints: 航点列表(包含坐标信息)
         risk_repository: 风险数据仓库
+        risk_cache_manager: 风险缓存(可选,降级路径)
 
     Returns:
         List[WaypointRisk]: 航点风险评估列表(航点序号、风险等级、危险类型)
@@ -1354,27 +1352,12 @@ async def risk_overlay_task(
         waypoint_count=len(waypoints),
     )
 
-    risks: List[WaypointRisk] = []
+    points = [(waypoint["location"]["lng"], waypoint["location"]["lat"]) for waypoint in waypoints]
+    zones_per_waypoint = await _lookup_waypoint_zones(points, risk_repository, risk_cache_manager)
 
-    for waypoint in waypoints:
+    risks: List[WaypointRisk] = []
+    for waypoint, nearby_zones in zip(waypoints, zones_per_waypoint):
         sequence = waypoint["sequence"]
-        coord = waypoint["location"]
-
-        # 查询该坐标附近500米内的风险区域
-        try:
-            nearby_zones = await risk_repository.find_zones_near(
-                lng=coord["lng"],
-                lat=coord["lat"],
-                radius_meters=500,
-            )
-        except Exception as exc:
-            logger.warning(
-                "risk_overlay_query_failed",
-                waypoint_seq=sequence,
-                coord=coord,
-                error=str(exc),
-            )
-            nearby_zones = []
 
         # 计算综合风险等级: 取最高严重等级
         if nearby_zones:
@@ -1406,6 +1389,35 @@ async def risk_overlay_task(
     return risks
 
 
+async def _lookup_waypoint_zones(
+    points: List[Tuple[float, float]],
+    risk_repository: RiskDataRepository,
+    risk_cache_manager: Optional[RiskCacheManager],
+) -> List[List[RiskZoneRecord]]:
+    """批量获取各航点附近的风险区域: 优先数据库批量查询,失败时降级到内存索引。"""
+    if not points:
+        return []
+    try:
+        return await risk_repository.find_zones_near_points(points, radius_meters=RISK_OVERLAY_RADIUS_METERS)
+    except Exception as exc:
+        logger.warning(
+            "risk_overlay_query_failed",
+            waypoint_count=len(points),
+            error=str(exc),
+        )
+
+    index = risk_cache_manager.spatial_index() if risk_cache_manager is not None else None
+    if index is None:
+        logger.warning("risk_overlay_no_fallback_index", waypoint_count=len(points))
+        return [[] for _ in points]
+    logger.info(
+        "risk_overlay_memory_index_fallback",
+        waypoint_count=len(points),
+        indexed_zones=len(index),
+    )
+    return index.query_many(points, RISK_OVERLAY_RADIUS_METERS)
+
+
 @task
 async def persist_scout_task(
     scout_task: Dict[str, Any],
@@ -6,6 +6,9 @@ SITREP（Situation Report）是军事/应急领域的标准概念，用于定期
 本子图特点：
 - 100%独立，不依赖其他子图的执行结果
 - 数据聚合 + LLM摘要的混合架构
+- 四路数据采集（事件/任务/风险/资源）在同一超步内并行执行，汇合后再聚合指标
+- 增量模式：基于上一版快照只查询变更数据并合并指标，LLM 在上一版摘要基础上更新；
+  无任何变化时直接复用上一版报告，不调用 LLM、不写新快照
 - 强类型State（TypedDict + NotRequired）
 - 所有副作用操作使用@task包装
 - durability="sync"确保可靠持久化
@@ -18,9 +21,11 @@ SITREP（Situation Report）是军事/应急领域的标准概念，用于定期
 
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
-from datetime import datetime, timezone
-from typing import Any, Dict, List, TypedDict
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Awaitable, Dict, List, Optional, Tuple, TypedDict, TypeVar
 
 try:
     from typing import NotRequired
@@ -49,10 +54,24 @@ from emergency_agents.risk.service import RiskCacheManager, RiskZoneRecord
 
 logger = structlog.get_logger(__name__)
 
+SITREP_SNAPSHOT_TYPE = "sitrep_report"
+
+# 上一版快照超过该时长则回退全量生成：统计窗口滑动后“移出窗口”的任务无法从增量查询中识别
+INCREMENTAL_MAX_AGE = timedelta(hours=2)
+
+_T = TypeVar("_T")
+
 
 # ========== 数据模型定义 ==========
 
 
+def _merge_timings(
+    left: Optional[Dict[str, float]], right: Optional[Dict[str, float]]
+) -> Dict[str, float]:
+    """并行采集节点各自写入耗时，按数据源合并。"""
+    return {**(left or {}), **(right or {})}
+
+
 class SITREPMetrics(TypedDict):
     """态势报告核心指标数据模型
 
@@ -103,12 +122,19 @@ class SITREPState(TypedDict):
     # 输入参数（可选）
     incident_id: NotRequired[str]  # 可选：指定事件ID生成专项报告
     time_range_hours: NotRequired[int]  # 统计时间范围（小时），默认24
+    incremental: NotRequired[bool]  # 增量模式：基于上一版快照 + 变更数据生成
 
     # 数据采集结果（可选）
     active_incidents: NotRequired[List[IncidentRecord]]
     task_progress: NotRequired[List[TaskSummary]]
     risk_zones: NotRequired[List[RiskZoneRecord]]
     resource_usage: NotRequired[Dict[str, Any]]
+    # 各数据源采集耗时（毫秒），并行节点同时写入，需 reducer 合并
+    fetch_timings_ms: NotRequired[Annotated[Dict[str, float], _merge_timings]]
+
+    # 增量模式（可选）
+    previous_snapshot: NotRequired[Dict[str, Any]]  # 上一版快照：snapshot_id / generated_at / payload
+    sitrep_delta: NotRequired[Dict[str, Any]]  # 相对上一版的变化摘要
 
     # 分析结果（可选）
     metrics: NotRequired[SITREPMetrics]
@@ -186,14 +212,14 @@ async def fetch_risk_zones_task(
     """
     缓存查询任务：获取活跃风险区域
 
-    幂等性保证：强制刷新模式（force_refresh=True）确保获取最新数据
-    副作用：缓存查询（可能触发数据库刷新）
+    幂等性保证：复用风险缓存（后台定时刷新 + TTL 过期自动刷新），同一缓存周期内结果一致
+    副作用：缓存查询（缓存过期时触发数据库刷新）
     """
     start_time = datetime.now(timezone.utc)
     logger.info("sitrep_fetch_risks_start")
 
-    # 强制刷新确保获取最新风险数据
-    zones = await risk_cache_manager.get_active_zones(force_refresh=True)
+    # 复用缓存：SITREP 按分钟级周期生成，强制刷新会让每轮都回源数据库
+    zones = await risk_cache_manager.get_active_zones()
 
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
     logger.info(
@@ -218,17 +244,7 @@ async def fetch_resource_usage_task(
     start_time = datetime.now(timezone.utc)
     logger.info("sitrep_fetch_resources_start")
 
-    # 查询所有可用救援队员（修正：使用正确的方法名）
-    rescuers = await rescue_dao.list_available_rescuers(limit=1000)
-
-    # 统计资源使用情况
-    resource_usage = {
-        "total_rescuers": len(rescuers),
-        "deployed_teams": len(set(r.rescuer_id for r in rescuers)),  # 修正：RescuerRecord没有team_id字段
-        "available_rescuers": len([r for r in rescuers if r.status == "available"]),
-        "busy_rescuers": len([r for r in rescuers if r.status == "busy"]),
-        "offline_rescuers": len([r for r in rescuers if r.status == "offline"]),
-    }
+    resource_usage = await _summarize_resources(rescue_dao)
 
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
     logger.info(
@@ -241,6 +257,82 @@ async def fetch_resource_usage_task(
     return resource_usage
 
 
+@task
+async def fetch_previous_snapshot_task(
+    snapshot_repo: IncidentSnapshotRepository,
+    scope: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    数据库查询任务：读取同一范围（全局/指定事件）的上一版态势快照
+
+    幂等性保证：只读查询
+    副作用：数据库查询
+    """
+    record = await snapshot_repo.get_latest_snapshot(
+        snapshot_type=SITREP_SNAPSHOT_TYPE,
+        payload_filter={"scope": scope},
+    )
+    if record is None:
+        return None
+    return {
+        "snapshot_id": record.snapshot_id,
+        "generated_at": record.generated_at.isoformat(),
+        "payload": dict(record.payload),
+    }
+
+
+@task
+async def fetch_sitrep_deltas_task(
+    incident_dao: IncidentDAO,
+    task_dao: TaskDAO,
+    risk_cache_manager: RiskCacheManager,
+    rescue_dao: RescueDAO,
+    since: datetime,
+    hours: int,
+) -> Dict[str, Any]:
+    """
+    数据库查询任务：并发查询自上一版快照以来的变更数据
+
+    幂等性保证：相同 since 返回相同的变更集合
+    副作用：数据库查询（救援力量有变更时才重新统计资源）
+    """
+    timings: Dict[str, float] = {}
+
+    async def _timed(name: str, awaitable: Awaitable[_T]) -> _T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[name] = _elapsed_ms(started)
+
+    incidents, tasks, zones, rescuers_changed = await asyncio.gather(
+        _timed("incidents", incident_dao.list_incidents_changed_since(since)),
+        _timed("tasks", task_dao.list_tasks_changed_since(since, hours=hours)),
+        _timed("risk_zones", risk_cache_manager.get_active_zones()),
+        _timed("resources", rescue_dao.count_rescuers_changed_since(since)),
+    )
+    resource_usage: Optional[Dict[str, Any]] = None
+    if rescuers_changed:
+        resource_usage = await _timed("resources_reload", _summarize_resources(rescue_dao))
+
+    logger.info(
+        "sitrep_fetch_deltas_completed",
+        since=since.isoformat(),
+        changed_incidents=len(incidents),
+        changed_tasks=len(tasks),
+        rescuers_changed=rescuers_changed,
+        timings_ms=timings,
+    )
+    return {
+        "incidents": incidents,
+        "tasks": tasks,
+        "risk_zones": zones,
+        "rescuers_changed": rescuers_changed,
+        "resource_usage": resource_usage,
+        "timings": timings,
+    }
+
+
 @task
 async def call_llm_for_sitrep(
     llm_client: Any,
@@ -267,24 +359,49 @@ async def call_llm_for_sitrep(
         prompt_length=len(prompt),
     )
 
-    # 调用LLM（temperature=0确保稳定性）
-    response = llm_client.chat.completions.create(
+    summary = _chat_summary(llm_client, llm_model, prompt)
+
+    duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+    logger.info(
+        "sitrep_llm_call_completed",
         model=llm_model,
-        messages=[
-            {
-                "role": "system",
-                "content": "你是应急指挥系统的态势分析专家，负责生成简明、客观、专业的态势报告摘要。",
-            },
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0,  # 确保输出稳定
+        summary_length=len(summary),
+        duration_ms=duration * 1000,
+    )
+
+    return summary
+
+
+@task
+async def call_llm_for_sitrep_update(
+    llm_client: Any,
+    llm_model: str,
+    previous_summary: str,
+    previous_metrics: SITREPMetrics,
+    metrics: SITREPMetrics,
+    delta: Dict[str, Any],
+) -> str:
+    """
+    LLM调用任务：在上一版摘要基础上按变化更新态势摘要（增量模式）
+
+    提示词只包含上一版摘要与变化部分，token 远少于全量重写
+    幂等性保证：temperature=0确保相同输入返回稳定输出
+    副作用：LLM API调用
+    """
+    start_time = datetime.now(timezone.utc)
+    prompt = _build_sitrep_update_prompt(previous_summary, previous_metrics, metrics, delta)
+
+    logger.info(
+        "sitrep_llm_update_start",
+        model=llm_model,
+        prompt_length=len(prompt),
     )
 
-    summary = response.choices[0].message.content.strip()
+    summary = _chat_summary(llm_client, llm_model, prompt)
 
     duration = (datetime.now(timezone.utc) - start_time).total_seconds()
     logger.info(
-        "sitrep_llm_call_completed",
+        "sitrep_llm_update_completed",
         model=llm_model,
         summary_length=len(summary),
         duration_ms=duration * 1000,
@@ -345,6 +462,104 @@ def ingest(state: SITREPState) -> SITREPState:
     }
 
 
+def load_previous_snapshot(
+    state: SITREPState,
+    snapshot_repo: IncidentSnapshotRepository,
+) -> Dict[str, Any]:
+    """
+    增量节点：读取上一版快照，不满足增量条件时回退全量采集
+
+    幂等性：如果state中已有previous_snapshot，直接返回
+    副作用：通过@task包装的函数执行数据库查询
+    """
+    if state.get("previous_snapshot"):
+        return {}
+
+    previous = fetch_previous_snapshot_task(snapshot_repo, _report_scope(state)).result()
+    reason = _incremental_unusable_reason(previous, state)
+    if reason is not None:
+        logger.info(
+            "sitrep_incremental_fallback_full",
+            report_id=state["report_id"],
+            reason=reason,
+        )
+        return {"incremental": False}
+
+    logger.info(
+        "sitrep_incremental_base_loaded",
+        report_id=state["report_id"],
+        base_snapshot_id=previous["snapshot_id"],
+        data_as_of=previous["payload"]["data_as_of"],
+    )
+    return {"previous_snapshot": previous}
+
+
+def fetch_deltas(
+    state: SITREPState,
+    incident_dao: IncidentDAO,
+    task_dao: TaskDAO,
+    risk_cache_manager: RiskCacheManager,
+    rescue_dao: RescueDAO,
+) -> Dict[str, Any]:
+    """
+    增量节点：只查询上一版快照之后变更的数据，并与上一版明细合并
+
+    幂等性：如果state中已有sitrep_delta，直接返回
+    副作用：通过@task包装的函数执行数据库查询
+    """
+    if state.get("sitrep_delta"):
+        return {}
+
+    previous = state["previous_snapshot"]
+    since = _parse_datetime(previous["payload"]["data_as_of"])
+    delta = fetch_sitrep_deltas_task(
+        incident_dao,
+        task_dao,
+        risk_cache_manager,
+        rescue_dao,
+        since,
+        state.get("time_range_hours", 24),
+    ).result()
+
+    # 与全量模式同一统计窗口：创建时间早于 触发时间-N小时 的任务不再计入
+    window_start = _parse_datetime(state["triggered_at"]) - timedelta(hours=state.get("time_range_hours", 24))
+    merged = merge_sitrep_delta(
+        previous["payload"], delta, incident_id=state.get("incident_id"), window_start=window_start
+    )
+    merged["sitrep_delta"]["base_snapshot_id"] = previous["snapshot_id"]
+    logger.info(
+        "sitrep_incremental_merged",
+        report_id=state["report_id"],
+        unchanged=merged["sitrep_delta"]["unchanged"],
+        changed_tasks=len(merged["sitrep_delta"]["task_changes"]),
+        incidents_added=len(merged["sitrep_delta"]["incidents_added"]),
+        incidents_updated=len(merged["sitrep_delta"]["incidents_updated"]),
+        tasks_expired=len(merged["sitrep_delta"]["tasks_expired"]),
+        incidents_closed=len(merged["sitrep_delta"]["incidents_closed"]),
+    )
+    return merged
+
+
+def reuse_previous_report(state: SITREPState) -> Dict[str, Any]:
+    """
+    增量节点：自上一版以来无任何变化，直接复用上一版指标、摘要与快照
+
+    幂等性：纯计算节点，无副作用（不调用LLM、不写新快照）
+    """
+    previous = state["previous_snapshot"]
+    payload = previous["payload"]
+    logger.info(
+        "sitrep_incremental_unchanged",
+        report_id=state["report_id"],
+        base_snapshot_id=previous["snapshot_id"],
+    )
+    return {
+        "metrics": payload.get("metrics", {}),
+        "llm_summary": payload.get("summary", ""),
+        "snapshot_id": previous["snapshot_id"],
+    }
+
+
 def fetch_active_incidents(
     state: SITREPState,
     incident_dao: IncidentDAO,
@@ -365,7 +580,9 @@ def fetch_active_incidents(
         return {}
 
     # 调用@task包装的数据库查询
+    started = time.perf_counter()
     incidents = fetch_active_incidents_task(incident_dao).result()
+    elapsed_ms = _elapsed_ms(started)
 
     # 如果指定了incident_id，过滤出特定事件
     if "incident_id" in state and state["incident_id"]:
@@ -378,7 +595,7 @@ def fetch_active_incidents(
             filtered_count=len(incidents),
         )
 
-    return {"active_incidents": incidents}
+    return {"active_incidents": incidents, "fetch_timings_ms": {"incidents": elapsed_ms}}
 
 
 def fetch_task_progress(
@@ -403,9 +620,10 @@ def fetch_task_progress(
     time_range = state.get("time_range_hours", 24)
 
     # 调用@task包装的数据库查询
+    started = time.perf_counter()
     tasks = fetch_recent_tasks_task(task_dao, time_range).result()
 
-    return {"task_progress": tasks}
+    return {"task_progress": tasks, "fetch_timings_ms": {"tasks": _elapsed_ms(started)}}
 
 
 def fetch_risk_zones(
@@ -428,9 +646,10 @@ def fetch_risk_zones(
         return {}
 
     # 调用@task包装的缓存查询
+    started = time.perf_counter()
     zones = fetch_risk_zones_task(risk_cache_manager).result()
 
-    return {"risk_zones": zones}
+    return {"risk_zones": zones, "fetch_timings_ms": {"risk_zones": _elapsed_ms(started)}}
 
 
 def fetch_resource_usage(
@@ -453,9 +672,10 @@ def fetch_resource_usage(
         return {}
 
     # 调用@task包装的数据库查询
+    started = time.perf_counter()
     resource_usage = fetch_resource_usage_task(rescue_dao).result()
 
-    return {"resource_usage": resource_usage}
+    return {"resource_usage": resource_usage, "fetch_timings_ms": {"resources": _elapsed_ms(started)}}
 
 
 def aggregate_metrics(state: SITREPState) -> Dict[str, Any]:
@@ -489,6 +709,7 @@ def aggregate_metrics(state: SITREPState) -> Dict[str, Any]:
         "sitrep_aggregate_metrics_completed",
         report_id=state["report_id"],
         metrics=metrics,
+        fetch_timings_ms=state.get("fetch_timings_ms", {}),
     )
 
     return {"metrics": metrics}
@@ -519,6 +740,21 @@ def llm_generate_summary(
     tasks = state.get("task_progress", [])
     risks = state.get("risk_zones", [])
 
+    previous = state.get("previous_snapshot")
+    delta = state.get("sitrep_delta")
+    if previous and delta:
+        # 增量模式：在上一版摘要基础上按变化更新，而非重新生成
+        previous_payload = previous["payload"]
+        summary = call_llm_for_sitrep_update(
+            llm_client,
+            llm_model,
+            previous_payload.get("summary", ""),
+            previous_payload.get("metrics", {}),
+            metrics,
+            delta,
+        ).result()
+        return {"llm_summary": summary}
+
     # 调用@task包装的LLM函数
     summary = call_llm_for_sitrep(
         llm_client,
@@ -568,7 +804,7 @@ def persist_report(
 
     snapshot_input = IncidentSnapshotCreateInput(
         incident_id=incident_id_value,  # 必填字段，关联到具体事件或系统事件
-        snapshot_type="sitrep_report",  # 态势报告类型
+        snapshot_type=SITREP_SNAPSHOT_TYPE,  # 态势报告类型
         generated_at=datetime.now(timezone.utc),  # 必填字段
         created_by=state["user_id"],  # 必填字段
         payload={
@@ -579,10 +815,12 @@ def persist_report(
                 "incidents": [
                     {
                         "id": i.id,
+                        "event_code": i.event_code,
                         "title": i.title,
                         "type": i.type,
                         "priority": i.priority,
                         "status": i.status,
+                        "updated_at": _isoformat(i.updated_at),
                     }
                     for i in state.get("active_incidents", [])
                 ],
@@ -590,8 +828,12 @@ def persist_report(
                     {
                         "id": t.id,
                         "code": t.code,
+                        "description": t.description,
                         "status": t.status,
                         "progress": t.progress,
+                        "updated_at": _isoformat(t.updated_at),
+                        # 增量模式按创建时间裁剪滑出统计窗口的任务
+                        "created_at": _isoformat(t.created_at),
                     }
                     for t in state.get("task_progress", [])
                 ],
@@ -607,6 +849,11 @@ def persist_report(
                 "resources": state.get("resource_usage", {}),
             },
             "time_range_hours": state.get("time_range_hours", 24),
+            "fetch_timings_ms": state.get("fetch_timings_ms", {}),
+            # 增量模式定位上一版快照与变更起点：scope 区分全局/专项报告，data_as_of 为本次采集开始时间
+            "scope": _report_scope(state),
+            "data_as_of": _isoformat(state["triggered_at"]),
+            "incremental": _delta_brief(state.get("sitrep_delta")),
             "generated_at": datetime.now(timezone.utc).isoformat(),
         },
     )
@@ -636,10 +883,14 @@ def finalize(state: SITREPState) -> Dict[str, Any]:
             "tasks": state.get("task_progress", []),
             "risks": state.get("risk_zones", []),
             "resources": state.get("resource_usage", {}),
+            "fetch_timings_ms": state.get("fetch_timings_ms", {}),
         },
         "snapshot_id": state.get("snapshot_id", ""),
     }
 
+    if state.get("sitrep_delta"):
+        report["details"]["incremental"] = state["sitrep_delta"]
+
     logger.info(
         "sitrep_finalized",
         report_id=state["report_id"],
@@ -656,6 +907,231 @@ def finalize(state: SITREPState) -> Dict[str, Any]:
 # ========== 辅助函数 ==========
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def _summarize_resources(rescue_dao: RescueDAO) -> Dict[str, Any]:
+    """统计资源使用情况（全量采集与增量重算共用）。"""
+    # 查询所有可用救援队员（修正：使用正确的方法名）
+    rescuers = await rescue_dao.list_available_rescuers(limit=1000)
+
+    return {
+        "total_rescuers": len(rescuers),
+        "deployed_teams": len(set(r.rescuer_id for r in rescuers)),  # 修正：RescuerRecord没有team_id字段
+        "available_rescuers": len([r for r in rescuers if r.status == "available"]),
+        "busy_rescuers": len([r for r in rescuers if r.status == "busy"]),
+        "offline_rescuers": len([r for r in rescuers if r.status == "offline"]),
+    }
+
+
+def _chat_summary(llm_client: Any, llm_model: str, prompt: str) -> str:
+    # 调用LLM（temperature=0确保稳定性）
+    response = llm_client.chat.completions.create(
+        model=llm_model,
+        messages=[
+            {
+                "role": "system",
+                "content": "你是应急指挥系统的态势分析专家，负责生成简明、客观、专业的态势报告摘要。",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0,  # 确保输出稳定
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _report_scope(state: SITREPState) -> str:
+    """快照范围：指定事件的专项报告按事件ID区分，否则为全局报告。"""
+    return state.get("incident_id") or "all"
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _incremental_unusable_reason(
+    previous: Optional[Dict[str, Any]],
+    state: SITREPState,
+) -> Optional[str]:
+    """判断上一版快照能否作为增量基线，不能时返回原因。"""
+    if previous is None:
+        return "no_previous_snapshot"
+    payload = previous.get("payload") or {}
+    details = payload.get("details") or {}
+    if not payload.get("data_as_of") or not isinstance(details.get("tasks"), list):
+        return "legacy_snapshot"
+    if any(not item.get("created_at") for item in details["tasks"]):
+        return "legacy_snapshot"  # 缺少任务创建时间，无法按统计窗口裁剪
+    if payload.get("time_range_hours", 24) != state.get("time_range_hours", 24):
+        return "time_range_changed"
+    if datetime.now(timezone.utc) - _parse_datetime(payload["data_as_of"]) > INCREMENTAL_MAX_AGE:
+        return "snapshot_too_old"
+    return None
+
+
+def _incident_from_detail(detail: Dict[str, Any]) -> IncidentRecord:
+    """由快照明细还原事件记录（快照只保存摘要字段，其余字段置空）。"""
+    updated_at = _parse_datetime(detail["updated_at"]) if detail.get("updated_at") else None
+    return IncidentRecord(
+        id=detail["id"],
+        parent_event_id=None,
+        event_code=detail.get("event_code"),
+        title=detail.get("title", ""),
+        type=detail.get("type", ""),
+        priority=int(detail.get("priority") or 0),
+        status=detail.get("status", "active"),
+        description=None,
+        created_by=None,
+        updated_by=None,
+        created_at=updated_at,  # type: ignore[arg-type]
+        updated_at=updated_at,  # type: ignore[arg-type]
+        deleted_at=None,
+    )
+
+
+def _task_from_detail(detail: Dict[str, Any]) -> TaskSummary:
+    """由快照明细还原任务概况。"""
+    updated_at = _parse_datetime(detail["updated_at"]) if detail.get("updated_at") else None
+    return TaskSummary(
+        id=detail["id"],
+        code=detail.get("code"),
+        description=detail.get("description"),
+        status=detail.get("status", "pending"),
+        progress=detail.get("progress"),
+        updated_at=updated_at,  # type: ignore[arg-type]
+        created_at=_parse_datetime(detail["created_at"]) if detail.get("created_at") else None,
+    )
+
+
+def merge_sitrep_delta(
+    previous_payload: Dict[str, Any],
+    delta: Dict[str, Any],
+    *,
+    incident_id: Optional[str] = None,
+    window_start: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """将变更数据合并进上一版快照明细，返回可直接写入State的采集结果与变化摘要。
+
+    - 事件：变更后仍为 active 的新增/更新（updated_at 变化计入 incidents_updated），其余（关闭/删除）移出；
+    - 任务：按ID覆盖，status='deleted' 的移出，状态或进度变化计入 task_changes；
+      创建时间早于 window_start 的任务已滑出统计窗口，移出并计入 tasks_expired（与全量模式口径一致）；
+    - 风险区域：来自缓存的当前全集，与上一版ID集合比对；
+    - 资源：救援力量无变更时沿用上一版统计。
+    """
+    details = previous_payload.get("details") or {}
+
+    incidents: Dict[str, IncidentRecord] = {
+        item["id"]: _incident_from_detail(item) for item in details.get("incidents", [])
+    }
+    incidents_added: List[str] = []
+    incidents_updated: List[str] = []
+    incidents_closed: List[str] = []
+    for record in delta["incidents"]:
+        if incident_id and record.id != incident_id:
+            continue
+        if record.status == "active" and record.deleted_at is None:
+            known = incidents.get(record.id)
+            if known is None:
+                incidents_added.append(record.id)
+            elif known.updated_at != record.updated_at:
+                incidents_updated.append(record.id)  # 标题、优先级等变化，摘要需要更新
+            incidents[record.id] = record
+        elif incidents.pop(record.id, None) is not None:
+            incidents_closed.append(record.id)
+
+    tasks: Dict[str, TaskSummary] = {item["id"]: _task_from_detail(item) for item in details.get("tasks", [])}
+    task_changes: List[Dict[str, Any]] = []
+    for record in delta["tasks"]:
+        previous = tasks.get(record.id)
+        if record.status == "deleted":
+            if tasks.pop(record.id, None) is not None:
+                task_changes.append(
+                    {"id": record.id, "code": record.code, "status": "deleted", "previous_status": previous.status}
+                )
+            continue
+        tasks[record.id] = record
+        if previous is None or previous.status != record.status or previous.progress != record.progress:
+            task_changes.append(
+                {
+                    "id": record.id,
+                    "code": record.code,
+                    "status": record.status,
+                    "previous_status": previous.status if previous else None,
+                    "progress": record.progress,
+                }
+            )
+
+    tasks_expired: List[str] = []
+    if window_start is not None:
+        for task_id, record in list(tasks.items()):
+            if record.created_at is not None and record.created_at < window_start:
+                del tasks[task_id]
+                tasks_expired.append(task_id)
+
+    previous_zone_ids = {item.get("zone_id") for item in details.get("risk_zones", [])}
+    current_zone_ids = {zone.zone_id for zone in delta["risk_zones"]}
+    risk_zones_added = sorted(current_zone_ids - previous_zone_ids)
+    risk_zones_removed = sorted(z for z in previous_zone_ids - current_zone_ids if z)
+
+    resources_changed = bool(delta["rescuers_changed"])
+    resource_usage = delta["resource_usage"] if delta.get("resource_usage") is not None else details.get("resources", {})
+
+    unchanged = not (
+        incidents_added
+        or incidents_updated
+        or incidents_closed
+        or task_changes
+        or tasks_expired
+        or risk_zones_added
+        or risk_zones_removed
+        or resources_changed
+    )
+    return {
+        "active_incidents": sorted(incidents.values(), key=lambda i: i.priority, reverse=True),
+        "task_progress": list(tasks.values()),
+        "risk_zones": list(delta["risk_zones"]),
+        "resource_usage": resource_usage,
+        "fetch_timings_ms": dict(delta.get("timings", {})),
+        "sitrep_delta": {
+            "unchanged": unchanged,
+            "incidents_added": incidents_added,
+            "incidents_updated": incidents_updated,
+            "incidents_closed": incidents_closed,
+            "task_changes": task_changes,
+            "tasks_expired": tasks_expired,
+            "risk_zones_added": risk_zones_added,
+            "risk_zones_removed": risk_zones_removed,
+            "resources_changed": resources_changed,
+        },
+    }
+
+
+def _delta_brief(delta: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """快照中只保留变化计数，明细已体现在 details 中。"""
+    if not delta:
+        return None
+    return {
+        "base_snapshot_id": delta.get("base_snapshot_id"),
+        "incidents_added": len(delta.get("incidents_added", [])),
+        "incidents_updated": len(delta.get("incidents_updated", [])),
+        "incidents_closed": len(delta.get("incidents_closed", [])),
+        "task_changes": len(delta.get("task_changes", [])),
+        "tasks_expired": len(delta.get("tasks_expired", [])),
+        "risk_zones_added": len(delta.get("risk_zones_added", [])),
+        "risk_zones_removed": len(delta.get("risk_zones_removed", [])),
+        "resources_changed": bool(delta.get("resources_changed")),
+    }
+
+
 def _build_sitrep_prompt(
     metrics: SITREPMetrics,
     incidents: List[IncidentRecord],
@@ -723,6 +1199,75 @@ def _build_sitrep_prompt(
     return prompt
 
 
+_METRIC_LABELS: Tuple[Tuple[str, str], ...] = (
+    ("active_incidents_count", "活跃事件"),
+    ("completed_tasks_count", "已完成任务"),
+    ("in_progress_tasks_count", "进行中任务"),
+    ("pending_tasks_count", "待办任务"),
+    ("active_risk_zones_count", "活跃风险区域"),
+    ("deployed_teams_count", "部署队伍"),
+    ("total_rescuers_count", "救援人员"),
+)
+
+
+def _build_sitrep_update_prompt(
+    previous_summary: str,
+    previous_metrics: SITREPMetrics,
+    metrics: SITREPMetrics,
+    delta: Dict[str, Any],
+) -> str:
+    """
+    构建增量更新提示词
+
+    只包含上一版摘要、指标变化和变更明细（最多20条任务变化）
+    """
+    metric_lines = []
+    for key, label in _METRIC_LABELS:
+        before = previous_metrics.get(key, 0)
+        after = metrics.get(key, 0)
+        change = f"（{after - before:+d}）" if after != before else "（无变化）"
+        metric_lines.append(f"- {label}：{before} → {after}{change}")
+
+    task_lines = [
+        f"- 任务{c.get('code') or c['id']}：{c.get('previous_status') or '新增'} → {c['status']}"
+        for c in delta.get("task_changes", [])[:20]
+    ]
+    omitted = len(delta.get("task_changes", [])) - len(task_lines)
+    if omitted > 0:
+        task_lines.append(f"- 另有{omitted}项任务变化")
+
+    newline = "\n"
+    prompt = f"""以下是上一版态势报告摘要，请根据最新变化对其进行更新（200-500字），保留仍然有效的内容，修正已过时的描述。
+
+# 上一版摘要
+
+{previous_summary or "（无）"}
+
+# 指标变化
+
+{newline.join(metric_lines)}
+
+# 变更明细
+
+- 新增活跃事件：{len(delta.get("incidents_added", []))}个
+- 信息更新的事件：{len(delta.get("incidents_updated", []))}个
+- 已关闭事件：{len(delta.get("incidents_closed", []))}个
+- 移出统计窗口的任务：{len(delta.get("tasks_expired", []))}项
+- 新增风险区域：{len(delta.get("risk_zones_added", []))}个
+- 解除风险区域：{len(delta.get("risk_zones_removed", []))}个
+- 救援力量状态：{"有变化" if delta.get("resources_changed") else "无变化"}
+{newline.join(task_lines)}
+
+# 生成要求
+
+- 保持原有结构：总体态势概述、关键进展和成果、当前风险和挑战、后续行动建议
+- 突出本次变化，语气专业、简洁、客观，使用中文
+- 直接输出更新后的完整摘要，不要解释修改过程
+"""
+
+    return prompt
+
+
 # ========== Graph构建函数 ==========
 
 
@@ -763,6 +1308,15 @@ async def build_sitrep_graph(
 
     # 添加节点（使用闭包捕获依赖）
     graph.add_node("ingest", ingest)
+    graph.add_node(
+        "load_previous_snapshot",
+        lambda state: load_previous_snapshot(state, snapshot_repo),
+    )
+    graph.add_node(
+        "fetch_deltas",
+        lambda state: fetch_deltas(state, incident_dao, task_dao, risk_cache_manager, rescue_dao),
+    )
+    graph.add_node("reuse_previous_report", reuse_previous_report)
     graph.add_node(
         "fetch_active_incidents",
         lambda state: fetch_active_incidents(state, incident_dao),
@@ -790,13 +1344,41 @@ async def build_sitrep_graph(
     )
     graph.add_node("finalize", finalize)
 
-    # 配置线性流程边
+    # 配置流程边：四个采集节点数据源互不依赖，ingest 后扇出为同一超步并行执行，
+    # 全部完成后汇合到 aggregate_metrics
+    # 增量模式：ingest → load_previous_snapshot → fetch_deltas → aggregate_metrics / reuse_previous_report，
+    # 无可用基线时回退到全量采集
+    fetch_nodes = [
+        "fetch_active_incidents",
+        "fetch_task_progress",
+        "fetch_risk_zones",
+        "fetch_resource_usage",
+    ]
+
+    def _route_after_ingest(state: SITREPState) -> Any:
+        return "load_previous_snapshot" if state.get("incremental") else fetch_nodes
+
+    def _route_after_previous_snapshot(state: SITREPState) -> Any:
+        return "fetch_deltas" if state.get("previous_snapshot") else fetch_nodes
+
+    def _route_after_deltas(state: SITREPState) -> str:
+        delta = state.get("sitrep_delta") or {}
+        return "reuse_previous_report" if delta.get("unchanged") else "aggregate_metrics"
+
     graph.add_edge(START, "ingest")
-    graph.add_edge("ingest", "fetch_active_incidents")
-    graph.add_edge("fetch_active_incidents", "fetch_task_progress")
-    graph.add_edge("fetch_task_progress", "fetch_risk_zones")
-    graph.add_edge("fetch_risk_zones", "fetch_resource_usage")
-    graph.add_edge("fetch_resource_usage", "aggregate_metrics")
+    graph.add_conditional_edges("ingest", _route_after_ingest, ["load_previous_snapshot", *fetch_nodes])
+    graph.add_conditional_edges(
+        "load_previous_snapshot",
+        _route_after_previous_snapshot,
+        ["fetch_deltas", *fetch_nodes],
+    )
+    graph.add_edge(fetch_nodes, "aggregate_metrics")
+    graph.add_conditional_edges(
+        "fetch_deltas",
+        _route_after_deltas,
+        ["aggregate_metrics", "reuse_previous_report"],
+    )
+    graph.add_edge("reuse_previous_report", "finalize")
     graph.add_edge("aggregate_metrics", "llm_generate_summary")
     graph.add_edge("llm_generate_summary", "persist_report")
     graph.add_edge("persist_report", "finalize")
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import structlog
 
 from emergency_agents.config import AppConfig
 from emergency_agents.intent.providers.base import IntentProvider, IntentThresholds
 from emergency_agents.intent.providers.factory import build_providers
+from emergency_agents.intent.providers.llm import LLMIntentProvider
 from emergency_agents.intent.providers.types import IntentPrediction
+from emergency_agents.intent.result_cache import IntentResultCache, build_intent_result_cache
 
 logger = logging.getLogger(__name__)
 structured_logger = structlog.get_logger(__name__)
@@ -51,6 +53,14 @@ def _extract_text_from_state(state: Dict[str, Any]) -> str:
     return ""
 
 
+def _empty_intent() -> Dict[str, Any]:
+    return {
+        "intent_type": "unknown",
+        "slots": {},
+        "meta": {"need_confirm": True, "confidence": 0.0, "margin": 0.0, "source": "unknown"},
+    }
+
+
 @dataclass
 class IntentClassifierRuntime:
     """封装意图识别运行时依赖。"""
@@ -58,29 +68,69 @@ class IntentClassifierRuntime:
     provider: IntentProvider
     fallback: IntentProvider
     thresholds: IntentThresholds
+    cache: Optional[IntentResultCache] = None
 
     def classify_text(self, text: str) -> IntentPrediction:
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached  # type: ignore[return-value]
+        try:
+            prediction = self.provider.predict(text)
+        except Exception as exc:  # pragma: no cover - 极端网络错误兜底
+            structured_logger.warning(
+                "intent_provider_error",
+                provider=getattr(self.provider, "__class__", type(self.provider)).__name__,
+                error=str(exc),
+            )
+            prediction = self.fallback.predict(text)
+        if self.cache is not None:
+            self.cache.put(text, dict(prediction))
+        return prediction
+
+    async def aclassify_text(self, text: str) -> IntentPrediction:
+        """异步版本：HTTP/LLM 请求不占用事件循环。"""
+        if self.cache is not None:
+            cached = await self.cache.aget(text)
+            if cached is not None:
+                return cached  # type: ignore[return-value]
         try:
-            return self.provider.predict(text)
+            prediction = await self.provider.apredict(text)
         except Exception as exc:  # pragma: no cover - 极端网络错误兜底
             structured_logger.warning(
                 "intent_provider_error",
                 provider=getattr(self.provider, "__class__", type(self.provider)).__name__,
                 error=str(exc),
             )
-            return self.fallback.predict(text)
+            prediction = await self.fallback.apredict(text)
+        if self.cache is not None:
+            await self.cache.aput(text, dict(prediction))
+        return prediction
+
+    def bind_async_llm_client(self, async_llm_client: Any) -> None:
+        """为尚未绑定异步客户端的 LLM 提供者补充 FailoverAsyncLLMClient。"""
+        for candidate in (self.provider, self.fallback):
+            if isinstance(candidate, LLMIntentProvider) and candidate.async_llm_client is None:
+                candidate.use_async_client(async_llm_client)
 
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         text = _extract_text_from_state(state)
         if not text:
-            intent_stub = {
-                "intent_type": "unknown",
-                "slots": {},
-                "meta": {"need_confirm": True, "confidence": 0.0, "margin": 0.0, "source": "unknown"},
-            }
-            return state | {"intent": intent_stub}
-
-        prediction = self.classify_text(text)
+            return state | {"intent": _empty_intent()}
+        return self._apply_prediction(state, text, self.classify_text(text))
+
+    async def ainvoke(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        text = _extract_text_from_state(state)
+        if not text:
+            return state | {"intent": _empty_intent()}
+        return self._apply_prediction(state, text, await self.aclassify_text(text))
+
+    def _apply_prediction(
+        self,
+        state: Dict[str, Any],
+        text: str,
+        prediction: IntentPrediction,
+    ) -> Dict[str, Any]:
         confidence = float(prediction.get("confidence", 0.0) or 0.0)
         margin = float(prediction.get("margin", 0.0) or 0.0)
         source = prediction.get("source", "unknown")
@@ -178,15 +228,33 @@ def build_intent_classifier_runtime(
     cfg: AppConfig,
     llm_client,
     llm_model: str,
+    async_llm_client=None,
 ) -> IntentClassifierRuntime:
     """构建意图分类运行时"""
-    provider, fallback, thresholds = build_providers(cfg, llm_client, llm_model)
-    return IntentClassifierRuntime(provider=provider, fallback=fallback, thresholds=thresholds)
+    provider, fallback, thresholds = build_providers(
+        cfg, llm_client, llm_model, async_llm_client=async_llm_client
+    )
+    return IntentClassifierRuntime(
+        provider=provider,
+        fallback=fallback,
+        thresholds=thresholds,
+        cache=build_intent_result_cache(cfg),
+    )
 
 
 _default_runtime: IntentClassifierRuntime | None = None
 
 
+def _resolve_default_runtime(llm_client, llm_model: str | None) -> IntentClassifierRuntime:
+    global _default_runtime
+    if _default_runtime is None:
+        if llm_client is None or llm_model is None:
+            raise ValueError("intent_classifier_node requires runtime or (llm_client, llm_model)")
+        cfg = AppConfig.load_from_env()
+        _default_runtime = build_intent_classifier_runtime(cfg, llm_client, llm_model)
+    return _default_runtime
+
+
 def intent_classifier_node(
     state: Dict[str, Any],
     llm_client=None,
@@ -194,13 +262,24 @@ def intent_classifier_node(
     runtime: IntentClassifierRuntime | None = None,
 ) -> Dict[str, Any]:
     """意图分类入口。runtime 明确传入时优先使用，否则使用全局默认。"""
-    global _default_runtime
     if runtime is not None:
         return runtime(state)
+    return _resolve_default_runtime(llm_client, llm_model)(state)
 
-    if _default_runtime is None:
-        if llm_client is None or llm_model is None:
-            raise ValueError("intent_classifier_node requires runtime or (llm_client, llm_model)")
-        cfg = AppConfig.load_from_env()
-        _default_runtime = build_intent_classifier_runtime(cfg, llm_client, llm_model)
-    return _default_runtime(state)
+
+async def aintent_classifier_node(
+    state: Dict[str, Any],
+    llm_client=None,
+    llm_model: str | None = None,
+    runtime: IntentClassifierRuntime | None = None,
+    async_llm_client=None,
+) -> Dict[str, Any]:
+    """异步意图分类入口，供 IntentPipeline 在事件循环内调用。
+
+    async_llm_client 通常为 FailoverAsyncLLMClient，经 LLMEndpointManager.call_async 发起请求。
+    """
+    if runtime is None:
+        runtime = _resolve_default_runtime(llm_client, llm_model)
+    if async_llm_client is not None:
+        runtime.bind_async_llm_client(async_llm_client)
+    return await runtime.ainvoke(state)
@@ -6,6 +6,7 @@
 """
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict, Callable, Awaitable, Optional
 
@@ -156,7 +157,8 @@ class GeneralChatHandler(IntentHandler[GeneralChatSlots]):
                 answer = "".join(chunks).strip()
             else:
                 # 非流式路径：用于文本API或未启用流式的场景
-                response = self.llm_client.chat.completions.create(
+                response = await asyncio.to_thread(
+                    self.llm_client.chat.completions.create,
                     model=self.llm_model,
                     messages=messages_payload,
                     temperature=0.7,  # 对话可以稍微灵活一些
@@ -20,6 +20,7 @@ from emergency_agents.constants import RESCUE_DEMO_INCIDENT_ID
 from emergency_agents.external.amap_client import AmapClient
 from emergency_agents.external.orchestrator_client import OrchestratorClient
 from emergency_agents.graph.kg_service import KGService
+from emergency_agents.graph.progress import EventSink, ainvoke_with_progress
 from emergency_agents.graph.rescue_tactical_app import (
     AnalysisSummary,
     RescueTacticalGraph,
@@ -908,9 +909,12 @@ class RescueTaskGenerationHandler(IntentHandler[RescueTaskGenerationSlots]):
                     task_id=task_id,
                     thread_id=state.get("thread_id"),
                 )
-                simple_result = await self._simple_graph.ainvoke(
+                simple_result = await ainvoke_with_progress(
+                    self._simple_graph,
                     simple_state,
                     config={"configurable": {"thread_id": str(state.get("thread_id"))}},
+                    event_sink=cast(Optional[EventSink], state.get("event_sink")),
+                    graph_name="SimpleRescueGraph",
                 )
                 logger.info(
                     "simple_rescue_graph_invoke_complete",
@@ -970,6 +974,7 @@ class RescueTaskGenerationHandler(IntentHandler[RescueTaskGenerationSlots]):
         result = await graph.invoke(
             tactical_state,
             config={"durability": "sync"},
+            event_sink=cast(Optional[EventSink], state.get("event_sink")),
         )
         if result.get("status") == "error":
             error_text = result.get("error", "任务生成失败。")
@@ -1209,6 +1214,7 @@ class RescueSimulationHandler(IntentHandler[RescueTaskGenerationSlots]):
         result = await graph.invoke(
             tactical_state,
             config={"durability": "sync"},  # 长流程（救援任务生成），同步保存checkpoint确保高可靠性
+            event_sink=cast(Optional[EventSink], state.get("event_sink")),
         )
         response_text = result.get("response_text", "已生成模拟救援方案。")
         summary = cast(AnalysisSummary, result.get("analysis_summary") or AnalysisSummary())
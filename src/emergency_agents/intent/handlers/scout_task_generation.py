@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, cast
 
 import structlog
 from psycopg_pool import AsyncConnectionPool
@@ -16,6 +16,7 @@ from emergency_agents.db.dao import RescueTaskRepository
 from emergency_agents.external.amap_client import AmapClient
 from emergency_agents.external.device_directory import DeviceDirectory
 from emergency_agents.external.orchestrator_client import OrchestratorClient
+from emergency_agents.graph.progress import EventSink
 from emergency_agents.graph.scout_tactical_app import ScoutTacticalGraph, ScoutTacticalState
 from emergency_agents.intent.handlers.base import IntentHandler
 from emergency_agents.intent.schemas import ScoutTaskGenerationSlots
@@ -69,6 +70,7 @@ class ScoutTaskGenerationHandler(IntentHandler[ScoutTaskGenerationSlots]):
                     orchestrator_client=self.orchestrator_client,
                     task_repository=task_repository,
                     postgres_dsn=self.postgres_dsn,
+                    risk_cache_manager=self._risk_cache,
                 )
 
                 logger.info("scout_tactical_graph_lazy_init_complete")
@@ -115,6 +117,7 @@ class ScoutTaskGenerationHandler(IntentHandler[ScoutTaskGenerationSlots]):
         result = await graph.invoke(
             tactical_state,
             config={"durability": "sync"},  # 长流程（侦察任务生成），同步保存checkpoint确保高可靠性
+            event_sink=cast(Optional[EventSink], state.get("event_sink")),
         )
 
         plan = result.get("scout_plan", {})
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Sequence, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, cast
 from uuid import uuid4
 
 import structlog
@@ -17,6 +18,7 @@ from emergency_agents.external.orchestrator_client import (
     RescueScenarioLocation,
     ScoutScenarioPayload,
 )
+from emergency_agents.graph.progress import EventSink, emit_event
 from emergency_agents.intent.handlers.base import IntentHandler
 from emergency_agents.intent.schemas import ScoutTaskGenerationSlots
 from emergency_agents.llm.client import LLMClientProtocol
@@ -82,8 +84,14 @@ class SimpleScoutDispatchHandler(IntentHandler[ScoutTaskGenerationSlots]):
 
         logger.info("scout_coordinates_validated", lng=lng, lat=lat)
 
+        event_sink = cast(Optional[EventSink], state.get("event_sink"))
         devices = await self._fetch_selected_devices()
         logger.info("scout_devices_fetched", device_count=len(devices))
+        await emit_event(
+            event_sink,
+            "progress",
+            {"graph": "SimpleScoutDispatch", "node": "fetch_devices", "device_count": len(devices)},
+        )
 
         if not devices:
             message = "当前未筛选出可用的无人侦察设备，请指挥员协调具备侦察能力的装备。"
@@ -98,7 +106,8 @@ class SimpleScoutDispatchHandler(IntentHandler[ScoutTaskGenerationSlots]):
         target_description = getattr(slots, "objective_summary", "") or "侦察现场态势"
         logger.info("scout_llm_selection_start", device_count=len(devices), objective=target_description, lat=lat, lng=lng)
 
-        selection = self._choose_device_with_llm(
+        selection = await asyncio.to_thread(
+            self._choose_device_with_llm,
             devices=devices,
             objective=target_description,
             latitude=float(lat),
@@ -117,6 +126,12 @@ class SimpleScoutDispatchHandler(IntentHandler[ScoutTaskGenerationSlots]):
             dispatch_id=dispatch_id,
         )
 
+        await emit_event(
+            event_sink,
+            "progress",
+            {"graph": "SimpleScoutDispatch", "node": "select_device", "device_name": selected.name},
+        )
+
         await self._notify_backend(
             incident_id=incident_id,
             dispatch_id=dispatch_id,
@@ -127,6 +142,12 @@ class SimpleScoutDispatchHandler(IntentHandler[ScoutTaskGenerationSlots]):
             slots=slots,
         )
 
+        await emit_event(
+            event_sink,
+            "progress",
+            {"graph": "SimpleScoutDispatch", "node": "notify_backend", "dispatch_id": dispatch_id},
+        )
+
         reasons_text = "；".join(f"{idx}. {text}" for idx, text in enumerate(reasons, start=1))
         response_text = (
             f"已派遣 {selected.name} 执行无人侦察，任务编号 {dispatch_id}。原因：（{reasons_text}）。"
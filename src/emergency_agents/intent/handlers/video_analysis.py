@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from dataclasses import dataclass
 from typing import Any
 
+from emergency_agents.container import container
 from emergency_agents.intent.handlers.base import IntentHandler
 from emergency_agents.intent.schemas import VideoAnalysisSlots
-from emergency_agents.video.frame_capture import VideoFrameCapture
+from emergency_agents.video.frame_encoder import FrameEncoder
 from emergency_agents.vehicle.vision import VisionAnalyzer, DangerLevel
 from emergency_agents.video.stream_catalog import VideoStreamCatalog, VideoStreamEntry
+from emergency_agents.video.stream_pool import StreamUnavailableError, VideoStreamReaderPool
+from emergency_agents.video.vision_monitor import BatchVisionMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,54 @@ class VideoAnalysisHandler(IntentHandler[VideoAnalysisSlots]):
     vllm_url: str  # GLM-4V 视觉模型 API 地址
     vllm_api_key: str | None = None
     vllm_model: str = "glm-4.5-v"
+    frame_max_side: int = 1280  # 送入视觉模型前的最长边上限
+    jpeg_quality: int = 85
+
+    def _shared_analyzer(self) -> VisionAnalyzer:
+        """同一视觉模型端点复用一个分析器及其长连接池（连接池由容器在 shutdown 时关闭）。"""
+        headers = {"Authorization": f"Bearer {self.vllm_api_key}"} if self.vllm_api_key else None
+        key_digest = hashlib.sha256((self.vllm_api_key or "").encode("utf-8")).hexdigest()[:12]
+        return container.get_or_create(
+            f"vision_analyzer:{self.vllm_url}:{self.vllm_model}:{key_digest}",
+            lambda: VisionAnalyzer(
+                vllm_url=self.vllm_url,
+                model_name=self.vllm_model,
+                api_key=self.vllm_api_key,
+                timeout=30.0,
+                temperature=0.1,
+                enable_thinking=True,
+                http_client=container.async_http_client(timeout=30.0, headers=headers),
+            ),
+        )
+
+    def _shared_stream_pool(self) -> VideoStreamReaderPool:
+        """同一设备目录共享一个常驻读取池：热点设备保持解码，取帧不再重复建连（容器 shutdown 时关闭）。"""
+        return container.get_or_create(
+            f"video_stream_pool:{id(self.stream_catalog)}",
+            lambda: VideoStreamReaderPool(self.stream_catalog, open_timeout_seconds=10.0),
+            closer=lambda pool: pool.close(),
+        )
+
+    def _shared_frame_encoder(self) -> FrameEncoder:
+        """相同缩放/质量参数共享一个编码器（线程池与按设备的去重缓存），容器 shutdown 时关闭。"""
+        return container.get_or_create(
+            f"frame_encoder:{self.frame_max_side}:{self.jpeg_quality}",
+            lambda: FrameEncoder(max_side=self.frame_max_side, jpeg_quality=self.jpeg_quality),
+            closer=lambda encoder: encoder.close(),
+        )
+
+    def shared_monitor(self, *, batch_size: int = 4, max_concurrency: int = 2) -> BatchVisionMonitor:
+        """多路批量监控复用同一读取池、编码器与视觉分析器，变化检测状态与结果缓存在进程内共享。"""
+        return container.get_or_create(
+            f"vision_monitor:{id(self.stream_catalog)}:{self.vllm_url}:{self.vllm_model}",
+            lambda: BatchVisionMonitor(
+                self._shared_stream_pool(),
+                self._shared_analyzer(),
+                self._shared_frame_encoder(),
+                batch_size=batch_size,
+                max_concurrency=max_concurrency,
+            ),
+        )
 
     async def handle(self, slots: VideoAnalysisSlots, state: dict[str, object]) -> dict[str, object]:
         """视频分析意图处理 - 基于 GLM-4V 视觉大模型
@@ -39,7 +91,7 @@ class VideoAnalysisHandler(IntentHandler[VideoAnalysisSlots]):
 
         Reference:
             - video/vision.py: VisionAnalyzer 视觉分析器
-            - video/frame_capture.py: VideoFrameCapture 帧截取工具
+            - video/stream_pool.py: VideoStreamReaderPool 常驻视频流读取池
         """
         logger.info(
             "video_analysis_start",
@@ -132,51 +184,45 @@ class VideoAnalysisHandler(IntentHandler[VideoAnalysisSlots]):
                     "stream_url": stream_url,
                 },
             )
-            capturer = VideoFrameCapture(stream_url=stream_url, timeout=10.0, max_retries=2)
-            capture_result = capturer.capture_frame()
-
-            if not capture_result.success:
+            try:
+                latest = await self._shared_stream_pool().get_latest_frame(device_entry.device_id)
+            except StreamUnavailableError as exc:
                 logger.error(
                     "video_frame_capture_failed",
                     extra={
                         "device_id": device_entry.device_id,
-                        "error": capture_result.error_message,
+                        "error": str(exc),
                     },
                 )
                 return {
                     "response_text": (
                         f"无法从设备 {device_entry.display_name or device_entry.device_id} 获取视频画面："
-                        f"{capture_result.error_message}"
+                        f"{exc}"
                     ),
                     "video_analysis": {
                         "status": "capture_failed",
-                        "error": capture_result.error_message,
+                        "error": str(exc),
                     },
                 }
+            # 缩放 + JPEG 编码在线程池中完成；画面未变化时复用上次编码结果
+            encoded = await self._shared_frame_encoder().aencode(latest.frame, cache_key=device_entry.device_id)
 
             # 4. 调用 GLM-4V 视觉分析
             logger.info(
                 "video_analysis_inference_start",
                 extra={
                     "device_id": device_entry.device_id,
-                    "image_size": capture_result.image_size,
+                    "image_size": encoded.image_size,
+                    "source_size": encoded.source_size,
+                    "jpeg_bytes": encoded.jpeg_bytes,
+                    "encode_reused": encoded.reused,
+                    "frame_age_ms": int(latest.age_ms),
                 },
             )
-            analyzer = VisionAnalyzer(
-                vllm_url=self.vllm_url,
-                model_name=self.vllm_model,
-                api_key=self.vllm_api_key,
-                timeout=30.0,
-                temperature=0.1,
-                enable_thinking=True,
+            analysis_result = await self._shared_analyzer().analyze_drone_image(
+                image_base64=encoded.image_base64
             )
 
-            analysis_result = await analyzer.analyze_drone_image(
-                image_base64=capture_result.image_base64
-            )
-
-            await analyzer.close()
-
             # 5. 生成自然语言描述（对话式回复）
             response_text = self._format_analysis_response(
                 device_name=device_entry.display_name or device_entry.device_id,
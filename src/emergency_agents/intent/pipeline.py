@@ -6,8 +6,8 @@ import time
 from typing import Any, Dict, Literal, Optional
 
 from emergency_agents.container import container
-from emergency_agents.intent.classifier import intent_classifier_node
-from emergency_agents.intent.validator import validate_and_prompt_node
+from emergency_agents.intent.classifier import aintent_classifier_node
+from emergency_agents.intent.validator import avalidate_and_prompt_node
 
 logger = logging.getLogger(__name__)
 
@@ -36,18 +36,20 @@ class IntentPipeline:
         }
 
         # 1. Classify
-        # 注意：这里我们直接复用旧的 node 函数，但传入 container 的 llm
-        # 未来可以将 classifier_node 也重构为 LLMAgentNode
-        state = intent_classifier_node(
-            state, 
-            llm_client=container.llm_client, 
-            llm_model=container.config.llm_model
+        # 使用异步节点：LLM 请求经 FailoverAsyncLLMClient（LLMEndpointManager.call_async）发出，
+        # SetFit/Rasa 走 httpx.AsyncClient，避免阻塞事件循环（语音 websocket 等共享同一 loop）
+        async_llm_client = container.async_llm_client
+        state = await aintent_classifier_node(
+            state,
+            llm_client=container.llm_client,
+            llm_model=container.config.llm_model,
+            async_llm_client=async_llm_client,
         )
-        
+
         # 2. Validate
-        state = validate_and_prompt_node(
+        state = await avalidate_and_prompt_node(
             state,
-            llm_client=container.llm_client,
+            llm_client=async_llm_client or container.llm_client,
             llm_model=container.config.llm_model,
         )
 
@@ -5,6 +5,7 @@ from emergency_agents.intent.providers.factory import build_providers
 from emergency_agents.intent.providers.http import HttpIntentProvider
 from emergency_agents.intent.providers.llm import LLMIntentProvider
 from emergency_agents.intent.providers.rasa import RasaIntentProvider
+from emergency_agents.intent.providers.rules import FastPathIntentProvider, RuleIntentProvider
 from emergency_agents.intent.providers.setfit import SetFitIntentProvider
 from emergency_agents.intent.providers.types import IntentCandidate, IntentPrediction
 
@@ -14,6 +15,8 @@ __all__ = [
     "HttpIntentProvider",
     "LLMIntentProvider",
     "RasaIntentProvider",
+    "RuleIntentProvider",
+    "FastPathIntentProvider",
     "SetFitIntentProvider",
     "IntentCandidate",
     "IntentPrediction",
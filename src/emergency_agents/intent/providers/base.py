@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
@@ -27,3 +28,7 @@ class IntentProvider(ABC):
     @abstractmethod
     def predict(self, text: str) -> IntentPrediction:
         """执行意图识别。"""
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        """异步意图识别；默认放到线程池执行同步实现，避免阻塞事件循环。"""
+        return await asyncio.to_thread(self.predict, text)
@@ -6,6 +6,7 @@ from emergency_agents.config import AppConfig
 from emergency_agents.intent.providers.base import IntentProvider, IntentThresholds
 from emergency_agents.intent.providers.llm import LLMIntentProvider
 from emergency_agents.intent.providers.rasa import RasaIntentProvider
+from emergency_agents.intent.providers.rules import FastPathIntentProvider
 from emergency_agents.intent.providers.setfit import SetFitIntentProvider
 
 logger = structlog.get_logger(__name__)
@@ -15,6 +16,7 @@ def build_providers(
     cfg: AppConfig,
     llm_client,
     llm_model: str,
+    async_llm_client=None,
 ) -> tuple[IntentProvider, IntentProvider, IntentThresholds]:
     """根据配置构建主提供者、兜底提供者及阈值。"""
     thresholds = IntentThresholds(
@@ -22,7 +24,7 @@ def build_providers(
         margin=max(cfg.intent_margin_threshold, 0.0),
     )
 
-    fallback = LLMIntentProvider(llm_client=llm_client, model=llm_model)
+    fallback = LLMIntentProvider(llm_client=llm_client, model=llm_model, async_llm_client=async_llm_client)
 
     provider_key = (cfg.intent_provider or "llm").strip().lower()
     logger.info("intent_provider_selected", provider=provider_key)
@@ -41,6 +43,11 @@ def build_providers(
         logger.warning("unknown_intent_provider", provider=provider_key)
         primary = fallback
 
+    if cfg.intent_fast_path_enabled:
+        # 规则快速通道置于主提供者之前；兜底提供者保持为纯 LLM
+        primary = FastPathIntentProvider(primary, min_confidence=cfg.intent_fast_path_min_confidence)
+        logger.info("intent_fast_path_enabled", min_confidence=cfg.intent_fast_path_min_confidence)
+
     return primary, fallback, thresholds
 
 
@@ -16,7 +16,10 @@ class HttpIntentProvider(IntentProvider):
         sanitized = base_url.rstrip("/")
         if not sanitized:
             raise ValueError("HTTP意图服务的base_url不能为空")
+        self._base_url = sanitized
+        self._timeout = timeout
         self._client: httpx.Client = httpx.Client(base_url=sanitized, timeout=timeout)
+        self._async_client: httpx.AsyncClient | None = None
         self._lock = Lock()
         self._closed = False
         atexit.register(self.close)
@@ -25,6 +28,13 @@ class HttpIntentProvider(IntentProvider):
     def client(self) -> httpx.Client:
         return self._client
 
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """惰性创建异步客户端，需在事件循环内首次访问。"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout)
+        return self._async_client
+
     def close(self) -> None:
         """释放HTTP连接资源。"""
         with self._lock:
@@ -33,6 +43,14 @@ class HttpIntentProvider(IntentProvider):
             self._client.close()
             self._closed = True
 
+    async def aclose(self) -> None:
+        """释放异步HTTP连接资源。"""
+        client = self._async_client
+        self._async_client = None
+        if client is not None:
+            await client.aclose()
+        self.close()
+
     def __del__(self) -> None:
         try:
             self.close()
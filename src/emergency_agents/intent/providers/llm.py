@@ -237,6 +237,19 @@ def _parse_prediction(raw_text: str) -> IntentPrediction:
     return prediction
 
 
+def _to_langchain_messages(messages: list[dict[str, str]]) -> list[Any]:
+    """将OpenAI风格消息转换为LangChain消息。"""
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    lc_messages: list[Any] = []
+    for m in messages:
+        if m["role"] == "system":
+            lc_messages.append(SystemMessage(content=m["content"]))
+        else:
+            lc_messages.append(HumanMessage(content=m["content"]))
+    return lc_messages
+
+
 class LLMIntentProvider(IntentProvider):
     """利用LLM直接完成意图识别。"""
 
@@ -245,12 +258,22 @@ class LLMIntentProvider(IntentProvider):
         llm_client: LLMClientProtocol,
         model: str,
         system_prompt: str | None = None,
+        async_llm_client: Any | None = None,
     ) -> None:
         super().__init__("llm")
         self._llm_client = llm_client
+        self._async_llm_client = async_llm_client
         self._model = model
         self._system_prompt = system_prompt or _DEFAULT_SYSTEM_PROMPT
 
+    @property
+    def async_llm_client(self) -> Any | None:
+        return self._async_llm_client
+
+    def use_async_client(self, async_llm_client: Any) -> None:
+        """绑定异步LLM客户端（FailoverAsyncLLMClient），供 apredict 使用。"""
+        self._async_llm_client = async_llm_client
+
     def _build_messages(self, text: str) -> list[dict[str, str]]:
         """构造聊天消息。"""
         return [
@@ -277,31 +300,56 @@ class LLMIntentProvider(IntentProvider):
                 messages=messages,
                 temperature=0.0,
             )
-            content = getattr(response.choices[0].message, "content", "")
-            finish_reason = getattr(response.choices[0], "finish_reason", None)
-            response_id = getattr(response, "id", None)
-            usage = getattr(response, "usage", None)
-            usage_dict = getattr(usage, "model_dump", lambda: usage)() if usage else {}
-        else:
-            # Assume LangChain ChatOpenAI / Runnable
-            from langchain_core.messages import HumanMessage, SystemMessage
-            
-            lc_messages = []
-            for m in messages:
-                if m["role"] == "system":
-                    lc_messages.append(SystemMessage(content=m["content"]))
-                elif m["role"] == "user":
-                    lc_messages.append(HumanMessage(content=m["content"]))
-                else:
-                    lc_messages.append(HumanMessage(content=m["content"]))
-            
-            response = self._llm_client.invoke(lc_messages)
-            content = str(response.content)
-            response_id = getattr(response, "id", None)
-            response_metadata = getattr(response, "response_metadata", {})
-            finish_reason = response_metadata.get("finish_reason")
-            usage_dict = response_metadata.get("token_usage", {})
+            return self._parse_completion(response)
+
+        # Assume LangChain ChatOpenAI / Runnable
+        response = self._llm_client.invoke(_to_langchain_messages(messages))
+        return self._parse_langchain(response)
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        """异步意图识别：优先走 FailoverAsyncLLMClient，其次 LangChain ainvoke，最后退回线程池。"""
+        if not text or not text.strip():
+            raise ValueError("意图识别文本为空")
+
+        messages = self._build_messages(text)
+        logger.info(
+            "llm_intent_request",
+            model=self._model,
+            message_preview=text[:80],
+            mode="async",
+        )
+
+        if self._async_llm_client is not None:
+            response = await self._async_llm_client.chat.completions.create(
+                model=self._model,
+                messages=messages,
+                temperature=0.0,
+            )
+            return self._parse_completion(response)
+        if hasattr(self._llm_client, "ainvoke"):
+            response = await self._llm_client.ainvoke(_to_langchain_messages(messages))
+            return self._parse_langchain(response)
+        return await super().apredict(text)
+
+    def _parse_completion(self, response: Any) -> IntentPrediction:
+        """解析OpenAI兼容的 chat.completions 响应。"""
+        content = getattr(response.choices[0].message, "content", "")
+        finish_reason = getattr(response.choices[0], "finish_reason", None)
+        response_id = getattr(response, "id", None)
+        usage = getattr(response, "usage", None)
+        usage_dict = getattr(usage, "model_dump", lambda: usage)() if usage else {}
+        return self._finalize(content, response_id, finish_reason, usage_dict)
+
+    def _parse_langchain(self, response: Any) -> IntentPrediction:
+        """解析 LangChain 消息响应。"""
+        content = str(response.content)
+        response_id = getattr(response, "id", None)
+        response_metadata = getattr(response, "response_metadata", {})
+        finish_reason = response_metadata.get("finish_reason")
+        usage_dict = response_metadata.get("token_usage", {})
+        return self._finalize(content, response_id, finish_reason, usage_dict)
 
+    def _finalize(self, content: str, response_id: Any, finish_reason: Any, usage_dict: Any) -> IntentPrediction:
         logger.info(
             "llm_intent_response",
             model=self._model,
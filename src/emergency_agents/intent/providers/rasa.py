@@ -26,6 +26,15 @@ class RasaIntentProvider(HttpIntentProvider):
             raise ValueError("Rasa返回结构异常")
         return data
 
+    async def _arequest(self, text: str) -> Dict[str, Any]:
+        """异步向Rasa发送解析请求。"""
+        response = await self.async_client.post("/model/parse", json={"text": text})
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, dict):
+            raise ValueError("Rasa返回结构异常")
+        return data
+
     @staticmethod
     def _build_slots(entities: Any) -> Dict[str, Any]:
         """根据实体列表提取槽位字典。"""
@@ -65,8 +74,16 @@ class RasaIntentProvider(HttpIntentProvider):
         """执行Rasa意图识别并规范化输出。"""
         if not text or not text.strip():
             raise ValueError("意图识别文本为空")
+        return self._to_prediction(self._request(text))
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        """异步执行Rasa意图识别。"""
+        if not text or not text.strip():
+            raise ValueError("意图识别文本为空")
+        return self._to_prediction(await self._arequest(text))
 
-        data = self._request(text)
+    def _to_prediction(self, data: Dict[str, Any]) -> IntentPrediction:
+        """将Rasa响应规范化为统一结构。"""
         intent_block = data.get("intent") if isinstance(data.get("intent"), dict) else {}
         intent_name = str(intent_block.get("name") or "unknown").strip() or "unknown"
         confidence = float(intent_block.get("confidence") or 0.0)
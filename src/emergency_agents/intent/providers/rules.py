@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Pattern, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from emergency_agents.intent.providers.base import IntentProvider
+from emergency_agents.intent.providers.types import IntentPrediction
+
+logger = structlog.get_logger(__name__)
+
+_FAST_PATH_COUNTER = Counter(
+    "intent_fast_path_total",
+    "意图快速通道命中情况",
+    ["result", "intent"],  # result: hit / below_threshold / miss
+)
+
+_PUNCT = "。！？!?，,、.~～ "
+
+# 问候 / 测试 / 自我介绍：整句匹配，避免“你好，A楼有人被困”之类被误判
+_GREETING_RE = re.compile(
+    r"^(?:喂+|你好|您好|哈喽|hello|hi|在吗|在不在|早上好|下午好|晚上好|测试(?:一下)?|试试看?"
+    r"|能(?:否)?听(?:见|到)(?:我)?(?:说话)?吗?|听得(?:见|到)吗|你是谁|你叫什么(?:名字)?"
+    r"|你是什么(?:大)?模型|你能做什么|你会什么)[" + _PUNCT + r"]*$",
+    re.IGNORECASE,
+)
+_CARRIED_DEVICES_RE = re.compile(
+    r"^(?:请|帮我)?(?:查看|查询|显示|列出|看看|看一下)?(?:一下)?(?:所有|全部)?的?(?:携带|车载)的?(?:设备|装备)(?:列表|清单)?[" + _PUNCT + r"]*$"
+)
+_ROBOTDOG_RE = re.compile(r"(?:机器狗|机械狗|robot\s*dog|robotdog)", re.IGNORECASE)
+_ROBOTDOG_ACTIONS: Tuple[Tuple[str, str], ...] = (
+    ("急停", "forceStop"),
+    ("停止", "stop"),
+    ("停下", "stop"),
+    ("前进", "forward"),
+    ("向前", "forward"),
+    ("往前", "forward"),
+    ("后退", "back"),
+    ("向后", "back"),
+    ("往后", "back"),
+    ("左转", "turnLeft"),
+    ("右转", "turnRight"),
+    ("起立", "up"),
+    ("站立", "up"),
+    ("站起", "up"),
+    ("趴下", "down"),
+    ("坐下", "down"),
+)
+# 动作词之前出现否定/迟疑（不要、别、能不能、是否、停止…）时不下发实体设备指令，交给 LLM 判断
+_NEGATION_RE = re.compile(r"[不别勿没莫]|禁止|停止|暂停|取消|是否")
+_QUESTION_SUFFIX_RE = re.compile(r"[吗么嘛][" + _PUNCT + r"]*$")
+_DISTANCE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:米|m\b)", re.IGNORECASE)
+_COORDINATE_RE = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*[,，]\s*(\d{1,3}(?:\.\d+)?)")
+_SCOUT_RE = re.compile(r"侦察|侦查|巡视|巡查|监控|查看")
+# 涉及救援派遣的表述需要 LLM 抽取态势摘要，不走快速通道
+_RESCUE_HINT_RE = re.compile(r"救援|被困|伤亡|倒塌|派遣|转运")
+_MAX_COMMAND_LENGTH = 40
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """一条快速通道规则：matcher 命中时返回槽位，否则返回 None。"""
+
+    name: str
+    intent: str
+    confidence: float
+    matcher: Callable[[str], Optional[Dict[str, Any]]]
+
+
+def _match_pattern(pattern: Pattern[str], slots: Dict[str, Any]) -> Callable[[str], Optional[Dict[str, Any]]]:
+    def _matcher(text: str) -> Optional[Dict[str, Any]]:
+        return dict(slots) if pattern.match(text) else None
+
+    return _matcher
+
+
+def _match_robotdog(text: str) -> Optional[Dict[str, Any]]:
+    if len(text) > _MAX_COMMAND_LENGTH or not _ROBOTDOG_RE.search(text):
+        return None
+    matches = [(text.index(keyword), action) for keyword, action in _ROBOTDOG_ACTIONS if keyword in text]
+    actions = {action for _, action in matches}
+    if len(actions) != 1:
+        return None  # 无动作或多个动作交给 LLM 处理
+    verb_at = min(position for position, _ in matches)
+    if _NEGATION_RE.search(text[:verb_at]) or _QUESTION_SUFFIX_RE.search(text):
+        return None  # “不要前进”“别后退”“能不能前进”等不是执行指令
+    slots: Dict[str, Any] = {"action": actions.pop()}
+    distance = _DISTANCE_RE.search(text)
+    if distance:
+        slots["distance_m"] = float(distance.group(1))
+    return slots
+
+
+def _parse_coordinates(text: str) -> Optional[Dict[str, float]]:
+    match = _COORDINATE_RE.search(text)
+    if not match:
+        return None
+    first, second = float(match.group(1)), float(match.group(2))
+    # 默认 (lng, lat)；若第一个值只可能是纬度则交换
+    if abs(first) <= 90 < abs(second) <= 180:
+        first, second = second, first
+    if not (abs(first) <= 180 and abs(second) <= 90):
+        return None
+    return {"lng": first, "lat": second}
+
+
+def _match_scout_with_coordinates(text: str) -> Optional[Dict[str, Any]]:
+    if len(text) > _MAX_COMMAND_LENGTH or not _SCOUT_RE.search(text) or _RESCUE_HINT_RE.search(text):
+        return None
+    coordinates = _parse_coordinates(text)
+    if coordinates is None:
+        return None
+    summary = _COORDINATE_RE.sub("", text).strip(_PUNCT + "()（）") or "侦察现场态势"
+    return {"coordinates": coordinates, "objective_summary": summary}
+
+
+DEFAULT_RULES: Tuple[IntentRule, ...] = (
+    IntentRule("greeting", "general-chat", 0.97, _match_pattern(_GREETING_RE, {})),
+    IntentRule(
+        "carried_devices",
+        "system-data-query",
+        0.95,
+        _match_pattern(_CARRIED_DEVICES_RE, {"query_type": "carried_devices", "query_params": {}}),
+    ),
+    IntentRule("robotdog_move", "device_control_robotdog", 0.92, _match_robotdog),
+    IntentRule("scout_coordinates", "scout-task-simple", 0.9, _match_scout_with_coordinates),
+)
+
+
+class RuleIntentProvider(IntentProvider):
+    """基于编译正则/关键词的确定性意图识别，未命中时 intent 为 unknown。"""
+
+    def __init__(self, rules: Tuple[IntentRule, ...] = DEFAULT_RULES) -> None:
+        super().__init__("rules")
+        self._rules = rules
+
+    def predict(self, text: str) -> IntentPrediction:
+        normalized = (text or "").strip()
+        for rule in self._rules:
+            slots = rule.matcher(normalized)
+            if slots is None:
+                continue
+            return {
+                "intent": rule.intent,
+                "confidence": rule.confidence,
+                "margin": rule.confidence,
+                "slots": slots,
+                "need_confirm": False,
+                "source": "rules",
+                "ranking": [{"intent": rule.intent, "confidence": rule.confidence}],
+                "raw": {"rule": rule.name},
+            }
+        return {
+            "intent": "unknown",
+            "confidence": 0.0,
+            "margin": 0.0,
+            "slots": {},
+            "need_confirm": True,
+            "source": "rules",
+            "ranking": [],
+            "raw": {},
+        }
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        return self.predict(text)
+
+
+class FastPathIntentProvider(IntentProvider):
+    """快速通道：规则置信度达到阈值时直接返回，否则委托给下游提供者（LLM/SetFit/Rasa）。"""
+
+    def __init__(
+        self,
+        delegate: IntentProvider,
+        *,
+        rules: RuleIntentProvider | None = None,
+        min_confidence: float = 0.85,
+    ) -> None:
+        super().__init__(delegate.source)
+        self._delegate = delegate
+        self._rules = rules or RuleIntentProvider()
+        self._min_confidence = min_confidence
+
+    @property
+    def delegate(self) -> IntentProvider:
+        return self._delegate
+
+    def _try_rules(self, text: str) -> Optional[IntentPrediction]:
+        prediction = self._rules.predict(text)
+        intent = prediction.get("intent", "unknown")
+        if intent == "unknown":
+            _FAST_PATH_COUNTER.labels(result="miss", intent="none").inc()
+            return None
+        if float(prediction.get("confidence", 0.0)) < self._min_confidence:
+            _FAST_PATH_COUNTER.labels(result="below_threshold", intent=intent).inc()
+            return None
+        _FAST_PATH_COUNTER.labels(result="hit", intent=intent).inc()
+        logger.info(
+            "intent_fast_path_hit",
+            intent=intent,
+            rule=(prediction.get("raw") or {}).get("rule"),
+            text_preview=text[:40],
+        )
+        return prediction
+
+    def predict(self, text: str) -> IntentPrediction:
+        hit = self._try_rules(text)
+        if hit is not None:
+            return hit
+        return self._delegate.predict(text)
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        hit = self._try_rules(text)
+        if hit is not None:
+            return hit
+        return await self._delegate.apredict(text)
+
+
+__all__ = ["IntentRule", "DEFAULT_RULES", "RuleIntentProvider", "FastPathIntentProvider"]
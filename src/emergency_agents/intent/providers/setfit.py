@@ -25,6 +25,15 @@ class SetFitIntentProvider(HttpIntentProvider):
             raise ValueError("SetFit返回结构异常")
         return data
 
+    async def _arequest(self, text: str) -> Dict[str, Any]:
+        """异步发送预测请求。"""
+        response = await self.async_client.post("/predict", json={"text": text})
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, dict):
+            raise ValueError("SetFit返回结构异常")
+        return data
+
     @staticmethod
     def _normalize_ranking(raw: Any) -> List[Dict[str, Any]]:
         """整理概率分布信息。"""
@@ -49,8 +58,16 @@ class SetFitIntentProvider(HttpIntentProvider):
         """执行SetFit预测并转换为统一结构。"""
         if not text or not text.strip():
             raise ValueError("意图识别文本为空")
+        return self._to_prediction(self._request(text))
+
+    async def apredict(self, text: str) -> IntentPrediction:
+        """异步执行SetFit预测。"""
+        if not text or not text.strip():
+            raise ValueError("意图识别文本为空")
+        return self._to_prediction(await self._arequest(text))
 
-        data = self._request(text)
+    def _to_prediction(self, data: Dict[str, Any]) -> IntentPrediction:
+        """将SetFit响应转换为统一结构。"""
         intent_name = str(data.get("intent") or "unknown").strip() or "unknown"
         confidence = float(data.get("proba") or data.get("confidence") or 0.0)
         margin = float(data.get("margin") or 0.0)
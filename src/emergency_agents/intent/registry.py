@@ -65,6 +65,8 @@ class IntentHandlerRegistry:
         vllm_url: str,  # GLM-4V 视觉模型 API 地址
         vllm_api_key: str | None,
         vllm_model: str,
+        video_frame_max_side: int = 1280,
+        video_frame_jpeg_quality: int = 85,
         simple_rescue_graph: Any | None = None,
         llm_async_client: Any | None = None,
     ) -> "IntentHandlerRegistry":
@@ -135,7 +137,14 @@ class IntentHandlerRegistry:
             "device-control": DeviceControlHandler(device_dao, adapter_client, default_robotdog_id),
             "device-control-robotdog": robotdog_control,
             "device_control_robotdog": robotdog_control,
-            "video-analysis": VideoAnalysisHandler(stream_catalog, vllm_url, vllm_api_key, vllm_model),
+            "video-analysis": VideoAnalysisHandler(
+                stream_catalog,
+                vllm_url,
+                vllm_api_key,
+                vllm_model,
+                frame_max_side=video_frame_max_side,
+                jpeg_quality=video_frame_jpeg_quality,
+            ),
             "rescue-task-generate": rescue_dispatch_handler,
             "rescue_task_generate": rescue_dispatch_handler,
             "scout-task-simple": simple_scout_handler,
@@ -156,10 +165,11 @@ class IntentHandlerRegistry:
         return self.handlers.get(intent_type)
 
     def attach_risk_cache(self, risk_cache: RiskCacheManager | None) -> None:
-        """为救援/模拟处理器挂载共享风险缓存。"""
+        """为救援/模拟、侦察等支持的处理器挂载共享风险缓存。"""
         for handler in self.handlers.values():
-            if isinstance(handler, RescueTaskGenerationHandler):
-                handler.attach_risk_cache(risk_cache)
+            attach_fn = getattr(handler, "attach_risk_cache", None)
+            if callable(attach_fn):
+                attach_fn(risk_cache)
 
     def attach_rescue_draft_service(self, draft_service: RescueDraftService | None) -> None:
         """为救援处理器挂载草稿服务。"""
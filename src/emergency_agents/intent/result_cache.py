@@ -0,0 +1,337 @@
+"""意图识别结果缓存。
+
+指挥员在不同会话中经常重复近似指令（“派无人机侦察XX”、设备状态查询等），
+一次 LLM 分类耗时数秒，因此在分类器前增加按规范化文本命中的结果缓存：
+
+- 一级：进程内 LRU + TTL；可选二级：RedisClient（跨 worker 共享）
+- 可选语义匹配：对规范化文本做嵌入，余弦相似度超过阈值视为命中（仅进程内）
+- 含位置信息的意图/槽位一律不缓存，避免坐标、地点跨事件泄漏
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import structlog
+from prometheus_client import Counter
+
+if TYPE_CHECKING:
+    from emergency_agents.config import AppConfig
+
+logger = structlog.get_logger(__name__)
+
+_INTENT_CACHE_REQUESTS = Counter(
+    "intent_cache_requests_total",
+    "意图结果缓存查询次数",
+    ["namespace", "result"],  # result: hit / similar_hit / redis_hit / miss
+)
+_INTENT_CACHE_SKIPPED = Counter(
+    "intent_cache_store_skipped_total",
+    "意图结果未写入缓存的次数",
+    ["namespace", "reason"],
+)
+
+# 槽位天然携带位置信息的意图，默认不参与缓存
+LOCATION_SENSITIVE_INTENTS: FrozenSet[str] = frozenset(
+    {
+        "rescue_task_generate",
+        "rescue_task_generation",
+        "rescue_simulation",
+        "scout_task_simple",
+        "scout_task_generate",
+        "hazard_report",
+        "trapped_report",
+        "geo_annotate",
+        "annotation_sign",
+        "route_safe_point_query",
+        "location_positioning",
+        "ui_camera_flyto",
+        "recon_minimal",
+        "event_update",
+    }
+)
+_LOCATION_SLOT_KEYS: FrozenSet[str] = frozenset(
+    {
+        "coordinates",
+        "lat",
+        "lng",
+        "lon",
+        "latitude",
+        "longitude",
+        "location",
+        "location_name",
+        "location_text",
+        "locationName",
+        "address",
+    }
+)
+_PUNCT_RE = re.compile(r"[\s　。，、！？；：,.!?;:\"'“”‘’（）()【】\[\]…~～-]+")
+
+
+def normalize_utterance(text: str) -> str:
+    """规范化指令文本：全半角统一、小写、去标点空白。"""
+    folded = unicodedata.normalize("NFKC", text or "").lower()
+    return _PUNCT_RE.sub("", folded)
+
+
+def _canonical_intent(intent: str) -> str:
+    return (intent or "").strip().lower().replace("-", "_").replace(" ", "_")
+
+
+def _cosine(left: Sequence[float], right: Sequence[float]) -> float:
+    dot = sum(a * b for a, b in zip(left, right))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class _Entry:
+    payload: Dict[str, Any]
+    expires_at: float
+    vector: Optional[List[float]] = None
+
+
+class IntentResultCache:
+    """意图结果缓存（进程内 LRU+TTL，可选 Redis 与语义相似匹配）。"""
+
+    def __init__(
+        self,
+        *,
+        namespace: str = "intent",
+        ttl_seconds: int = 600,
+        max_entries: int = 1024,
+        min_confidence: float = 0.8,
+        opt_out_intents: Iterable[str] = LOCATION_SENSITIVE_INTENTS,
+        redis: Optional[Any] = None,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.0,
+    ) -> None:
+        self._namespace = namespace
+        self._ttl = max(1, int(ttl_seconds))
+        self._max_entries = max(1, max_entries)
+        self._min_confidence = min_confidence
+        self._opt_out = frozenset(_canonical_intent(item) for item in opt_out_intents)
+        self._redis = redis
+        self._embedder = embedder if similarity_threshold > 0 else None
+        self._similarity_threshold = similarity_threshold
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def uses_io(self) -> bool:
+        """是否会产生网络 IO（Redis/嵌入），异步调用方据此决定是否切线程。"""
+        return self._redis is not None or self._embedder is not None
+
+    def _key(self, normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+    def _redis_prefix(self) -> str:
+        return f"emergency:intent_cache:{self._namespace}:"
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """按规范化文本查询；命中返回结果副本。"""
+        normalized = normalize_utterance(text)
+        if not normalized:
+            return None
+        key = self._key(normalized)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._entries.pop(key, None)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                payload = copy.deepcopy(entry.payload)
+        if entry is not None:
+            self._record("hit")
+            return payload
+
+        if self._redis is not None:
+            remote = self._redis.get(key, prefix=self._redis_prefix())
+            if isinstance(remote, dict):
+                self._store_local(key, remote, self._ttl, None)
+                self._record("redis_hit")
+                return copy.deepcopy(remote)
+
+        if self._embedder is not None:
+            similar = self._similar(normalized, now)
+            if similar is not None:
+                self._record("similar_hit")
+                return similar
+
+        self._record("miss")
+        return None
+
+    def put(self, text: str, prediction: Dict[str, Any]) -> bool:
+        """写入分类结果（IntentPrediction 结构），返回是否实际缓存。"""
+        if prediction.get("source") == "rules":
+            return self._skip("fast_path")
+        return self.store(
+            text,
+            prediction,
+            intent=str(prediction.get("intent") or "unknown"),
+            confidence=float(prediction.get("confidence", 0.0) or 0.0),
+            slots=prediction.get("slots") if isinstance(prediction.get("slots"), dict) else {},
+            need_confirm=bool(prediction.get("need_confirm", False)),
+        )
+
+    def store(
+        self,
+        text: str,
+        payload: Dict[str, Any],
+        *,
+        intent: str,
+        confidence: float,
+        slots: Dict[str, Any],
+        need_confirm: bool = False,
+    ) -> bool:
+        """按显式的意图/置信度/槽位判定可缓存性后写入任意结果结构。"""
+        normalized = normalize_utterance(text)
+        canonical = _canonical_intent(intent)
+        if not normalized:
+            return self._skip("empty")
+        if canonical in {"", "unknown"}:
+            return self._skip("unknown")
+        if canonical in self._opt_out:
+            return self._skip("opt_out")
+        if any(slots.get(key) for key in _LOCATION_SLOT_KEYS):
+            return self._skip("location_slot")
+        if need_confirm or confidence < self._min_confidence:
+            return self._skip("low_confidence")
+
+        key = self._key(normalized)
+        vector: Optional[List[float]] = None
+        if self._embedder is not None:
+            try:
+                vector = [float(value) for value in self._embedder(normalized)]
+            except Exception as exc:  # noqa: BLE001 - 嵌入失败仅影响语义匹配
+                logger.warning("intent_cache_embed_failed", error=str(exc))
+        snapshot = copy.deepcopy(payload)
+        self._store_local(key, snapshot, self._ttl, vector)
+        if self._redis is not None:
+            self._redis.set(key, snapshot, ttl=self._ttl, prefix=self._redis_prefix())
+        return True
+
+    async def aget(self, text: str) -> Optional[Dict[str, Any]]:
+        if not self.uses_io:
+            return self.get(text)
+        return await asyncio.to_thread(self.get, text)
+
+    async def aput(self, text: str, prediction: Dict[str, Any]) -> bool:
+        if not self.uses_io:
+            return self.put(text, prediction)
+        return await asyncio.to_thread(self.put, text, prediction)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _similar(self, normalized: str, now: float) -> Optional[Dict[str, Any]]:
+        assert self._embedder is not None
+        with self._lock:
+            candidates = [
+                (entry.vector, entry.payload)
+                for entry in self._entries.values()
+                if entry.vector is not None and entry.expires_at > now
+            ]
+        if not candidates:
+            return None
+        try:
+            query = [float(value) for value in self._embedder(normalized)]
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("intent_cache_embed_failed", error=str(exc))
+            return None
+        best_score, best_payload = max(
+            ((_cosine(query, vector), payload) for vector, payload in candidates),
+            key=lambda item: item[0],
+        )
+        if best_score < self._similarity_threshold:
+            return None
+        logger.info("intent_cache_similar_hit", score=round(best_score, 4))
+        return copy.deepcopy(best_payload)
+
+    def _store_local(self, key: str, payload: Dict[str, Any], ttl: int, vector: Optional[List[float]]) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(payload=payload, expires_at=time.time() + ttl, vector=vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, result: str) -> None:
+        _INTENT_CACHE_REQUESTS.labels(namespace=self._namespace, result=result).inc()
+
+    def _skip(self, reason: str) -> bool:
+        _INTENT_CACHE_SKIPPED.labels(namespace=self._namespace, reason=reason).inc()
+        return False
+
+
+def _build_embedder(cfg: "AppConfig") -> Callable[[str], Sequence[float]]:
+    """基于 OpenAI 兼容嵌入接口构造同步嵌入函数，复用共享嵌入缓存。"""
+    import httpx
+    from openai import OpenAI
+
+    from emergency_agents.cache.embedding_cache import get_embedding_cache
+
+    client = OpenAI(
+        base_url=cfg.openai_base_url,
+        api_key=cfg.openai_api_key,
+        http_client=httpx.Client(trust_env=False, timeout=httpx.Timeout(10.0, connect=5.0)),
+    )
+    embedding_cache = get_embedding_cache()
+
+    def _embed(text: str) -> Sequence[float]:
+        cached = embedding_cache.get(cfg.embedding_model, text, subsystem="intent")
+        if cached is not None:
+            return cached
+        response = client.embeddings.create(model=cfg.embedding_model, input=text)
+        vector = list(response.data[0].embedding)
+        embedding_cache.set(cfg.embedding_model, text, vector)
+        return vector
+
+    return _embed
+
+
+def build_intent_result_cache(cfg: "AppConfig", *, namespace: str = "intent") -> Optional[IntentResultCache]:
+    """根据配置构建意图结果缓存，未启用时返回 None。"""
+    if not cfg.intent_cache_enabled:
+        return None
+    redis = None
+    if cfg.intent_cache_redis:
+        from emergency_agents.cache.redis_client import redis_client
+
+        redis = redis_client if redis_client.get_client() is not None else None
+    embedder = _build_embedder(cfg) if cfg.intent_cache_similarity > 0 else None
+    opt_out = set(LOCATION_SENSITIVE_INTENTS) | set(cfg.intent_cache_opt_out)
+    logger.info(
+        "intent_result_cache_enabled",
+        namespace=namespace,
+        ttl_seconds=cfg.intent_cache_ttl_seconds,
+        redis_enabled=redis is not None,
+        similarity=cfg.intent_cache_similarity,
+    )
+    return IntentResultCache(
+        namespace=namespace,
+        ttl_seconds=cfg.intent_cache_ttl_seconds,
+        opt_out_intents=opt_out,
+        redis=redis,
+        embedder=embedder,
+        similarity_threshold=cfg.intent_cache_similarity,
+    )
+
+
+__all__ = [
+    "IntentResultCache",
+    "LOCATION_SENSITIVE_INTENTS",
+    "build_intent_result_cache",
+    "normalize_utterance",
+]
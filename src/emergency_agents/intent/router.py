@@ -1,6 +1,7 @@
 # Copyright 2025 msq
 from __future__ import annotations
 
+import asyncio
 import json
 import structlog
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
@@ -570,7 +571,8 @@ async def intent_router_node(state: Dict[str, Any]) -> Dict[str, Any]:
                 # 3. LLM选择最合适的设备
                 objective = slots.get("objective_summary") or "侦察现场态势" if isinstance(slots, dict) else "侦察现场态势"
                 try:
-                    selected_device, reasons = _choose_scout_device_with_llm(
+                    selected_device, reasons = await asyncio.to_thread(
+                        _choose_scout_device_with_llm,
                         devices=devices,
                         objective=objective,
                         latitude=float(lat),
@@ -17,11 +17,12 @@ from __future__ import annotations
 import json
 import os
 import structlog
-from typing import Any, Dict, List, Literal
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, ValidationError
 from emergency_agents.llm.endpoint_manager import LLMEndpointsExhaustedError
 from emergency_agents.intent.schemas import INTENT_SCHEMAS
+from emergency_agents.intent.result_cache import IntentResultCache
 
 logger = structlog.get_logger(__name__)
 
@@ -286,7 +287,8 @@ def _safe_json_parse(text: str) -> Dict[str, Any]:
 def unified_intent_node(
     state: Dict[str, Any],
     llm_client,
-    llm_model: str
+    llm_model: str,
+    cache: Optional[IntentResultCache] = None,
 ) -> Dict[str, Any]:
     """统一意图处理节点（合并分类+验证）。
 
@@ -302,6 +304,7 @@ def unified_intent_node(
         state: 图状态，期望包含messages或raw_report
         llm_client: LLM客户端（OpenAI兼容接口）
         llm_model: 模型名（推荐glm-4.5-air）
+        cache: 可选的意图结果缓存；仅缓存 valid 且不含位置信息的结果
 
     Returns:
         更新后的state，包含unified_intent字段
@@ -345,6 +348,12 @@ def unified_intent_node(
         )
         return state | {"unified_intent": result.model_dump()}
 
+    if cache is not None:
+        cached = cache.get(input_text)
+        if cached is not None:
+            logger.info("unified_intent_cache_hit", intent_type=cached.get("intent_type"))
+            return state | {"unified_intent": cached}
+
     # 构建统一prompt
     from emergency_agents.intent.schemas import INTENT_SCHEMAS
 
@@ -504,7 +513,16 @@ def unified_intent_node(
             "has_missing_fields": len(result.missing_fields) > 0
         })
 
-        return state | {"unified_intent": result.model_dump()}
+        payload = result.model_dump()
+        if cache is not None and result.validation_status == "valid":
+            cache.store(
+                input_text,
+                payload,
+                intent=canonical_intent,
+                confidence=result.confidence,
+                slots=result.slots if isinstance(result.slots, dict) else {},
+            )
+        return state | {"unified_intent": payload}
 
     except LLMEndpointsExhaustedError as exc:
         logger.error(
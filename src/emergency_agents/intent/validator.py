@@ -2,8 +2,10 @@
 """意图槽位校验与追问生成。"""
 from __future__ import annotations
 
+import asyncio
+import inspect
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import jsonschema
 import structlog
@@ -175,6 +177,13 @@ def _enforce_required_fields(intent_type: Optional[str], slots: Dict[str, Any])
     return missing
 
 
+def _build_missing_prompt(intent_type: str, missing_fields: List[str]) -> str:
+    return (
+        f"用户执行'{intent_type}'操作，但缺少必填参数：{', '.join(missing_fields)}。\n"
+        "请生成一句简短的中文追问，帮助用户补充这些信息。只返回追问句子，不要其他内容。"
+    )
+
+
 def _generate_prompt_for_missing(intent_type: str, missing_fields: List[str], llm_client, llm_model: str) -> str:
     """LLM生成自然语言追问。
 
@@ -187,11 +196,8 @@ def _generate_prompt_for_missing(intent_type: str, missing_fields: List[str], ll
     Returns:
         自然语言追问文本。
     """
-    prompt = (
-        f"用户执行'{intent_type}'操作，但缺少必填参数：{', '.join(missing_fields)}。\n"
-        "请生成一句简短的中文追问，帮助用户补充这些信息。只返回追问句子，不要其他内容。"
-    )
-    
+    prompt = _build_missing_prompt(intent_type, missing_fields)
+
     try:
         if hasattr(llm_client, "chat") and hasattr(llm_client.chat, "completions"):
             rsp = llm_client.chat.completions.create(
@@ -217,6 +223,40 @@ def _generate_prompt_for_missing(intent_type: str, missing_fields: List[str], ll
         return f"请补充以下信息：{', '.join(missing_fields)}"
 
 
+async def _agenerate_prompt_for_missing(intent_type: str, missing_fields: List[str], llm_client, llm_model: str) -> str:
+    """异步生成追问：支持 FailoverAsyncLLMClient 与 LangChain ainvoke，同步客户端放入线程池。"""
+    prompt = _build_missing_prompt(intent_type, missing_fields)
+
+    try:
+        completions = getattr(getattr(llm_client, "chat", None), "completions", None)
+        if completions is not None and inspect.iscoroutinefunction(completions.create):
+            rsp = await completions.create(
+                model=llm_model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.3
+            )
+            content = rsp.choices[0].message.content.strip()
+        elif completions is None and hasattr(llm_client, "ainvoke"):
+            from langchain_core.messages import HumanMessage
+            rsp = await llm_client.ainvoke([HumanMessage(content=prompt)])
+            content = str(rsp.content).strip()
+        else:
+            return await asyncio.to_thread(
+                _generate_prompt_for_missing, intent_type, missing_fields, llm_client, llm_model
+            )
+
+        logger.info(
+            "intent_prompt_generated",
+            intent=intent_type,
+            missing=missing_fields,
+            prompt_preview=content,
+        )
+        return content
+    except Exception as e:
+        logger.warning("LLM生成追问失败: %s，使用模板", e)
+        return f"请补充以下信息：{', '.join(missing_fields)}"
+
+
 def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str) -> Dict[str, Any]:
     """验证intent槽位并在缺失时生成追问。
     
@@ -228,6 +268,25 @@ def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str)
     Returns:
         更新后的state，包含validation_status字段。
     """
+    result, pending = _validate_slots(state)
+    if pending is not None:
+        intent_type, missing = pending
+        result = result | {"prompt": _generate_prompt_for_missing(intent_type, missing, llm_client, llm_model)}
+    return result
+
+
+async def avalidate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str) -> Dict[str, Any]:
+    """validate_and_prompt_node 的异步版本：校验逻辑相同，追问生成不阻塞事件循环。"""
+    result, pending = _validate_slots(state)
+    if pending is not None:
+        intent_type, missing = pending
+        prompt = await _agenerate_prompt_for_missing(intent_type, missing, llm_client, llm_model)
+        result = result | {"prompt": prompt}
+    return result
+
+
+def _validate_slots(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Tuple[str, List[str]]]]:
+    """纯校验步骤，返回 (更新后的state, 待生成追问的(意图, 缺失字段))。"""
     intent = state.get("intent") or {}
     intent_type = intent.get("intent_type")
     # 兼容别名：将 video_analyze / video-analysis / video_analysis 等归并为 video-analysis
@@ -255,12 +314,12 @@ def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str)
     schema = INTENT_SCHEMAS.get(intent_type)
     if not schema:
         logger.info("intent_type=%s 无schema定义，跳过验证", intent_type)
-        return state | {"validation_status": "valid"}
+        return state | {"validation_status": "valid"}, None
 
     skip_validation_intents = {"device-control"}
     if intent_type in skip_validation_intents:
         logger.info("intent_type=%s 跳过槽位验证（基础控制）", intent_type)
-        return state | {"intent": intent, "validation_status": "valid"}
+        return state | {"intent": intent, "validation_status": "valid"}, None
 
     extra_missing = _enforce_required_fields(intent_type, slots)
     sanitized_extra = _sanitize_missing_fields(extra_missing)
@@ -283,14 +342,12 @@ def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str)
                 missing=sanitized_extra,
                 attempt=attempt,
             )
-            prompt = _generate_prompt_for_missing(intent_type, sanitized_extra, llm_client, llm_model)
             return state | {
                 "validation_status": "invalid",
-                "prompt": prompt,
                 "missing_fields": sanitized_extra,
                 "validation_attempt": attempt,
-            }
-        return state | {"validation_status": "valid"}
+            }, (intent_type, sanitized_extra)
+        return state | {"validation_status": "valid"}, None
     except jsonschema.ValidationError as e:
         missing = _sanitize_missing_fields(_extract_missing_fields(e, schema))
         extra_from_rules = _sanitize_missing_fields(extra_missing)
@@ -321,9 +378,7 @@ def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str)
                 "validation_status": "failed",
                 "validation_attempt": attempt,
                 "last_error": {"validator": "max_attempts_exceeded", "missing": combined_missing}
-            }
-
-        prompt = _generate_prompt_for_missing(intent_type, combined_missing, llm_client, llm_model)
+            }, None
 
         logger.info(
             "intent_validation_missing_after_schema_error",
@@ -336,10 +391,9 @@ def validate_and_prompt_node(state: Dict[str, Any], llm_client, llm_model: str)
 
         return state | {
             "validation_status": "invalid",
-            "prompt": prompt,
             "missing_fields": combined_missing,
             "validation_attempt": attempt
-        }
+        }, (intent_type, combined_missing)
 
 
 def _is_placeholder_location_text(text: str) -> bool:
@@ -21,14 +21,15 @@ class LLMClientProtocol(Protocol):
     chat: _ChatNamespace
 
 
-_MANAGER: LLMEndpointManager | None = None
+_MANAGERS: dict[str, LLMEndpointManager] = {}
 
 
-def _get_manager(cfg: AppConfig) -> LLMEndpointManager:
-    global _MANAGER
-    if _MANAGER is None:
-        _MANAGER = LLMEndpointManager.from_config(cfg)
-    return _MANAGER
+def _get_manager(cfg: AppConfig, scope: str = "default") -> LLMEndpointManager:
+    manager = _MANAGERS.get(scope)
+    if manager is None:
+        manager = LLMEndpointManager.from_config(cfg, scope=scope)
+        _MANAGERS[scope] = manager
+    return manager
 
 
 class _FailoverChatCompletions:
@@ -80,15 +81,15 @@ class FailoverAsyncLLMClient:
         self.chat = _AsyncFailoverChat(manager)
 
 
-def get_openai_client(config: Optional[AppConfig] = None) -> LLMClientProtocol:
+def get_openai_client(config: Optional[AppConfig] = None, *, scope: str = "default") -> LLMClientProtocol:
     cfg = config or AppConfig.load_from_env()
-    manager = _get_manager(cfg)
+    manager = _get_manager(cfg, scope)
     return FailoverLLMClient(manager)
 
 
-def get_async_openai_client(config: Optional[AppConfig] = None) -> FailoverAsyncLLMClient:
+def get_async_openai_client(config: Optional[AppConfig] = None, *, scope: str = "default") -> FailoverAsyncLLMClient:
     cfg = config or AppConfig.load_from_env()
-    manager = _get_manager(cfg)
+    manager = _get_manager(cfg, scope)
     return FailoverAsyncLLMClient(manager)
 
 
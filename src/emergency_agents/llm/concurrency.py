@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+if TYPE_CHECKING:
+    from emergency_agents.config import AppConfig
+
+logger = structlog.get_logger(__name__)
+
+_LIMIT_GAUGE = Gauge("llm_concurrency_limit", "LLM全局自适应并发上限")
+_INFLIGHT_GAUGE = Gauge("llm_concurrency_inflight", "LLM全局在途请求数")
+_QUEUE_DEPTH = Gauge("llm_concurrency_queue_depth", "等待LLM并发名额的请求数", ["priority"])
+_WAIT_SECONDS = Histogram(
+    "llm_concurrency_wait_seconds",
+    "等待LLM并发名额的时间（秒）",
+    ["priority"],
+    buckets=(0.005, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+_ADJUSTMENTS = Counter(
+    "llm_concurrency_adjustments_total",
+    "LLM并发上限调整次数",
+    ["direction"],  # increase / decrease
+)
+
+# 优先级：数值越小越优先
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+_PRIORITY_LABELS = {PRIORITY_CRITICAL: "critical", PRIORITY_NORMAL: "normal", PRIORITY_BACKGROUND: "background"}
+
+# 各优先级可占用的上限比例：低优先级请求最多用到部分名额，为语音/救援保留余量
+_PRIORITY_SHARE: Dict[int, float] = {
+    PRIORITY_CRITICAL: 1.0,
+    PRIORITY_NORMAL: 0.85,
+    PRIORITY_BACKGROUND: 0.5,
+}
+
+DEFAULT_SCOPE_PRIORITIES: Mapping[str, int] = {
+    "voice": PRIORITY_CRITICAL,
+    "intent": PRIORITY_CRITICAL,
+    "rescue": PRIORITY_CRITICAL,
+    "default": PRIORITY_NORMAL,
+    "strategic": PRIORITY_NORMAL,
+    "reports": PRIORITY_BACKGROUND,
+    "markdown": PRIORITY_BACKGROUND,
+}
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    enqueued_at: float = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class AdaptiveConcurrencyLimiter:
+    """进程级自适应并发控制器（AIMD + 延迟梯度）。
+
+    - 所有 LLMEndpointManager 共享同一实例，上游真实并发受统一约束；
+    - 成功且延迟未明显劣化时加性增长（每个“窗口”约 +1）；
+    - 遇到 429/超时乘性回退，延迟超过基线 ``latency_tolerance`` 倍时小幅回退；
+    - 名额按优先级发放（同级 FIFO），低优先级只能占用上限的一部分。
+    同步线程与异步协程可混合使用；事件循环线程上的同步调用走独立的阻塞名额池（见 acquire_sync）。
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.7,
+        latency_tolerance: float = 2.0,
+        cooldown_seconds: float = 1.0,
+        loop_sync_slots: int = 4,
+    ) -> None:
+        self._min_limit = max(1, int(min_limit))
+        self._max_limit = max(self._min_limit, int(max_limit))
+        self._limit = float(min(self._max_limit, max(self._min_limit, int(initial_limit))))
+        self._backoff_ratio = min(0.95, max(0.1, backoff_ratio))
+        self._latency_tolerance = max(1.1, latency_tolerance)
+        self._cooldown = max(0.0, cooldown_seconds)
+        self._inflight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._baseline_ms: Optional[float] = None
+        self._last_decrease = 0.0
+        # 事件循环线程上的同步调用专用名额池：不与协程争抢共享名额，避免阻塞循环后互相等待
+        self._loop_sync_pool = threading.BoundedSemaphore(max(1, int(loop_sync_slots)))
+        self._loop_sync_held = threading.local()
+        _LIMIT_GAUGE.set(self._limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        with self._lock:
+            return sum(1 for w in self._waiters if not w.cancelled and (priority is None or w.priority == priority))
+
+    def _capacity(self, priority: int) -> int:
+        share = _PRIORITY_SHARE.get(priority, _PRIORITY_SHARE[PRIORITY_BACKGROUND])
+        return max(1, int(self._limit * share))
+
+    def _can_admit(self, priority: int) -> bool:
+        if self._inflight >= self._capacity(priority):
+            return False
+        # 已有同级或更高优先级在排队时不插队
+        return not any(not w.cancelled and w.priority <= priority for w in self._waiters)
+
+    def _admit(self) -> None:
+        self._inflight += 1
+        _INFLIGHT_GAUGE.set(self._inflight)
+
+    def _enqueue(self, priority: int, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(priority=priority, seq=next(self._seq), enqueued_at=time.monotonic(), wake=wake)
+        heapq.heappush(self._waiters, waiter)
+        self._publish_queue(priority)
+        return waiter
+
+    def _dispatch(self) -> None:
+        """把空出的名额按优先级发给排队者（需持锁调用）。"""
+        while self._waiters:
+            head = self._waiters[0]
+            if head.cancelled:
+                heapq.heappop(self._waiters)
+                continue
+            if self._inflight >= self._capacity(head.priority):
+                break
+            heapq.heappop(self._waiters)
+            head.granted = True
+            self._admit()
+            self._publish_queue(head.priority)
+            _WAIT_SECONDS.labels(priority=_PRIORITY_LABELS.get(head.priority, str(head.priority))).observe(
+                time.monotonic() - head.enqueued_at
+            )
+            head.wake()
+
+    def _publish_queue(self, priority: int) -> None:
+        depth = sum(1 for w in self._waiters if not w.cancelled and w.priority == priority)
+        _QUEUE_DEPTH.labels(priority=_PRIORITY_LABELS.get(priority, str(priority))).set(depth)
+
+    def try_acquire(self, priority: int = PRIORITY_NORMAL) -> bool:
+        """非阻塞获取名额（用于对冲等可选请求）。"""
+        with self._lock:
+            if not self._can_admit(priority):
+                return False
+            self._admit()
+            return True
+
+    def acquire_sync(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """阻塞获取名额，超时返回 False；名额须用 release_sync 归还。
+
+        在事件循环线程上调用且无空闲名额时，不在共享队列中排队：名额持有者多为同一循环上的协程，
+        阻塞循环会使其永远无法归还名额。此时改为等待独立的循环同步名额池，拿到后超额占用一个共享名额
+        （仍计入在途数，自适应上限照常生效）。
+        """
+        started = time.monotonic()
+        with self._lock:
+            if self._can_admit(priority):
+                self._admit()
+                _WAIT_SECONDS.labels(priority=_PRIORITY_LABELS.get(priority, str(priority))).observe(0.0)
+                return True
+            on_loop = running_on_event_loop()
+            if not on_loop:
+                if timeout is not None and timeout <= 0:
+                    return False
+                event = threading.Event()
+                waiter = self._enqueue(priority, event.set)
+        if on_loop:
+            return self._acquire_loop_sync(priority, timeout, started)
+        if not event.wait(timeout):
+            with self._lock:
+                if not waiter.granted:
+                    waiter.cancelled = True
+                    self._publish_queue(priority)
+                    self._dispatch()
+                    return False
+                # 超时瞬间恰好获得名额：照常使用
+        self._log_wait(priority, started)
+        return True
+
+    def _acquire_loop_sync(self, priority: int, timeout: Optional[float], started: float) -> bool:
+        if not self._loop_sync_pool.acquire(timeout=None if timeout is None else max(timeout, 0.0)):
+            return False
+        self._loop_sync_held.count = getattr(self._loop_sync_held, "count", 0) + 1
+        with self._lock:
+            self._admit()
+        _WAIT_SECONDS.labels(priority=_PRIORITY_LABELS.get(priority, str(priority))).observe(
+            time.monotonic() - started
+        )
+        logger.warning("llm_sync_call_on_event_loop", priority=priority, inflight=self._inflight, limit=int(self._limit))
+        return True
+
+    async def acquire_async(self, priority: int = PRIORITY_NORMAL) -> None:
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        def _wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            if self._can_admit(priority):
+                self._admit()
+                _WAIT_SECONDS.labels(priority=_PRIORITY_LABELS.get(priority, str(priority))).observe(0.0)
+                return
+            waiter = self._enqueue(priority, _wake)
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    # 名额已发放但调用方已取消：立即归还
+                    self._inflight -= 1
+                    _INFLIGHT_GAUGE.set(self._inflight)
+                else:
+                    waiter.cancelled = True
+                    self._publish_queue(priority)
+                self._dispatch()
+            raise
+        self._log_wait(priority, started)
+
+    def release(self) -> None:
+        with self._lock:
+            self._inflight = max(0, self._inflight - 1)
+            _INFLIGHT_GAUGE.set(self._inflight)
+            self._dispatch()
+
+    def release_sync(self) -> None:
+        """归还 acquire_sync 获得的名额（须在获取名额的同一线程调用）。"""
+        held = getattr(self._loop_sync_held, "count", 0)
+        if held:
+            self._loop_sync_held.count = held - 1
+            self._loop_sync_pool.release()
+        self.release()
+
+    def observe(self, latency_ms: float, *, overloaded: bool = False) -> None:
+        """根据一次调用结果调整上限：过载（429/超时）乘性回退，否则按延迟梯度加性增长或小幅回退。"""
+        with self._lock:
+            now = time.monotonic()
+            if overloaded:
+                self._decrease(now, self._backoff_ratio, reason="overloaded")
+            else:
+                latency = max(1.0, float(latency_ms))
+                if self._baseline_ms is None:
+                    self._baseline_ms = latency
+                else:
+                    # 基线缓慢跟随，快速下探：用作“无排队”时的延迟参考
+                    self._baseline_ms = min(latency, self._baseline_ms * 0.99 + latency * 0.01)
+                if latency > self._baseline_ms * self._latency_tolerance:
+                    self._decrease(now, 0.9, reason="latency")
+                elif self._inflight + 1 >= int(self._limit) and self._limit < self._max_limit:
+                    # 仅在名额接近用满时增长，避免空闲期无限抬高上限
+                    before = int(self._limit)
+                    self._limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+                    if int(self._limit) > before:
+                        _ADJUSTMENTS.labels(direction="increase").inc()
+            _LIMIT_GAUGE.set(self._limit)
+            self._dispatch()
+
+    def _decrease(self, now: float, ratio: float, *, reason: str) -> None:
+        if now - self._last_decrease < self._cooldown:
+            return  # 同一拥塞窗口内只回退一次
+        self._last_decrease = now
+        previous = self._limit
+        self._limit = max(float(self._min_limit), self._limit * ratio)
+        if int(self._limit) < int(previous):
+            _ADJUSTMENTS.labels(direction="decrease").inc()
+            logger.warning(
+                "llm_concurrency_limit_decreased",
+                reason=reason,
+                previous=int(previous),
+                limit=int(self._limit),
+                inflight=self._inflight,
+            )
+
+    def _log_wait(self, priority: int, started: float) -> None:
+        waited_ms = int((time.monotonic() - started) * 1000)
+        if waited_ms > 2000:
+            logger.warning("llm_concurrency_wait", priority=priority, waited_ms=waited_ms, limit=int(self._limit))
+
+
+def running_on_event_loop() -> bool:
+    """当前线程是否正在运行 asyncio 事件循环。"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def scope_priority(scope: str, overrides: Optional[Mapping[str, int]] = None) -> int:
+    """作用域对应的优先级；未知作用域按普通优先级处理。"""
+    if overrides and scope in overrides:
+        return int(overrides[scope])
+    return DEFAULT_SCOPE_PRIORITIES.get(scope, PRIORITY_NORMAL)
+
+
+_LIMITER: Optional[AdaptiveConcurrencyLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_concurrency_limiter(cfg: Optional["AppConfig"] = None) -> AdaptiveConcurrencyLimiter:
+    """进程级单例；首次调用时按配置初始化。"""
+    global _LIMITER
+    if _LIMITER is not None:
+        return _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            if cfg is not None:
+                _LIMITER = AdaptiveConcurrencyLimiter(
+                    initial_limit=cfg.llm_max_concurrency,
+                    min_limit=cfg.llm_concurrency_min,
+                    max_limit=cfg.llm_concurrency_max,
+                )
+            else:
+                _LIMITER = AdaptiveConcurrencyLimiter()
+            logger.info(
+                "llm_concurrency_limiter_initialized",
+                limit=_LIMITER.limit,
+                min_limit=_LIMITER._min_limit,
+                max_limit=_LIMITER._max_limit,
+            )
+    return _LIMITER
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "DEFAULT_SCOPE_PRIORITIES",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_CRITICAL",
+    "PRIORITY_NORMAL",
+    "get_concurrency_limiter",
+    "running_on_event_loop",
+    "scope_priority",
+]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# 请求级截止时间（time.monotonic 绝对值）。ContextVar 会随 asyncio.create_task / asyncio.to_thread
+# 复制到子任务与工作线程，因此 API 入口设置一次，即可约束其下所有嵌套 LLM 调用。
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("llm_request_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """请求剩余时间预算耗尽时抛出。"""
+
+    def __init__(self, operation: str) -> None:
+        super().__init__(f"request deadline exceeded before {operation}")
+        self.operation = operation
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """在当前上下文内设置剩余时间预算；嵌套设置时取更早的截止时间。
+
+    seconds 为 None 或非正数时不设置新的截止时间（沿用外层）。
+    """
+    current = _DEADLINE.get()
+    if seconds is None or seconds <= 0:
+        yield current
+        return
+    deadline = time.monotonic() + seconds
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """当前请求剩余的时间预算（秒），未设置截止时间时返回 None。"""
+    deadline = _DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def bounded_timeout(timeout: float) -> float:
+    """将单次调用超时收紧到剩余预算之内。"""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    return max(0.0, min(timeout, remaining))
+
+
+__all__ = ["DeadlineExceededError", "bounded_timeout", "remaining_seconds", "request_deadline"]
@@ -3,11 +3,20 @@ from __future__ import annotations
 import asyncio
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from typing import Awaitable, Callable, Deque, Dict, FrozenSet, Iterable, List, Literal, Optional, Tuple, TypeVar
 
 import structlog
-from openai import AsyncOpenAI, OpenAI
+from openai import APITimeoutError, AsyncOpenAI, OpenAI
+from prometheus_client import Counter, Gauge
+
+from emergency_agents.llm.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    get_concurrency_limiter,
+    scope_priority,
+)
+from emergency_agents.llm.deadline import DeadlineExceededError, bounded_timeout, remaining_seconds
 
 from typing import TYPE_CHECKING
 
@@ -15,9 +24,39 @@ if TYPE_CHECKING:
     from emergency_agents.config import AppConfig
 
 T = TypeVar("T")
+C = TypeVar("C")
 
 logger = structlog.get_logger(__name__)
 
+_LLM_ENDPOINT_INFLIGHT = Gauge(
+    "llm_endpoint_inflight",
+    "LLM端点当前在途请求数",
+    ["scope", "endpoint"],
+)
+_LLM_ENDPOINT_LATENCY_EWMA = Gauge(
+    "llm_endpoint_latency_ewma_ms",
+    "LLM端点成功请求延迟的指数滑动平均（毫秒）",
+    ["scope", "endpoint"],
+)
+
+_LLM_HEDGE_EVENTS = Counter(
+    "llm_hedge_events_total",
+    "LLM对冲请求事件",
+    ["scope", "event"],  # event: fired / primary_won / hedge_won
+)
+_LLM_DEADLINE_EXCEEDED = Counter(
+    "llm_deadline_exceeded_total",
+    "因请求截止时间耗尽而放弃的LLM调用",
+    ["scope", "operation"],
+)
+
+RoutingPolicy = Literal["priority", "weighted"]
+_HEDGE_MIN_SAMPLES = 20
+
+
+def _is_timeout_error(exc: BaseException) -> bool:
+    return isinstance(exc, (TimeoutError, APITimeoutError))
+
 
 class LLMEndpointsExhaustedError(RuntimeError):
     """所有端点不可用时抛出。"""
@@ -38,7 +77,7 @@ class LLMEndpointConfig:
         base_url: 模型服务的Base URL。
         api_key: 调用该端点时使用的API Key。
         priority: 优先级，数值越大优先选用。
-        weight: 当多个端点同优先级时的权重（预留扩展）。
+        weight: 加权路由策略下的流量权重，权重越大分到的请求越多。
     """
 
     name: str
@@ -58,6 +97,8 @@ class LLMEndpointState:
         consecutive_successes: 连续成功次数。
         half_open: 是否处于半开尝试阶段。
         recovery_at: 允许重新尝试的时间戳（秒）。
+        inflight: 当前在途请求数。
+        ewma_latency_ms: 成功请求延迟的指数滑动平均，尚无样本时为 None。
     """
 
     available: bool = True
@@ -65,6 +106,8 @@ class LLMEndpointState:
     consecutive_successes: int = 0
     half_open: bool = False
     recovery_at: float = 0.0
+    inflight: int = 0
+    ewma_latency_ms: Optional[float] = None
 
 
 class LLMEndpointManager:
@@ -75,6 +118,16 @@ class LLMEndpointManager:
     - 当主端点失败达到阈值时短暂熔断，转而使用备用端点；
     - 到达恢复时间窗口后，会进入半开状态尝试恢复；
     - 同步 / 异步客户端均通过此管理器生成，确保选用相同策略。
+
+    路由策略：
+    - ``priority``：始终选用优先级最高的可用端点，其余端点仅作热备；
+    - ``weighted``：在全部健康端点间分流，得分 = (在途数 + 1) × EWMA延迟 / 权重，
+      取得分最低者（最少在途 + 延迟感知），同分时按优先级；半开端点同一时刻只放行一个探测请求。
+
+    对冲与截止时间（仅异步入口支持对冲）：
+    - 开启对冲后，请求超过最近成功延迟的分位值仍未返回时，向另一端点发出副本，先成功者胜出；
+    - 请求截止时间由 ``llm.deadline.request_deadline`` 在 API 入口设置，单次调用超时不超过剩余预算，
+      预算耗尽时抛出 ``DeadlineExceededError`` 且不再切换端点重试。
     """
 
     def __init__(
@@ -87,9 +140,20 @@ class LLMEndpointManager:
         async_client_builder: Callable[[LLMEndpointConfig], AsyncOpenAI],
         max_concurrency: int = 5,
         request_timeout: float = 60.0,
+        routing_policy: RoutingPolicy = "weighted",
+        ewma_alpha: float = 0.3,
+        scope: str = "default",
+        hedge_enabled: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.3,
+        hedge_max_delay: float = 5.0,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: Optional[int] = None,
     ) -> None:
         if not endpoints:
             raise ValueError("至少需要一个LLM端点配置")
+        if routing_policy not in ("priority", "weighted"):
+            raise ValueError(f"未知的LLM路由策略: {routing_policy}")
 
         # 按优先级排序，优先级越高越靠前
         self._order: List[LLMEndpointConfig] = sorted(
@@ -103,6 +167,15 @@ class LLMEndpointManager:
         self._sync_builder = sync_client_builder
         self._async_builder = async_client_builder
         self._request_timeout = max(1.0, float(request_timeout))
+        self._routing_policy: RoutingPolicy = routing_policy
+        self._ewma_alpha = min(1.0, max(0.01, float(ewma_alpha)))
+        self._scope = scope
+        self._hedge_enabled = hedge_enabled
+        self._hedge_quantile = min(0.999, max(0.5, float(hedge_quantile)))
+        self._hedge_min_delay = max(0.0, float(hedge_min_delay))
+        self._hedge_max_delay = max(self._hedge_min_delay, float(hedge_max_delay))
+        # 最近成功请求延迟（毫秒），用于计算对冲触发分位
+        self._latency_window: Deque[float] = deque(maxlen=256)
 
         # 端点对应的客户端缓存，减少重复创建开销
         self._sync_clients: Dict[str, OpenAI] = {}
@@ -111,10 +184,13 @@ class LLMEndpointManager:
         # 线程锁保证多协程/线程同时访问时状态安全
         self._lock = threading.Lock()
 
-        # 并发控制
+        # 并发控制：生产路径共享进程级自适应限流器；未注入时使用独立实例（以 max_concurrency 为初值）
         self._max_concurrency = max(1, int(max_concurrency))
-        self._sync_semaphore = threading.Semaphore(self._max_concurrency)
-        self._async_semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._limiter = limiter or AdaptiveConcurrencyLimiter(
+            initial_limit=self._max_concurrency,
+            max_limit=max(self._max_concurrency, 64),
+        )
+        self._priority = scope_priority(scope) if priority is None else priority
 
         logger.info(
             "llm_endpoint_manager_initialized",
@@ -123,11 +199,15 @@ class LLMEndpointManager:
             recovery_seconds=self._recovery_seconds,
             max_concurrency=self._max_concurrency,
             request_timeout_seconds=self._request_timeout,
+            routing_policy=self._routing_policy,
+            hedge_enabled=self._hedge_enabled,
+            scope=self._scope,
+            priority=self._priority,
         )
 
     @classmethod
-    def from_config(cls, cfg: "AppConfig") -> "LLMEndpointManager":
-        """基于AppConfig构建端点管理器。"""
+    def from_config(cls, cfg: "AppConfig", *, scope: str = "default") -> "LLMEndpointManager":
+        """基于AppConfig构建端点管理器（scope 决定共享限流器中的优先级）。"""
 
         return cls.from_endpoints(
             cfg.llm_endpoints,
@@ -135,6 +215,15 @@ class LLMEndpointManager:
             recovery_seconds=cfg.llm_recovery_seconds,
             max_concurrency=cfg.llm_max_concurrency,
             request_timeout=cfg.llm_request_timeout_seconds,
+            routing_policy=cfg.llm_routing_policy,
+            ewma_alpha=cfg.llm_latency_ewma_alpha,
+            hedge_enabled=cfg.llm_hedge_enabled,
+            hedge_quantile=cfg.llm_hedge_quantile,
+            hedge_min_delay=cfg.llm_hedge_min_delay_seconds,
+            hedge_max_delay=cfg.llm_hedge_max_delay_seconds,
+            scope=scope,
+            limiter=get_concurrency_limiter(cfg),
+            priority=scope_priority(scope, cfg.llm_scope_priorities),
         )
 
     @classmethod
@@ -146,6 +235,15 @@ class LLMEndpointManager:
         recovery_seconds: int,
         max_concurrency: int,
         request_timeout: float,
+        routing_policy: RoutingPolicy = "weighted",
+        ewma_alpha: float = 0.3,
+        scope: str = "default",
+        hedge_enabled: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.3,
+        hedge_max_delay: float = 5.0,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        priority: Optional[int] = None,
     ) -> "LLMEndpointManager":
         endpoint_list = list(endpoints)
         if not endpoint_list:
@@ -181,23 +279,62 @@ class LLMEndpointManager:
             async_client_builder=build_async,
             max_concurrency=max(1, max_concurrency),
             request_timeout=request_timeout,
+            routing_policy=routing_policy,
+            ewma_alpha=ewma_alpha,
+            scope=scope,
+            hedge_enabled=hedge_enabled,
+            hedge_quantile=hedge_quantile,
+            hedge_min_delay=hedge_min_delay,
+            hedge_max_delay=hedge_max_delay,
+            limiter=limiter,
+            priority=priority,
         )
 
-    def _select_endpoint(self) -> LLMEndpointConfig:
-        """选择一个可用端点，若都不可用则返回优先级最高的端点做最终尝试。"""
-        now = time.time()
-        candidate: Optional[LLMEndpointConfig] = None
+    def _refresh_availability(self, state: LLMEndpointState, now: float) -> bool:
+        if not state.available and now >= state.recovery_at:
+            # 中文注释：到达恢复时间后，允许端点以半开状态试探
+            state.available = True
+            state.half_open = True
+        return state.available
 
+    def _select_weighted(self, now: float, exclude: FrozenSet[str]) -> Optional[LLMEndpointConfig]:
+        candidates: List[LLMEndpointConfig] = []
         for endpoint in self._order:
+            if endpoint.name in exclude:
+                continue
+            state = self._states[endpoint.name]
+            if not self._refresh_availability(state, now):
+                continue
+            if state.half_open and state.inflight > 0:
+                continue  # 半开端点已有探测请求在途
+            candidates.append(endpoint)
+        if not candidates:
+            return None
+
+        known = [state.ewma_latency_ms for state in self._states.values() if state.ewma_latency_ms is not None]
+        # 无样本端点按已知最小延迟的一半乐观估计，保证冷端点能被探测到；全部无样本时只看在途数与权重
+        default_latency = min(known) / 2 if known else 1.0
+
+        def _score(endpoint: LLMEndpointConfig) -> Tuple[float, int]:
             state = self._states[endpoint.name]
-            if not state.available and now >= state.recovery_at:
-                # 中文注释：到达恢复时间后，允许端点以半开状态试探
-                state.available = True
-                state.half_open = True
+            latency = state.ewma_latency_ms if state.ewma_latency_ms is not None else default_latency
+            return ((state.inflight + 1) * max(latency, 1.0) / max(endpoint.weight, 1), -endpoint.priority)
+
+        return min(candidates, key=_score)
 
-            if state.available:
-                candidate = endpoint
-                break
+    def _pick_candidate(self, now: float, exclude: FrozenSet[str] = frozenset()) -> Optional[LLMEndpointConfig]:
+        if self._routing_policy == "weighted":
+            return self._select_weighted(now, exclude)
+        for endpoint in self._order:
+            if endpoint.name in exclude:
+                continue
+            if self._refresh_availability(self._states[endpoint.name], now):
+                return endpoint
+        return None
+
+    def _select_endpoint(self) -> LLMEndpointConfig:
+        """选择一个可用端点（并计入在途数），若都不可用则返回优先级最高的端点做最终尝试。"""
+        candidate = self._pick_candidate(time.time())
 
         if candidate is None:
             candidate = self._order[0]
@@ -207,8 +344,23 @@ class LLMEndpointManager:
                 states=self._snapshot(),
             )
 
+        self._mark_inflight(candidate)
         return candidate
 
+    def _mark_inflight(self, endpoint: LLMEndpointConfig) -> None:
+        self._states[endpoint.name].inflight += 1
+        self._publish_inflight(endpoint)
+
+    def _release_endpoint(self, endpoint: LLMEndpointConfig) -> None:
+        state = self._states[endpoint.name]
+        state.inflight = max(0, state.inflight - 1)
+        self._publish_inflight(endpoint)
+
+    def _publish_inflight(self, endpoint: LLMEndpointConfig) -> None:
+        _LLM_ENDPOINT_INFLIGHT.labels(scope=self._scope, endpoint=endpoint.name).set(
+            self._states[endpoint.name].inflight
+        )
+
     def _acquire_sync_client(self, endpoint: LLMEndpointConfig) -> OpenAI:
         client = self._sync_clients.get(endpoint.name)
         if client is None:
@@ -229,6 +381,13 @@ class LLMEndpointManager:
         state.consecutive_failures = 0
         state.available = True
         state.half_open = False
+        if state.ewma_latency_ms is None:
+            state.ewma_latency_ms = float(latency_ms)
+        else:
+            state.ewma_latency_ms += self._ewma_alpha * (latency_ms - state.ewma_latency_ms)
+        _LLM_ENDPOINT_LATENCY_EWMA.labels(scope=self._scope, endpoint=endpoint.name).set(state.ewma_latency_ms)
+        self._latency_window.append(float(latency_ms))
+        self._limiter.observe(latency_ms)
 
         logger.info(
             "llm_endpoint_success",
@@ -250,6 +409,9 @@ class LLMEndpointManager:
         error_text = str(error)
         is_rate_limit = status_code_int == 429 or ('429' in error_text)
         cooldown = self._recovery_seconds * (2 if is_rate_limit else 1)
+        if is_rate_limit or status_code_int == 503 or isinstance(error, TimeoutError):
+            # 上游过载信号：收紧进程级并发上限
+            self._limiter.observe(latency_ms, overloaded=True)
 
         if state.consecutive_failures >= self._failure_threshold or is_rate_limit:
             state.available = False
@@ -274,6 +436,8 @@ class LLMEndpointManager:
                 "half_open": state.half_open,
                 "failures": state.consecutive_failures,
                 "recovery_at": state.recovery_at,
+                "inflight": state.inflight,
+                "ewma_latency_ms": state.ewma_latency_ms,
             }
             for name, state in self._states.items()
         }
@@ -283,15 +447,20 @@ class LLMEndpointManager:
         operation: str,
         caller: Callable[[OpenAI, LLMEndpointConfig], T],
     ) -> T:
-        """同步调用入口，自动处理主备切换。"""
+        """同步调用入口，自动处理主备切换与截止时间。"""
 
         last_exc: Optional[Exception] = None
         attempts = 0
         max_attempts = len(self._order) + self._failure_threshold
 
         while attempts < max_attempts:
+            self._check_deadline(operation, last_exc)
             t_qs = time.time()
-            self._sync_semaphore.acquire()
+            remaining = remaining_seconds()
+            if not self._limiter.acquire_sync(
+                self._priority, timeout=None if remaining is None else max(remaining, 0.0)
+            ):
+                raise DeadlineExceededError(operation) from last_exc
             queued_ms = int((time.time() - t_qs) * 1000)
             if queued_ms > 2000:
                 logger.warning("llm_queue_wait", operation=operation, queued_ms=queued_ms)
@@ -302,7 +471,8 @@ class LLMEndpointManager:
                     endpoint = self._select_endpoint()
                 attempts += 1
 
-                client = self._acquire_sync_client(endpoint)
+                client = self._bind_deadline(self._acquire_sync_client(endpoint))
+                timeout = bounded_timeout(self._request_timeout)
                 start = time.time()
 
                 try:
@@ -312,13 +482,23 @@ class LLMEndpointManager:
                         self._on_success(endpoint, latency_ms)
                     return result
                 except Exception as exc:  # noqa: BLE001
+                    remaining = remaining_seconds()
+                    if remaining is not None and (
+                        remaining <= 0 or (timeout < self._request_timeout and _is_timeout_error(exc))
+                    ):
+                        # 剩余预算不足导致的超时不是端点故障，不计入熔断，也不切换备用端点
+                        _LLM_DEADLINE_EXCEEDED.labels(scope=self._scope, operation=operation).inc()
+                        raise DeadlineExceededError(operation) from exc
                     latency_ms = int((time.time() - start) * 1000)
                     with self._lock:
                         self._on_failure(endpoint, latency_ms, exc)
                     last_exc = exc
                     continue
+                finally:
+                    with self._lock:
+                        self._release_endpoint(endpoint)
             finally:
-                self._sync_semaphore.release()
+                self._limiter.release_sync()
 
         assert last_exc is not None
         snapshot = self._snapshot()  # 捕获当前状态
@@ -328,17 +508,25 @@ class LLMEndpointManager:
     async def call_async(
         self,
         operation: str,
-        caller: Callable[[AsyncOpenAI, LLMEndpointConfig], T],
+        caller: Callable[[AsyncOpenAI, LLMEndpointConfig], Awaitable[T]],
     ) -> T:
-        """异步调用入口，自动处理主备切换。"""
+        """异步调用入口，自动处理主备切换、请求对冲与截止时间。"""
 
         last_exc: Optional[Exception] = None
         attempts = 0
         max_attempts = len(self._order) + self._failure_threshold
 
         while attempts < max_attempts:
+            self._check_deadline(operation, last_exc)
             t_qs = time.time()
-            await self._async_semaphore.acquire()
+            remaining = remaining_seconds()
+            try:
+                if remaining is None:
+                    await self._limiter.acquire_async(self._priority)
+                else:
+                    await asyncio.wait_for(self._limiter.acquire_async(self._priority), timeout=max(remaining, 0.0))
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError(operation) from last_exc
             queued_ms = int((time.time() - t_qs) * 1000)
             if queued_ms > 2000:
                 logger.warning("llm_queue_wait", operation=operation, queued_ms=queued_ms)
@@ -348,34 +536,141 @@ class LLMEndpointManager:
                 with self._lock:
                     endpoint = self._select_endpoint()
                 attempts += 1
-
-                client = self._acquire_async_client(endpoint)
-                start = time.time()
-
                 try:
-                    call = caller(client, endpoint)
-                    if self._request_timeout > 0:
-                        result = await asyncio.wait_for(call, timeout=self._request_timeout)
-                    else:
-                        result = await call
-                    latency_ms = int((time.time() - start) * 1000)
-                    with self._lock:
-                        self._on_success(endpoint, latency_ms)
-                    return result
+                    return await self._call_hedged(operation, endpoint, caller)
+                except DeadlineExceededError:
+                    raise
                 except Exception as exc:  # noqa: BLE001
-                    latency_ms = int((time.time() - start) * 1000)
-                    with self._lock:
-                        self._on_failure(endpoint, latency_ms, exc)
                     last_exc = exc
                     continue
             finally:
-                self._async_semaphore.release()
+                self._limiter.release()
 
         assert last_exc is not None
         snapshot = self._snapshot()  # 捕获当前状态
         logger.error("llm_endpoints_exhausted", operation=operation, states=snapshot)  # 记录致命错误
         raise LLMEndpointsExhaustedError(operation, snapshot) from last_exc  # 抛出自定义异常
 
+    def _check_deadline(self, operation: str, last_exc: Optional[Exception]) -> None:
+        remaining = remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            _LLM_DEADLINE_EXCEEDED.labels(scope=self._scope, operation=operation).inc()
+            raise DeadlineExceededError(operation) from last_exc
+
+    def _bind_deadline(self, client: C) -> C:
+        """存在请求截止时间时，为客户端绑定不超过剩余预算的单次超时。"""
+        if remaining_seconds() is None or not hasattr(client, "with_options"):
+            return client
+        return client.with_options(timeout=bounded_timeout(self._request_timeout))  # type: ignore[attr-defined]
+
+    def _hedge_delay(self) -> Optional[float]:
+        """对冲触发延迟：最近成功延迟的分位数（样本不足时取上限），夹在 [min, max] 之间。"""
+        if not self._hedge_enabled or len(self._order) < 2:
+            return None
+        with self._lock:
+            samples = sorted(self._latency_window)
+        if len(samples) < _HEDGE_MIN_SAMPLES:
+            delay = self._hedge_max_delay
+        else:
+            index = min(len(samples) - 1, int(self._hedge_quantile * len(samples)))
+            delay = samples[index] / 1000.0
+        return min(self._hedge_max_delay, max(self._hedge_min_delay, delay))
+
+    async def _invoke_async(
+        self,
+        operation: str,
+        endpoint: LLMEndpointConfig,
+        caller: Callable[[AsyncOpenAI, LLMEndpointConfig], Awaitable[T]],
+    ) -> T:
+        """在单个端点上执行一次调用（端点须已计入在途数），负责熔断状态与在途数回收。"""
+        start = time.time()
+        try:
+            client = self._bind_deadline(self._acquire_async_client(endpoint))
+            timeout = bounded_timeout(self._request_timeout)
+            try:
+                result = await asyncio.wait_for(caller(client, endpoint), timeout=timeout)
+            except asyncio.TimeoutError:
+                if timeout < self._request_timeout:
+                    # 剩余预算不足导致的超时不是端点故障，不计入熔断
+                    _LLM_DEADLINE_EXCEEDED.labels(scope=self._scope, operation=operation).inc()
+                    raise DeadlineExceededError(operation) from None
+                raise
+            latency_ms = int((time.time() - start) * 1000)
+            with self._lock:
+                self._on_success(endpoint, latency_ms)
+            return result
+        except DeadlineExceededError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            latency_ms = int((time.time() - start) * 1000)
+            with self._lock:
+                self._on_failure(endpoint, latency_ms, exc)
+            raise
+        finally:
+            with self._lock:
+                self._release_endpoint(endpoint)
+
+    async def _call_hedged(
+        self,
+        operation: str,
+        endpoint: LLMEndpointConfig,
+        caller: Callable[[AsyncOpenAI, LLMEndpointConfig], Awaitable[T]],
+    ) -> T:
+        """对冲请求：首个请求超过分位延迟仍未返回时，向另一端点发出副本，取先成功者并取消落后者。"""
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._invoke_async(operation, endpoint, caller)
+
+        primary = asyncio.ensure_future(self._invoke_async(operation, endpoint, caller))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+
+        remaining = remaining_seconds()
+        if (remaining is not None and remaining <= delay) or not self._limiter.try_acquire(self._priority):
+            return await primary  # 预算将尽或并发名额已满时不再加压
+        with self._lock:
+            backup = self._pick_candidate(time.time(), exclude=frozenset({endpoint.name}))
+            if backup is not None:
+                self._mark_inflight(backup)
+        if backup is None:
+            self._limiter.release()
+            return await primary
+
+        _LLM_HEDGE_EVENTS.labels(scope=self._scope, event="fired").inc()
+        logger.info(
+            "llm_hedge_fired",
+            operation=operation,
+            primary=endpoint.name,
+            backup=backup.name,
+            delay_ms=int(delay * 1000),
+        )
+        hedge = asyncio.ensure_future(self._invoke_async(operation, backup, caller))
+        hedge.add_done_callback(lambda _: self._limiter.release())
+        owners = {primary: "primary", hedge: "hedge"}
+        pending: set[asyncio.Future[T]] = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        _LLM_HEDGE_EVENTS.labels(scope=self._scope, event=f"{owners[task]}_won").inc()
+                        return task.result()
+                    first_error = first_error or error
+            assert first_error is not None
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     def status_snapshot(self) -> Dict[str, Dict[str, object]]:
         """供监控/日志使用的状态快照。"""
         with self._lock:
@@ -6,6 +6,7 @@ from typing import Dict, Iterable, Optional
 import structlog
 from emergency_agents.config import AppConfig
 from emergency_agents.llm.client import FailoverAsyncLLMClient, FailoverLLMClient
+from emergency_agents.llm.concurrency import get_concurrency_limiter, scope_priority
 from emergency_agents.llm.endpoint_manager import LLMEndpointConfig, LLMEndpointManager
 
 
@@ -54,6 +55,15 @@ class LLMClientFactory:
             recovery_seconds=self._config.llm_recovery_seconds,
             max_concurrency=self._config.llm_max_concurrency,
             request_timeout=self._config.llm_request_timeout_seconds,
+            routing_policy=self._config.llm_routing_policy,
+            ewma_alpha=self._config.llm_latency_ewma_alpha,
+            scope=scope,
+            hedge_enabled=self._config.llm_hedge_enabled,
+            hedge_quantile=self._config.llm_hedge_quantile,
+            hedge_min_delay=self._config.llm_hedge_min_delay_seconds,
+            hedge_max_delay=self._config.llm_hedge_max_delay_seconds,
+            limiter=get_concurrency_limiter(self._config),
+            priority=scope_priority(scope, self._config.llm_scope_priorities),
         )
         self._manager_cache[scope] = manager
         self._logger.info(
@@ -62,6 +72,9 @@ class LLMClientFactory:
             endpoints=[endpoint.name for endpoint in endpoint_list],
             max_concurrency=self._config.llm_max_concurrency,
             request_timeout_seconds=self._config.llm_request_timeout_seconds,
+            routing_policy=self._config.llm_routing_policy,
+            hedge_enabled=self._config.llm_hedge_enabled,
+            priority=scope_priority(scope, self._config.llm_scope_priorities),
         )
         return manager
 
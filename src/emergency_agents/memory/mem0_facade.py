@@ -1,6 +1,7 @@
 # Copyright 2025 msq
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import os
 import time
@@ -11,6 +12,9 @@ from typing import Any, Dict, List, Optional, Tuple  # 引入类型集合
 import structlog  # 引入结构化日志库
 from mem0 import Memory
 
+from emergency_agents.cache.embedding_cache import CachedMem0Embedder, get_embedding_cache
+from emergency_agents.memory.write_behind import Mem0WriteBehindQueue, PendingWrite, WriteCallback
+
 logger = structlog.get_logger(__name__)  # 初始化模块级日志器
 
 
@@ -46,6 +50,14 @@ class MemoryFacade:
         self._max_retries: int = int(os.getenv("MEM0_MAX_RETRIES", "2"))  # 最大重试次数
         self._retry_backoff_base: float = float(os.getenv("MEM0_RETRY_BACKOFF_BASE", "0.5"))  # 退避基准
         self._rate_limit_cooldown: int = int(os.getenv("MEM0_RATE_LIMIT_COOLDOWN", "60"))  # 限流冷却秒数
+        self._search_timeout: float = float(os.getenv("MEM0_SEARCH_TIMEOUT", "3.0"))  # 异步检索超时
+        self._write_queue: Mem0WriteBehindQueue = Mem0WriteBehindQueue(  # 写后队列，响应不等待落库
+            self._awrite,
+            max_size=int(os.getenv("MEM0_WRITE_QUEUE_SIZE", "256")),
+            batch_size=int(os.getenv("MEM0_WRITE_BATCH_SIZE", "8")),
+            max_attempts=int(os.getenv("MEM0_WRITE_MAX_ATTEMPTS", "3")),
+            retry_backoff=float(os.getenv("MEM0_WRITE_RETRY_BACKOFF", "1.0")),
+        )
 
         vector_store_config: Dict[str, Any] = {  # 构建向量存储配置
             "url": cfg.qdrant_url,  # Qdrant 地址
@@ -92,9 +104,21 @@ class MemoryFacade:
     def _ensure_mem(self) -> Memory:
         """首次访问时创建 Mem0 实例。"""
         if self._mem is None:
-            self._mem = Memory.from_config(config_dict=self._config_dict)
+            mem = Memory.from_config(config_dict=self._config_dict)
+            self._wrap_embedders(mem)
+            self._mem = mem
         return self._mem
 
+    def _wrap_embedders(self, mem: Memory) -> None:
+        """为向量检索与图检索的嵌入器挂上共享嵌入缓存（与 RAG 同一实例）。"""
+        cache = get_embedding_cache()
+        model = self._cfg.embedding_model
+        mem.embedding_model = CachedMem0Embedder(mem.embedding_model, cache, model)
+        graph = getattr(mem, "graph", None)
+        graph_embedder = getattr(graph, "embedding_model", None)
+        if graph_embedder is not None:
+            graph.embedding_model = CachedMem0Embedder(graph_embedder, cache, model)
+
     def _classify_exception(self, exc: Exception) -> Tuple[str, str]:
         """根据异常内容判断类型。"""
         message: str = str(exc).lower()  # 转小写便于匹配
@@ -210,6 +234,81 @@ class MemoryFacade:
         mem = self._ensure_mem()
         return mem.search(query, user_id=user_id, agent_id=agent_id, run_id=run_id, limit=top_k)
 
+    async def asearch(
+        self,
+        *,
+        query: str,
+        user_id: str,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        top_k: int = 5,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """异步检索：在线程池执行 search 并受超时约束，超时抛出 asyncio.TimeoutError。"""
+        if not user_id:
+            raise ValueError("user_id is required for multi-tenant isolation")
+        call = asyncio.to_thread(
+            self.search,
+            query=query,
+            user_id=user_id,
+            run_id=run_id,
+            agent_id=agent_id,
+            top_k=top_k,
+        )
+        limit = self._search_timeout if timeout is None else timeout
+        if limit and limit > 0:
+            return await asyncio.wait_for(call, timeout=limit)
+        return await call
+
+    def submit_add(
+        self,
+        *,
+        content: str,
+        user_id: str,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        actor: str = "ai_agent",
+        metadata: Optional[Dict[str, Any]] = None,
+        on_done: Optional[WriteCallback] = None,
+    ) -> bool:
+        """提交写入到后台写后队列，立即返回是否入队成功。
+
+        on_done 在真正落库后回调：参数为 None 表示成功，否则为失败原因。
+        必须在事件循环内调用。
+        """
+        if not user_id:
+            raise ValueError("user_id is required for multi-tenant isolation")
+        return self._write_queue.submit(
+            PendingWrite(
+                content=content,
+                user_id=user_id,
+                run_id=run_id,
+                agent_id=agent_id,
+                actor=actor,
+                metadata=dict(metadata or {}),
+                on_done=on_done,
+            )
+        )
+
+    async def flush(self, timeout: float = 5.0) -> bool:
+        """等待写后队列清空。"""
+        return await self._write_queue.drain(timeout)
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """停机时尽量刷完积压写入。"""
+        await self._write_queue.aclose(timeout)
+
+    async def _awrite(self, item: PendingWrite) -> bool:
+        return await asyncio.to_thread(
+            self.add,
+            content=item.content,
+            user_id=item.user_id,
+            run_id=item.run_id,
+            agent_id=item.agent_id,
+            actor=item.actor,
+            metadata=item.metadata,
+        )
+
 
 class DisabledMemoryFacade:
     """Mem0 关闭时的占位实现，显式记录禁用原因。"""
@@ -250,3 +349,34 @@ class DisabledMemoryFacade:
             query_preview=query[:32],
         )
         return []
+
+    async def asearch(
+        self,
+        *,
+        query: str,
+        user_id: str,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        top_k: int = 5,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.search(query=query, user_id=user_id, run_id=run_id, agent_id=agent_id, top_k=top_k)
+
+    def submit_add(
+        self,
+        *,
+        content: str,
+        user_id: str,
+        run_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        actor: str = "ai_agent",
+        metadata: Optional[Dict[str, Any]] = None,
+        on_done: Optional[WriteCallback] = None,
+    ) -> bool:
+        return self.add(content=content, user_id=user_id, run_id=run_id, agent_id=agent_id, actor=actor, metadata=metadata)
+
+    async def flush(self, timeout: float = 5.0) -> bool:
+        return True
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        return None
@@ -0,0 +1,228 @@
+# Copyright 2025 msq
+"""Mem0 写后队列：把记忆写入从请求链路中剥离，后台批量落库。"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = structlog.get_logger(__name__)
+
+_MEM0_QUEUE_DEPTH = Gauge("mem0_write_queue_depth", "mem0写后队列积压条数")
+_MEM0_QUEUE_EVENTS = Counter(
+    "mem0_write_queue_events_total",
+    "mem0写后队列事件",
+    ["event"],  # enqueued / written / retried / dropped_full / failed
+)
+_MEM0_QUEUE_BATCH = Histogram(
+    "mem0_write_batch_size",
+    "mem0单批合并写入条数",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+_MEM0_QUEUE_LATENCY = Histogram(
+    "mem0_write_queue_wait_seconds",
+    "mem0写入从入队到落库的等待时间（秒）",
+)
+
+WriteCallback = Callable[[Optional[str]], None]
+
+
+@dataclass
+class PendingWrite:
+    """一条待写入的记忆。"""
+
+    content: str
+    user_id: str
+    run_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    actor: str = "ai_agent"
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    on_done: Optional[WriteCallback] = None  # 落库结果回调：None 表示成功，否则为失败原因
+    attempt: int = 0
+    enqueued_at: float = 0.0
+
+    def group_key(self) -> Tuple[str, Optional[str], Optional[str], str, str]:
+        """同一会话、同一元信息的写入可合并为一次 mem0.add（一次事实抽取）。"""
+        meta = json.dumps(self.metadata, ensure_ascii=False, sort_keys=True, default=str)
+        return (self.user_id, self.run_id, self.agent_id, self.actor, meta)
+
+
+class Mem0WriteBehindQueue:
+    """有界异步写后队列。
+
+    - 队列满时拒绝新写入（计入 dropped_full），不阻塞请求；
+    - 后台 worker 每次最多取 batch_size 条，按会话与元信息合并后调用 writer；
+    - writer 抛错时按指数退避重新入队，超过 max_attempts 后放弃并回调失败原因。
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[PendingWrite], Awaitable[bool]],
+        *,
+        max_size: int = 256,
+        batch_size: int = 8,
+        max_attempts: int = 3,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        self._writer = writer
+        self._max_size = max(1, max_size)
+        self._batch_size = max(1, batch_size)
+        self._max_attempts = max(1, max_attempts)
+        self._retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue[PendingWrite]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._retry_tasks: set[asyncio.Task[None]] = set()
+        self._closing = False
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, item: PendingWrite) -> bool:
+        """入队（需在事件循环内调用），返回是否被接受。"""
+        if self._closing:
+            self._reject(item, "closing")
+            return False
+        self._ensure_worker()
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        item.enqueued_at = item.enqueued_at or loop.time()
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._reject(item, "queue_full")
+            return False
+        _MEM0_QUEUE_EVENTS.labels(event="enqueued").inc()
+        _MEM0_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    async def drain(self, timeout: float = 5.0) -> bool:
+        """等待积压写入全部完成，超时返回 False。"""
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning("mem0_write_queue_drain_timeout", pending=self._queue.qsize())
+            return False
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """停止接收新写入，尽量刷完积压后结束 worker。"""
+        self._closing = True
+        for task in list(self._retry_tasks):
+            task.cancel()
+        await self.drain(timeout)
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run(), name="mem0-write-behind")
+
+    def _reject(self, item: PendingWrite, reason: str) -> None:
+        event = "dropped_full" if reason == "queue_full" else "failed"
+        _MEM0_QUEUE_EVENTS.labels(event=event).inc()
+        logger.warning("mem0_write_rejected", reason=reason, user_id=item.user_id, run_id=item.run_id)
+        self._notify(item, reason)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            first = await queue.get()
+            batch: List[PendingWrite] = [first]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            _MEM0_QUEUE_DEPTH.set(queue.qsize())
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: List[PendingWrite]) -> None:
+        groups: Dict[Tuple[str, Optional[str], Optional[str], str, str], List[PendingWrite]] = {}
+        for item in batch:
+            groups.setdefault(item.group_key(), []).append(item)
+        _MEM0_QUEUE_BATCH.observe(len(batch))
+
+        for items in groups.values():
+            merged = items[0] if len(items) == 1 else PendingWrite(
+                content="\n".join(item.content for item in items),
+                user_id=items[0].user_id,
+                run_id=items[0].run_id,
+                agent_id=items[0].agent_id,
+                actor=items[0].actor,
+                metadata=dict(items[0].metadata) | {"batched": len(items)},
+            )
+            try:
+                accepted = await self._writer(merged)
+            except Exception as exc:  # noqa: BLE001
+                for item in items:
+                    self._schedule_retry(item, exc)
+                continue
+            now = asyncio.get_running_loop().time()
+            for item in items:
+                _MEM0_QUEUE_LATENCY.observe(max(now - item.enqueued_at, 0.0))
+                if accepted:
+                    _MEM0_QUEUE_EVENTS.labels(event="written").inc()
+                    self._notify(item, None)
+                else:
+                    # writer 主动跳过（如限流冷却期），不再重试
+                    _MEM0_QUEUE_EVENTS.labels(event="failed").inc()
+                    self._notify(item, "skipped")
+
+    def _schedule_retry(self, item: PendingWrite, exc: Exception) -> None:
+        item.attempt += 1
+        reason = exc.__class__.__name__
+        if item.attempt >= self._max_attempts or self._closing:
+            _MEM0_QUEUE_EVENTS.labels(event="failed").inc()
+            logger.error(
+                "mem0_write_failed",
+                attempts=item.attempt,
+                error=str(exc),
+                user_id=item.user_id,
+                run_id=item.run_id,
+            )
+            self._notify(item, reason)
+            return
+        _MEM0_QUEUE_EVENTS.labels(event="retried").inc()
+        delay = self._retry_backoff * (2 ** (item.attempt - 1))
+        logger.warning("mem0_write_retry_scheduled", attempt=item.attempt, delay_s=delay, error=str(exc))
+        task = asyncio.get_running_loop().create_task(self._requeue_later(item, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue_later(self, item: PendingWrite, delay: float) -> None:
+        await asyncio.sleep(delay)
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._reject(item, "queue_full")
+            return
+        _MEM0_QUEUE_DEPTH.set(self._queue.qsize())
+
+    @staticmethod
+    def _notify(item: PendingWrite, error: Optional[str]) -> None:
+        if item.on_done is None:
+            return
+        try:
+            item.on_done(error)
+        except Exception:  # noqa: BLE001
+            logger.exception("mem0_write_callback_failed")
+
+
+__all__ = ["Mem0WriteBehindQueue", "PendingWrite", "WriteCallback"]
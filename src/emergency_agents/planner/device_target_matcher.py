@@ -7,18 +7,23 @@
 - 确保每个设备至少分配1个目标，每个目标至少被1个设备覆盖
 
 核心算法：
-1. 计算设备-目标匹配分数（环境匹配 + 能力匹配 + 优先级加权）
-2. 贪心分配：高优先级目标优先，选择最佳设备
-3. 负载均衡：确保设备任务量均衡，避免某些设备过载
+1. 计算设备-目标匹配分数矩阵（环境匹配 + 能力匹配 + 优先级加权 + 距离），NumPy 向量化
+2. 带负载上限的最小费用流分配：以“分数 × 优先级权重”之和最大为目标，高优先级目标的匹配质量权重更高
+3. 负载均衡：单设备不超过平均任务数+2，目标数足够时每个设备至少分配1个目标
+
+技术要点：
+- 设备侧预计算环境类型编码与能力等级，目标侧预计算关键词位掩码与危险等级编码，按查表广播出 M×N 分数矩阵
+- 分配采用逐目标最短增广路（Dijkstra + 势函数），图只包含 M 个设备节点，数千目标规模下仍在秒级以内
 """
 
 from __future__ import annotations
 
 import math
 from enum import Enum
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Sequence, Union
 from uuid import UUID
 
+import numpy as np
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -57,6 +62,17 @@ class TargetPoint:
     lat: float
 
 
+# ============ 匹配关键词 ============
+
+# 空中设备适合：广域监控、快速侦察、全局扫描
+AIR_TARGET_KEYWORDS = ("广域", "监控", "重灾区", "搜索", "扫图", "建模", "aerial", "overview")
+# 地面设备适合：近距离侦察、复杂地形、建筑物内部
+LAND_TARGET_KEYWORDS = ("建筑", "道路", "地质", "滑坡", "裂缝", "桥梁", "社区", "building", "road", "bridge")
+# 水域设备适合：水域侦察、洪水区域、水质检测
+WATER_TARGET_KEYWORDS = ("水", "河", "湖", "江", "水库", "water", "river", "flood")
+FLOOD_DISASTER_TYPES = ("flood", "洪水", "水灾")
+
+
 # ============ 辅助函数 ============
 
 
@@ -135,26 +151,23 @@ class MatchingRule:
 
         if env_type == "air":
             # 空中设备适合：广域监控、快速侦察、全局扫描
-            if any(keyword in target_type or keyword in target_name for keyword in
-                   ["广域", "监控", "重灾区", "搜索", "扫图", "建模", "aerial", "overview"]):
+            if any(keyword in target_type or keyword in target_name for keyword in AIR_TARGET_KEYWORDS):
                 score += 40
             else:
                 score += 30  # 空中设备可以覆盖任何目标，但不是最优
 
         elif env_type == "land":
             # 地面设备适合：近距离侦察、复杂地形、建筑物内部
-            if any(keyword in target_type or keyword in target_name for keyword in
-                   ["建筑", "道路", "地质", "滑坡", "裂缝", "桥梁", "社区", "building", "road", "bridge"]):
+            if any(keyword in target_type or keyword in target_name for keyword in LAND_TARGET_KEYWORDS):
                 score += 40
             else:
                 score += 25
 
         elif env_type == "sea" or env_type == "water":
             # 水域设备适合：水域侦察、洪水区域、水质检测
-            if disaster_type.lower() in ["flood", "洪水", "水灾"]:
+            if disaster_type.lower() in FLOOD_DISASTER_TYPES:
                 score += 40
-            elif any(keyword in target_type or keyword in target_name for keyword in
-                     ["水", "河", "湖", "江", "水库", "water", "river", "flood"]):
+            elif any(keyword in target_type or keyword in target_name for keyword in WATER_TARGET_KEYWORDS):
                 score += 40
             else:
                 score += 10  # 水域设备不适合陆地任务
@@ -217,6 +230,209 @@ class MatchingRule:
         return score
 
 
+# ============ 向量化分数矩阵 ============
+
+# 目标关键词位掩码
+_AIR_BIT = 1
+_LAND_BIT = 2
+_WATER_BIT = 4
+
+# 设备环境编码 → 环境分数（未命中关键词 / 命中关键词）
+_ENV_AIR, _ENV_LAND, _ENV_WATER, _ENV_OTHER = 0, 1, 2, 3
+_ENV_BASE_SCORE = np.array([30.0, 25.0, 10.0, 25.0])
+
+# 能力等级(1-3) × 危险等级编码(0=中低危, 1=高危, 2=极高危) → 能力分数
+_CAPABILITY_SCORE = np.array([
+    [0.0, 0.0, 0.0],     # 占位（能力等级从1开始）
+    [25.0, 20.0, 10.0],  # BASIC
+    [25.0, 30.0, 20.0],  # STANDARD
+    [25.0, 30.0, 30.0],  # ADVANCED
+])
+_HAZARD_CODE = {"critical": 2, "high": 1}
+
+
+def _env_code(env_type: str) -> int:
+    env = env_type.lower()
+    if env == "air":
+        return _ENV_AIR
+    if env == "land":
+        return _ENV_LAND
+    if env in ("sea", "water"):
+        return _ENV_WATER
+    return _ENV_OTHER
+
+
+def _keyword_mask(target: Dict[str, Any]) -> int:
+    target_type = target.get("target_type", "").lower()
+    target_name = target.get("name", "").lower()
+    mask = 0
+    for bit, keywords in (
+        (_AIR_BIT, AIR_TARGET_KEYWORDS),
+        (_LAND_BIT, LAND_TARGET_KEYWORDS),
+        (_WATER_BIT, WATER_TARGET_KEYWORDS),
+    ):
+        if any(keyword in target_type or keyword in target_name for keyword in keywords):
+            mask |= bit
+    return mask
+
+
+def build_score_matrix(
+    devices: Sequence[Dict[str, Any]],
+    targets: Sequence[Dict[str, Any]],
+    disaster_type: str,
+    command_center: Optional[Dict[str, float]] = None,
+) -> np.ndarray:
+    """
+    向量化计算 M×N 匹配分数矩阵（行=设备，列=目标）
+
+    与 MatchingRule.calculate_match_score 逐对计算的结果一致：
+    设备侧只推断一次环境编码与能力等级，目标侧只扫描一次关键词，
+    再按查表 + 广播得到各维度分数，避免 M×N 次关键词扫描。
+    """
+    env_codes = np.array([_env_code(d.get("env_type", "")) for d in devices], dtype=np.int64)
+    levels = np.array(
+        [infer_capability_level(d.get("capabilities", [])).value for d in devices], dtype=np.int64
+    )
+    masks = np.array([_keyword_mask(t) for t in targets], dtype=np.int64)
+    hazard_codes = np.array(
+        [_HAZARD_CODE.get(t.get("hazard_level", "medium").lower(), 0) for t in targets], dtype=np.int64
+    )
+    priorities = np.array([t.get("priority", 50.0) for t in targets], dtype=float)
+
+    # 1. 环境匹配 (40分)
+    keyword_hit = np.stack([
+        (masks & _AIR_BIT) > 0,
+        (masks & _LAND_BIT) > 0,
+        np.full(masks.shape, disaster_type.lower() in FLOOD_DISASTER_TYPES) | ((masks & _WATER_BIT) > 0),
+        np.zeros(masks.shape, dtype=bool),
+    ])  # (4, N)，按环境编码取行
+    env_score = np.where(keyword_hit[env_codes], 40.0, _ENV_BASE_SCORE[env_codes][:, None])
+
+    # 2. 能力匹配 (30分)
+    capability_score = _CAPABILITY_SCORE[levels[:, None], hazard_codes[None, :]]
+
+    # 3. 优先级加权 (20分)
+    priority_bonus = np.minimum(20.0, priorities / 5.0)
+
+    # 4. 距离因素 (10分)
+    if command_center:
+        device_lon = np.array([d.get("lon", command_center.get("lon", 0)) for d in devices], dtype=float)
+        device_lat = np.array([d.get("lat", command_center.get("lat", 0)) for d in devices], dtype=float)
+        target_lon = np.array([t.get("lon", 0) for t in targets], dtype=float)
+        target_lat = np.array([t.get("lat", 0) for t in targets], dtype=float)
+        distance_km = _haversine_matrix_km(device_lon, device_lat, target_lon, target_lat)
+        distance_score = np.where(
+            distance_km < 10,
+            10.0,
+            np.where(distance_km < 50, 10 * (1 - (distance_km - 10) / 40), 0.0),
+        )
+    else:
+        distance_score = 5.0
+
+    return env_score + capability_score + priority_bonus[None, :] + distance_score
+
+
+def _haversine_matrix_km(
+    lon1: np.ndarray, lat1: np.ndarray, lon2: np.ndarray, lat2: np.ndarray
+) -> np.ndarray:
+    """haversine_distance 的矩阵版本（行=第一组点，列=第二组点，公里）"""
+    lat1_rad = np.radians(lat1)[:, None]
+    lat2_rad = np.radians(lat2)[None, :]
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lon2)[None, :] - np.radians(lon1)[:, None]
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# ============ 带负载上限的最小费用分配 ============
+
+# 设备“首个任务”的奖励，远大于任意两个分配方案的分数差，使目标数足够时每个设备都有任务
+_FIRST_TASK_BONUS = 1e4
+
+
+def min_cost_assign(
+    cost: np.ndarray,
+    capacity: np.ndarray,
+    first_slots: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    带负载上限的最小费用分配（运输问题）
+
+    参数：
+        cost: N×M 费用矩阵（行=目标，列=设备）
+        capacity: 长度 M 的设备负载上限，要求总容量 ≥ N
+        first_slots: 长度 M，每列前若干个任务享受首任务奖励（默认每列1个；列代表一组同类设备时取设备数）
+
+    返回：
+        长度 N 的数组，第 i 个目标分配到的设备下标
+
+    算法：逐目标求最短增广路（Dijkstra + 势函数）。已分配目标被折叠为设备间的边
+    （把目标 t 从设备 a 改派到 b 的费用 cost[t,b]-cost[t,a]），因此每次搜索只在 M 个设备节点上进行；
+    设备到汇点的边在首任务名额内费用为 -_FIRST_TASK_BONUS，未满载时为 0，满载时不可达。
+    """
+    n_targets, n_devices = cost.shape
+    if int(capacity.sum()) < n_targets:
+        raise ValueError("设备总容量不足以覆盖全部目标")
+    if first_slots is None:
+        first_slots = np.minimum(capacity, 1)
+
+    assignment = np.full(n_targets, -1, dtype=np.int64)
+    members: List[List[int]] = [[] for _ in range(n_devices)]
+    load = np.zeros(n_devices, dtype=np.int64)
+    potential = np.zeros(n_devices)
+    sink_potential = -_FIRST_TASK_BONUS
+    columns = np.arange(n_devices)
+
+    for target in range(n_targets):
+        reduced = cost[target] - potential
+        dist = reduced - reduced.min()
+        pred_device = np.full(n_devices, -1, dtype=np.int64)
+        pred_target = np.full(n_devices, -1, dtype=np.int64)
+        visited = np.zeros(n_devices, dtype=bool)
+        sink_cost = np.where(load < first_slots, -_FIRST_TASK_BONUS, np.where(load < capacity, 0.0, np.inf))
+        sink_reduced = sink_cost + potential - sink_potential
+
+        best, best_device = np.inf, -1
+        while True:
+            candidates = np.where(visited, np.inf, dist)
+            device = int(np.argmin(candidates))
+            current = candidates[device]
+            if current >= best:
+                break
+            visited[device] = True
+            if current + sink_reduced[device] < best:
+                best, best_device = current + sink_reduced[device], device
+            if not members[device]:
+                continue
+            assigned = np.asarray(members[device])
+            moved = cost[assigned] - potential
+            moved -= moved[:, device][:, None]
+            rows = moved.argmin(axis=0)
+            relaxed = current + moved[rows, columns]
+            improved = (relaxed < dist) & ~visited
+            dist[improved] = relaxed[improved]
+            pred_device[improved] = device
+            pred_target[improved] = assigned[rows[improved]]
+
+        # 更新势函数：已确定最短距离的设备按 dist-D 调整，保持约化费用非负
+        potential[visited] += dist[visited] - best
+
+        # 沿前驱链改派目标
+        device = best_device
+        load[device] += 1
+        while pred_device[device] != -1:
+            moved_target = int(pred_target[device])
+            previous = int(pred_device[device])
+            members[previous].remove(moved_target)
+            members[device].append(moved_target)
+            assignment[moved_target] = device
+            device = previous
+        members[device].append(target)
+        assignment[target] = device
+
+    return assignment
+
+
 # ============ 核心分配算法 ============
 
 
@@ -231,13 +447,11 @@ def smart_allocate(
     智能分配设备到目标
 
     算法流程：
-    1. 计算所有设备-目标的匹配分数矩阵 (M x N)
-    2. 贪心分配：
-       - 优先分配高优先级目标
-       - 为每个目标选择得分最高的设备
-    3. 负载均衡：
-       - 确保每个设备至少分配1个目标
-       - 避免某个设备任务过载（不超过平均任务数+2）
+    1. 向量化计算所有设备-目标的匹配分数矩阵 (M x N)
+    2. 最小费用流分配：
+       - 最大化 Σ 分数 × (1 + 优先级/100)，高优先级目标优先获得匹配度高的设备
+       - 单个设备不超过平均任务数+2（负载上限）
+    3. 负载均衡：目标数不少于设备数时，确保每个设备至少分配1个目标
 
     参数：
         devices: 设备列表（每个设备包含id, name, env_type, capabilities等）
@@ -252,6 +466,7 @@ def smart_allocate(
             "device_id_2": ["target_id_2"],
             ...
         }
+        每个设备的目标按优先级降序排列
     """
     logger.info(
         "开始智能设备-目标分配",
@@ -270,103 +485,57 @@ def smart_allocate(
         logger.warning("目标列表为空，返回空分配", trace_id=trace_id)
         return {str(d["id"]): [] for d in devices}
 
-    # 初始化分配结果
-    allocation: Dict[str, List[str]] = {str(d["id"]): [] for d in devices}
-    target_assigned: Dict[str, bool] = {str(t["id"]): False for t in targets}
-
     # 1. 计算匹配矩阵
-    match_matrix = []
-    for device in devices:
-        for target in targets:
-            score = MatchingRule.calculate_match_score(
-                device, target, disaster_type, command_center
-            )
-            match_matrix.append({
-                "device_id": str(device["id"]),
-                "target_id": str(target["id"]),
-                "score": score,
-                "target_priority": target.get("priority", 50.0)
-            })
+    score_matrix = build_score_matrix(devices, targets, disaster_type, command_center)
 
     logger.debug(
         "匹配矩阵计算完成",
-        matrix_size=len(match_matrix),
+        matrix_size=score_matrix.size,
         trace_id=trace_id
     )
 
-    # 2. 按目标优先级和匹配分数排序
-    match_matrix.sort(
-        key=lambda x: (x["target_priority"], x["score"]),
-        reverse=True
+    # 2. 分数完全相同的设备可互换，合并为设备组后求解（设备位置相同时组数不超过 环境类型×能力等级）
+    classes, device_class, class_sizes = np.unique(
+        score_matrix, axis=0, return_inverse=True, return_counts=True
     )
+    device_class = device_class.reshape(-1)
 
-    # 3. 贪心分配（优先处理高优先级目标）
+    # 3. 最小费用分配（按优先级降序处理目标，保证结果确定）
+    priorities = np.array([t.get("priority", 50.0) for t in targets], dtype=float)
+    order = np.argsort(-priorities, kind="stable")
     avg_load = len(targets) / len(devices)
-    max_load = avg_load + 2  # 单个设备最多分配平均值+2个任务
-
-    for match in match_matrix:
-        device_id = match["device_id"]
-        target_id = match["target_id"]
-
-        # 检查目标是否已分配
-        if target_assigned[target_id]:
-            continue
-
-        # 检查设备负载（避免过载）
-        if len(allocation[device_id]) >= max_load:
-            continue
-
-        # 分配
-        allocation[device_id].append(target_id)
-        target_assigned[target_id] = True
-
-    logger.info(
-        "贪心分配完成",
-        assigned_targets=sum(target_assigned.values()),
-        total_targets=len(targets),
-        trace_id=trace_id
+    max_load = math.ceil(avg_load + 2)  # 单个设备最多分配平均值+2个任务
+    weighted_cost = -(classes.T * (1 + priorities / 100.0)[:, None])
+    assigned_classes = min_cost_assign(
+        weighted_cost[order], class_sizes * max_load, first_slots=class_sizes
     )
 
-    # 4. 确保每个设备至少有1个任务（负载均衡兜底）
-    unassigned_targets = [tid for tid, assigned in target_assigned.items() if not assigned]
-    idle_devices = [did for did, targets_list in allocation.items() if not targets_list]
-
-    for device_id in idle_devices:
-        if unassigned_targets:
-            target_id = unassigned_targets.pop(0)
-            allocation[device_id].append(target_id)
-            target_assigned[target_id] = True
-            logger.debug(
-                "为空闲设备分配任务",
-                device_id=device_id,
-                target_id=target_id,
-                trace_id=trace_id
-            )
-
-    # 5. 如果还有未分配目标，分配给任务最少的设备
-    while unassigned_targets:
-        # 找到任务最少的设备
-        min_device = min(allocation.keys(), key=lambda d: len(allocation[d]))
-        target_id = unassigned_targets.pop(0)
-        allocation[min_device].append(target_id)
-        target_assigned[target_id] = True
-        logger.debug(
-            "剩余目标分配给任务最少设备",
-            device_id=min_device,
-            target_id=target_id,
-            trace_id=trace_id
-        )
-
-    # 6. 统计分配结果
+    # 4. 组内按优先级轮流分给各设备，组内负载差不超过1
+    allocation: Dict[str, List[str]] = {str(d["id"]): [] for d in devices}
+    device_ids = [str(d["id"]) for d in devices]
+    class_members = [np.flatnonzero(device_class == c).tolist() for c in range(len(classes))]
+    dealt = np.zeros(len(classes), dtype=np.int64)
+    assigned_devices = np.empty(len(targets), dtype=np.int64)
+    for target_index, class_index in zip(order, assigned_classes):
+        members = class_members[class_index]
+        device_index = members[dealt[class_index] % len(members)]
+        dealt[class_index] += 1
+        assigned_devices[target_index] = device_index
+        allocation[device_ids[device_index]].append(str(targets[target_index]["id"]))
+
+    # 5. 统计分配结果
     task_counts = [len(v) for v in allocation.values()]
+    assigned_scores = score_matrix[assigned_devices, np.arange(len(targets))]
     logger.info(
         "智能分配完成",
         total_devices=len(devices),
         total_targets=len(targets),
-        min_tasks_per_device=min(task_counts) if task_counts else 0,
-        max_tasks_per_device=max(task_counts) if task_counts else 0,
-        avg_tasks_per_device=sum(task_counts) / len(task_counts) if task_counts else 0,
-        coverage_rate=sum(target_assigned.values()) / len(targets) if targets else 0,
+        min_tasks_per_device=min(task_counts),
+        max_tasks_per_device=max(task_counts),
+        avg_tasks_per_device=sum(task_counts) / len(task_counts),
+        device_classes=len(classes),
+        avg_match_score=round(float(assigned_scores.mean()), 2),
+        coverage_rate=sum(task_counts) / len(targets),
         trace_id=trace_id
     )
 
@@ -8,8 +8,9 @@
 
 核心优化：
 1. 分组：将分配结果按env_type分为 air/land/sea 三组
-2. 并行LLM调用：每组独立调用LLM生成Markdown（3个线程）
+2. 并行LLM调用：每组独立调用LLM生成Markdown（同步版3个线程；异步版 agenerate 在事件循环内并发）
 3. 章节拼接：按顺序拼接为完整Markdown
+4. 异步版每个章节独立超时与降级，章节完成即通过 event_sink 推送，便于接口流式输出
 
 性能目标：
 - 3个章节并行调用：<45秒
@@ -18,16 +19,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import structlog
 
+from emergency_agents.graph.progress import EventSink, emit_event
+
 logger = structlog.get_logger(__name__)
 
+# 单个章节LLM调用的默认超时（秒），与同步版整体超时一致
+DEFAULT_SECTION_TIMEOUT_SECONDS = 300.0
+
+SECTION_SYSTEM_PROMPT = "你是应急救援侦察方案专家，擅长生成清晰专业的任务报告。"
+
 
 # ============ 章节标题映射 ============
 
@@ -58,16 +67,29 @@ SEVERITY_NAMES = {
 class GroupedMarkdownGenerator:
     """分组Markdown生成器"""
 
-    def __init__(self, llm_client: OpenAI, llm_model: str):
+    def __init__(
+        self,
+        llm_client: Optional[OpenAI],
+        llm_model: str,
+        *,
+        async_llm_client: Optional[AsyncOpenAI] = None,
+        section_timeout_seconds: float = DEFAULT_SECTION_TIMEOUT_SECONDS,
+    ):
         """
         初始化生成器
 
         参数：
-            llm_client: OpenAI客户端实例
+            llm_client: OpenAI客户端实例（同步 generate 使用；异步版未提供 async_llm_client 时放到线程中调用）
             llm_model: 模型名称（如 'glm-4.6'）
+            async_llm_client: AsyncOpenAI客户端实例（agenerate 使用，不占用线程）
+            section_timeout_seconds: 异步版单个章节的超时时间，超时章节使用降级内容
         """
+        if llm_client is None and async_llm_client is None:
+            raise ValueError("llm_client 与 async_llm_client 至少提供一个")
         self.llm_client = llm_client
+        self.async_llm_client = async_llm_client
         self.llm_model = llm_model
+        self.section_timeout_seconds = section_timeout_seconds
         self.logger = logger.bind(model=llm_model)
 
     def generate(
@@ -207,6 +229,179 @@ class GroupedMarkdownGenerator:
 
         return full_markdown
 
+    async def agenerate(
+        self,
+        allocation: Dict[str, List[str]],  # device_id -> target_ids
+        devices: List[Dict[str, Any]],
+        targets: List[Dict[str, Any]],
+        disaster_info: Dict[str, Any],
+        command_center: Dict[str, float],
+        trace_id: str = None,
+        *,
+        event_sink: Optional[EventSink] = None,
+    ) -> str:
+        """
+        异步生成按设备类型分组的Markdown报告（不阻塞事件循环）
+
+        流程：
+        1. 按env_type分组，立即推送 header 事件（标题+概述，无需LLM）
+        2. 并发生成各章节，每个章节独立超时；失败或超时的章节使用降级内容
+        3. 每个章节完成即推送 section 事件（完成顺序，不等待其他章节）
+        4. 推送 footer 事件，返回按 air/land/sea 顺序拼接的完整Markdown
+
+        参数：
+            与 generate 相同；event_sink 为可选的事件回调（见 graph.progress.EventSink）
+
+        返回：
+            完整的Markdown文本（与 generate 结构一致）
+        """
+        start_time = time.perf_counter()
+
+        self.logger.info(
+            "开始异步分组Markdown生成",
+            device_count=len(devices),
+            target_count=len(targets),
+            section_timeout_seconds=self.section_timeout_seconds,
+            trace_id=trace_id
+        )
+
+        groups = {
+            env_type: self._group_by_env_type(allocation, devices, targets, env_type)
+            for env_type in SECTION_TITLES
+        }
+        header = self._render_header(disaster_info, command_center, groups["air"], groups["land"], groups["sea"])
+        await emit_event(event_sink, "header", {"markdown": header})
+
+        pending = [
+            asyncio.create_task(
+                self._agenerate_section_safe(env_type, group, disaster_info, command_center, trace_id),
+                name=f"markdown_gen_{env_type}",
+            )
+            for env_type, group in groups.items()
+            if group["devices"]
+        ]
+
+        sections: Dict[str, str] = {}
+        try:
+            for completed in asyncio.as_completed(pending):
+                env_type, markdown, fallback, elapsed_ms = await completed
+                sections[env_type] = markdown
+                await emit_event(
+                    event_sink,
+                    "section",
+                    {
+                        "env_type": env_type,
+                        "title": SECTION_TITLES[env_type],
+                        "markdown": markdown,
+                        "fallback": fallback,
+                        "elapsed_ms": elapsed_ms,
+                    },
+                )
+        finally:
+            # 调用方取消（如客户端断开）时不遗留后台LLM请求
+            for task in pending:
+                task.cancel()
+
+        footer = self._render_footer()
+        await emit_event(event_sink, "footer", {"markdown": footer})
+
+        full_markdown = self._join_markdown(header, sections, footer)
+        self.logger.info(
+            "异步分组Markdown生成完成",
+            sections_count=len(sections),
+            total_length=len(full_markdown),
+            elapsed_seconds=round(time.perf_counter() - start_time, 2),
+            trace_id=trace_id
+        )
+        return full_markdown
+
+    async def _agenerate_section_safe(
+        self,
+        env_type: str,
+        group_data: Dict[str, Any],
+        disaster_info: Dict[str, Any],
+        command_center: Dict[str, float],
+        trace_id: str = None
+    ) -> Tuple[str, str, bool, int]:
+        """生成单个章节，超时或失败时返回降级内容：(env_type, markdown, 是否降级, 耗时ms)"""
+        start_time = time.perf_counter()
+        try:
+            markdown = await asyncio.wait_for(
+                self._agenerate_section(env_type, group_data, disaster_info, command_center, trace_id),
+                timeout=self.section_timeout_seconds,
+            )
+            fallback = False
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"{ENV_TYPE_NAMES[env_type]}章节生成超时，使用降级方案",
+                env_type=env_type,
+                timeout_seconds=self.section_timeout_seconds,
+                trace_id=trace_id
+            )
+            markdown = self._generate_fallback_section(
+                env_type, f"生成超时（>{self.section_timeout_seconds:g}秒），已取消该章节生成"
+            )
+            fallback = True
+        except Exception as e:
+            self.logger.error(
+                f"{ENV_TYPE_NAMES[env_type]}章节生成失败",
+                env_type=env_type,
+                error=str(e),
+                trace_id=trace_id
+            )
+            markdown = self._generate_fallback_section(env_type, str(e))
+            fallback = True
+        return env_type, markdown, fallback, int((time.perf_counter() - start_time) * 1000)
+
+    async def _agenerate_section(
+        self,
+        env_type: str,
+        group_data: Dict[str, Any],
+        disaster_info: Dict[str, Any],
+        command_center: Dict[str, float],
+        trace_id: str = None
+    ) -> str:
+        """异步生成单个章节；未配置异步客户端时在线程中执行同步版本"""
+        if self.async_llm_client is None:
+            return await asyncio.to_thread(
+                self._generate_section, env_type, group_data, disaster_info, command_center, trace_id
+            )
+
+        start_time = time.perf_counter()
+        self.logger.info(
+            f"开始生成{ENV_TYPE_NAMES[env_type]}章节",
+            env_type=env_type,
+            device_count=len(group_data["devices"]),
+            target_count=group_data["target_count"],
+            trace_id=trace_id
+        )
+        prompt = self._build_section_prompt(env_type, group_data, disaster_info, command_center)
+        response = await self.async_llm_client.chat.completions.create(
+            **self._completion_kwargs(prompt),
+            timeout=self.section_timeout_seconds,
+        )
+        markdown = response.choices[0].message.content.strip()
+        self.logger.info(
+            f"{ENV_TYPE_NAMES[env_type]}章节LLM调用成功",
+            env_type=env_type,
+            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+            output_length=len(markdown),
+            trace_id=trace_id
+        )
+        return markdown
+
+    def _completion_kwargs(self, prompt: str) -> Dict[str, Any]:
+        """章节生成的LLM请求参数（同步/异步共用）"""
+        return {
+            "model": self.llm_model,
+            "messages": [
+                {"role": "system", "content": SECTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.3,
+            "max_tokens": 16000,  # GLM-4.6支持最大128K，设置16K足够容纳完整输出
+        }
+
     def _group_by_env_type(
         self,
         allocation: Dict[str, List[str]],
@@ -312,19 +507,7 @@ class GroupedMarkdownGenerator:
         # 调用LLM（添加显式300秒超时）
         try:
             response = self.llm_client.chat.completions.create(
-                model=self.llm_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是应急救援侦察方案专家，擅长生成清晰专业的任务报告。"
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=16000,  # GLM-4.6支持最大128K，设置16K足够容纳完整输出
+                **self._completion_kwargs(prompt),
                 timeout=300  # 显式设置300秒超时，与ThreadPoolExecutor一致
             )
 
@@ -464,6 +647,28 @@ class GroupedMarkdownGenerator:
         ## 四、数据整合与通信
         ...
         """
+        header = self._render_header(disaster_info, command_center, air_group, land_group, sea_group)
+        return self._join_markdown(header, sections, self._render_footer())
+
+    def _join_markdown(self, header: str, sections: Dict[str, str], footer: str) -> str:
+        """按 air/land/sea 顺序拼接章节"""
+        parts = [header]
+        for env_type in ["air", "land", "sea"]:
+            if env_type in sections and sections[env_type]:
+                parts.append(sections[env_type])
+                parts.append("")
+        parts.append(footer)
+        return "\n".join(parts)
+
+    def _render_header(
+        self,
+        disaster_info: Dict[str, Any],
+        command_center: Dict[str, float],
+        air_group: Dict[str, Any],
+        land_group: Dict[str, Any],
+        sea_group: Dict[str, Any]
+    ) -> str:
+        """标题 + 概述（不依赖LLM，可在章节生成前先行输出）"""
         parts = []
 
         # 1. 标题
@@ -491,13 +696,11 @@ class GroupedMarkdownGenerator:
         parts.append("**整体任务目标**：全面侦察灾区情况，采集多维度数据，为救援决策提供依据。")
         parts.append("")
 
-        # 3. 拼接各章节（按air/land/sea顺序）
-        for env_type in ["air", "land", "sea"]:
-            if env_type in sections and sections[env_type]:
-                parts.append(sections[env_type])
-                parts.append("")
+        return "\n".join(parts)
 
-        # 4. 数据整合与通信章节
+    def _render_footer(self) -> str:
+        """数据整合与通信章节（固定内容）"""
+        parts = []
         parts.append("## 四、数据整合与通信")
         parts.append("")
         parts.append("**数据回传**：")
@@ -0,0 +1,281 @@
+"""
+侦察路线访问顺序优化模块
+
+功能：为“起点 → 多个目标 → 返回起点”的闭环侦察路线求解较优访问顺序（TSP）
+算法：
+1. NumPy 向量化计算 haversine 直线距离矩阵
+2. 最近邻构造初始回路
+3. 2-opt（区间反转）+ Or-opt（1~3 个连续点迁移）局部搜索至收敛
+4. 用真实道路耗时修正：并发获取所选回路各段的道路距离/耗时，按实测校准其余边的估计代价后重新搜索，
+   仅在真实总耗时下降时接受新顺序
+
+技术要点：
+- 纯函数为主：距离矩阵、构造、局部搜索均无副作用，可测试性强
+- 确定性：相同输入保证相同输出（并列时取较小下标）
+- 起点固定为下标 0，回路首尾都是起点
+- 道路代价通过注入的异步 leg_fetcher 获取，模块本身不依赖具体地图服务
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_EARTH_RADIUS_M = 6_371_008.8
+# Or-opt 迁移的最大连续段长度
+_OR_OPT_MAX_SEGMENT = 3
+# 浮点比较容差（米/秒），避免在等价解之间来回震荡
+_EPSILON = 1e-6
+
+
+@dataclass(slots=True)
+class RoadLeg:
+    """一段道路行程（由 leg_fetcher 提供）。"""
+
+    distance_m: float
+    duration_s: float
+    estimated: bool = False  # True 表示道路规划失败、按直线估算
+
+
+LegFetcher = Callable[[int, int], Awaitable[RoadLeg]]
+
+
+# ============ 距离矩阵 ============
+
+
+def haversine_matrix(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """计算 (lng, lat) 点集两两之间的大圆距离矩阵（米）。"""
+    coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+    lng = coords[:, 0][:, None]
+    lat = coords[:, 1][:, None]
+    d_lat = lat.T - lat
+    d_lng = lng.T - lng
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(d_lng / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def tour_cost(order: Sequence[int], cost: np.ndarray) -> float:
+    """闭环回路总代价（order 以起点 0 开头，不重复写终点）。"""
+    if len(order) < 2:
+        return 0.0
+    idx = np.asarray(order)
+    return float(cost[idx, np.roll(idx, -1)].sum())
+
+
+# ============ 构造 + 局部搜索 ============
+
+
+def nearest_neighbor_tour(cost: np.ndarray, start: int = 0) -> List[int]:
+    """最近邻构造：从起点出发每次前往最近的未访问点。"""
+    n = cost.shape[0]
+    order = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    current = start
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, cost[current])
+        current = int(np.argmin(row))
+        visited[current] = True
+        order.append(current)
+    return order
+
+
+def two_opt(order: List[int], cost: np.ndarray) -> List[int]:
+    """2-opt：反转区间 order[i..j] 直至无改进（起点位置固定）。"""
+    tour = list(order)
+    n = len(tour)
+    if n < 4:
+        return tour
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            a, b = tour[i - 1], tour[i]
+            for j in range(i + 1, n):
+                c, d = tour[j], tour[(j + 1) % n]
+                delta = cost[a, c] + cost[b, d] - cost[a, b] - cost[c, d]
+                if delta < -_EPSILON:
+                    tour[i : j + 1] = reversed(tour[i : j + 1])
+                    improved = True
+                    a, b = tour[i - 1], tour[i]
+    return tour
+
+
+def or_opt(order: List[int], cost: np.ndarray) -> List[int]:
+    """Or-opt：将 1~3 个连续点整体迁移到回路其他位置（保持或反转方向），直至无改进。"""
+    tour = list(order)
+    n = len(tour)
+    if n < 4:
+        return tour
+    improved = True
+    while improved:
+        improved = False
+        for seg_len in range(1, min(_OR_OPT_MAX_SEGMENT, n - 2) + 1):
+            for i in range(1, n - seg_len + 1):
+                prev_node = tour[i - 1]
+                first, last = tour[i], tour[i + seg_len - 1]
+                next_node = tour[(i + seg_len) % n]
+                removal_gain = cost[prev_node, first] + cost[last, next_node] - cost[prev_node, next_node]
+                remainder = tour[:i] + tour[i + seg_len :]
+                segment = tour[i : i + seg_len]
+                best: Optional[Tuple[float, int, bool]] = None
+                for k in range(len(remainder)):
+                    u, v = remainder[k], remainder[(k + 1) % len(remainder)]
+                    forward = cost[u, first] + cost[last, v] - cost[u, v]
+                    backward = cost[u, last] + cost[first, v] - cost[u, v]
+                    for added, reverse in ((forward, False), (backward, True)):
+                        delta = added - removal_gain
+                        if delta < -_EPSILON and (best is None or delta < best[0]):
+                            best = (delta, k, reverse)
+                if best is not None:
+                    _, k, reverse = best
+                    moved = list(reversed(segment)) if reverse else segment
+                    tour = remainder[: k + 1] + moved + remainder[k + 1 :]
+                    improved = True
+                    break
+            if improved:
+                break
+    return tour
+
+
+def solve_closed_tour(cost: np.ndarray, *, initial: Optional[List[int]] = None) -> List[int]:
+    """最近邻（或给定初始解）+ 交替 2-opt / Or-opt 至收敛，返回以 0 开头的访问顺序。"""
+    tour = list(initial) if initial is not None else nearest_neighbor_tour(cost, 0)
+    best_cost = tour_cost(tour, cost)
+    while True:
+        tour = or_opt(two_opt(tour, cost), cost)
+        current = tour_cost(tour, cost)
+        if current >= best_cost - _EPSILON:
+            break
+        best_cost = current
+    return tour
+
+
+# ============ 道路代价修正 ============
+
+
+@dataclass(slots=True)
+class OptimizedRoute:
+    """优化结果：访问顺序（以起点 0 开头）与各段道路行程（按回路顺序，含返程）。"""
+
+    order: List[int]
+    legs: List[RoadLeg]
+    straight_line_m: float
+    refinement_rounds: int
+
+    @property
+    def road_distance_m(self) -> float:
+        return sum(leg.distance_m for leg in self.legs)
+
+    @property
+    def road_duration_s(self) -> float:
+        return sum(leg.duration_s for leg in self.legs)
+
+
+def _tour_edges(order: Sequence[int]) -> List[Tuple[int, int]]:
+    return [(order[i], order[(i + 1) % len(order)]) for i in range(len(order))]
+
+
+async def optimize_route(
+    points: Sequence[Tuple[float, float]],
+    leg_fetcher: LegFetcher,
+    *,
+    max_refinement_rounds: int = 2,
+    max_concurrency: int = 8,
+) -> OptimizedRoute:
+    """求解闭环访问顺序并用真实道路耗时修正。
+
+    Args:
+        points: (lng, lat) 列表，下标 0 为起点
+        leg_fetcher: 异步获取 i→j 道路行程的回调（同一回路的各段会有界并发请求）
+        max_refinement_rounds: 道路代价修正的最大轮数
+        max_concurrency: 同时在途的 leg_fetcher 请求上限（避免超出地图服务 QPS 后退化为直线估算）
+    """
+    distance = haversine_matrix(points)
+    order = solve_closed_tour(distance)
+    straight_line = tour_cost(order, distance)
+
+    known: Dict[Tuple[int, int], RoadLeg] = {}
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _fetch_leg(i: int, j: int) -> RoadLeg:
+        async with semaphore:
+            return await leg_fetcher(i, j)
+
+    async def _fetch_missing(edges: List[Tuple[int, int]]) -> None:
+        missing = [edge for edge in dict.fromkeys(edges) if edge not in known]
+        if missing:
+            results = await asyncio.gather(*(_fetch_leg(i, j) for i, j in missing))
+            known.update(zip(missing, results))
+
+    await _fetch_missing(_tour_edges(order))
+    best_duration = sum(known[edge].duration_s for edge in _tour_edges(order))
+
+    rounds = 0
+    for _ in range(max_refinement_rounds):
+        road_cost = _calibrated_cost(distance, known)
+        candidate = solve_closed_tour(road_cost, initial=order)
+        if candidate == order:
+            break
+        rounds += 1
+        await _fetch_missing(_tour_edges(candidate))
+        candidate_duration = sum(known[edge].duration_s for edge in _tour_edges(candidate))
+        if candidate_duration >= best_duration - _EPSILON:
+            break
+        order, best_duration = candidate, candidate_duration
+
+    legs = [known[edge] for edge in _tour_edges(order)]
+    logger.info(
+        "route_optimizer_completed",
+        point_count=len(points),
+        straight_line_m=round(straight_line, 1),
+        road_duration_s=round(best_duration, 1),
+        refinement_rounds=rounds,
+        fetched_legs=len(known),
+    )
+    return OptimizedRoute(order=order, legs=legs, straight_line_m=straight_line, refinement_rounds=rounds)
+
+
+def _calibrated_cost(distance: np.ndarray, known: Dict[Tuple[int, int], RoadLeg]) -> np.ndarray:
+    """以秒为单位的代价矩阵：已知边取实测道路耗时，其余按实测“秒/直线米”中位数估计。
+
+    结果取双向平均后对称化，保证 2-opt 区间反转的增量计算准确；往返不对称由调用方按实测耗时复核。
+    """
+    ratios = [
+        leg.duration_s / distance[edge]
+        for edge, leg in known.items()
+        if distance[edge] > 0 and leg.duration_s > 0 and not leg.estimated
+    ]
+    seconds_per_meter = float(np.median(ratios)) if ratios else 1.0 / 15.0
+    cost = distance * seconds_per_meter
+    for (i, j), leg in known.items():
+        cost[i, j] = leg.duration_s
+        if (j, i) not in known:
+            cost[j, i] = leg.duration_s
+    return (cost + cost.T) / 2
+
+
+def naive_order(count: int) -> List[int]:
+    """按输入顺序访问（对照基线）。"""
+    return list(range(count))
+
+
+__all__ = [
+    "LegFetcher",
+    "OptimizedRoute",
+    "RoadLeg",
+    "haversine_matrix",
+    "naive_order",
+    "nearest_neighbor_tour",
+    "optimize_route",
+    "or_opt",
+    "solve_closed_tour",
+    "tour_cost",
+    "two_opt",
+]
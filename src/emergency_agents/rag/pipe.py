@@ -1,8 +1,10 @@
 # Copyright 2025 msq
 from __future__ import annotations
 
+import asyncio
+import threading
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 import httpx
 from qdrant_client import QdrantClient
@@ -13,6 +15,9 @@ from llama_index.vector_stores.qdrant import QdrantVectorStore
 from llama_index.llms.openai_like import OpenAILike
 from llama_index.embeddings.openai import OpenAIEmbedding
 from prometheus_client import Counter, Histogram
+from pydantic import PrivateAttr
+
+from emergency_agents.cache.embedding_cache import EmbeddingCache, get_embedding_cache
 
 # 全局注册一次 Prometheus 指标，避免多实例重复注册
 _RAG_IDX_COUNTER = Counter('rag_index_total', 'RAG index requests', ['domain'])
@@ -29,6 +34,32 @@ class RagChunk:
     loc: str     # 页码/段落
 
 
+class CachedOpenAIEmbedding(OpenAIEmbedding):
+    """带内容哈希缓存的查询嵌入；文档批量嵌入（索引）不经过缓存。"""
+
+    _embedding_cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(self, *, embedding_cache: EmbeddingCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._embedding_cache = embedding_cache
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        cached = self._embedding_cache.get(self.model_name, query, subsystem="rag")
+        if cached is not None:
+            return cached
+        vector = super()._get_query_embedding(query)
+        self._embedding_cache.set(self.model_name, query, vector)
+        return vector
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        cached = await self._embedding_cache.aget(self.model_name, query, subsystem="rag")
+        if cached is not None:
+            return cached
+        vector = await super()._aget_query_embedding(query)
+        await self._embedding_cache.aset(self.model_name, query, vector)
+        return vector
+
+
 class RagPipeline:
     """基于 LlamaIndex 与 Qdrant 的最小 RAG 外观。
 
@@ -69,11 +100,13 @@ class RagPipeline:
             is_function_calling_model=False,
             http_client=custom_http_client,  # 使用自定义客户端
         )
-        Settings.embed_model = OpenAIEmbedding(
+        Settings.embed_model = CachedOpenAIEmbedding(
+            embedding_cache=get_embedding_cache(),  # 与 Mem0 共享的查询嵌入缓存
             model_name=self.embedding_model,
             api_key=self.openai_api_key,
             api_base=self.openai_base_url,
             http_client=custom_http_client,  # 使用自定义客户端
+            async_http_client=httpx.AsyncClient(trust_env=False, timeout=timeout),  # aquery 路径同样禁用系统代理
             embed_batch_size=32,  # 智谱GLM API限制：最大64条，设置32保守处理
         )
 
@@ -82,10 +115,71 @@ class RagPipeline:
         self._qry_counter = _RAG_QRY_COUNTER
         self._qry_latency = _RAG_QRY_LATENCY
 
+        # 长生命周期 Qdrant 客户端：进程内复用连接池，避免每次查询重建客户端与索引
+        self._client = QdrantClient(url=self.qdrant_url, api_key=self.qdrant_api_key)
+        self._aclient: Any | None = None
+        self._indexes: Dict[str, VectorStoreIndex] = {}
+        self._retrievers: Dict[Tuple[str, int], Any] = {}
+        self._cache_lock = threading.Lock()
+
+    def _async_client(self) -> Any | None:
+        """惰性创建异步 Qdrant 客户端；依赖缺失时返回 None 并退回同步检索。"""
+        if self._aclient is None:
+            try:
+                from qdrant_client import AsyncQdrantClient
+            except ImportError:  # pragma: no cover - 旧版 qdrant-client
+                return None
+            self._aclient = AsyncQdrantClient(url=self.qdrant_url, api_key=self.qdrant_api_key)
+        return self._aclient
+
     def _vector_store(self, collection: str) -> QdrantVectorStore:
-        """构造 Qdrant 向量存储实例。"""
-        client = QdrantClient(url=self.qdrant_url, api_key=self.qdrant_api_key)
-        return QdrantVectorStore(client=client, collection_name=collection)
+        """构造绑定共享客户端的 Qdrant 向量存储实例。"""
+        aclient = self._async_client()
+        if aclient is None:
+            return QdrantVectorStore(client=self._client, collection_name=collection)
+        return QdrantVectorStore(client=self._client, aclient=aclient, collection_name=collection)
+
+    def _index(self, domain: str) -> VectorStoreIndex:
+        """按域缓存 VectorStoreIndex，首次访问时构建。"""
+        collection = f"rag_{domain}"
+        index = self._indexes.get(collection)
+        if index is not None:
+            return index
+        with self._cache_lock:
+            index = self._indexes.get(collection)
+            if index is None:
+                index = VectorStoreIndex.from_vector_store(self._vector_store(collection))
+                self._indexes[collection] = index
+                logger.info("rag_index_cached", collection=collection)
+        return index
+
+    def _retriever(self, domain: str, top_k: int) -> Any:
+        """按 (域, top_k) 缓存检索器。
+
+        只取召回片段，不经过 query engine 的 LLM 答案合成（合成结果从未被使用）。
+        """
+        key = (domain, top_k)
+        retriever = self._retrievers.get(key)
+        if retriever is not None:
+            return retriever
+        index = self._index(domain)
+        with self._cache_lock:
+            retriever = self._retrievers.get(key)
+            if retriever is None:
+                retriever = index.as_retriever(similarity_top_k=top_k)
+                self._retrievers[key] = retriever
+        return retriever
+
+    def close(self) -> None:
+        """释放 Qdrant 客户端连接。"""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """释放同步与异步 Qdrant 客户端连接。"""
+        self._client.close()
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
 
     def index_documents(self, domain: str, docs: List[Dict[str, Any]]) -> None:
         """索引一批文档。
@@ -104,8 +198,7 @@ class RagPipeline:
 
         # 强校验：已存在集合的维度必须一致，否则直接失败
         try:
-            client = QdrantClient(url=self.qdrant_url, api_key=self.qdrant_api_key)
-            info = client.get_collection(collection)
+            info = self._client.get_collection(collection)
             actual = info.config.params.vectors.size  # type: ignore[attr-defined]
             if int(actual) != int(self.embedding_dim):
                 raise ValueError(f"Qdrant collection '{collection}' dim={actual} != EMBEDDING_DIM={self.embedding_dim}")
@@ -127,20 +220,39 @@ class RagPipeline:
         Returns:
             可引用片段列表（文本+来源+位置）。
         """
-        collection = f"rag_{domain}"
-        vector_store = self._vector_store(collection)
-        index = VectorStoreIndex.from_vector_store(vector_store)
-        engine = index.as_query_engine(similarity_top_k=top_k)
+        retriever = self._retriever(domain, top_k)
+        with self._qry_latency.labels(domain=domain).time():
+            nodes = retriever.retrieve(question)
+        self._qry_counter.labels(domain=domain).inc()
+        return _nodes_to_chunks(nodes)
+
+    async def aquery(self, question: str, domain: str, top_k: int = 3) -> List[RagChunk]:
+        """异步查询，语义同 :meth:`query`，无需 ``asyncio.to_thread``。"""
+        if self._async_client() is None:  # pragma: no cover - 旧版 qdrant-client
+            return await asyncio.to_thread(self.query, question, domain, top_k)
+        retriever = self._retriever(domain, top_k)
         with self._qry_latency.labels(domain=domain).time():
-            resp = engine.query(question)
-        chunks: List[RagChunk] = []
-        for node in getattr(resp, "source_nodes", []) or []:
-            meta = node.node.metadata or {}
-            source = meta.get("id") or meta.get("source") or "unknown"
-            loc = meta.get("loc") or meta.get("page") or ""
-            chunks.append(RagChunk(text=node.node.get_content(), source=source, loc=str(loc)))
+            nodes = await retriever.aretrieve(question)
         self._qry_counter.labels(domain=domain).inc()
-        return chunks
+        return _nodes_to_chunks(nodes)
+
+
+def _nodes_to_chunks(nodes: List[Any]) -> List[RagChunk]:
+    chunks: List[RagChunk] = []
+    for node in nodes or []:
+        meta = node.node.metadata or {}
+        source = meta.get("id") or meta.get("source") or "unknown"
+        loc = meta.get("loc") or meta.get("page") or ""
+        chunks.append(RagChunk(text=node.node.get_content(), source=source, loc=str(loc)))
+    return chunks
+
+
+async def aquery_rag(rag_pipeline: Any, question: str, domain: str, top_k: int = 3) -> List[RagChunk]:
+    """优先走管道的 ``aquery``；仅实现同步 ``query`` 的替身/旧实现退回线程池。"""
+    aquery = getattr(rag_pipeline, "aquery", None)
+    if aquery is not None:
+        return await aquery(question=question, domain=domain, top_k=top_k)
+    return await asyncio.to_thread(rag_pipeline.query, question=question, domain=domain, top_k=top_k)
 
 
 class DisabledRagPipeline:
@@ -165,3 +277,12 @@ class DisabledRagPipeline:
             top_k=top_k,
         )
         return []
+
+    async def aquery(self, question: str, domain: str, top_k: int = 3) -> List[RagChunk]:
+        return self.query(question, domain, top_k)
+
+    def close(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
@@ -3,6 +3,7 @@
 from .service import RiskCacheManager, RiskCacheState
 from .repository import RiskDataRepository
 from .predictor import RiskPredictor, RiskPredictionResult
+from .spatial_index import RiskZoneSpatialIndex
 
 __all__ = [
     "RiskCacheManager",
@@ -10,4 +11,5 @@ __all__ = [
     "RiskDataRepository",
     "RiskPredictor",
     "RiskPredictionResult",
+    "RiskZoneSpatialIndex",
 ]
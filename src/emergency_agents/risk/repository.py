@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Sequence, Tuple
 
 from emergency_agents.db.dao import IncidentDAO
 from emergency_agents.db.models import RiskZoneRecord
@@ -24,3 +24,12 @@ class RiskDataRepository:
             radius_meters=radius_meters,
         )
         return zones
+
+    async def find_zones_near_points(
+        self,
+        points: Sequence[Tuple[float, float]],
+        *,
+        radius_meters: float,
+    ) -> list[list[RiskZoneRecord]]:
+        """批量查询多个 (lng, lat) 坐标附近的活跃风险区域（单次数据库往返）"""
+        return await self._incident_dao.find_zones_near_points(points, radius_meters=radius_meters)
@@ -3,12 +3,13 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Sequence
+from typing import List, Optional, Sequence, Tuple
 
 import structlog
 
 from emergency_agents.db.dao import IncidentDAO
 from emergency_agents.db.models import RiskZoneRecord
+from emergency_agents.risk.spatial_index import RiskZoneSpatialIndex
 
 
 @dataclass(slots=True)
@@ -33,6 +34,7 @@ class RiskCacheManager:
         self._incident_dao = incident_dao
         self._ttl = timedelta(seconds=ttl_seconds)
         self._state: RiskCacheState | None = None
+        self._index: Optional[Tuple[datetime, RiskZoneSpatialIndex]] = None
         self._lock = asyncio.Lock()
         self._logger = structlog.get_logger(__name__)
 
@@ -80,6 +82,17 @@ class RiskCacheManager:
             return None
         return RiskCacheState(list(state.zones), state.refreshed_at)
 
+    def spatial_index(self) -> RiskZoneSpatialIndex | None:
+        """当前缓存区域的内存空间索引（每个刷新批次懒构建一次，不触发刷新）。"""
+        state = self._state
+        if state is None:
+            return None
+        cached = self._index
+        if cached is None or cached[0] != state.refreshed_at:
+            cached = (state.refreshed_at, RiskZoneSpatialIndex(state.zones))
+            self._index = cached
+        return cached[1]
+
     def _is_expired(self, refreshed_at: datetime) -> bool:
         return datetime.now(timezone.utc) - refreshed_at >= self._ttl
 
@@ -0,0 +1,217 @@
+"""危险区域内存空间索引。
+
+为 RiskCacheManager 缓存的危险区域建立均匀网格索引，支持在不访问数据库的情况下
+批量判断航点附近的风险区域（risk_overlay 的降级路径）。
+
+距离在查询点附近做等距圆柱投影后按平面计算，百米至公里级半径下与 PostGIS
+geography 距离的误差在 1% 以内，足以用于风险分级。
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from emergency_agents.db.models import RiskZoneRecord
+
+_METERS_PER_DEG_LAT = 110_540.0
+_METERS_PER_DEG_LNG = 111_320.0
+
+# 覆盖网格数超过该值的超大区域不入网格，每次查询直接参与精确计算
+_MAX_CELLS_PER_ZONE = 4096
+
+
+@dataclass(slots=True)
+class _IndexedZone:
+    zone: RiskZoneRecord
+    bbox: Tuple[float, float, float, float]  # min_lng, min_lat, max_lng, max_lat
+    polygons: List[List[np.ndarray]]  # 每个多边形：外环 + 内环（经纬度 (n, 2)）
+    lines: List[np.ndarray]  # 线要素与点要素（单点按长度为 1 的折线处理）
+
+
+class RiskZoneSpatialIndex:
+    """危险区域网格索引（只读，重建代价与区域数量线性相关）。"""
+
+    def __init__(self, zones: Iterable[RiskZoneRecord], *, cell_size_deg: float = 0.01) -> None:
+        if cell_size_deg <= 0:
+            raise ValueError("cell_size_deg 必须大于 0")
+        self._cell = cell_size_deg
+        self._zones: List[_IndexedZone] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._oversized: List[int] = []
+        for zone in zones:
+            indexed = _index_zone(zone)
+            if indexed is None:
+                continue
+            position = len(self._zones)
+            self._zones.append(indexed)
+            min_x, min_y = self._cell_of(indexed.bbox[0], indexed.bbox[1])
+            max_x, max_y = self._cell_of(indexed.bbox[2], indexed.bbox[3])
+            if (max_x - min_x + 1) * (max_y - min_y + 1) > _MAX_CELLS_PER_ZONE:
+                self._oversized.append(position)
+                continue
+            for cx in range(min_x, max_x + 1):
+                for cy in range(min_y, max_y + 1):
+                    self._grid[(cx, cy)].append(position)
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def _cell_of(self, lng: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lng / self._cell), math.floor(lat / self._cell)
+
+    def _candidates(self, lng: float, lat: float, radius_meters: float) -> Set[int]:
+        d_lat = radius_meters / _METERS_PER_DEG_LAT
+        d_lng = radius_meters / (_METERS_PER_DEG_LNG * max(math.cos(math.radians(lat)), 1e-6))
+        min_x, min_y = self._cell_of(lng - d_lng, lat - d_lat)
+        max_x, max_y = self._cell_of(lng + d_lng, lat + d_lat)
+        found: Set[int] = set(self._oversized)
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                found.update(self._grid.get((cx, cy), ()))
+        return found
+
+    def query(
+        self,
+        lng: float,
+        lat: float,
+        radius_meters: float,
+        *,
+        reference_time: Optional[datetime] = None,
+    ) -> List[RiskZoneRecord]:
+        """返回距坐标 radius_meters 内的有效区域，按严重度降序、距离升序（与 PostGIS 查询一致）。"""
+        now = reference_time or datetime.now(timezone.utc)
+        hits: List[Tuple[int, float, RiskZoneRecord]] = []
+        for position in self._candidates(lng, lat, radius_meters):
+            indexed = self._zones[position]
+            valid_until = indexed.zone.valid_until
+            if valid_until is not None and valid_until < now:
+                continue
+            distance = _distance_meters(indexed, lng, lat, radius_meters)
+            if distance is not None and distance <= radius_meters:
+                hits.append((indexed.zone.severity, distance, indexed.zone))
+        hits.sort(key=lambda item: (-item[0], item[1]))
+        return [zone for _, _, zone in hits]
+
+    def query_many(
+        self,
+        points: Sequence[Tuple[float, float]],
+        radius_meters: float,
+        *,
+        reference_time: Optional[datetime] = None,
+    ) -> List[List[RiskZoneRecord]]:
+        """批量查询，points 为 (lng, lat) 序列，返回值与之一一对应。"""
+        now = reference_time or datetime.now(timezone.utc)
+        return [self.query(lng, lat, radius_meters, reference_time=now) for lng, lat in points]
+
+
+def _index_zone(zone: RiskZoneRecord) -> Optional[_IndexedZone]:
+    polygons: List[List[np.ndarray]] = []
+    lines: List[np.ndarray] = []
+    _collect_geometry(zone.geometry_geojson, polygons, lines)
+    arrays = [ring for polygon in polygons for ring in polygon] + lines
+    if not arrays:
+        return None
+    stacked = np.vstack(arrays)
+    bbox = (
+        float(stacked[:, 0].min()),
+        float(stacked[:, 1].min()),
+        float(stacked[:, 0].max()),
+        float(stacked[:, 1].max()),
+    )
+    return _IndexedZone(zone=zone, bbox=bbox, polygons=polygons, lines=lines)
+
+
+def _collect_geometry(
+    geometry: Mapping[str, Any] | None,
+    polygons: List[List[np.ndarray]],
+    lines: List[np.ndarray],
+) -> None:
+    """解析 GeoJSON 几何为坐标数组（忽略无法识别的类型）。"""
+    if not geometry:
+        return
+    kind = geometry.get("type")
+    coords = geometry.get("coordinates")
+    if kind == "GeometryCollection":
+        for child in geometry.get("geometries") or []:
+            _collect_geometry(child, polygons, lines)
+    elif kind == "Polygon" and coords:
+        polygons.append([_as_array(ring) for ring in coords if ring])
+    elif kind == "MultiPolygon" and coords:
+        for polygon in coords:
+            if polygon:
+                polygons.append([_as_array(ring) for ring in polygon if ring])
+    elif kind == "LineString" and coords:
+        lines.append(_as_array(coords))
+    elif kind == "MultiLineString" and coords:
+        lines.extend(_as_array(line) for line in coords if line)
+    elif kind == "Point" and coords:
+        lines.append(_as_array([coords]))
+    elif kind == "MultiPoint" and coords:
+        lines.extend(_as_array([point]) for point in coords)
+
+
+def _as_array(coords: Sequence[Sequence[float]]) -> np.ndarray:
+    return np.asarray([(float(c[0]), float(c[1])) for c in coords], dtype=float)
+
+
+def _distance_meters(indexed: _IndexedZone, lng: float, lat: float, radius_meters: float) -> Optional[float]:
+    """点到区域的距离（米）；点在多边形内返回 0；包围盒已超出半径时返回 None。"""
+    scale_x = _METERS_PER_DEG_LNG * math.cos(math.radians(lat))
+    min_lng, min_lat, max_lng, max_lat = indexed.bbox
+    dx = max(min_lng - lng, 0.0, lng - max_lng) * scale_x
+    dy = max(min_lat - lat, 0.0, lat - max_lat) * _METERS_PER_DEG_LAT
+    if math.hypot(dx, dy) > radius_meters:
+        return None
+
+    best = math.inf
+    for polygon in indexed.polygons:
+        if _point_in_polygon(polygon, lng, lat):
+            return 0.0
+        for ring in polygon:
+            best = min(best, _distance_to_path(ring, lng, lat, scale_x))
+    for line in indexed.lines:
+        best = min(best, _distance_to_path(line, lng, lat, scale_x))
+    return best
+
+
+def _point_in_polygon(rings: List[np.ndarray], lng: float, lat: float) -> bool:
+    """射线法：在外环内且不在任一内环（洞）内。"""
+    if not rings or not _point_in_ring(rings[0], lng, lat):
+        return False
+    return not any(_point_in_ring(hole, lng, lat) for hole in rings[1:])
+
+
+def _point_in_ring(ring: np.ndarray, lng: float, lat: float) -> bool:
+    if len(ring) < 3:
+        return False
+    x1, y1 = ring[:, 0], ring[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    crosses = (y1 > lat) != (y2 > lat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+    return bool(np.count_nonzero(crosses & (lng < x_at)) % 2)
+
+
+def _distance_to_path(path: np.ndarray, lng: float, lat: float, scale_x: float) -> float:
+    """点到折线（逐段）的最短平面距离（米）。"""
+    xs = (path[:, 0] - lng) * scale_x
+    ys = (path[:, 1] - lat) * _METERS_PER_DEG_LAT
+    if len(path) == 1:
+        return float(math.hypot(xs[0], ys[0]))
+    ax, ay, bx, by = xs[:-1], ys[:-1], xs[1:], ys[1:]
+    seg_x, seg_y = bx - ax, by - ay
+    length_sq = seg_x * seg_x + seg_y * seg_y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, -(ax * seg_x + ay * seg_y) / length_sq, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    px, py = ax + t * seg_x, ay + t * seg_y
+    return float(np.sqrt(px * px + py * py).min())
+
+
+__all__ = ["RiskZoneSpatialIndex"]
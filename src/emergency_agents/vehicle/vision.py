@@ -12,18 +12,21 @@
 技术栈：
 - GLM-4V-Plus (vLLM部署在H100 GPU#1)
 - 结构化JSON输出
+- 多图批量分析（一次请求携带多张图像）
 - 毫秒级性能监控
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
+import re
 import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 
 import httpx
 
@@ -112,6 +115,7 @@ class VisionAnalyzer:
         timeout: float = 30.0,
         temperature: float = 0.1,
         enable_thinking: bool = True,
+        http_client: httpx.AsyncClient | None = None,
     ):
         """初始化视觉分析器
 
@@ -120,6 +124,7 @@ class VisionAnalyzer:
             model_name: 模型名称
             timeout: 超时时间（秒）
             temperature: LLM温度参数（建议0.1保证稳定性）
+            http_client: 外部共享的异步客户端（需已带鉴权头）；传入时由调用方负责关闭
         """
         self.vllm_url = vllm_url.rstrip("/")
         self.model_name = model_name
@@ -130,7 +135,8 @@ class VisionAnalyzer:
         headers: dict[str, str] = {}
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
-        self.client = httpx.AsyncClient(timeout=timeout, trust_env=False, headers=headers)
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(timeout=timeout, trust_env=False, headers=headers)
 
         logger.info(
             f"VisionAnalyzer initialized: vllm_url={vllm_url}, "
@@ -191,6 +197,58 @@ class VisionAnalyzer:
             logger.error(f"Vision analysis failed: {e}", exc_info=True)
             raise
 
+    async def analyze_image_batch(
+        self,
+        images_base64: Sequence[str],
+        *,
+        concurrency: Optional[asyncio.Semaphore] = None,
+    ) -> List[VisionAnalysisResult]:
+        """一次请求分析多张图像（多图输入），结果顺序与输入一致
+
+        模型返回的数组长度不符或无法解析时，退回逐张调用 analyze_drone_image，保证每张图都有结果。
+
+        Args:
+            images_base64: Base64编码的JPEG图像列表
+            concurrency: 可选信号量，每次 vLLM 调用（含逐张退回）各占用一个名额
+
+        Returns:
+            List[VisionAnalysisResult]: 与输入等长的结构化结果
+        """
+        if not images_base64:
+            return []
+
+        async def _single(image: str) -> VisionAnalysisResult:
+            if concurrency is None:
+                return await self.analyze_drone_image(image_base64=image)
+            async with concurrency:
+                return await self.analyze_drone_image(image_base64=image)
+
+        if len(images_base64) == 1:
+            return [await _single(images_base64[0])]
+
+        start_time = time.time()
+        prompt = self._build_batch_prompt(len(images_base64))
+        if concurrency is None:
+            raw_result = await self._call_vllm_api_multi(images_base64, prompt)
+        else:
+            async with concurrency:
+                raw_result = await self._call_vllm_api_multi(images_base64, prompt)
+        items = self._parse_batch_output(raw_result, len(images_base64))
+        if items is None:
+            logger.warning(
+                f"Batch vision output unusable for {len(images_base64)} images, falling back to single-image calls"
+            )
+            return list(await asyncio.gather(*(_single(image) for image in images_base64)))
+
+        # 单次请求的耗时按图像数均摊
+        latency_ms = (time.time() - start_time) * 1000
+        results = [self._build_result(item, latency_ms / len(items)) for item in items]
+        logger.info(
+            f"Batch vision analysis completed in {latency_ms:.0f}ms: images={len(results)}, "
+            f"danger={[r.danger_level.value for r in results]}"
+        )
+        return results
+
     def _encode_image_file(self, image_path: str) -> str:
         """将图像文件编码为Base64"""
         path = Path(image_path)
@@ -278,31 +336,47 @@ class VisionAnalyzer:
 
 如果某些信息无法确定，使用null或空数组。"""
 
+    def _build_batch_prompt(self, count: int) -> str:
+        """多图分析提示词：逐张套用单图分析要求，返回等长 JSON 数组"""
+        return (
+            f"以上共 {count} 张图像（图像1..图像{count}），彼此独立，可能来自不同设备。"
+            "请对每张图像分别按下述要求分析，禁止混用不同图像中的信息。\n\n"
+            + self._build_analysis_prompt()
+            + f"\n\n**多图返回格式：**请返回长度为 {count} 的 JSON 数组，第 i 个元素对应图像i，"
+            "每个元素的结构与上面的 JSON 对象完全相同；不要返回数组以外的任何文字。"
+        )
+
     async def _call_vllm_api(self, image_b64: str, prompt: str) -> str:
         """调用vLLM OpenAI兼容API"""
-        messages = [
+        content: List[Dict[str, Any]] = [
             {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_b64}"
-                        },
-                    },
-                    {
-                        "type": "text",
-                        "text": prompt,
-                    },
-                ],
-            }
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{image_b64}"
+                },
+            },
+            {
+                "type": "text",
+                "text": prompt,
+            },
         ]
-
+        return await self._chat_completion(content, max_tokens=2048)
+
+    async def _call_vllm_api_multi(self, images_b64: Sequence[str], prompt: str) -> str:
+        """一次请求携带多张图像（按顺序标注“图像1..N”）"""
+        content: List[Dict[str, Any]] = []
+        for index, image_b64 in enumerate(images_b64, start=1):
+            content.append({"type": "text", "text": f"图像{index}："})
+            content.append({"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"}})
+        content.append({"type": "text", "text": prompt})
+        return await self._chat_completion(content, max_tokens=2048 * len(images_b64))
+
+    async def _chat_completion(self, content: List[Dict[str, Any]], *, max_tokens: int) -> str:
         payload = {
             "model": self.model_name,
-            "messages": messages,
+            "messages": [{"role": "user", "content": content}],
             "temperature": self.temperature,
-            "max_tokens": 2048,
+            "max_tokens": max_tokens,
         }
         if self.enable_thinking:
             payload["thinking"] = {"type": "enabled"}
@@ -358,6 +432,22 @@ class VisionAnalyzer:
                 "confidence_score": 0.0,
             }
 
+    def _parse_batch_output(self, raw_output: str, expected: int) -> Optional[List[Dict[str, Any]]]:
+        """解析多图输出的 JSON 数组；长度不符或无法解析时返回 None"""
+        match = re.search(r"```(?:json)?\s*\n(.*?)\n```", raw_output, re.DOTALL)
+        json_str = match.group(1) if match else raw_output.strip()
+        try:
+            parsed = json.loads(json_str)
+        except json.JSONDecodeError as e:
+            logger.error(f"Batch JSON parsing failed: {e}\nRaw output: {raw_output[:500]}")
+            return None
+        if isinstance(parsed, dict):
+            parsed = parsed.get("results")
+        if not isinstance(parsed, list) or len(parsed) != expected or not all(isinstance(i, dict) for i in parsed):
+            logger.error(f"Batch output shape mismatch: expected {expected} objects")
+            return None
+        return parsed
+
     def _build_result(
         self, structured: Dict[str, Any], latency_ms: float
     ) -> VisionAnalysisResult:
@@ -394,5 +484,6 @@ class VisionAnalyzer:
         )
 
     async def close(self):
-        """关闭HTTP客户端"""
-        await self.client.aclose()
+        """关闭HTTP客户端（共享客户端由容器统一关闭）"""
+        if self._owns_client:
+            await self.client.aclose()
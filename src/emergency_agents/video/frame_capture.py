@@ -19,12 +19,10 @@ import base64
 import logging
 import time
 from dataclasses import dataclass
-from io import BytesIO
 from typing import Optional, Tuple
 
 import cv2
 import numpy as np
-from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -175,57 +173,63 @@ class VideoFrameCapture:
         )
 
     def _is_valid_frame(self, frame: np.ndarray) -> bool:
-        """检测帧是否有效（非全黑/全白）
+        """检测帧是否有效（非全黑/全白），见 is_valid_frame"""
+        return is_valid_frame(frame, warn=True)
 
-        Args:
-            frame: OpenCV 读取的帧（BGR格式）
+    def _frame_to_base64(self, frame: np.ndarray) -> str:
+        """将 OpenCV 帧转换为 Base64 编码的 JPEG，见 frame_to_base64"""
+        return frame_to_base64(frame)
 
-        Returns:
-            bool: True 表示有效帧
-        """
-        # 转换为灰度图
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-        # 计算平均亮度
-        mean_brightness = np.mean(gray)
+def is_valid_frame(frame: np.ndarray, *, warn: bool = False) -> bool:
+    """检测帧是否有效（非全黑/全白）
+
+    Args:
+        frame: OpenCV 读取的帧（BGR格式）
+        warn: 是否记录无效原因（后台持续解码时关闭，避免日志刷屏）
+
+    Returns:
+        bool: True 表示有效帧
+    """
+    # 转换为灰度图
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    # 计算平均亮度
+    mean_brightness = np.mean(gray)
 
-        # 判断是否全黑（平均亮度 < 10）或全白（平均亮度 > 245）
-        if mean_brightness < 10:
+    # 判断是否全黑（平均亮度 < 10）或全白（平均亮度 > 245）
+    if mean_brightness < 10:
+        if warn:
             logger.warning(f"Frame too dark: mean_brightness={mean_brightness:.1f}")
-            return False
-        if mean_brightness > 245:
+        return False
+    if mean_brightness > 245:
+        if warn:
             logger.warning(f"Frame too bright: mean_brightness={mean_brightness:.1f}")
-            return False
+        return False
 
-        # 计算标准差（检测是否有内容变化）
-        std_dev = np.std(gray)
-        if std_dev < 5:
+    # 计算标准差（检测是否有内容变化）
+    std_dev = np.std(gray)
+    if std_dev < 5:
+        if warn:
             logger.warning(f"Frame has low variance: std_dev={std_dev:.1f}")
-            return False
+        return False
 
-        return True
+    return True
 
-    def _frame_to_base64(self, frame: np.ndarray) -> str:
-        """将 OpenCV 帧转换为 Base64 编码的 JPEG
 
-        Args:
-            frame: OpenCV 读取的帧（BGR格式）
+def frame_to_base64(frame: np.ndarray) -> str:
+    """将 OpenCV 帧转换为 Base64 编码的 JPEG
 
-        Returns:
-            str: Base64 编码的图像数据
-        """
-        # 将 BGR 转换为 RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    Args:
+        frame: OpenCV 读取的帧（BGR格式）
 
-        # 转换为 PIL Image
-        pil_image = Image.fromarray(frame_rgb)
-
-        # 编码为 JPEG（保存到内存）
-        buffered = BytesIO()
-        pil_image.save(buffered, format="JPEG", quality=85)
-
-        # Base64 编码
-        img_bytes = buffered.getvalue()
-        img_base64 = base64.b64encode(img_bytes).decode("utf-8")
+    Returns:
+        str: Base64 编码的图像数据
+    """
+    # cv2.imencode 直接编码 BGR 帧，省去 RGB 转换与 PIL 中间拷贝
+    ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if not ok:
+        raise ValueError("JPEG 编码失败")
 
-        return img_base64
+    # Base64 编码
+    return base64.b64encode(jpeg).decode("ascii")
@@ -0,0 +1,171 @@
+# Copyright 2025 msq
+"""
+视觉模型输入帧编码 - 缩放 + cv2.imencode 直出 JPEG + Base64，在线程池中执行
+
+核心功能：
+- 按最长边缩放到视觉模型需要的分辨率（4K 航拍帧直接上传会使单次请求达数 MB）
+- cv2.imencode 直接编码 BGR 帧，省去 BGR→RGB 转换与 PIL/BytesIO 中间拷贝
+- 缩放目标缓冲按线程复用；Base64 直接读取编码结果缓冲，不再额外复制字节
+- 同一来源（如设备ID）画面未变化时复用上次编码结果，跳过 JPEG 编码
+- aencode 在专用线程池中运行，不阻塞事件循环
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIDE = 1280
+DEFAULT_JPEG_QUALITY = 85
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedFrame:
+    """编码结果"""
+
+    image_base64: str
+    image_size: Tuple[int, int]  # 编码后 (width, height)
+    source_size: Tuple[int, int]  # 原始 (width, height)
+    jpeg_bytes: int
+    digest: str  # 缩放后像素的摘要
+    reused: bool = False  # True 表示画面未变化、复用了上次的编码结果
+
+
+def scaled_size(width: int, height: int, max_side: Optional[int]) -> Tuple[int, int]:
+    """按最长边等比缩放后的尺寸（只缩小不放大）。"""
+    if not max_side or max(width, height) <= max_side:
+        return width, height
+    scale = max_side / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class FrameEncoder:
+    """视觉模型输入帧编码器（进程内共享，线程安全）。
+
+    使用方法：
+        encoder = FrameEncoder(max_side=1280, jpeg_quality=85)
+        encoded = await encoder.aencode(frame, cache_key="dog-alpha")
+        await analyzer.analyze_drone_image(image_base64=encoded.image_base64)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_side: Optional[int] = DEFAULT_MAX_SIDE,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+        max_workers: int = 2,
+    ) -> None:
+        """初始化编码器
+
+        Args:
+            max_side: 编码前最长边上限（像素），None 表示保持原分辨率
+            jpeg_quality: JPEG 质量（1-100）
+            max_workers: 编码线程数
+        """
+        if not 1 <= jpeg_quality <= 100:
+            raise ValueError("jpeg_quality 必须在 1-100 之间")
+        self.max_side = max_side
+        self.jpeg_quality = jpeg_quality
+        self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="frame-encoder")
+        self._buffers = threading.local()
+        self._last: Dict[str, EncodedFrame] = {}
+        self._lock = threading.Lock()
+
+    def _resize_buffer(self, width: int, height: int, channels: int) -> np.ndarray:
+        """取当前线程的缩放目标缓冲，尺寸不变时复用。"""
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        buffer = getattr(self._buffers, "resized", None)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers.resized = buffer
+        return buffer
+
+    def encode(self, frame: np.ndarray, *, cache_key: Optional[str] = None) -> EncodedFrame:
+        """同步编码（在调用线程中执行）。
+
+        Args:
+            frame: OpenCV 读取的帧（BGR格式，uint8）
+            cache_key: 画面来源标识；同一来源画面未变化时复用上次结果
+        """
+        started = time.perf_counter()
+        height, width = frame.shape[:2]
+        target_w, target_h = scaled_size(width, height, self.max_side)
+        if (target_w, target_h) != (width, height):
+            channels = frame.shape[2] if frame.ndim == 3 else 1
+            pixels = cv2.resize(
+                frame,
+                (target_w, target_h),
+                dst=self._resize_buffer(target_w, target_h, channels),
+                interpolation=cv2.INTER_AREA,
+            )
+        else:
+            pixels = np.ascontiguousarray(frame)
+
+        digest = hashlib.blake2b(pixels, digest_size=16).hexdigest()
+        if cache_key is not None:
+            with self._lock:
+                previous = self._last.get(cache_key)
+            if previous is not None and previous.digest == digest and previous.source_size == (width, height):
+                logger.debug("frame_encode_reused", extra={"cache_key": cache_key})
+                return EncodedFrame(
+                    image_base64=previous.image_base64,
+                    image_size=previous.image_size,
+                    source_size=previous.source_size,
+                    jpeg_bytes=previous.jpeg_bytes,
+                    digest=digest,
+                    reused=True,
+                )
+
+        ok, jpeg = cv2.imencode(".jpg", pixels, self._encode_params)
+        if not ok:
+            raise ValueError("JPEG 编码失败")
+        encoded = EncodedFrame(
+            image_base64=base64.b64encode(jpeg).decode("ascii"),
+            image_size=(target_w, target_h),
+            source_size=(width, height),
+            jpeg_bytes=int(jpeg.size),
+            digest=digest,
+        )
+        if cache_key is not None:
+            with self._lock:
+                self._last[cache_key] = encoded
+        logger.debug(
+            "frame_encoded",
+            extra={
+                "source_size": encoded.source_size,
+                "image_size": encoded.image_size,
+                "jpeg_bytes": encoded.jpeg_bytes,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return encoded
+
+    async def aencode(self, frame: np.ndarray, *, cache_key: Optional[str] = None) -> EncodedFrame:
+        """在编码线程池中执行 encode，不阻塞事件循环。"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: self.encode(frame, cache_key=cache_key))
+
+    def close(self) -> None:
+        """关闭编码线程池。"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "DEFAULT_JPEG_QUALITY",
+    "DEFAULT_MAX_SIDE",
+    "EncodedFrame",
+    "FrameEncoder",
+    "scaled_size",
+]
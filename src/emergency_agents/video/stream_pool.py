@@ -0,0 +1,343 @@
+# Copyright 2025 msq
+"""
+视频流常驻读取池 - 为热点设备保持后台解码，按需毫秒级取最新帧
+
+核心功能：
+- 按 VideoStreamCatalog 的 device_id 懒启动后台解码线程，复用已打开的视频流
+- 每路流保留最近若干帧的环形缓冲，取帧时返回其中最新的有效帧（非全黑/全白）
+- 流中断后自动重连（指数退避），空闲超过阈值的流自动关闭释放解码资源
+- 异步接口 get_latest_frame：命中热流时不等待 I/O；冷启动时挂起协程等待首帧，不阻塞事件循环
+
+线程模型：
+- 解码线程负责 read()、帧有效性检测与写入环形缓冲，事件循环上取帧只做缓冲查找，不做任何像素计算
+- 新帧到达时通过 loop.call_soon_threadsafe 唤醒等待中的协程
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import structlog
+
+from emergency_agents.video.frame_capture import is_valid_frame
+from emergency_agents.video.stream_catalog import VideoStreamCatalog, VideoStreamEntry
+
+logger = structlog.get_logger(__name__)
+
+CaptureFactory = Callable[[str], Any]  # 返回具备 isOpened/read/release 的对象（cv2.VideoCapture 兼容）
+
+
+class StreamUnavailableError(RuntimeError):
+    """设备视频流不可用（未配置、无法打开或等待首帧超时）。"""
+
+
+@dataclass(slots=True)
+class LatestFrame:
+    """环形缓冲中的一帧。"""
+
+    device_id: str
+    frame: np.ndarray
+    captured_at: float  # Unix timestamp
+    sequence: int
+    valid: bool = True  # 非全黑/全白；由解码线程在写入缓冲前计算
+
+    @property
+    def age_ms(self) -> float:
+        return (time.time() - self.captured_at) * 1000
+
+    @property
+    def image_size(self) -> Tuple[int, int]:
+        """(width, height)"""
+        height, width = self.frame.shape[:2]
+        return width, height
+
+
+def open_video_capture(stream_url: str, *, timeout_seconds: float = 10.0) -> Any:
+    """打开视频流：设置连接/读取超时，并尽量缩小解码器内部缓冲以降低延迟。"""
+    timeout_ms = int(timeout_seconds * 1000)
+    cap = cv2.VideoCapture(
+        stream_url,
+        cv2.CAP_ANY,
+        [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms, cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms],
+    )
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class _StreamReader:
+    """单路视频流的后台解码线程。"""
+
+    def __init__(
+        self,
+        entry: VideoStreamEntry,
+        *,
+        capture_factory: CaptureFactory,
+        buffer_size: int,
+        idle_timeout_seconds: float,
+        reconnect_delay_seconds: float,
+        max_reconnect_delay_seconds: float,
+    ) -> None:
+        self.entry = entry
+        self._capture_factory = capture_factory
+        self._idle_timeout = idle_timeout_seconds
+        self._reconnect_delay = reconnect_delay_seconds
+        self._max_reconnect_delay = max_reconnect_delay_seconds
+        self._frames: Deque[LatestFrame] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+        self._sequence = 0
+        self._last_access = time.monotonic()
+        self.last_error: Optional[str] = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"video-reader-{entry.device_id}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def touch(self) -> None:
+        self._last_access = time.monotonic()
+
+    def stop(self, *, join_timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake_waiters()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=join_timeout)
+
+    def latest_valid(self, *, max_age_seconds: float) -> Optional[LatestFrame]:
+        """从新到旧返回第一帧有效且未过期的帧。"""
+        with self._lock:
+            frames = list(self._frames)
+        oldest_allowed = time.time() - max_age_seconds
+        for item in reversed(frames):
+            if item.captured_at < oldest_allowed:
+                break
+            if item.valid:
+                return item
+        return None
+
+    def add_waiter(self) -> asyncio.Future[None]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        with self._lock:
+            self._waiters.append((loop, future))
+        return future
+
+    def _wake_waiters(self) -> None:
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, future)
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self._last_access > self._idle_timeout
+
+    def _run(self) -> None:
+        delay = self._reconnect_delay
+        logger.info("video_reader_started", device_id=self.entry.device_id)
+        while not self._stop.is_set() and not self._idle():
+            cap = None
+            open_error = f"无法打开视频流: {self.entry.stream_url}"
+            try:
+                cap = self._capture_factory(self.entry.stream_url)
+            except Exception as exc:  # noqa: BLE001
+                open_error = f"打开视频流异常: {exc}"
+            if cap is None or not cap.isOpened():
+                self.last_error = open_error
+                logger.warning("video_reader_open_failed", device_id=self.entry.device_id, error=open_error)
+                self._wake_waiters()
+                if cap is not None:
+                    cap.release()
+                self._stop.wait(delay)
+                delay = min(delay * 2, self._max_reconnect_delay)
+                continue
+
+            delay = self._reconnect_delay
+            try:
+                while not self._stop.is_set():
+                    ok, frame = cap.read()
+                    if not ok or frame is None:
+                        self.last_error = "读取帧失败，可能视频流中断"
+                        logger.warning("video_reader_read_failed", device_id=self.entry.device_id)
+                        break
+                    self.last_error = None
+                    valid = is_valid_frame(frame)
+                    with self._lock:
+                        self._sequence += 1
+                        self._frames.append(
+                            LatestFrame(
+                                device_id=self.entry.device_id,
+                                frame=frame,
+                                captured_at=time.time(),
+                                sequence=self._sequence,
+                                valid=valid,
+                            )
+                        )
+                    self._wake_waiters()
+                    if self._idle():
+                        break
+            finally:
+                cap.release()
+
+        self._stop.set()
+        self._wake_waiters()
+        with self._lock:
+            self._frames.clear()
+        logger.info("video_reader_stopped", device_id=self.entry.device_id, idle=self._idle())
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class VideoStreamReaderPool:
+    """视频流常驻读取池（进程内共享，按 device_id 复用解码线程）。
+
+    使用方法：
+        pool = VideoStreamReaderPool(catalog)
+        latest = await pool.get_latest_frame("dog-alpha")
+        image_base64 = frame_to_base64(latest.frame)
+    """
+
+    def __init__(
+        self,
+        catalog: VideoStreamCatalog,
+        *,
+        buffer_size: int = 3,
+        idle_timeout_seconds: float = 120.0,
+        max_frame_age_seconds: float = 2.0,
+        open_timeout_seconds: float = 10.0,
+        reconnect_delay_seconds: float = 0.5,
+        max_reconnect_delay_seconds: float = 10.0,
+        capture_factory: Optional[CaptureFactory] = None,
+    ) -> None:
+        """初始化读取池
+
+        Args:
+            catalog: 视频流目录（device_id → stream_url）
+            buffer_size: 每路流保留的最近帧数
+            idle_timeout_seconds: 超过该时间无人取帧则关闭该路流
+            max_frame_age_seconds: 返回帧的最大时延，超过则等待新帧
+            open_timeout_seconds: 打开/读取视频流的超时
+            reconnect_delay_seconds: 断流后首次重连等待，之后指数退避
+            max_reconnect_delay_seconds: 重连等待上限
+            capture_factory: 自定义视频流打开方式（测试注入）
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size 必须大于 0")
+        self._catalog = catalog
+        self._buffer_size = buffer_size
+        self._idle_timeout = idle_timeout_seconds
+        self._max_frame_age = max_frame_age_seconds
+        self._open_timeout = open_timeout_seconds
+        self._reconnect_delay = reconnect_delay_seconds
+        self._max_reconnect_delay = max_reconnect_delay_seconds
+        self._capture_factory = capture_factory or (
+            lambda url: open_video_capture(url, timeout_seconds=open_timeout_seconds)
+        )
+        self._readers: Dict[str, _StreamReader] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _reader_for(self, entry: VideoStreamEntry) -> _StreamReader:
+        with self._lock:
+            if self._closed:
+                raise StreamUnavailableError("视频流读取池已关闭")
+            reader = self._readers.get(entry.device_id)
+            if reader is None or not reader.alive:
+                reader = _StreamReader(
+                    entry,
+                    capture_factory=self._capture_factory,
+                    buffer_size=self._buffer_size,
+                    idle_timeout_seconds=self._idle_timeout,
+                    reconnect_delay_seconds=self._reconnect_delay,
+                    max_reconnect_delay_seconds=self._max_reconnect_delay,
+                )
+                self._readers[entry.device_id] = reader
+                reader.start()
+            reader.touch()
+            return reader
+
+    async def get_latest_frame(self, device_id: str, *, timeout: Optional[float] = None) -> LatestFrame:
+        """返回设备最新的有效帧。
+
+        热流直接返回环形缓冲中的帧；冷启动或缓冲帧过期时挂起等待新帧，最长 timeout 秒
+        （默认 open_timeout_seconds）。失败抛出 StreamUnavailableError。
+        """
+        entry = self._catalog.get(device_id)
+        if entry is None or not entry.stream_url:
+            raise StreamUnavailableError(f"设备 {device_id} 未配置视频流地址")
+
+        reader = self._reader_for(entry)
+        latest = reader.latest_valid(max_age_seconds=self._max_frame_age)
+        if latest is not None:
+            return latest
+
+        wait_timeout = self._open_timeout if timeout is None else timeout
+        deadline = time.monotonic() + wait_timeout
+        started = time.perf_counter()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            waiter = reader.add_waiter()
+            # 注册等待后再检查一次，避免错过注册前刚到达的帧
+            latest = reader.latest_valid(max_age_seconds=self._max_frame_age)
+            if latest is not None:
+                break
+            try:
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            latest = reader.latest_valid(max_age_seconds=self._max_frame_age)
+            if latest is not None:
+                break
+            if not reader.alive:
+                break
+
+        if latest is not None:
+            logger.info(
+                "video_frame_ready",
+                device_id=device_id,
+                wait_ms=int((time.perf_counter() - started) * 1000),
+                sequence=latest.sequence,
+            )
+            return latest
+        error = reader.last_error or f"等待视频帧超时（>{wait_timeout:g}秒）"
+        raise StreamUnavailableError(error)
+
+    def active_streams(self) -> List[str]:
+        """当前保持解码的设备ID。"""
+        with self._lock:
+            return [device_id for device_id, reader in self._readers.items() if reader.alive]
+
+    def close(self) -> None:
+        """停止全部解码线程。"""
+        with self._lock:
+            self._closed = True
+            readers, self._readers = list(self._readers.values()), {}
+        for reader in readers:
+            reader.stop()
+        if readers:
+            logger.info("video_stream_pool_closed", stream_count=len(readers))
+
+
+__all__ = [
+    "LatestFrame",
+    "StreamUnavailableError",
+    "VideoStreamReaderPool",
+    "open_video_capture",
+]
@@ -0,0 +1,260 @@
+# Copyright 2025 msq
+"""
+多路视频批量视觉分析 - 变化检测 + 多图批量推理，节省视觉模型 GPU 时间
+
+核心功能：
+- 按固定间隔从多路视频流（VideoStreamReaderPool）采样最新帧
+- dHash 感知哈希做变化检测：与该设备上次送检帧的汉明距离低于阈值则跳过推理，沿用上次结果
+- 结果按 (device_id, 帧哈希) 缓存（LRU），画面回到此前出现过的场景时直接命中
+- 需要推理的帧按 batch_size 组成多图请求，并用信号量限制对视觉端点的并发
+
+使用方法：
+    monitor = BatchVisionMonitor(stream_pool, analyzer, encoder, batch_size=4, max_concurrency=2)
+    observations = await monitor.analyze_once(["dog-alpha", "uav-1"])
+    await monitor.run(["dog-alpha", "uav-1"], interval_seconds=5.0, stop=stop_event, sink=event_sink)
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import structlog
+from prometheus_client import Counter, Histogram
+
+from emergency_agents.graph.progress import EventSink, emit_event
+from emergency_agents.vehicle.vision import VisionAnalysisResult, VisionAnalyzer
+from emergency_agents.video.frame_encoder import FrameEncoder
+from emergency_agents.video.stream_pool import LatestFrame, StreamUnavailableError, VideoStreamReaderPool
+
+logger = structlog.get_logger(__name__)
+
+_monitor_frames = Counter(
+    "vision_monitor_frames_total",
+    "Frames sampled by the batch vision monitor",
+    ["outcome"],  # analyzed / unchanged / cached / unavailable / failed
+)
+_monitor_batch_seconds = Histogram(
+    "vision_monitor_batch_seconds",
+    "Latency of one multi-image vision request",
+)
+
+DEFAULT_CHANGE_THRESHOLD_BITS = 6
+
+
+def dhash(frame: np.ndarray, *, hash_size: int = 8) -> int:
+    """差值哈希：缩放为 (hash_size+1)×hash_size 灰度图，比较水平相邻像素，得到 hash_size² 位整数。"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass(slots=True)
+class MonitorObservation:
+    """单路视频的一次采样结果"""
+
+    device_id: str
+    status: str  # analyzed / unchanged / cached / unavailable / failed
+    result: Optional[VisionAnalysisResult] = None
+    frame_hash: Optional[int] = None
+    captured_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_event(self) -> Dict[str, object]:
+        payload: Dict[str, object] = {
+            "device_id": self.device_id,
+            "status": self.status,
+            "frame_hash": f"{self.frame_hash:016x}" if self.frame_hash is not None else None,
+            "captured_at": self.captured_at,
+        }
+        if self.result is not None:
+            payload.update(
+                danger_level=self.result.danger_level.value,
+                person_count=self.result.persons.count,
+                vehicle_count=self.result.vehicles.total_count,
+                hazards=list(self.result.hazards),
+                scene_summary=self.result.scene_summary,
+            )
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+class BatchVisionMonitor:
+    """多路视频批量视觉分析器（变化检测 + 结果缓存 + 多图批量推理）"""
+
+    def __init__(
+        self,
+        stream_pool: VideoStreamReaderPool,
+        analyzer: VisionAnalyzer,
+        encoder: FrameEncoder,
+        *,
+        batch_size: int = 4,
+        max_concurrency: int = 2,
+        change_threshold_bits: int = DEFAULT_CHANGE_THRESHOLD_BITS,
+        cache_size: int = 512,
+        frame_timeout_seconds: float = 5.0,
+    ) -> None:
+        """初始化批量分析器
+
+        Args:
+            stream_pool: 视频流常驻读取池
+            analyzer: 视觉分析器（多图请求）
+            encoder: 帧编码器（缩放 + JPEG）
+            batch_size: 单次请求携带的最大图像数
+            max_concurrency: 对视觉端点的最大并发请求数
+            change_threshold_bits: dHash 汉明距离低于该值视为画面未变化
+            cache_size: (device_id, 帧哈希) 结果缓存条数
+            frame_timeout_seconds: 单路取帧超时
+        """
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size 与 max_concurrency 必须大于 0")
+        self._pool = stream_pool
+        self._analyzer = analyzer
+        self._encoder = encoder
+        self._batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._threshold = change_threshold_bits
+        self._cache_size = cache_size
+        self._frame_timeout = frame_timeout_seconds
+        self._cache: "OrderedDict[Tuple[str, int], VisionAnalysisResult]" = OrderedDict()
+        self._last_analyzed: Dict[str, Tuple[int, VisionAnalysisResult]] = {}
+
+    # ============ 缓存与变化检测 ============
+
+    def _cache_get(self, device_id: str, frame_hash: int) -> Optional[VisionAnalysisResult]:
+        key = (device_id, frame_hash)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, device_id: str, frame_hash: int, result: VisionAnalysisResult) -> None:
+        self._cache[(device_id, frame_hash)] = result
+        self._cache.move_to_end((device_id, frame_hash))
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _classify(self, device_id: str, frame_hash: int) -> Tuple[str, Optional[VisionAnalysisResult]]:
+        """返回 (status, 可复用结果)；status 为 pending 表示需要推理。"""
+        last = self._last_analyzed.get(device_id)
+        if last is not None and hamming_distance(last[0], frame_hash) < self._threshold:
+            return "unchanged", last[1]
+        cached = self._cache_get(device_id, frame_hash)
+        if cached is not None:
+            return "cached", cached
+        return "pending", None
+
+    # ============ 采样与推理 ============
+
+    async def _sample(self, device_id: str) -> Tuple[Optional[LatestFrame], Optional[int], Optional[str]]:
+        try:
+            latest = await self._pool.get_latest_frame(device_id, timeout=self._frame_timeout)
+        except StreamUnavailableError as exc:
+            return None, None, str(exc)
+        frame_hash = await asyncio.to_thread(dhash, latest.frame)
+        return latest, frame_hash, None
+
+    async def _analyze_batch(
+        self, batch: List[Tuple[str, LatestFrame, int]]
+    ) -> List[Tuple[str, LatestFrame, int, Optional[VisionAnalysisResult], Optional[str]]]:
+        encoded = await asyncio.gather(
+            *(self._encoder.aencode(latest.frame, cache_key=device_id) for device_id, latest, _ in batch)
+        )
+        started = time.perf_counter()
+        try:
+            # 信号量按每次 vLLM 调用占用（含逐张退回），端点在途请求数始终不超过 max_concurrency
+            results = await self._analyzer.analyze_image_batch(
+                [item.image_base64 for item in encoded], concurrency=self._semaphore
+            )
+        except Exception as exc:  # noqa: BLE001 - 单批失败不影响其他批次
+            logger.error("vision_monitor_batch_failed", devices=[d for d, _, _ in batch], error=str(exc))
+            return [(device_id, latest, frame_hash, None, str(exc)) for device_id, latest, frame_hash in batch]
+        finally:
+            _monitor_batch_seconds.observe(time.perf_counter() - started)
+        return [
+            (device_id, latest, frame_hash, result, None)
+            for (device_id, latest, frame_hash), result in zip(batch, results)
+        ]
+
+    async def analyze_once(self, device_ids: Sequence[str]) -> List[MonitorObservation]:
+        """对每路视频采样一帧，只对画面有变化且未命中缓存的帧发起推理。结果顺序与 device_ids 一致。"""
+        device_ids = list(dict.fromkeys(device_ids))
+        samples = await asyncio.gather(*(self._sample(device_id) for device_id in device_ids))
+
+        observations: Dict[str, MonitorObservation] = {}
+        pending: List[Tuple[str, LatestFrame, int]] = []
+        for device_id, (latest, frame_hash, error) in zip(device_ids, samples):
+            if latest is None or frame_hash is None:
+                observations[device_id] = MonitorObservation(device_id, "unavailable", error=error)
+                continue
+            status, reused = self._classify(device_id, frame_hash)
+            if status == "pending":
+                pending.append((device_id, latest, frame_hash))
+            else:
+                observations[device_id] = MonitorObservation(
+                    device_id, status, result=reused, frame_hash=frame_hash, captured_at=latest.captured_at
+                )
+
+        batches = [pending[i : i + self._batch_size] for i in range(0, len(pending), self._batch_size)]
+        for batch_result in await asyncio.gather(*(self._analyze_batch(batch) for batch in batches)):
+            for device_id, latest, frame_hash, result, error in batch_result:
+                if result is None:
+                    observations[device_id] = MonitorObservation(
+                        device_id, "failed", frame_hash=frame_hash, captured_at=latest.captured_at, error=error
+                    )
+                    continue
+                self._last_analyzed[device_id] = (frame_hash, result)
+                self._cache_put(device_id, frame_hash, result)
+                observations[device_id] = MonitorObservation(
+                    device_id, "analyzed", result=result, frame_hash=frame_hash, captured_at=latest.captured_at
+                )
+
+        ordered = [observations[device_id] for device_id in device_ids]
+        for observation in ordered:
+            _monitor_frames.labels(outcome=observation.status).inc()
+        logger.info(
+            "vision_monitor_round_completed",
+            devices=len(device_ids),
+            analyzed=sum(1 for o in ordered if o.status == "analyzed"),
+            skipped=sum(1 for o in ordered if o.status in ("unchanged", "cached")),
+            batches=len(batches),
+        )
+        return ordered
+
+    async def run(
+        self,
+        device_ids: Sequence[str],
+        *,
+        interval_seconds: float,
+        stop: asyncio.Event,
+        sink: Optional[EventSink] = None,
+    ) -> None:
+        """按间隔持续采样分析，直至 stop 被设置；每路结果以 vision_observation 事件推送。"""
+        while not stop.is_set():
+            started = time.monotonic()
+            for observation in await self.analyze_once(device_ids):
+                await emit_event(sink, "vision_observation", observation.to_event())
+            remaining = interval_seconds - (time.monotonic() - started)
+            if remaining > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+
+__all__ = [
+    "BatchVisionMonitor",
+    "MonitorObservation",
+    "dhash",
+    "hamming_distance",
+]
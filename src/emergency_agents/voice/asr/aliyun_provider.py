@@ -4,6 +4,7 @@ from __future__ import annotations
 """阿里云百炼 fun-asr 提供方实现。
 
 摘要：基于 DashScope SDK 的实时识别实现，适用于 16k 单声道 PCM/WAV。
+open_stream 在说话开始时启动识别，边说边送帧，句内结果作为中间结果推送。
 """
 
 import asyncio
@@ -13,7 +14,7 @@ from typing import Optional
 
 import structlog
 
-from .base import ASRConfig, ASRProvider, ASRResult
+from .base import ASRConfig, ASRProvider, ASRResult, ASRStream, PartialCallback
 
 logger = structlog.get_logger(__name__)
 
@@ -64,6 +65,121 @@ class _AliyunASRCallback:  # 轻量内部回调桥接，避免直接依赖SDK类
             raise self.error
 
 
+class _AliyunStreamCallback(_AliyunASRCallback):
+    """流式会话回调：SDK 线程中回调，经 call_soon_threadsafe 回到事件循环。"""
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        loop: asyncio.AbstractEventLoop,
+        on_partial: PartialCallback | None,
+        provider: str,
+    ) -> None:
+        super().__init__(timeout_seconds)
+        self._loop = loop
+        self._on_partial = on_partial
+        self._provider = provider
+        self._committed = ""
+        self._started_at = time.time()
+
+    def _set_done(self) -> None:
+        self._loop.call_soon_threadsafe(self._done.set)
+
+    def on_close(self) -> None:  # noqa: D401
+        logger.debug("aliyun_asr_close")
+        self._set_done()
+
+    def on_complete(self) -> None:  # noqa: D401
+        logger.debug("aliyun_asr_complete")
+        self._set_done()
+
+    def on_error(self, result) -> None:  # noqa: D401
+        msg = getattr(result, "message", "unknown_error")
+        req_id = getattr(result, "request_id", "")
+        logger.error("aliyun_asr_error", message=msg, request_id=req_id)
+        self.error = Exception(f"request_id={req_id}, message={msg}")
+        self._set_done()
+
+    def on_event(self, result) -> None:  # noqa: D401
+        try:
+            sentence = result.get_sentence()  # type: ignore[attr-defined]
+        except Exception:  # SDK 兼容
+            sentence = None
+        if not sentence or "text" not in sentence:
+            return
+        text = sentence["text"] or ""
+        # 句末（带 end_time）时固化该句，否则为当前句的中间结果
+        if sentence.get("sentence_end") or sentence.get("end_time") is not None:
+            self._committed += text
+            self.final_text = self._committed
+        else:
+            self.final_text = self._committed + text
+        if self._on_partial is not None and self.final_text:
+            partial = ASRResult(
+                text=self.final_text,
+                is_final=False,
+                provider=self._provider,
+                latency_ms=int((time.time() - self._started_at) * 1000),
+            )
+            self._loop.call_soon_threadsafe(self._dispatch_partial, partial)
+
+    def _dispatch_partial(self, partial: ASRResult) -> None:
+        self._loop.create_task(self._emit_partial(partial))
+
+    async def _emit_partial(self, partial: ASRResult) -> None:
+        try:
+            await self._on_partial(partial)  # type: ignore[misc]
+        except Exception as exc:  # noqa: BLE001 - 推送失败不影响识别
+            logger.warning("aliyun_asr_partial_callback_failed", error=str(exc))
+
+
+class _AliyunASRStream(ASRStream):
+    """DashScope 实时识别会话。"""
+
+    def __init__(self, provider: str, model: str, recognition, callback: _AliyunStreamCallback) -> None:
+        self._provider = provider
+        self._model = model
+        self._recognition = recognition
+        self._callback = callback
+        self._started_at = time.time()
+
+    @property
+    def provider(self) -> str:
+        return self._provider
+
+    async def send(self, pcm_chunk: bytes) -> None:
+        if self._callback.error:
+            raise self._callback.error
+        self._recognition.send_audio_frame(pcm_chunk)
+
+    async def finish(self) -> ASRResult:
+        end_ts = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            # SDK 的 stop 同步阻塞，放到线程池执行
+            await loop.run_in_executor(None, self._recognition.stop)
+            await self._callback.wait()
+        except Exception:
+            await self.abort()
+            raise
+        finalize_ms = int((time.time() - end_ts) * 1000)
+        logger.info("aliyun_asr_stream_done", finalize_ms=finalize_ms, text_preview=self._callback.final_text[:50])
+        return ASRResult(
+            text=self._callback.final_text,
+            confidence=1.0,
+            is_final=True,
+            provider=self._provider,
+            latency_ms=int((time.time() - self._started_at) * 1000),
+            metadata={"model": self._model, "streaming": True, "finalize_ms": finalize_ms},
+        )
+
+    async def abort(self) -> None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._recognition.stop)
+        except Exception:  # 忽略二次关闭错误
+            pass
+
+
 class AliyunASRProvider(ASRProvider):
     """阿里云百炼 fun-asr 提供方。"""
 
@@ -158,6 +274,32 @@ class AliyunASRProvider(ASRProvider):
         logger.info("aliyun_asr_done", latency_ms=latency_ms, text_preview=result.text[:50])
         return result
 
+    async def open_stream(
+        self,
+        config: ASRConfig | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> ASRStream:
+        """启动实时识别会话，音频随说随送。"""
+
+        cfg = config or ASRConfig()
+
+        from dashscope.audio.asr import Recognition  # type: ignore
+
+        loop = asyncio.get_running_loop()
+        callback = _AliyunStreamCallback(self._timeout_seconds, loop, on_partial, self.name)
+        recognition = Recognition(
+            model=self._model,
+            format=cfg.format,
+            sample_rate=cfg.sample_rate,
+            callback=callback,
+            semantic_punctuation_enabled=False,
+            punctuation_prediction_enabled=cfg.enable_punctuation,
+        )
+        # start 建立连接时同步阻塞，放到线程池执行
+        await loop.run_in_executor(None, recognition.start)
+        logger.info("aliyun_asr_stream_opened", fmt=cfg.format, sr=cfg.sample_rate)
+        return _AliyunASRStream(self.name, self._model, recognition, callback)
+
     async def health_check(self) -> bool:
         """执行轻量健康检查：静音识别是否成功返回。"""
 
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 """ASR 抽象基类与数据模型。
 
-摘要：定义语音识别契约，规范入参/出参与健康检查。
+摘要：定义语音识别契约，规范入参/出参与健康检查；流式会话契约见 ASRStream。
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 
 @dataclass
@@ -53,6 +53,65 @@ class ASRConfig:
     enable_timestamps: bool = False
 
 
+PartialCallback = Callable[["ASRResult"], Awaitable[None]]
+
+
+class ASRStream(ABC):
+    """流式识别会话：说话开始时打开，边说边 send，VAD 判定结束后 finish 取最终文本。
+
+    中间结果（is_final=False）通过打开会话时传入的 on_partial 回调推送。
+    """
+
+    @property
+    @abstractmethod
+    def provider(self) -> str:
+        """返回实际承载该会话的提供方名称。"""
+
+    @abstractmethod
+    async def send(self, pcm_chunk: bytes) -> None:
+        """发送一段音频（PCM16 单声道）。
+
+        Args:
+            pcm_chunk: 音频数据块。
+        """
+
+    @abstractmethod
+    async def finish(self) -> ASRResult:
+        """结束发送并等待最终结果。
+
+        Returns:
+            ASRResult: 最终识别结果（is_final=True）。
+        """
+
+    @abstractmethod
+    async def abort(self) -> None:
+        """放弃本次识别并释放连接（不产出结果）。"""
+
+
+class BufferedASRStream(ASRStream):
+    """不支持流式的提供方的默认实现：缓存音频，finish 时一次性调用 recognize。"""
+
+    def __init__(self, provider: "ASRProvider", config: ASRConfig | None = None) -> None:
+        self._provider = provider
+        self._config = config
+        self._chunks: list[bytes] = []
+
+    @property
+    def provider(self) -> str:
+        return self._provider.name
+
+    async def send(self, pcm_chunk: bytes) -> None:
+        self._chunks.append(pcm_chunk)
+
+    async def finish(self) -> ASRResult:
+        audio = b"".join(self._chunks)
+        self._chunks.clear()
+        return await self._provider.recognize(audio, self._config)
+
+    async def abort(self) -> None:
+        self._chunks.clear()
+
+
 class ASRProvider(ABC):
     """ASR 提供方抽象基类。
 
@@ -90,6 +149,25 @@ class ASRProvider(ABC):
             ASRResult: 识别结果对象。
         """
 
+    async def open_stream(
+        self,
+        config: ASRConfig | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> ASRStream:
+        """打开流式识别会话。
+
+        默认实现缓存音频并在 finish 时调用 recognize（无中间结果）；支持流式的提供方应覆盖。
+
+        Args:
+            config: 识别配置，None 表示使用默认值。
+            on_partial: 中间结果回调。
+
+        Returns:
+            ASRStream: 流式识别会话。
+        """
+
+        return BufferedASRStream(self, config)
+
     @abstractmethod
     async def health_check(self) -> bool:
         """健康检查。
@@ -4,22 +4,46 @@ from __future__ import annotations
 """本地 FunASR 提供方实现（WebSocket）。
 
 摘要：通过 WebSocket 使用本地 FunASR，遵循 start/end 协议进行流式识别。
+open_stream 在说话开始时建立 2pass 会话，边说边转发音频并推送在线中间结果，
+说话结束时只需等待最后一个分句的离线修正结果。
 """
 
 import asyncio
 import json
 import os
+import re
 import ssl
 import time
-from typing import Any
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque
 
 import structlog
 import websockets
 
-from .base import ASRConfig, ASRProvider, ASRResult
+from .base import ASRConfig, ASRProvider, ASRResult, ASRStream, PartialCallback
 
 logger = structlog.get_logger(__name__)
 
+# 结束帧发出后：最近一次离线结果之后仍发送过音频时，等待最终离线结果（is_final）的上限；
+# 所有音频均已修正时，仅短暂等待可能仍在途的消息
+_FINAL_TIMEOUT_SECONDS = 5.0
+_FINAL_GRACE_SECONDS = 0.3
+# 对齐在线/离线文本时忽略标点与空白（离线结果带标点，在线结果不带）
+_NON_SPEECH_RE = re.compile(r"[\W_]+")
+
+
+def _speech_len(text: str) -> int:
+    return len(_NON_SPEECH_RE.sub("", text))
+
+
+@dataclass(slots=True)
+class _OnlinePiece:
+    """一条尚未被离线修正的在线结果。"""
+
+    text: str
+    bytes_at: int  # 收到该结果时已发送的音频字节数（该结果覆盖的音频上界）
+
 
 class LocalFunASRProvider(ASRProvider):
     """本地 FunASR 提供方。"""
@@ -43,6 +67,52 @@ class LocalFunASRProvider(ASRProvider):
     def name(self) -> str:  # noqa: D401
         return "local"
 
+    def _connect(self) -> Any:
+        ssl_ctx = None
+        if self._url.startswith("wss://"):
+            ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ssl_ctx.check_hostname = False
+            ssl_ctx.verify_mode = ssl.CERT_NONE
+        return websockets.connect(
+            self._url,
+            open_timeout=10,
+            ping_interval=None,
+            subprotocols=["binary"],
+            additional_headers={"User-Agent": "EA-LocalASR/1.0"},
+            user_agent_header="EA-LocalASR/1.0",
+            max_size=None,
+            ssl=ssl_ctx,
+        )
+
+    def _start_message(self, cfg: ASRConfig) -> dict[str, Any]:
+        return {
+            "mode": "2pass",
+            "wav_name": "audio_stream",
+            "is_speaking": True,
+            "wav_format": cfg.format,
+            "audio_fs": cfg.sample_rate,
+            "chunk_size": self._chunk_cfg,
+            "hotwords": self._hotwords_json,
+            "itn": True,
+        }
+
+    async def open_stream(
+        self,
+        config: ASRConfig | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> ASRStream:
+        """建立 2pass 流式会话：在线结果作为中间结果推送，离线结果修正已说完的分句。"""
+
+        cfg = config or ASRConfig()
+        ws = await self._connect()
+        try:
+            await ws.send(json.dumps(self._start_message(cfg)))
+        except Exception:
+            await ws.close()
+            raise
+        logger.info("local_asr_stream_opened", url=self._url)
+        return _FunASRStream(self.name, self._url, ws, on_partial)
+
     async def recognize(self, audio_data: bytes, config: ASRConfig | None = None) -> ASRResult:
         """使用本地 FunASR 进行识别。
 
@@ -57,35 +127,10 @@ class LocalFunASRProvider(ASRProvider):
         cfg = config or ASRConfig()
         start_ts = time.time()
 
-        ssl_ctx = None
-        if self._url.startswith("wss://"):
-            ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ssl_ctx.check_hostname = False
-            ssl_ctx.verify_mode = ssl.CERT_NONE
-
         logger.info("local_asr_connect", url=self._url, size=len(audio_data))
 
-        async with websockets.connect(
-            self._url,
-            open_timeout=10,
-            ping_interval=None,
-            subprotocols=["binary"],
-            additional_headers={"User-Agent": "EA-LocalASR/1.0"},
-            user_agent_header="EA-LocalASR/1.0",
-            max_size=None,
-            ssl=ssl_ctx,
-        ) as ws:
-            start_msg: dict[str, Any] = {
-                "mode": "2pass",
-                "wav_name": "audio_stream",
-                "is_speaking": True,
-                "wav_format": cfg.format,
-                "audio_fs": cfg.sample_rate,
-                "chunk_size": self._chunk_cfg,
-                "hotwords": self._hotwords_json,
-                "itn": True,
-            }
-            await ws.send(json.dumps(start_msg))
+        async with self._connect() as ws:
+            await ws.send(json.dumps(self._start_message(cfg)))
 
             # 200ms 分块发送
             chunk_bytes = 6400
@@ -141,3 +186,165 @@ class LocalFunASRProvider(ASRProvider):
             logger.warning("local_asr_unhealthy", error=str(e))
             return False
 
+
+
+class _FunASRStream(ASRStream):
+    """FunASR 2pass 流式会话。
+
+    - 2pass-online：增量在线文本，按到达顺序暂存为待修正片段，并作为中间结果推送
+    - 2pass-offline：服务端 VAD 切出一个分句后的离线修正文本，替换该分句的在线片段
+    分句按顺序修正：离线结果只消费队首与其字数相当的在线片段，后续分句已到达的在线文本与音频仍视为待修正，
+    因此分句 N 的迟到修正不会清掉分句 N+1 的进度。
+    结束帧发出后只以带 is_final 的离线结果作为会话结束信号：较早分句的迟到修正不会提前结束等待。
+    """
+
+    _ONLINE_MODES = ("online", "2pass-online")
+
+    def __init__(self, provider: str, url: str, ws: Any, on_partial: PartialCallback | None) -> None:
+        self._provider = provider
+        self._url = url
+        self._ws = ws
+        self._on_partial = on_partial
+        self._committed = ""  # 已经离线修正的分句
+        self._pending: Deque[_OnlinePiece] = deque()  # 尚未修正的在线片段（可能跨多个分句）
+        self._ending = False
+        self._offline_after_end = asyncio.Event()
+        self._error: Exception | None = None
+        self._started_at = time.time()
+        self._bytes_sent = 0
+        self._corrected_bytes = 0  # 已被离线结果覆盖的音频字节数
+        self._reader = asyncio.create_task(self._read_loop())
+
+    @property
+    def provider(self) -> str:
+        return self._provider
+
+    @property
+    def text(self) -> str:
+        return self._committed + "".join(piece.text for piece in self._pending)
+
+    @property
+    def _uncorrected_bytes(self) -> int:
+        return self._bytes_sent - self._corrected_bytes
+
+    def _settle_segment(self, offline_text: str) -> None:
+        """用一个分句的离线结果替换队首对应的在线片段，只推进该分句覆盖的音频。"""
+        target = _speech_len(offline_text)
+        consumed = 0
+        while self._pending:
+            piece = self._pending[0]
+            size = _speech_len(piece.text)
+            # 片段大半落在离线文本范围内才归入本分句，其余留给后续分句
+            if consumed >= target or consumed + size / 2 > target:
+                break
+            self._pending.popleft()
+            consumed += size
+            self._corrected_bytes = max(self._corrected_bytes, piece.bytes_at)
+
+    async def _read_loop(self) -> None:
+        try:
+            async for message in self._ws:
+                if isinstance(message, bytes):
+                    continue
+                try:
+                    obj = json.loads(message)
+                except json.JSONDecodeError:
+                    continue
+                text = obj.get("text", "") or ""
+                mode = obj.get("mode", "")
+                if mode in self._ONLINE_MODES:
+                    if text:
+                        self._pending.append(_OnlinePiece(text, self._bytes_sent))
+                        await self._emit_partial()
+                    continue
+                if text:
+                    self._committed += text
+                    self._settle_segment(text)
+                if self._ending and obj.get("is_final"):
+                    # 最终结果覆盖剩余全部音频
+                    self._pending.clear()
+                    self._corrected_bytes = self._bytes_sent
+                    self._offline_after_end.set()
+                    return
+                if text:
+                    await self._emit_partial()
+        except Exception as exc:  # 连接中断
+            if not self._ending:
+                self._error = exc
+                logger.warning("local_asr_stream_read_failed", error=str(exc))
+        finally:
+            self._offline_after_end.set()
+
+    async def _emit_partial(self) -> None:
+        if self._on_partial is None:
+            return
+        try:
+            await self._on_partial(
+                ASRResult(
+                    text=self.text,
+                    is_final=False,
+                    provider=self._provider,
+                    latency_ms=int((time.time() - self._started_at) * 1000),
+                )
+            )
+        except Exception as exc:  # noqa: BLE001 - 推送失败不影响识别
+            logger.warning("local_asr_partial_callback_failed", error=str(exc))
+
+    async def send(self, pcm_chunk: bytes) -> None:
+        if self._error is not None:
+            raise self._error
+        await self._ws.send(pcm_chunk)
+        self._bytes_sent += len(pcm_chunk)
+
+    async def finish(self) -> ASRResult:
+        end_ts = time.time()
+        self._ending = True
+        try:
+            if self._error is None:
+                await self._ws.send(json.dumps({"is_speaking": False}))
+            pending = self._uncorrected_bytes > 0 or bool(self._pending)
+            timeout = _FINAL_TIMEOUT_SECONDS if pending else _FINAL_GRACE_SECONDS
+            try:
+                await asyncio.wait_for(self._offline_after_end.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.info(
+                    "local_asr_stream_final_timeout",
+                    pending_online=len(self._pending),
+                    uncorrected_bytes=self._uncorrected_bytes,
+                    timeout=timeout,
+                )
+        finally:
+            await self._close()
+
+        if self._error is not None and not self.text:
+            raise self._error
+        finalize_ms = int((time.time() - end_ts) * 1000)
+        logger.info(
+            "local_asr_stream_done",
+            bytes_sent=self._bytes_sent,
+            finalize_ms=finalize_ms,
+            text_preview=self.text[:50],
+        )
+        return ASRResult(
+            text=self.text,
+            confidence=1.0,
+            is_final=True,
+            provider=self._provider,
+            latency_ms=int((time.time() - self._started_at) * 1000),
+            metadata={"url": self._url, "streaming": True, "finalize_ms": finalize_ms},
+        )
+
+    async def abort(self) -> None:
+        self._ending = True
+        await self._close()
+
+    async def _close(self) -> None:
+        self._reader.cancel()
+        try:
+            await self._reader
+        except (asyncio.CancelledError, Exception):
+            pass
+        try:
+            await self._ws.close()
+        except Exception:
+            pass
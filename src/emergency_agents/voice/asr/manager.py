@@ -14,7 +14,7 @@ from typing import Optional
 
 import structlog
 
-from .base import ASRConfig, ASRProvider, ASRResult
+from .base import ASRConfig, ASRProvider, ASRResult, ASRStream, PartialCallback
 
 logger = structlog.get_logger(__name__)
 
@@ -249,6 +249,54 @@ class ASRManager:
             # 没有可用的备用Provider，或者备用Provider就是当前失败的Provider
             raise RuntimeError(f"ASR provider failed: {provider.name}") from e
 
+    async def open_stream(
+        self,
+        config: ASRConfig | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> ASRStream:
+        """打开流式识别会话，支持自动降级。
+
+        打开失败时立即切换备用Provider；会话中途失败时，finish 用已缓存的整句音频
+        调用备用Provider的 recognize，保证与非流式路径相同的降级语义。
+
+        Args:
+            config: 识别配置，None表示使用默认值。
+            on_partial: 中间结果回调。
+
+        Returns:
+            ASRStream: 带降级能力的流式会话。
+
+        Raises:
+            RuntimeError: 所有Provider都无法打开会话时抛出。
+        """
+        provider = self._select_provider()
+        try:
+            stream = await provider.open_stream(config, on_partial)
+        except Exception as e:
+            logger.warning("asr_stream_open_failed", provider=provider.name, error=str(e))
+            self._mark_failure(provider.name)
+            fallback_provider = self._get_fallback_provider()
+            if fallback_provider is None or fallback_provider.name == provider.name:
+                raise RuntimeError(f"ASR provider failed: {provider.name}") from e
+            logger.warning(
+                "asr_fallback",
+                from_provider=provider.name,
+                to_provider=fallback_provider.name,
+                stage="open_stream",
+                status=self._snapshot_status(),
+            )
+            try:
+                stream = await fallback_provider.open_stream(config, on_partial)
+            except Exception as fallback_error:
+                self._mark_failure(fallback_provider.name)
+                raise RuntimeError(
+                    f"All ASR providers failed: primary={provider.name}, fallback={fallback_provider.name}"
+                ) from fallback_error
+            provider = fallback_provider
+
+        logger.info("asr_stream_opened", provider=provider.name)
+        return _FailoverASRStream(self, provider, stream, config)
+
     def _select_provider(self) -> ASRProvider:
         """选择最佳Provider。
         
@@ -499,3 +547,73 @@ class ASRManager:
 
     def _snapshot_status(self) -> dict[str, bool]:
         return {name: status.available for name, status in self._provider_status.items()}
+
+
+class _FailoverASRStream(ASRStream):
+    """包装Provider会话：记录成功/失败，中途失败时用缓存音频降级到备用Provider。"""
+
+    def __init__(
+        self,
+        manager: ASRManager,
+        provider: ASRProvider,
+        stream: ASRStream,
+        config: ASRConfig | None,
+    ) -> None:
+        self._manager = manager
+        self._provider = provider
+        self._stream = stream
+        self._config = config
+        self._audio = bytearray()
+        self._failed: Optional[Exception] = None
+
+    @property
+    def provider(self) -> str:
+        return self._stream.provider
+
+    async def send(self, pcm_chunk: bytes) -> None:
+        self._audio.extend(pcm_chunk)
+        if self._failed is not None:
+            return
+        try:
+            await self._stream.send(pcm_chunk)
+        except Exception as e:
+            logger.warning("asr_stream_send_failed", provider=self._provider.name, error=str(e))
+            self._failed = e
+            await self._stream.abort()
+
+    async def finish(self) -> ASRResult:
+        if self._failed is None:
+            try:
+                result = await self._stream.finish()
+                self._manager._mark_success(self._provider.name)
+                return result
+            except Exception as e:
+                logger.warning("asr_stream_finish_failed", provider=self._provider.name, error=str(e))
+                self._failed = e
+
+        self._manager._mark_failure(self._provider.name)
+        fallback_provider = self._manager._get_fallback_provider()
+        if fallback_provider is None or fallback_provider.name == self._provider.name:
+            raise RuntimeError(f"ASR provider failed: {self._provider.name}") from self._failed
+
+        logger.warning(
+            "asr_fallback",
+            from_provider=self._provider.name,
+            to_provider=fallback_provider.name,
+            stage="stream",
+            audio_size=len(self._audio),
+        )
+        try:
+            result = await fallback_provider.recognize(bytes(self._audio), self._config)
+        except Exception as fallback_error:
+            self._manager._mark_failure(fallback_provider.name)
+            raise RuntimeError(
+                f"All ASR providers failed: primary={self._provider.name}, fallback={fallback_provider.name}"
+            ) from fallback_error
+        self._manager._mark_success(fallback_provider.name)
+        return result
+
+    async def abort(self) -> None:
+        self._audio.clear()
+        if self._failed is None:
+            await self._stream.abort()
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import structlog
 
-from .base import ASRConfig, ASRResult
+from .base import ASRConfig, ASRResult, ASRStream, PartialCallback
 from .manager import ASRManager
 
 logger = structlog.get_logger(__name__)
@@ -22,6 +22,13 @@ class ASRService:
     async def recognize(self, audio_data: bytes, config: ASRConfig | None = None) -> ASRResult:
         return await self._manager.recognize(audio_data, config)
 
+    async def open_stream(
+        self,
+        config: ASRConfig | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> ASRStream:
+        return await self._manager.open_stream(config, on_partial)
+
     async def start_health_check(self) -> None:
         await self._manager.start_health_check()
 
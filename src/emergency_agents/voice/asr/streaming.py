@@ -0,0 +1,109 @@
+# Copyright 2025 msq
+"""单句流式识别：说话开始时打开 ASR 会话，音频随到随送，VAD 判定结束后取最终结果。
+
+摘要：WebSocket 接收循环只需 feed/end，不等待任何网络 I/O；打开会话、转发音频、
+等待最终文本都在后台任务中按顺序完成。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+import structlog
+
+from .base import ASRConfig, ASRResult, PartialCallback
+from .service import ASRService
+
+logger = structlog.get_logger(__name__)
+
+_END = object()
+
+
+class StreamingUtterance:
+    """一句话的流式识别任务。
+
+    使用方法：
+        utterance = StreamingUtterance(asr_service, on_partial=send_partial)
+        utterance.feed(pcm)          # 每收到一块音频
+        utterance.end()              # VAD 判定说话结束
+        result = await utterance.result()
+    """
+
+    def __init__(
+        self,
+        asr_service: ASRService,
+        *,
+        on_partial: PartialCallback | None = None,
+        config: ASRConfig | None = None,
+    ) -> None:
+        self._asr_service = asr_service
+        self._on_partial = on_partial
+        self._config = config
+        self._queue: asyncio.Queue[object] = asyncio.Queue()
+        self._aborted = False
+        self._ended_at: Optional[float] = None
+        self.bytes_fed = 0
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._log_failure)
+
+    @property
+    def ended(self) -> bool:
+        return self._ended_at is not None
+
+    def feed(self, pcm_chunk: bytes) -> None:
+        """排入一块音频（不阻塞）。"""
+        if self._ended_at is not None or not pcm_chunk:
+            return
+        self.bytes_fed += len(pcm_chunk)
+        self._queue.put_nowait(pcm_chunk)
+
+    def end(self) -> None:
+        """标记说话结束，后台任务发完剩余音频后取最终结果。"""
+        if self._ended_at is None:
+            self._ended_at = time.time()
+            self._queue.put_nowait(_END)
+
+    def abort(self) -> None:
+        """放弃本句（如会话关闭、重新开始录音），不产出结果。"""
+        self._aborted = True
+        self.end()
+
+    async def result(self) -> Optional[ASRResult]:
+        """等待最终结果；被 abort 时返回 None。"""
+        result = await self._task
+        if result is not None and self._ended_at is not None:
+            finalize_ms = int((time.time() - self._ended_at) * 1000)
+            result.metadata = {**(result.metadata or {}), "finalize_ms": finalize_ms}
+            logger.info(
+                "asr_utterance_finalized",
+                provider=result.provider,
+                bytes_fed=self.bytes_fed,
+                finalize_ms=finalize_ms,
+            )
+        return result
+
+    def _log_failure(self, task: asyncio.Task[Optional[ASRResult]]) -> None:
+        # 取走异常，避免被 abort 的任务无人等待时报 "exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("asr_utterance_failed", error=str(task.exception()), aborted=self._aborted)
+
+    async def _run(self) -> Optional[ASRResult]:
+        stream = await self._asr_service.open_stream(self._config, self._on_partial)
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is _END:
+                    break
+                if not self._aborted:
+                    await stream.send(item)  # type: ignore[arg-type]
+            if self._aborted:
+                await stream.abort()
+                return None
+            return await stream.finish()
+        except BaseException:
+            await stream.abort()
+            raise
+
+
+__all__ = ["StreamingUtterance"]
@@ -8,6 +8,14 @@ import opuslib
 import structlog
 import torch
 
+from .vad_engine import (
+    VAD_SAMPLE_RATE,
+    VAD_WINDOW_BYTES,
+    BatchedVADEngine,
+    PcmRingBuffer,
+    SileroVADModel,
+)
+
 
 logger = structlog.get_logger(__name__)
 
@@ -15,12 +23,13 @@ logger = structlog.get_logger(__name__)
 class VADDetector:
     """语音活动检测器（Silero VAD）
 
-    - 支持两种输入：裸 Opus 帧（process_opus_packet）与原始 PCM 块（process_pcm_chunk）
+    - 支持两种输入：裸 Opus 帧（process_opus_packet）与原始 PCM 块（process_pcm_chunk / aprocess_pcm_chunk）
     - 采样率：16kHz，单声道，int16 LE
     - 滑动窗口去抖动与双阈值判断，静默 1s 认为一句话结束
+    - 推理交给 BatchedVADEngine：所有会话的窗口在后台线程按 batch 推理，每个会话独立保存循环状态
     """
 
-    def __init__(self, model_dir: str = "models/silero-vad") -> None:
+    def __init__(self, model_dir: str = "models/silero-vad", *, max_batch_size: int = 32) -> None:
         # 加载 Silero VAD 模型（优先本地，失败则尝试线上仓）
         try:
             self.model, _ = torch.hub.load(
@@ -39,8 +48,11 @@ class VADDetector:
             )
             logger.info("silero_vad_loaded_online")
 
+        # 批量推理引擎（独立线程，模型只在该线程内调用）
+        self.engine = BatchedVADEngine(SileroVADModel(self.model), max_batch_size=max_batch_size)
+
         # Opus 解码器（16kHz, mono）
-        self.decoder = opuslib.Decoder(16000, 1)
+        self.decoder = opuslib.Decoder(VAD_SAMPLE_RATE, 1)
 
         # 判定阈值与窗口配置
         self.vad_threshold = 0.5
@@ -62,127 +74,115 @@ class VADDetector:
         try:
             # Opus → PCM（每帧 960 采样点 ≈ 60ms @ 16kHz）
             pcm_frame = self.decoder.decode(opus_packet, 960)
-            state.client_audio_buffer.extend(pcm_frame)
-
-            client_have_voice = False
-
-            # 每次消费 512 采样点（=1024 字节）
-            while len(state.client_audio_buffer) >= 512 * 2:
-                chunk = state.client_audio_buffer[: 512 * 2]
-                state.client_audio_buffer = state.client_audio_buffer[512 * 2 :]
-
-                audio_int16 = np.frombuffer(chunk, dtype=np.int16)
-                audio_float32 = audio_int16.astype(np.float32) / 32768.0
-                audio_tensor = torch.from_numpy(audio_float32)
-
-                with torch.no_grad():
-                    speech_prob = self.model(audio_tensor, 16000).item()
-
-                if speech_prob >= self.vad_threshold:
-                    is_voice = True
-                elif speech_prob <= self.vad_threshold_low:
-                    is_voice = False
-                else:
-                    is_voice = state.last_is_voice
-
-                state.last_is_voice = is_voice
-
-                state.client_voice_window.append(is_voice)
-                client_have_voice = (
-                    state.client_voice_window.count(True) >= self.frame_window_threshold
-                )
-
-                if state.client_have_voice and not client_have_voice:
-                    stop_duration = time.time() * 1000 - state.last_activity_time
-                    if stop_duration >= self.silence_threshold_ms:
-                        state.client_voice_stop = True
-                        logger.info(
-                            "speech_ended_by_silence",
-                            session_id=session_id,
-                            silence_ms=stop_duration,
-                        )
-
-                if client_have_voice:
-                    state.client_have_voice = True
-                    state.last_activity_time = time.time() * 1000
-
-            return client_have_voice, state.client_voice_stop
+            state.client_audio_buffer.write(pcm_frame)
+            windows = state.client_audio_buffer.read_windows(VAD_WINDOW_BYTES)
+            probs = self.engine.infer(session_id, windows)
+            return self._apply_probabilities(session_id, state, probs)
 
         except opuslib.OpusError as e:
             logger.error("opus_decode_error", session_id=session_id, error=str(e))
             return False, False
 
     def process_pcm_chunk(self, session_id: str, pcm_chunk: bytes) -> tuple[bool, bool]:
-        """处理原始 PCM 数据块（16kHz, mono, int16 LE），返回 (是否在说话, 是否说话结束)"""
+        """处理原始 PCM 数据块（16kHz, mono, int16 LE），返回 (是否在说话, 是否说话结束)
+
+        同步版本会阻塞调用线程等待推理结果；事件循环内请使用 aprocess_pcm_chunk。
+        """
         state = self.get_or_create_state(session_id)
         try:
-            state.client_audio_buffer.extend(pcm_chunk)
-            client_have_voice = False
-
-            while len(state.client_audio_buffer) >= 512 * 2:
-                chunk = state.client_audio_buffer[: 512 * 2]
-                state.client_audio_buffer = state.client_audio_buffer[512 * 2 :]
-
-                audio_int16 = np.frombuffer(chunk, dtype=np.int16)
-                audio_float32 = audio_int16.astype(np.float32) / 32768.0
-                audio_tensor = torch.from_numpy(audio_float32)
-
-                with torch.no_grad():
-                    speech_prob = self.model(audio_tensor, 16000).item()
-
-                if speech_prob >= self.vad_threshold:
-                    is_voice = True
-                elif speech_prob <= self.vad_threshold_low:
-                    is_voice = False
-                else:
-                    is_voice = state.last_is_voice
-
-                state.last_is_voice = is_voice
-
-                state.client_voice_window.append(is_voice)
-                client_have_voice = (
-                    state.client_voice_window.count(True) >= self.frame_window_threshold
-                )
-
-                if state.client_have_voice and not client_have_voice:
-                    stop_duration = time.time() * 1000 - state.last_activity_time
-                    if stop_duration >= self.silence_threshold_ms:
-                        state.client_voice_stop = True
-                        logger.info(
-                            "speech_ended_by_silence",
-                            session_id=session_id,
-                            silence_ms=stop_duration,
-                        )
-
-                if client_have_voice:
-                    state.client_have_voice = True
-                    state.last_activity_time = time.time() * 1000
-
-            return client_have_voice, state.client_voice_stop
+            state.client_audio_buffer.write(pcm_chunk)
+            windows = state.client_audio_buffer.read_windows(VAD_WINDOW_BYTES)
+            probs = self.engine.infer(session_id, windows)
+            return self._apply_probabilities(session_id, state, probs)
 
         except Exception as e:
             logger.error("vad_process_failed", session_id=session_id, error=str(e))
             return False, False
 
+    async def aprocess_pcm_chunk(self, session_id: str, pcm_chunk: bytes) -> tuple[bool, bool]:
+        """process_pcm_chunk 的异步版本：推理在引擎线程批量执行，不阻塞事件循环。"""
+        state = self.get_or_create_state(session_id)
+        try:
+            state.client_audio_buffer.write(pcm_chunk)
+            windows = state.client_audio_buffer.read_windows(VAD_WINDOW_BYTES)
+            if len(windows) == 0:
+                return False, state.client_voice_stop
+            generation = state.generation
+            probs = await self.engine.ainfer(session_id, windows)
+            if generation != state.generation:
+                # 等待推理期间会话已被复位，丢弃旧窗口的结果
+                return False, False
+            return self._apply_probabilities(session_id, state, probs)
+
+        except Exception as e:
+            logger.error("vad_process_failed", session_id=session_id, error=str(e))
+            return False, False
+
+    def _apply_probabilities(
+        self, session_id: str, state: "VADSessionState", probs: np.ndarray
+    ) -> tuple[bool, bool]:
+        """按时间顺序应用各窗口的语音概率：双阈值 + 滑动窗口去抖 + 静默判停。"""
+        client_have_voice = False
+        for speech_prob in probs:
+            if speech_prob >= self.vad_threshold:
+                is_voice = True
+            elif speech_prob <= self.vad_threshold_low:
+                is_voice = False
+            else:
+                is_voice = state.last_is_voice
+
+            state.last_is_voice = is_voice
+
+            state.client_voice_window.append(is_voice)
+            client_have_voice = (
+                state.client_voice_window.count(True) >= self.frame_window_threshold
+            )
+
+            if state.client_have_voice and not client_have_voice:
+                stop_duration = time.time() * 1000 - state.last_activity_time
+                if stop_duration >= self.silence_threshold_ms:
+                    state.client_voice_stop = True
+                    logger.info(
+                        "speech_ended_by_silence",
+                        session_id=session_id,
+                        silence_ms=stop_duration,
+                    )
+
+            if client_have_voice:
+                state.client_have_voice = True
+                state.last_activity_time = time.time() * 1000
+
+        return client_have_voice, state.client_voice_stop
+
     def reset_session(self, session_id: str) -> None:
         if session_id in self.session_states:
             state = self.session_states[session_id]
-            state.client_audio_buffer = bytearray()
+            state.client_audio_buffer.clear()
             state.client_have_voice = False
             state.client_voice_stop = False
             state.client_voice_window.clear()
             state.last_is_voice = False
             state.last_activity_time = time.time() * 1000
+            state.generation += 1
+            self.engine.reset(session_id)
             logger.info("vad_session_reset", session_id=session_id)
 
+    def remove_session(self, session_id: str) -> None:
+        """会话断开后释放缓冲与模型循环状态。"""
+        if self.session_states.pop(session_id, None) is not None:
+            self.engine.drop(session_id)
+
+    def close(self) -> None:
+        self.engine.close()
+
 
 class VADSessionState:
     def __init__(self) -> None:
-        self.client_audio_buffer = bytearray()
+        self.client_audio_buffer = PcmRingBuffer()
         self.client_have_voice = False
         self.last_activity_time = time.time() * 1000
         self.client_voice_stop = False
         self.client_voice_window: deque[bool] = deque(maxlen=5)
         self.last_is_voice = False
-
-
+        # 每次复位递增，用于识别复位前提交的推理结果
+        self.generation = 0
@@ -0,0 +1,380 @@
+# Copyright 2025 msq
+"""
+批量 VAD 推理引擎 - 汇聚所有语音会话的 512 采样窗口，在独立线程中批量推理
+
+核心功能：
+- PcmRingBuffer：按字节写入、按整窗口读出的 PCM 环形缓冲，避免 bytearray 切片反复拷贝
+- BatchedVADEngine：单个后台线程持有模型与各会话的循环状态（RNN state），
+  把同一时刻多个会话的待推理窗口拼成一个 batch 调用模型
+- SileroVADModel：Silero VAD（TorchScript v5）的批量适配，按会话换入/换出 _state/_context
+
+线程模型：
+- 事件循环只负责切窗口与 submit，推理在引擎线程完成；结果通过 concurrent Future 回传，
+  异步调用方用 asyncio.wrap_future 等待，不阻塞 WebSocket 收包
+- 同一会话的多个窗口必须按时间顺序推理（循环状态依赖上一窗口），
+  不同会话之间互不依赖，因此按"第 k 个窗口"跨会话组 batch
+- reset/drop 与推理请求走同一队列，保证与该会话已提交的窗口保持先后顺序
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import structlog
+from prometheus_client import Gauge, Histogram
+
+logger = structlog.get_logger(__name__)
+
+VAD_SAMPLE_RATE = 16000
+VAD_WINDOW_SAMPLES = 512  # Silero VAD @16kHz 固定窗口（32ms）
+VAD_WINDOW_BYTES = VAD_WINDOW_SAMPLES * 2  # int16 LE
+
+_VAD_CHUNK_SECONDS = Histogram(
+    "voice_vad_chunk_inference_seconds",
+    "Amortized Silero VAD inference time per 512-sample chunk",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+_VAD_BATCH_SIZE = Histogram(
+    "voice_vad_batch_size",
+    "Number of session chunks inferred together in one VAD batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+_VAD_QUEUE_DEPTH = Gauge(
+    "voice_vad_queue_depth",
+    "VAD chunks waiting for the inference worker",
+)
+
+
+class VADModel(Protocol):
+    """可批量推理、循环状态由调用方托管的 VAD 模型。"""
+
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        """windows: [B, 512] float32；states: 每行对应会话的循环状态（None 表示初始态）。
+
+        返回 (每行语音概率 [B], 每行推理后的新状态)。
+        """
+        ...
+
+
+class PcmRingBuffer:
+    """int16 PCM 字节环形缓冲。
+
+    写入按字节追加（容量不足时倍增），读出时一次取走所有完整窗口并转换为 float32，
+    每个字节只拷贝一次进缓冲、一次出缓冲。
+    """
+
+    __slots__ = ("_buf", "_view", "_head", "_size")
+
+    def __init__(self, capacity: int = VAD_WINDOW_BYTES * 8) -> None:
+        self._buf = bytearray(max(capacity, VAD_WINDOW_BYTES))
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        src = memoryview(data).cast("B")
+        n = len(src)
+        if n == 0:
+            return
+        if self._size + n > len(self._buf):
+            self._grow(self._size + n)
+        cap = len(self._buf)
+        tail = (self._head + self._size) % cap
+        first = min(n, cap - tail)
+        self._view[tail : tail + first] = src[:first]
+        if first < n:
+            self._view[: n - first] = src[first:]
+        self._size += n
+
+    def read_windows(self, window_bytes: int = VAD_WINDOW_BYTES) -> np.ndarray:
+        """取走所有完整窗口，返回 [n, window_bytes/2] 的 float32（已归一化到 [-1, 1)）。"""
+        count = self._size // window_bytes
+        samples = window_bytes // 2
+        if count == 0:
+            return np.empty((0, samples), dtype=np.float32)
+        total = count * window_bytes
+        pcm = np.empty(total // 2, dtype=np.int16)
+        dst = memoryview(pcm).cast("B")
+        cap = len(self._buf)
+        first = min(total, cap - self._head)
+        dst[:first] = self._view[self._head : self._head + first]
+        if first < total:
+            dst[first:] = self._view[: total - first]
+        self._head = (self._head + total) % cap
+        self._size -= total
+        if self._size == 0:
+            self._head = 0
+        windows = pcm.astype(np.float32)
+        windows *= 1.0 / 32768.0
+        return windows.reshape(count, samples)
+
+    def _grow(self, required: int) -> None:
+        capacity = len(self._buf)
+        while capacity < required:
+            capacity *= 2
+        data = bytearray(capacity)
+        cap = len(self._buf)
+        first = min(self._size, cap - self._head)
+        data[:first] = self._view[self._head : self._head + first]
+        if first < self._size:
+            data[first : self._size] = self._view[: self._size - first]
+        self._view.release()
+        self._buf = data
+        self._view = memoryview(self._buf)
+        self._head = 0
+
+
+@dataclass(slots=True)
+class _InferRequest:
+    session_id: str
+    windows: np.ndarray
+    future: "Future[np.ndarray]"
+    probs: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.probs = np.empty(len(self.windows), dtype=np.float32)
+
+
+@dataclass(slots=True)
+class _Control:
+    session_id: str
+    action: str  # reset / drop
+
+
+_STOP = object()
+
+
+class BatchedVADEngine:
+    """跨会话批量 VAD 推理引擎（单后台线程）。
+
+    使用方法：
+        engine = BatchedVADEngine(SileroVADModel(model))
+        probs = await engine.ainfer(session_id, windows)   # windows: [n, 512] float32
+        engine.reset(session_id)                           # 一句话结束后清空循环状态
+    """
+
+    def __init__(
+        self,
+        model: VADModel,
+        *,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 0.0,
+        name: str = "vad-engine",
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._states: Dict[str, Any] = {}
+        self._pending_chunks = 0
+        self._pending_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending_chunks
+
+    def submit(self, session_id: str, windows: np.ndarray) -> "Future[np.ndarray]":
+        """提交一个会话按时间顺序排列的若干窗口，Future 结果为逐窗口语音概率。"""
+        future: "Future[np.ndarray]" = Future()
+        if len(windows) == 0:
+            future.set_result(np.empty(0, dtype=np.float32))
+            return future
+        if self._closed:
+            future.set_exception(RuntimeError("VAD engine is closed"))
+            return future
+        self._add_pending(len(windows))
+        self._queue.put(_InferRequest(session_id, windows, future))
+        return future
+
+    async def ainfer(self, session_id: str, windows: np.ndarray) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(session_id, windows))
+
+    def infer(self, session_id: str, windows: np.ndarray, timeout: Optional[float] = None) -> np.ndarray:
+        """同步版本（阻塞调用线程直到结果返回），供非异步调用方使用。"""
+        return self.submit(session_id, windows).result(timeout)
+
+    def reset(self, session_id: str) -> None:
+        """清空会话循环状态（在该会话已提交的窗口之后生效）。"""
+        if not self._closed:
+            self._queue.put(_Control(session_id, "reset"))
+
+    def drop(self, session_id: str) -> None:
+        """会话关闭，释放其循环状态。"""
+        if not self._closed:
+            self._queue.put(_Control(session_id, "drop"))
+
+    def close(self, timeout: float = 2.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _add_pending(self, delta: int) -> None:
+        with self._pending_lock:
+            self._pending_chunks += delta
+            _VAD_QUEUE_DEPTH.set(self._pending_chunks)
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            items = [item]
+            if self._max_wait:
+                time.sleep(self._max_wait)  # 攒批窗口：以微小延迟换更大的 batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            pending: List[_InferRequest] = []
+            stop = False
+            for entry in items:
+                if entry is _STOP:
+                    stop = True
+                    break
+                assert isinstance(entry, (_InferRequest, _Control))
+                if isinstance(entry, _Control) or any(r.session_id == entry.session_id for r in pending):
+                    # 控制指令与同会话的后续窗口必须排在已收集的请求之后执行
+                    self._flush(pending)
+                    pending = []
+                if isinstance(entry, _Control):
+                    # reset 与 drop 在引擎侧都是丢弃循环状态；区分动作便于日志排查
+                    self._states.pop(entry.session_id, None)
+                    continue
+                pending.append(entry)
+            self._flush(pending)
+            if stop:
+                return
+
+    def _flush(self, requests: List[_InferRequest]) -> None:
+        if not requests:
+            return
+        error: Optional[Exception] = None
+        try:
+            steps = max(len(r.windows) for r in requests)
+            for step in range(steps):
+                active = [r for r in requests if len(r.windows) > step]
+                for offset in range(0, len(active), self._max_batch_size):
+                    self._run_batch(active[offset : offset + self._max_batch_size], step)
+        except Exception as exc:  # noqa: BLE001 - 推理异常回传给所有等待方
+            logger.error("vad_batch_inference_failed", error=str(exc), sessions=len(requests))
+            error = exc
+        # 先更新队列深度再唤醒等待方，保证调用方拿到结果时指标已反映出队
+        self._add_pending(-sum(len(r.windows) for r in requests))
+        for request in requests:
+            if request.future.done():
+                continue
+            if error is not None:
+                self._states.pop(request.session_id, None)
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(request.probs)
+
+    def _run_batch(self, batch: List[_InferRequest], step: int) -> None:
+        windows = np.stack([r.windows[step] for r in batch])
+        states = [self._states.get(r.session_id) for r in batch]
+        started = time.perf_counter()
+        probs, new_states = self._model.infer(windows, states)
+        elapsed = time.perf_counter() - started
+        _VAD_BATCH_SIZE.observe(len(batch))
+        _VAD_CHUNK_SECONDS.observe(elapsed / len(batch))
+        for index, request in enumerate(batch):
+            request.probs[step] = probs[index]
+            self._states[request.session_id] = new_states[index]
+
+
+class SileroVADModel:
+    """Silero VAD（TorchScript v5）批量适配。
+
+    v5 模型把循环状态保存在模块属性 _state [2, B, 128] 与 _context [B, 64] 上，
+    且 batch 大小变化时会自动清零。这里在每次推理前按会话拼装状态、推理后拆回，
+    使同一个模型实例可在不同会话组合的 batch 之间复用。
+    旧版本模型不暴露这些属性时退化为逐窗口推理（状态在会话间共享，与原先行为一致）。
+    """
+
+    _CONTEXT_SAMPLES = 64  # 16kHz 下模型拼接的上一窗口尾部采样数
+
+    def __init__(self, model: Any, sample_rate: int = VAD_SAMPLE_RATE) -> None:
+        import torch
+
+        self._torch = torch
+        self._model = model
+        self._sample_rate = sample_rate
+        self._batched = all(
+            hasattr(model, attr) for attr in ("_state", "_context", "_last_sr", "_last_batch_size", "reset_states")
+        )
+        if not self._batched:
+            logger.warning("silero_vad_batch_state_unavailable, falling back to per-chunk inference")
+
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        torch = self._torch
+        x = torch.from_numpy(windows)
+        if self._batched:
+            try:
+                return self._infer_batched(x, states)
+            except Exception as exc:  # noqa: BLE001 - 模型结构不符时永久降级
+                logger.warning("silero_vad_batch_failed, falling back to per-chunk inference", error=str(exc))
+                self._batched = False
+        probs = np.empty(len(windows), dtype=np.float32)
+        with torch.no_grad():
+            for index in range(len(windows)):
+                probs[index] = float(self._model(x[index], self._sample_rate).item())
+        return probs, [None] * len(windows)
+
+    def _infer_batched(self, x: Any, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        torch = self._torch
+        model = self._model
+        batch = x.shape[0]
+        model.reset_states(batch)
+        state = model._state
+        context = torch.zeros(batch, self._CONTEXT_SAMPLES)
+        for index, saved in enumerate(states):
+            if saved is not None:
+                state[:, index] = saved[0]
+                context[index] = saved[1]
+        model._state = state
+        model._context = context
+        model._last_sr = self._sample_rate
+        model._last_batch_size = batch
+        with torch.no_grad():
+            out = model(x, self._sample_rate)
+        probs = out.reshape(-1).float().numpy().astype(np.float32, copy=False)
+        new_state = model._state
+        new_context = model._context
+        return probs, [(new_state[:, i].clone(), new_context[i].clone()) for i in range(batch)]
+
+
+__all__ = [
+    "BatchedVADEngine",
+    "PcmRingBuffer",
+    "SileroVADModel",
+    "VADModel",
+    "VAD_SAMPLE_RATE",
+    "VAD_WINDOW_BYTES",
+    "VAD_WINDOW_SAMPLES",
+]
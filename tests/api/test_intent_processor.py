@@ -86,6 +86,12 @@ async def test_handle_robotdog_control_success() -> None:
             self.contents.append(content)
             return True
 
+        def submit_add(self, *, on_done: Any = None, **kwargs: Any) -> bool:
+            self.add(**kwargs)
+            if on_done is not None:
+                on_done(None)
+            return True
+
     add_success = {"count": 0}
 
     metrics = Mem0Metrics(
@@ -216,6 +222,12 @@ async def test_process_intent_core_passes_raw_text_and_messages() -> None:
         def search(self, **_: Any) -> List[Dict[str, Any]]:
             return []
 
+        async def asearch(self, **_: Any) -> List[Dict[str, Any]]:
+            return []
+
+        def submit_add(self, *, on_done: Any = None, **kwargs: Any) -> bool:
+            return self.add(**kwargs)
+
         def add(
             self,
             *,
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from langgraph.graph import StateGraph
+from typing_extensions import TypedDict
+
+from emergency_agents.api.intent_stream import IntentEventStream
+from emergency_agents.graph.progress import ainvoke_with_progress
+
+
+async def _collect(stream: IntentEventStream, work: Any, finalize: Any = lambda r: {"value": r}) -> List[bytes]:
+    return [chunk async for chunk in stream.iter_bytes(work, finalize)]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_emits_stage_events_before_final() -> None:
+    stream = IntentEventStream()
+    release = asyncio.Event()
+    seen_before_release: List[str] = []
+
+    async def _work() -> str:
+        await stream.sink("intent", {"intent_type": "general-chat"})
+        await stream.sink("delta", {"text": "你"})
+        await release.wait()
+        return "done"
+
+    async def _consume() -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        async for chunk in stream.iter_bytes(_work, lambda r: {"value": r}):
+            event = json.loads(chunk.decode("utf-8"))
+            events.append(event)
+            if event["event"] == "delta":
+                seen_before_release.extend(item["event"] for item in events)
+                release.set()
+        return events
+
+    events = await _consume()
+
+    # 分类结果与增量文本在处理完成前已推送
+    assert seen_before_release == ["accepted", "intent", "delta"]
+    assert [item["event"] for item in events] == ["accepted", "intent", "delta", "final"]
+    assert events[-1]["data"]["value"] == "done"
+    assert stream.media_type == "application/x-ndjson"
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_reports_error_event() -> None:
+    stream = IntentEventStream(fmt="sse")
+
+    async def _work() -> None:
+        raise RuntimeError("handler boom")
+
+    chunks = await _collect(stream, _work)
+    text = b"".join(chunks).decode("utf-8")
+
+    assert stream.media_type == "text/event-stream"
+    assert "event: accepted\n" in text
+    assert "event: error\n" in text
+    assert "handler boom" in text
+    assert "event: final" not in text
+
+
+@pytest.mark.asyncio
+async def test_stream_cancels_work_on_disconnect_only_when_requested() -> None:
+    async def _run(cancel_on_disconnect: bool) -> asyncio.Event:
+        stream = IntentEventStream()
+        started = asyncio.Event()
+        finished = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def _work() -> str:
+            started.set()
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            finished.set()
+            return "done"
+
+        chunks = stream.iter_bytes(_work, lambda r: {"value": r}, cancel_on_disconnect=cancel_on_disconnect)
+        await chunks.__anext__()  # accepted
+        await started.wait()
+        await chunks.aclose()  # 模拟客户端断开
+        await asyncio.sleep(0.1)
+        return cancelled if cancel_on_disconnect else finished
+
+    assert (await _run(True)).is_set()
+    assert (await _run(False)).is_set()
+
+
+class _State(TypedDict, total=False):
+    steps: List[str]
+    status: str
+
+
+def _build_graph() -> Any:
+    graph = StateGraph(_State)
+    graph.add_node("first", lambda state: {"steps": [*state.get("steps", []), "first"]})
+    graph.add_node("second", lambda state: {"steps": [*state.get("steps", []), "second"], "status": "ok"})
+    graph.set_entry_point("first")
+    graph.add_edge("first", "second")
+    graph.add_edge("second", "__end__")
+    return graph.compile()
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_with_progress_reports_each_node() -> None:
+    compiled = _build_graph()
+    events: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _sink(event: str, data: Dict[str, Any]) -> None:
+        events.append((event, data))
+
+    result = await ainvoke_with_progress(compiled, {"steps": []}, event_sink=_sink, graph_name="Demo")
+
+    assert result == await compiled.ainvoke({"steps": []})
+    assert [(name, data["node"]) for name, data in events] == [("progress", "first"), ("progress", "second")]
+    assert events[-1][1]["graph"] == "Demo"
+    assert events[-1][1]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_with_progress_sink_failure_does_not_break_graph() -> None:
+    compiled = _build_graph()
+
+    async def _broken_sink(event: str, data: Dict[str, Any]) -> None:
+        raise ConnectionError("client gone")
+
+    result = await ainvoke_with_progress(compiled, {"steps": []}, event_sink=_broken_sink, graph_name="Demo")
+
+    assert result["steps"] == ["first", "second"]
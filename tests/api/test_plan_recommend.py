@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any, Dict, List
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from emergency_agents.api.plan import router as plan_router
 
 
+@pytest.fixture(autouse=True)
+def _audit_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # 审计文件写入临时目录，避免测试运行污染工作区 temp/
+    monkeypatch.setenv("AGENTS_PLAN_AUDIT_DIR", str(tmp_path))
+
+
 def _req_payload(units_count: int = 3) -> Dict[str, Any]:
     units: List[Dict[str, Any]] = []
     for i in range(units_count):
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+
+from emergency_agents.api import recon_batch_weather
+
+
+class _FakeCursor:
+    def __init__(self, pool: "_FakePool") -> None:
+        self._pool = pool
+
+    async def __aenter__(self) -> "_FakeCursor":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, sql: str, params: Any = None) -> None:
+        self._pool.insert_started.set()
+        await self._pool.release_insert.wait()
+        self._pool.executed.append(sql)
+
+
+class _FakeConnection:
+    def __init__(self, pool: "_FakePool") -> None:
+        self._pool = pool
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self._pool)
+
+    async def commit(self) -> None:
+        self._pool.commits += 1
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.insert_started = asyncio.Event()
+        self.release_insert = asyncio.Event()
+        self.executed: List[str] = []
+        self.commits = 0
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[_FakeConnection]:
+        yield _FakeConnection(self)
+
+
+class _FakeGenerator:
+    started: asyncio.Event
+    release: asyncio.Event
+    cancelled: asyncio.Event
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def agenerate(self, *, event_sink: Optional[Any] = None, **kwargs: Any) -> str:
+        _FakeGenerator.started.set()
+        try:
+            await _FakeGenerator.release.wait()
+        except asyncio.CancelledError:
+            _FakeGenerator.cancelled.set()
+            raise
+        return "## 空中侦察\n- 无人机1号 → 目标A"
+
+
+def _install_fakes(monkeypatch: pytest.MonkeyPatch) -> _FakePool:
+    pool = _FakePool()
+    _FakeGenerator.started = asyncio.Event()
+    _FakeGenerator.release = asyncio.Event()
+    _FakeGenerator.cancelled = asyncio.Event()
+
+    async def _targets(*args: Any) -> List[Dict[str, Any]]:
+        return [{"id": "t1", "name": "目标A", "priority": 0.9, "lon": 103.86, "lat": 31.69}]
+
+    async def _devices(*args: Any) -> List[Dict[str, Any]]:
+        return [{"id": "d1", "name": "无人机1号", "device_type": "uav", "env_type": "air", "capabilities": []}]
+
+    monkeypatch.setattr(recon_batch_weather, "_pg_pool_async", pool)
+    monkeypatch.setattr(recon_batch_weather, "_fetch_targets_in_radius", _targets)
+    monkeypatch.setattr(recon_batch_weather, "_fetch_available_recon_devices", _devices)
+    monkeypatch.setattr(recon_batch_weather, "container", SimpleNamespace(config=SimpleNamespace()))
+    monkeypatch.setattr(recon_batch_weather, "_get_llm_client", lambda cfg: object())
+    monkeypatch.setattr(recon_batch_weather, "_get_async_llm_client", lambda cfg: object())
+    monkeypatch.setattr(recon_batch_weather, "smart_allocate", lambda **kwargs: {"d1": ["t1"]})
+    monkeypatch.setattr(recon_batch_weather, "GroupedMarkdownGenerator", _FakeGenerator)
+    return pool
+
+
+async def _open_stream() -> Any:
+    request = SimpleNamespace(headers={})
+    response = await recon_batch_weather.create_batch_weather_plan(request, format="md", stream=True)  # type: ignore[arg-type]
+    body = response.body_iterator
+    await body.__anext__()  # accepted
+    return body
+
+
+@pytest.mark.asyncio
+async def test_disconnect_during_generation_cancels_llm_and_skips_save(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _install_fakes(monkeypatch)
+    body = await _open_stream()
+    await asyncio.wait_for(_FakeGenerator.started.wait(), timeout=1.0)
+
+    await body.aclose()  # 模拟客户端断开
+
+    await asyncio.wait_for(_FakeGenerator.cancelled.wait(), timeout=1.0)
+    assert not pool.insert_started.is_set()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_during_save_still_persists_plan(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _install_fakes(monkeypatch)
+    body = await _open_stream()
+    _FakeGenerator.release.set()
+    await asyncio.wait_for(pool.insert_started.wait(), timeout=1.0)
+
+    await body.aclose()  # 方案已生成、正在入库时客户端断开
+    pool.release_insert.set()
+
+    for _ in range(50):
+        if pool.commits:
+            break
+        await asyncio.sleep(0.01)
+    assert len(pool.executed) == 1 and "INSERT INTO recon_plans" in pool.executed[0]
+    assert pool.commits == 1
+    assert not recon_batch_weather._PERSIST_TASKS
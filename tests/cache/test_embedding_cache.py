@@ -0,0 +1,73 @@
+"""嵌入缓存测试：LRU 淘汰、Redis 二级回填、RAG/Mem0 共享。"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from emergency_agents.cache.embedding_cache import CachedMem0Embedder, EmbeddingCache
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: Dict[str, Any] = {}
+
+    def get(self, key: str, prefix: str = "emergency:") -> Optional[Any]:
+        return self.store.get(f"{prefix}{key}")
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, prefix: str = "emergency:") -> bool:
+        self.store[f"{prefix}{key}"] = value
+        return True
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.config = {"model": "embedding-3"}
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> List[float]:
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+
+@pytest.mark.unit
+def test_lru_evicts_least_recently_used() -> None:
+    cache = EmbeddingCache(max_entries=2)
+    cache.set("m", "a", [1.0])
+    cache.set("m", "b", [2.0])
+    assert cache.get("m", "a") == [1.0]
+    cache.set("m", "c", [3.0])
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0]
+    assert cache.get("m", "c") == [3.0]
+    assert cache.get("other-model", "a") is None
+
+
+@pytest.mark.unit
+def test_redis_tier_backfills_local_cache() -> None:
+    redis = _FakeRedis()
+    writer = EmbeddingCache(redis=redis)
+    writer.set("m", "地震", [0.1, 0.2])
+
+    reader = EmbeddingCache(redis=redis)
+    assert asyncio.run(reader.aget("m", "地震")) == [0.1, 0.2]
+    redis.store.clear()
+    assert reader.get("m", "地震") == [0.1, 0.2]
+    assert reader.stats()["hit_rate"] == 1.0
+
+
+@pytest.mark.unit
+def test_mem0_embedder_proxy_uses_shared_cache() -> None:
+    cache = EmbeddingCache()
+    cache.set("embedding-3", "已缓存", [9.0, 9.0])
+    inner = _CountingEmbedder()
+    proxy = CachedMem0Embedder(inner, cache, "embedding-3")
+
+    assert proxy.embed("已缓存", "search") == [9.0, 9.0]
+    assert proxy.embed("新问题", "search") == [3.0, 1.0]
+    assert proxy.embed("新问题", "add") == [3.0, 1.0]
+    assert inner.calls == ["新问题"]
+    assert proxy.config == {"model": "embedding-3"}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List
 
 import httpx
@@ -103,3 +104,77 @@ async def test_direction_error_without_backup() -> None:
     with pytest.raises(AmapError):
         await client.direction(origin=origin, destination=dest, mode="driving")
     await client.close()
+
+
+def _route_payload(distance: str = "1000") -> Dict[str, Any]:
+    return {"status": "1", "route": {"paths": [{"distance": distance, "duration": "600", "steps": []}]}}
+
+
+def _counting_client(handler_payload: Dict[str, Any], **kwargs: Any) -> tuple[AmapClient, List[httpx.Request]]:
+    requests: List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=handler_payload)
+
+    client = AmapClient(
+        api_key="key",
+        backup_key=None,
+        base_url="https://mock.amap.com",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://mock.amap.com"),
+        **kwargs,
+    )
+    return client, requests
+
+
+@pytest.mark.asyncio
+async def test_direction_cache_quantizes_nearby_coordinates() -> None:
+    client, requests = _counting_client(_route_payload(), coordinate_precision=3)
+    dest: Coordinate = {"lng": 103.90, "lat": 31.70}
+    first = await client.direction(origin={"lng": 103.85001, "lat": 31.68002}, destination=dest, mode="driving")
+    second = await client.direction(origin={"lng": 103.85003, "lat": 31.68004}, destination=dest, mode="driving")
+    assert len(requests) == 1
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["distance_meters"] == first["distance_meters"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_direction_cache_is_bounded_lru() -> None:
+    client, requests = _counting_client(_route_payload(), cache_max_entries=2)
+    dest: Coordinate = {"lng": 103.90, "lat": 31.70}
+    origins: List[Coordinate] = [{"lng": 103.0 + idx, "lat": 31.0} for idx in range(3)]
+    for origin in origins:
+        await client.direction(origin=origin, destination=dest, mode="driving")
+    assert len(client._cache) == 2
+    # 最早写入的条目已被淘汰，需要重新请求上游
+    await client.direction(origin=origins[0], destination=dest, mode="driving")
+    assert len(requests) == 4
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced() -> None:
+    client, requests = _counting_client(_route_payload())
+    origin: Coordinate = {"lng": 103.85, "lat": 31.68}
+    dest: Coordinate = {"lng": 103.90, "lat": 31.70}
+    plans = await asyncio.gather(
+        *(client.direction(origin=origin, destination=dest, mode="driving") for _ in range(10))
+    )
+    assert len(requests) == 1
+    assert all(plan["distance_meters"] == 1000 for plan in plans)
+    assert not client._inflight
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_geocode_results_are_cached() -> None:
+    payload = {"status": "1", "geocodes": [{"formatted_address": "映秀镇", "location": "103.850000,31.680000", "level": "town"}]}
+    client, requests = _counting_client(payload)
+    first, second = await asyncio.gather(client.geocode("映秀镇"), client.geocode(" 映秀镇 "))
+    third = await client.geocode("映秀镇")
+    assert len(requests) == 1
+    assert first == second == third
+    await client.close()
@@ -0,0 +1,197 @@
+"""战术救援子图并行分支测试：验证扇出/扇入、分支超时与部分结果降级。"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from emergency_agents.db.models import RescuerRecord
+from emergency_agents.external.amap_client import Coordinate, RoutePlan
+from emergency_agents.graph.rescue_tactical_app import RescueTacticalGraph
+from emergency_agents.intent.schemas import RescueTaskGenerationSlots
+from emergency_agents.rag.pipe import RagChunk
+
+BRANCH_DELAY = 0.3
+
+
+@dataclass
+class SlowResourceDAO:
+    count: int = 1
+
+    async def list_available_rescuers(self, *, limit: int = 25) -> List[RescuerRecord]:
+        await asyncio.sleep(BRANCH_DELAY)
+        return [
+            RescuerRecord(
+                rescuer_id=f"r{idx + 1}",
+                name=f"救援队{idx + 1}号",
+                rescuer_type="rescue_team",
+                status="available",
+                availability=True,
+                lng=120.05 + idx * 0.01,
+                lat=30.25,
+                skills=["rescue"],
+                equipment={"life_detector": 2},
+            )
+            for idx in range(min(self.count, limit))
+        ]
+
+
+@dataclass
+class SlowKGService:
+    delay: float = BRANCH_DELAY
+
+    def get_equipment_requirements(self, disasters: List[str]) -> List[Dict[str, Any]]:
+        time.sleep(self.delay)
+        return [
+            {"equipment_name": "life_detector"},
+            {"equipment_name": "thermal_camera"},
+            {"equipment_name": "medkit"},
+        ]
+
+
+@dataclass
+class SlowRagPipeline:
+    delay: float = BRANCH_DELAY
+
+    def query(self, question: str, domain: str, top_k: int = 5) -> List[RagChunk]:
+        time.sleep(self.delay)
+        return [RagChunk(text="案例1", source="case1", loc="p1")]
+
+
+class FakeAmapClient:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def geocode(self, place: str) -> Dict[str, Any] | None:
+        return None
+
+    async def direction(self, *, origin: Coordinate, destination: Coordinate, mode: str) -> RoutePlan:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if origin["lng"] > 120.5:
+            raise RuntimeError("no route")
+        return RoutePlan(distance_meters=12000, duration_seconds=900, steps=[], cache_hit=False)
+
+
+def _build_graph(
+    rag: SlowRagPipeline,
+    rag_timeout: float = 5.0,
+    *,
+    resource_dao: SlowResourceDAO | None = None,
+    amap_client: FakeAmapClient | None = None,
+    route_concurrency: int = 8,
+) -> RescueTacticalGraph:
+    instance = RescueTacticalGraph(
+        pool=object(),  # type: ignore[arg-type]
+        kg_service=SlowKGService(),  # type: ignore[arg-type]
+        rag_pipeline=rag,  # type: ignore[arg-type]
+        amap_client=amap_client or FakeAmapClient(),  # type: ignore[arg-type]
+        llm_client=object(),
+        llm_model="test-model",
+        orchestrator=None,
+        rag_timeout=rag_timeout,
+        notify=False,
+        postgres_dsn="postgresql://unused",
+        resource_dao=resource_dao or SlowResourceDAO(),  # type: ignore[arg-type]
+        task_repository=object(),  # type: ignore[arg-type]
+        route_concurrency=route_concurrency,
+    )
+    instance._compiled = instance._graph.compile(checkpointer=MemorySaver())
+    return instance
+
+
+def _initial_state(thread_id: str) -> Dict[str, Any]:
+    return {
+        "task_id": "task-1",
+        "user_id": "u1",
+        "thread_id": thread_id,
+        "simulation_mode": True,
+        "slots": RescueTaskGenerationSlots(
+            mission_type="rescue",
+            coordinates={"lng": 120.1, "lat": 30.2},
+            disaster_type="earthquake",
+        ),
+    }
+
+
+@pytest.mark.unit
+def test_independent_branches_run_concurrently() -> None:
+    graph = _build_graph(SlowRagPipeline())
+
+    started = time.perf_counter()
+    result = asyncio.run(graph.invoke(_initial_state("thread-parallel")))  # type: ignore[arg-type]
+    elapsed = time.perf_counter() - started
+
+    assert result.get("status") != "error", result.get("error")
+    assert elapsed < BRANCH_DELAY * 2.5, f"分支未并发执行，耗时 {elapsed:.2f}s"
+    summary = result["analysis_summary"]
+    assert summary["kg_count"] == 3
+    assert summary["rag_count"] == 1
+    assert set(summary["branch_latency_ms"]) == {"query_resources", "kg_reasoning", "rag_analysis"}
+    assert summary["degraded_branches"] == []
+    assert result["recommendation"]["resource_id"] == "r1"
+
+
+@pytest.mark.unit
+def test_rag_timeout_degrades_to_partial_result() -> None:
+    graph = _build_graph(SlowRagPipeline(delay=1.5), rag_timeout=0.5)
+
+    result = asyncio.run(graph.invoke(_initial_state("thread-degraded")))  # type: ignore[arg-type]
+
+    assert result.get("status") != "error", result.get("error")
+    assert result["branch_status"]["rag_analysis"]["status"] in {"timeout", "error"}
+    assert result["analysis_summary"]["degraded_branches"] == ["rag_analysis"]
+    assert result["matched_resources"], "案例检索超时时仍应基于 KG 与资源给出推荐"
+
+
+@pytest.mark.unit
+def test_required_branch_timeout_fails_graph() -> None:
+    graph = _build_graph(SlowRagPipeline())
+    graph._branch_timeouts["kg_reasoning"] = 0.05
+    graph._compiled = graph._graph.compile(checkpointer=MemorySaver())
+
+    result = asyncio.run(graph.invoke(_initial_state("thread-kg-timeout")))  # type: ignore[arg-type]
+
+    assert result["status"] == "error"
+    assert "kg_reasoning" in result["error"]
+
+
+@pytest.mark.unit
+def test_route_planning_is_concurrent_and_bounded() -> None:
+    amap = FakeAmapClient(delay=0.2)
+    graph = _build_graph(
+        SlowRagPipeline(delay=0.0),
+        resource_dao=SlowResourceDAO(count=25),
+        amap_client=amap,
+        route_concurrency=5,
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(graph.invoke(_initial_state("thread-routes")))  # type: ignore[arg-type]
+    elapsed = time.perf_counter() - started
+
+    assert result.get("status") != "error", result.get("error")
+    assert amap.calls == 25
+    assert amap.max_in_flight == 5
+    assert elapsed < 25 * 0.2 / 2, f"路径规划未并发执行，耗时 {elapsed:.2f}s"
+    # 经度 > 120.5 的资源路径规划失败，应转入未匹配列表
+    failed_ids = {item["resource_id"] for item in result["unmatched_resources"]}
+    assert failed_ids == {f"r{idx + 1}" for idx in range(25) if 120.05 + idx * 0.01 > 120.5}
+    assert len(result["routes"]) == len(result["matched_resources"])
+    # ETA 相同时保持匹配阶段（按距离）的顺序，不受完成先后影响
+    assert [route["resource_id"] for route in result["routes"]] == [
+        item["resource_id"] for item in result["matched_resources"]
+    ]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict
 
 from emergency_agents.intent.classifier import IntentClassifierRuntime
 from emergency_agents.intent.providers.base import IntentThresholds
 from emergency_agents.intent.providers.llm import LLMIntentProvider
+from emergency_agents.intent.providers.setfit import SetFitIntentProvider
 
 
 class _DummyChatCompletion:
@@ -116,3 +118,86 @@ def test_runtime_fallback_when_provider_raises() -> None:
 
     assert result["intent"]["intent_type"] == "rescue_task_generate"
     assert result["intent"]["meta"]["need_confirm"] is False
+
+
+class _AsyncDummyChatCompletion(_DummyChatCompletion):
+    def __init__(self, content: str) -> None:
+        super().__init__(content)
+        self.calls = 0
+
+    async def create(self, *, model: str, messages: list[Dict[str, Any]], temperature: float) -> Any:  # type: ignore[override]
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return super().create(model=model, messages=messages, temperature=temperature)
+
+
+def test_runtime_ainvoke_uses_async_client_without_blocking_loop() -> None:
+    content = (
+        '{"intent_type": "scout_task_simple", "slots": {"coordinates": {"lat": 31.6, "lng": 103.8}, "objective_summary": "侦察现场态势"}, '
+        '"meta": {"need_confirm": false, "confidence": 0.9, "margin": 0.6}}'
+    )
+    async_completions = _AsyncDummyChatCompletion(content)
+    async_llm = type("AsyncLLM", (), {"chat": type("Chat", (), {"completions": async_completions})})()
+    provider = LLMIntentProvider(_DummyLLM("同步路径不应被调用"), "glm", async_llm_client=async_llm)
+    runtime = IntentClassifierRuntime(
+        provider=provider,
+        fallback=provider,
+        thresholds=IntentThresholds(confidence=0.60, margin=0.10),
+    )
+
+    async def _run() -> tuple[list[Dict[str, Any]], int]:
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(_ticker())
+        results = await asyncio.gather(
+            *(runtime.ainvoke({"raw_text": f"去103.8,31.6侦察{idx}"}) for idx in range(4))
+        )
+        ticker.cancel()
+        return list(results), ticks
+
+    results, ticks = asyncio.run(_run())
+
+    assert [item["intent"]["intent_type"] for item in results] == ["scout_task_simple"] * 4
+    assert async_completions.calls == 4
+    assert ticks >= 5, "分类期间事件循环应保持可调度"
+
+
+def test_setfit_apredict_uses_async_http_client() -> None:
+    import httpx
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/predict"
+        return httpx.Response(
+            200,
+            json={
+                "intent": "hazard_report",
+                "proba": 0.8,
+                "ranking": [
+                    {"intent": "hazard_report", "confidence": 0.8},
+                    {"intent": "rescue_task_generate", "confidence": 0.1},
+                ],
+            },
+        )
+
+    provider = SetFitIntentProvider("http://setfit.test", timeout=1.0)
+
+    async def _run() -> Dict[str, Any]:
+        provider._async_client = httpx.AsyncClient(
+            base_url="http://setfit.test", transport=httpx.MockTransport(_handler)
+        )
+        try:
+            return dict(await provider.apredict("东侧发生滑坡"))
+        finally:
+            await provider.aclose()
+
+    prediction = asyncio.run(_run())
+
+    assert prediction["intent"] == "hazard_report"
+    assert prediction["source"] == "setfit"
+    assert abs(prediction["margin"] - 0.7) < 1e-9
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from emergency_agents.intent.classifier import IntentClassifierRuntime
+from emergency_agents.intent.providers.base import IntentProvider, IntentThresholds
+from emergency_agents.intent.providers.rules import FastPathIntentProvider, RuleIntentProvider
+from emergency_agents.intent.providers.types import IntentPrediction
+
+
+class _RecordingProvider(IntentProvider):
+    def __init__(self) -> None:
+        super().__init__("llm")
+        self.calls: List[str] = []
+
+    def predict(self, text: str) -> IntentPrediction:
+        self.calls.append(text)
+        return {"intent": "hazard_report", "confidence": 0.9, "margin": 0.5, "slots": {}, "source": "llm"}
+
+
+@pytest.mark.parametrize(
+    ("text", "intent", "slots"),
+    [
+        ("你好", "general-chat", {}),
+        ("能听见我说话吗？", "general-chat", {}),
+        ("查看所有携带设备", "system-data-query", {"query_type": "carried_devices", "query_params": {}}),
+        ("机器狗前进5米", "device_control_robotdog", {"action": "forward", "distance_m": 5.0}),
+        ("机器狗停止", "device_control_robotdog", {"action": "stop"}),
+        (
+            "去103.8,31.6侦察",
+            "scout-task-simple",
+            {"coordinates": {"lng": 103.8, "lat": 31.6}, "objective_summary": "去侦察"},
+        ),
+        (
+            "侦察31.6，103.8",
+            "scout-task-simple",
+            {"coordinates": {"lng": 103.8, "lat": 31.6}, "objective_summary": "侦察"},
+        ),
+    ],
+)
+def test_rules_match_common_commands(text: str, intent: str, slots: Dict[str, Any]) -> None:
+    prediction = RuleIntentProvider().predict(text)
+
+    assert prediction["intent"] == intent
+    assert prediction["slots"] == slots
+    assert prediction["source"] == "rules"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "你好，A楼有人被困",
+        "机器狗先前进再左转",
+        "103.8,31.6 教学楼倒塌，12人被困需要救援",
+        "汶川地震的情况怎么样",
+    ],
+)
+def test_rules_leave_ambiguous_input_to_llm(text: str) -> None:
+    assert RuleIntentProvider().predict(text)["intent"] == "unknown"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "机器狗不要前进",
+        "机器狗别后退",
+        "别让机器狗前进",
+        "机器狗先不用起立",
+        "机器狗能不能左转",
+        "机器狗可以后退吗？",
+    ],
+)
+def test_rules_do_not_dispatch_negated_or_hedged_robotdog_moves(text: str) -> None:
+    assert RuleIntentProvider().predict(text)["intent"] == "unknown"
+
+
+def test_fast_path_skips_delegate_on_hit_and_respects_threshold() -> None:
+    delegate = _RecordingProvider()
+    runtime = IntentClassifierRuntime(
+        provider=FastPathIntentProvider(delegate, min_confidence=0.85),
+        fallback=delegate,
+        thresholds=IntentThresholds(confidence=0.60, margin=0.10),
+    )
+
+    result = runtime({"raw_text": "查看所有携带设备"})
+    assert result["intent"]["intent_type"] == "system_data_query"
+    assert result["intent"]["slots"] == {"query_type": "carried_devices", "query_params": {}}
+    assert delegate.calls == []
+
+    asyncio.run(runtime.ainvoke({"raw_text": "东侧山体滑坡"}))
+    assert delegate.calls == ["东侧山体滑坡"]
+
+    strict = FastPathIntentProvider(delegate, min_confidence=0.99)
+    assert strict.predict("机器狗前进")["source"] == "llm"
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from emergency_agents.intent.handlers import scout_task_generation
+from emergency_agents.intent.handlers.scout_task_generation import ScoutTaskGenerationHandler
+from emergency_agents.intent.registry import IntentHandlerRegistry
+
+
+@pytest.mark.asyncio
+async def test_registry_forwards_risk_cache_to_scout_handler(monkeypatch: pytest.MonkeyPatch) -> None:
+    scout_handler = ScoutTaskGenerationHandler(
+        risk_repository=Mock(),
+        device_directory=Mock(),
+        amap_client=AsyncMock(),
+        orchestrator_client=Mock(),
+        postgres_dsn="postgresql://stub",
+        pool=Mock(),
+    )
+    registry = IntentHandlerRegistry(handlers={"scout-task-generate": scout_handler, "general-chat": object()})
+    risk_cache = Mock()
+
+    registry.attach_risk_cache(risk_cache)
+
+    build = AsyncMock(return_value=Mock())
+    monkeypatch.setattr(scout_task_generation.ScoutTacticalGraph, "build", build)
+    monkeypatch.setattr(scout_task_generation.RescueTaskRepository, "create", Mock())
+    await scout_handler._ensure_graph()
+    # 侦察子图拿到共享缓存，航点风险叠加才能在数据库不可用时走内存空间索引
+    assert build.await_args.kwargs["risk_cache_manager"] is risk_cache
+
+    registry.attach_risk_cache(None)
+    assert scout_handler._risk_cache is None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from emergency_agents.intent.classifier import IntentClassifierRuntime
+from emergency_agents.intent.providers.base import IntentProvider, IntentThresholds
+from emergency_agents.intent.providers.types import IntentPrediction
+from emergency_agents.intent.result_cache import IntentResultCache, normalize_utterance
+
+
+class _CountingProvider(IntentProvider):
+    def __init__(self, prediction: IntentPrediction) -> None:
+        super().__init__("llm")
+        self.prediction = prediction
+        self.calls = 0
+
+    def predict(self, text: str) -> IntentPrediction:
+        self.calls += 1
+        return dict(self.prediction)  # type: ignore[return-value]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: Dict[str, Any] = {}
+
+    def get(self, key: str, prefix: str = "emergency:") -> Optional[Any]:
+        return self.store.get(prefix + key)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, prefix: str = "emergency:") -> bool:
+        self.store[prefix + key] = value
+        return True
+
+
+_STATUS_QUERY: IntentPrediction = {
+    "intent": "device_status_query",
+    "confidence": 0.9,
+    "margin": 0.6,
+    "slots": {"device_name": "无人机1号"},
+    "source": "llm",
+}
+
+
+def _runtime(provider: IntentProvider, cache: IntentResultCache) -> IntentClassifierRuntime:
+    return IntentClassifierRuntime(
+        provider=provider,
+        fallback=provider,
+        thresholds=IntentThresholds(confidence=0.6, margin=0.1),
+        cache=cache,
+    )
+
+
+def test_normalized_repeat_hits_cache_across_threads() -> None:
+    provider = _CountingProvider(_STATUS_QUERY)
+    runtime = _runtime(provider, IntentResultCache())
+
+    first = runtime({"raw_text": "查询无人机1号的电量", "thread_id": "t1"})
+    second = asyncio.run(runtime.ainvoke({"raw_text": "查询 无人机1号 的电量！", "thread_id": "t2"}))
+
+    assert provider.calls == 1
+    assert second["intent"] == first["intent"]
+    assert normalize_utterance("查询 无人机１号 的电量！") == "查询无人机1号的电量"
+
+
+@pytest.mark.parametrize(
+    "prediction",
+    [
+        {"intent": "scout-task-simple", "confidence": 0.95, "slots": {"objective_summary": "侦察"}, "source": "llm"},
+        {"intent": "video_analyze", "confidence": 0.95, "slots": {"coordinates": {"lat": 31.0, "lng": 103.0}}, "source": "llm"},
+        {"intent": "device_status_query", "confidence": 0.5, "slots": {}, "source": "llm"},
+        {"intent": "unknown", "confidence": 0.99, "slots": {}, "source": "llm"},
+    ],
+)
+def test_location_bearing_or_uncertain_results_are_not_cached(prediction: Dict[str, Any]) -> None:
+    provider = _CountingProvider(prediction)  # type: ignore[arg-type]
+    runtime = _runtime(provider, IntentResultCache())
+
+    runtime({"raw_text": "派无人机侦察A点"})
+    runtime({"raw_text": "派无人机侦察A点"})
+
+    assert provider.calls == 2
+
+
+def test_ttl_expiry_and_opt_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    import emergency_agents.intent.result_cache as module
+
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "time", lambda: now[0])
+    cache = IntentResultCache(ttl_seconds=60, opt_out_intents={"task-progress-query"})
+
+    assert cache.put("查询无人机电量", dict(_STATUS_QUERY))
+    assert not cache.put("任务进度", {"intent": "task_progress_query", "confidence": 0.9, "slots": {}})
+    assert cache.get("查询无人机电量") is not None
+    now[0] += 61
+    assert cache.get("查询无人机电量") is None
+
+
+def test_redis_tier_and_similarity_match() -> None:
+    redis = _FakeRedis()
+    IntentResultCache(redis=redis).put("查看设备状态", dict(_STATUS_QUERY))
+    assert IntentResultCache(redis=redis).get("查看设备状态！")["intent"] == "device_status_query"
+
+    vectors: Dict[str, List[float]] = {
+        "派无人机去巡查": [1.0, 0.0],
+        "派无人机巡查": [0.99, 0.05],
+        "撤回所有无人机": [0.0, 1.0],
+    }
+    cache = IntentResultCache(embedder=lambda text: vectors[text], similarity_threshold=0.95)
+    cache.put("派无人机去巡查", {"intent": "device-control", "confidence": 0.9, "slots": {"action": "patrol"}})
+
+    assert cache.get("派无人机巡查")["slots"] == {"action": "patrol"}
+    assert cache.get("撤回所有无人机") is None
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from emergency_agents.intent.validator import validate_and_prompt_node, set_default_robotdog_id
+from emergency_agents.intent.validator import (
+    avalidate_and_prompt_node,
+    set_default_robotdog_id,
+    validate_and_prompt_node,
+)
 
 set_default_robotdog_id(None)
 
@@ -111,3 +116,28 @@ class TestValidatorRescueTaskGenerate:
 
         assert result["validation_status"] == "valid"
         assert "missing_fields" not in result
+
+
+class TestAsyncValidator:
+    """异步校验与同步版本结果一致，追问通过异步客户端生成。"""
+
+    def test_async_prompt_uses_async_client(self) -> None:
+        state: Dict[str, Any] = {
+            "intent": {
+                "intent_type": "hazard_report",
+                "slots": {"location": "四川省阿坝州茂县南新村"},
+                "meta": {"need_confirm": True},
+            },
+            "validation_attempt": 0,
+        }
+        sync_client = _mock_llm("请补充灾害类型。")
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(
+            return_value=sync_client.chat.completions.create.return_value
+        )
+
+        result = asyncio.run(avalidate_and_prompt_node(state, async_client, "glm-4.5-air"))
+        expected = validate_and_prompt_node(state, sync_client, "glm-4.5-air")
+
+        assert result == expected
+        async_client.chat.completions.create.assert_awaited_once()
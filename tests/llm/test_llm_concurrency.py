@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from emergency_agents.llm.concurrency import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CRITICAL,
+    PRIORITY_NORMAL,
+    AdaptiveConcurrencyLimiter,
+    scope_priority,
+)
+from emergency_agents.llm.deadline import DeadlineExceededError, request_deadline
+from emergency_agents.llm.endpoint_manager import LLMEndpointConfig, LLMEndpointManager
+
+
+@pytest.mark.asyncio
+async def test_critical_waiters_are_served_before_background() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    await limiter.acquire_async(PRIORITY_CRITICAL)
+    await limiter.acquire_async(PRIORITY_CRITICAL)
+    order: List[str] = []
+
+    async def _wait(name: str, priority: int) -> None:
+        await limiter.acquire_async(priority)
+        order.append(name)
+
+    background = asyncio.create_task(_wait("reports", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    critical = asyncio.create_task(_wait("voice", PRIORITY_CRITICAL))
+    await asyncio.sleep(0)
+    assert limiter.queue_depth() == 2
+
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert order == ["voice"]
+
+    # 后台优先级最多占用 1 个名额：需要在途数降到 0 才放行
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert order == ["voice"]
+    limiter.release()
+    await asyncio.sleep(0.01)
+    assert order == ["voice", "reports"]
+    await asyncio.gather(background, critical)
+
+
+@pytest.mark.asyncio
+async def test_background_priority_keeps_headroom_for_critical() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+    # 后台优先级最多占用一半名额
+    assert limiter.try_acquire(PRIORITY_BACKGROUND)
+    assert limiter.try_acquire(PRIORITY_BACKGROUND)
+    assert not limiter.try_acquire(PRIORITY_BACKGROUND)
+    assert limiter.try_acquire(PRIORITY_CRITICAL)
+    assert limiter.try_acquire(PRIORITY_CRITICAL)
+    assert limiter.inflight == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    await limiter.acquire_async(PRIORITY_CRITICAL)
+    waiter = asyncio.create_task(limiter.acquire_async(PRIORITY_CRITICAL))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    assert limiter.inflight == 0
+    assert limiter.queue_depth() == 0
+    assert limiter.try_acquire(PRIORITY_CRITICAL)
+
+
+def _sync_manager(limiter: AdaptiveConcurrencyLimiter) -> LLMEndpointManager:
+    return LLMEndpointManager(
+        endpoints=[LLMEndpointConfig(name="primary", base_url="https://primary", api_key="k")],
+        sync_client_builder=lambda endpoint: object(),  # type: ignore[arg-type,return-value]
+        async_client_builder=lambda endpoint: object(),  # type: ignore[arg-type,return-value]
+        scope="reports",
+        limiter=limiter,
+    )
+
+
+def _hold_loop_sync_slot(limiter: AdaptiveConcurrencyLimiter, held: threading.Event, done: threading.Event) -> None:
+    """在另一个线程的事件循环上以同步方式占住一个循环同步名额，直到 done 被设置。"""
+
+    async def _run() -> None:
+        assert limiter.acquire_sync(PRIORITY_CRITICAL)
+        held.set()
+        done.wait(2.0)
+        limiter.release_sync()
+
+    asyncio.run(_run())
+
+
+@pytest.mark.asyncio
+async def test_sync_call_on_event_loop_waits_when_limiter_full() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2, loop_sync_slots=1)
+    await limiter.acquire_async(PRIORITY_CRITICAL)
+    await limiter.acquire_async(PRIORITY_CRITICAL)
+    manager = _sync_manager(limiter)
+    calls: List[str] = []
+
+    def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        calls.append(endpoint.name)
+        return "ok"
+
+    # 共享名额被本循环上的协程占满：循环线程上的同步调用不能排进共享队列（否则死锁），
+    # 也不能直接失败，而是等待循环同步名额池
+    held, done = threading.Event(), threading.Event()
+    holder = threading.Thread(target=_hold_loop_sync_slot, args=(limiter, held, done))
+    holder.start()
+    assert held.wait(1.0)
+    threading.Timer(0.1, done.set).start()
+
+    started = time.monotonic()
+    assert manager.call_sync("chat", _call) == "ok"
+    assert time.monotonic() - started >= 0.09
+    assert calls == ["primary"]
+    holder.join(1.0)
+    assert limiter.inflight == 2
+    assert limiter.queue_depth() == 0
+
+    # 放到工作线程中执行时在共享队列中排队，名额释放后完成
+    pending = asyncio.ensure_future(asyncio.to_thread(manager.call_sync, "chat", _call))
+    await asyncio.sleep(0.05)
+    assert not pending.done()
+    limiter.release()
+    limiter.release()
+    assert await asyncio.wait_for(pending, timeout=1.0) == "ok"
+    assert limiter.inflight == 0
+
+
+def test_sync_acquire_times_out_with_request_deadline() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    assert limiter.try_acquire(PRIORITY_CRITICAL)
+    manager = _sync_manager(limiter)
+
+    with request_deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            manager.call_sync("chat", lambda client, endpoint: "ok")
+    assert limiter.queue_depth() == 0
+    limiter.release()
+    assert limiter.inflight == 0
+
+
+def test_limit_backs_off_on_overload_and_grows_when_saturated() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=20, cooldown_seconds=0)
+    limiter.observe(1000, overloaded=True)
+    assert limiter.limit == 7
+
+    for _ in range(7):
+        assert limiter.try_acquire(PRIORITY_CRITICAL)
+    for _ in range(20):
+        limiter.observe(100)
+    assert limiter.limit > 7
+
+
+def test_latency_regression_reduces_limit() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, cooldown_seconds=0)
+    limiter.observe(100)
+    limiter.observe(500)
+    assert limiter.limit == 9
+
+
+def test_scope_priority_defaults_and_overrides() -> None:
+    assert scope_priority("voice") == PRIORITY_CRITICAL
+    assert scope_priority("reports") == PRIORITY_BACKGROUND
+    assert scope_priority("unknown") == PRIORITY_NORMAL
+    assert scope_priority("reports", {"reports": 0}) == PRIORITY_CRITICAL
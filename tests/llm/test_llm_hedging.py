@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from emergency_agents.llm.deadline import DeadlineExceededError, remaining_seconds, request_deadline
+from emergency_agents.llm.endpoint_manager import LLMEndpointConfig, LLMEndpointManager
+
+
+class _OptionsClient:
+    """带 with_options 的客户端桩，记录每次绑定的超时。"""
+
+    def __init__(self, name: str, timeouts: List[float]) -> None:
+        self.name = name
+        self._timeouts = timeouts
+
+    def with_options(self, *, timeout: float) -> "_OptionsClient":
+        self._timeouts.append(timeout)
+        return self
+
+
+def _build_manager(*, hedge_enabled: bool = True, timeouts: List[float] | None = None) -> LLMEndpointManager:
+    recorded = timeouts if timeouts is not None else []
+
+    def build_client(endpoint: LLMEndpointConfig) -> Any:
+        return _OptionsClient(endpoint.name, recorded)
+
+    return LLMEndpointManager(
+        endpoints=[
+            LLMEndpointConfig(name="primary", base_url="https://primary", api_key="k", priority=100),
+            LLMEndpointConfig(name="backup", base_url="https://backup", api_key="k", priority=80),
+        ],
+        failure_threshold=2,
+        recovery_seconds=30,
+        sync_client_builder=build_client,
+        async_client_builder=build_client,
+        routing_policy="priority",
+        hedge_enabled=hedge_enabled,
+        hedge_min_delay=0.01,
+        hedge_max_delay=0.05,
+    )
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_for_stuck_primary_and_cancels_loser() -> None:
+    manager = _build_manager()
+    cancelled: Dict[str, bool] = {}
+
+    async def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        if endpoint.name == "primary":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled["primary"] = True
+                raise
+        return endpoint.name
+
+    result = await asyncio.wait_for(manager.call_async("chat", _call), timeout=1.0)
+
+    assert result == "backup"
+    assert cancelled == {"primary": True}
+    snapshot = manager.status_snapshot()
+    # 被取消的落后请求不计入熔断
+    assert snapshot["primary"]["failures"] == 0
+    assert all(state["inflight"] == 0 for state in snapshot.values())
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_primary_answers_quickly() -> None:
+    manager = _build_manager()
+    calls: List[str] = []
+
+    async def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        calls.append(endpoint.name)
+        return endpoint.name
+
+    assert await manager.call_async("chat", _call) == "primary"
+    assert calls == ["primary"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_call_without_failover_or_breaker() -> None:
+    manager = _build_manager(hedge_enabled=False)
+    calls: List[str] = []
+
+    async def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        calls.append(endpoint.name)
+        await asyncio.sleep(5)
+        return endpoint.name
+
+    with request_deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            await manager.call_async("chat", _call)
+
+    assert calls == ["primary"]
+    assert manager.status_snapshot()["primary"]["failures"] == 0
+
+
+def test_sync_deadline_timeout_does_not_trip_breaker_or_fail_over() -> None:
+    timeouts: List[float] = []
+    manager = _build_manager(hedge_enabled=False, timeouts=timeouts)
+    calls: List[str] = []
+
+    def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        # 模拟客户端按绑定的剩余预算超时
+        calls.append(endpoint.name)
+        time.sleep(timeouts[-1])
+        raise TimeoutError("request timed out")
+
+    with request_deadline(0.05):
+        with pytest.raises(DeadlineExceededError):
+            manager.call_sync("chat", _call)
+
+    assert calls == ["primary"]
+    snapshot = manager.status_snapshot()
+    assert snapshot["primary"]["failures"] == 0
+    assert all(state["inflight"] == 0 for state in snapshot.values())
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_skips_upstream_call() -> None:
+    manager = _build_manager(hedge_enabled=False)
+    calls: List[str] = []
+
+    async def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        calls.append(endpoint.name)
+        return endpoint.name
+
+    with request_deadline(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            await manager.call_async("chat", _call)
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_deadline_flows_into_nested_threads_and_binds_client_timeout() -> None:
+    timeouts: List[float] = []
+    manager = _build_manager(hedge_enabled=False, timeouts=timeouts)
+
+    def _call(client: Any, endpoint: LLMEndpointConfig) -> Any:
+        return SimpleNamespace(endpoint=endpoint.name, remaining=remaining_seconds())
+
+    with request_deadline(10):
+        with request_deadline(30):  # 嵌套设置不会放宽外层预算
+            result = await asyncio.to_thread(manager.call_sync, "chat", _call)
+
+    assert result.endpoint == "primary"
+    assert result.remaining is not None and 0 < result.remaining <= 10
+    assert len(timeouts) == 1 and 0 < timeouts[0] <= 10
+    assert remaining_seconds() is None
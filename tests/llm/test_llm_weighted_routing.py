@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from emergency_agents.llm.endpoint_manager import LLMEndpointConfig, LLMEndpointManager
+
+
+def _build_manager(
+    endpoints: List[LLMEndpointConfig],
+    *,
+    routing_policy: str = "weighted",
+    max_concurrency: int = 16,
+) -> LLMEndpointManager:
+    def build_client(endpoint: LLMEndpointConfig) -> Any:
+        return SimpleNamespace(name=endpoint.name)
+
+    return LLMEndpointManager(
+        endpoints=endpoints,
+        failure_threshold=2,
+        recovery_seconds=30,
+        sync_client_builder=build_client,
+        async_client_builder=build_client,
+        max_concurrency=max_concurrency,
+        routing_policy=routing_policy,  # type: ignore[arg-type]
+        scope="test",
+    )
+
+
+async def _run_concurrently(manager: LLMEndpointManager, count: int) -> Counter[str]:
+    """并发发起 count 个请求，全部入场后再统一放行，返回各端点承接的请求数。"""
+    release = asyncio.Event()
+    entered = 0
+    all_entered = asyncio.Event()
+
+    async def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        nonlocal entered
+        entered += 1
+        if entered == count:
+            all_entered.set()
+        await release.wait()
+        return endpoint.name
+
+    tasks = [asyncio.create_task(manager.call_async("chat", _call)) for _ in range(count)]
+    await asyncio.wait_for(all_entered.wait(), timeout=1.0)
+    snapshot = manager.status_snapshot()
+    assert sum(int(state["inflight"]) for state in snapshot.values()) == count
+    release.set()
+    return Counter(await asyncio.gather(*tasks))
+
+
+@pytest.mark.asyncio
+async def test_weighted_policy_spreads_in_flight_requests_across_endpoints() -> None:
+    manager = _build_manager(
+        [
+            LLMEndpointConfig(name="primary", base_url="https://primary", api_key="k", priority=100),
+            LLMEndpointConfig(name="backup", base_url="https://backup", api_key="k", priority=80),
+        ]
+    )
+
+    counts = await _run_concurrently(manager, 4)
+
+    assert counts == Counter({"primary": 2, "backup": 2})
+    assert all(state["inflight"] == 0 for state in manager.status_snapshot().values())
+
+
+@pytest.mark.asyncio
+async def test_weighted_policy_respects_endpoint_weight() -> None:
+    manager = _build_manager(
+        [
+            LLMEndpointConfig(name="h100-a", base_url="https://a", api_key="k", weight=3),
+            LLMEndpointConfig(name="h100-b", base_url="https://b", api_key="k", weight=1),
+        ]
+    )
+
+    counts = await _run_concurrently(manager, 8)
+
+    assert counts == Counter({"h100-a": 6, "h100-b": 2})
+
+
+@pytest.mark.asyncio
+async def test_priority_policy_keeps_backup_idle() -> None:
+    manager = _build_manager(
+        [
+            LLMEndpointConfig(name="primary", base_url="https://primary", api_key="k", priority=100),
+            LLMEndpointConfig(name="backup", base_url="https://backup", api_key="k", priority=80),
+        ],
+        routing_policy="priority",
+    )
+
+    counts = await _run_concurrently(manager, 4)
+
+    assert counts == Counter({"primary": 4})
+
+
+def test_weighted_policy_prefers_lower_ewma_latency() -> None:
+    manager = _build_manager(
+        [
+            LLMEndpointConfig(name="slow", base_url="https://slow", api_key="k", priority=100),
+            LLMEndpointConfig(name="fast", base_url="https://fast", api_key="k", priority=80),
+        ]
+    )
+
+    def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        if endpoint.name == "slow":
+            time.sleep(0.05)
+        return endpoint.name
+
+    # 冷启动同分按优先级先选 slow，随后 fast 以乐观延迟估计被探测到
+    first = manager.call_sync("chat", _call)
+    second = manager.call_sync("chat", _call)
+    assert (first, second) == ("slow", "fast")
+
+    followups = [manager.call_sync("chat", _call) for _ in range(5)]
+    assert followups == ["fast"] * 5
+    snapshot = manager.status_snapshot()
+    assert float(snapshot["slow"]["ewma_latency_ms"]) > float(snapshot["fast"]["ewma_latency_ms"])
+
+
+def test_weighted_policy_skips_unavailable_endpoint() -> None:
+    manager = _build_manager(
+        [
+            LLMEndpointConfig(name="primary", base_url="https://primary", api_key="k", priority=100),
+            LLMEndpointConfig(name="backup", base_url="https://backup", api_key="k", priority=80),
+        ]
+    )
+
+    def _call(client: Any, endpoint: LLMEndpointConfig) -> str:
+        if endpoint.name == "primary":
+            raise RuntimeError("429 Too Many Requests")
+        return endpoint.name
+
+    assert manager.call_sync("chat", _call) == "backup"
+    assert manager.status_snapshot()["primary"]["available"] is False
+    assert [manager.call_sync("chat", _call) for _ in range(3)] == ["backup"] * 3
@@ -0,0 +1,137 @@
+"""Mem0 写后队列测试：不阻塞调用方、批量合并、失败重试与队列满拒绝。"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from emergency_agents.memory.write_behind import Mem0WriteBehindQueue, PendingWrite
+
+
+class _RecordingWriter:
+    def __init__(self, *, delay: float = 0.0, failures: int = 0) -> None:
+        self.delay = delay
+        self.failures = failures
+        self.written: List[PendingWrite] = []
+
+    async def __call__(self, item: PendingWrite) -> bool:
+        await asyncio.sleep(self.delay)
+        if self.failures > 0:
+            self.failures -= 1
+            raise TimeoutError("neo4j timeout")
+        self.written.append(item)
+        return True
+
+
+def _item(content: str, run_id: str = "thread-1", results: Optional[List[Optional[str]]] = None) -> PendingWrite:
+    return PendingWrite(
+        content=content,
+        user_id="u1",
+        run_id=run_id,
+        metadata={"incident_id": "inc-1"},
+        on_done=(results.append if results is not None else None),
+    )
+
+
+@pytest.mark.unit
+def test_submit_returns_immediately_and_batches_same_session() -> None:
+    writer = _RecordingWriter(delay=0.2)
+    queue = Mem0WriteBehindQueue(writer, batch_size=8)
+    results: List[Optional[str]] = []
+
+    async def _run() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for idx in range(3):
+            assert queue.submit(_item(f"意图{idx}", results=results))
+        queue.submit(_item("其他会话", run_id="thread-2", results=results))
+        submitted = loop.time() - started
+        assert await queue.drain(timeout=2.0)
+        await queue.aclose()
+        return submitted
+
+    submitted = asyncio.run(_run())
+
+    assert submitted < 0.05
+    assert results == [None, None, None, None]
+    contents = sorted(item.content for item in writer.written)
+    assert contents == ["其他会话", "意图0\n意图1\n意图2"]
+
+
+@pytest.mark.unit
+def test_failed_write_is_retried_then_succeeds() -> None:
+    writer = _RecordingWriter(failures=1)
+    queue = Mem0WriteBehindQueue(writer, retry_backoff=0.01, max_attempts=3)
+    results: List[Optional[str]] = []
+
+    async def _run() -> None:
+        queue.submit(_item("重试写入", results=results))
+        for _ in range(50):
+            if results:
+                break
+            await asyncio.sleep(0.01)
+        await queue.aclose()
+
+    asyncio.run(_run())
+
+    assert results == [None]
+    assert [item.content for item in writer.written] == ["重试写入"]
+
+
+@pytest.mark.unit
+def test_full_queue_rejects_without_blocking() -> None:
+    writer = _RecordingWriter(delay=0.2)
+    queue = Mem0WriteBehindQueue(writer, max_size=1, batch_size=1)
+    results: List[Optional[str]] = []
+
+    async def _run() -> List[bool]:
+        accepted = [queue.submit(_item(f"m{idx}", results=results)) for idx in range(3)]
+        await queue.aclose(timeout=2.0)
+        return accepted
+
+    accepted = asyncio.run(_run())
+
+    assert accepted == [True, False, False]
+    assert results.count("queue_full") == 2
+
+
+@pytest.mark.unit
+def test_facade_asearch_times_out_off_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    import time
+
+    from emergency_agents.memory.mem0_facade import Mem0Config, MemoryFacade
+
+    facade = MemoryFacade(
+        Mem0Config(
+            qdrant_url="http://qdrant.test:6333",
+            qdrant_api_key=None,
+            qdrant_collection="mem0_test",
+            embedding_model="embedding-3",
+            embedding_dim=1024,
+            neo4j_uri="bolt://neo4j.test:7687",
+            neo4j_user="neo4j",
+            neo4j_password="test",
+            openai_base_url="http://llm.test/v1",
+            openai_api_key="test",
+        )
+    )
+    monkeypatch.setattr(facade, "search", lambda **_: time.sleep(0.3) or [])
+
+    async def _run() -> int:
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(_ticker())
+        with pytest.raises(asyncio.TimeoutError):
+            await facade.asearch(query="q", user_id="u1", timeout=0.1)
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(_run()) >= 5
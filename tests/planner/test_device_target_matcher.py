@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+from emergency_agents.planner.device_target_matcher import (
+    MatchingRule,
+    build_score_matrix,
+    min_cost_assign,
+    smart_allocate,
+)
+
+_ENV_TYPES = ["air", "land", "sea", "water", "amphibious"]
+_CAPABILITIES = [["热成像", "GPS"], ["高清摄像", "GPS"], ["普通摄像头"], ["LiDAR", "4K"]]
+_TARGET_NAMES = ["倒塌建筑", "河道堰塞", "重灾区广域", "居民点"]
+_TARGET_TYPES = ["road", "water", "overview", "misc"]
+_HAZARD_LEVELS = ["critical", "high", "medium", "low"]
+
+
+def _scenario(
+    device_count: int, target_count: int, seed: int, *, locate_devices: bool = False
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    devices = []
+    for i in range(device_count):
+        device: Dict[str, Any] = {
+            "id": f"dev-{i}",
+            "name": f"设备{i}",
+            "env_type": rng.choice(_ENV_TYPES),
+            "capabilities": rng.choice(_CAPABILITIES),
+        }
+        if locate_devices:
+            device.update(lon=103.3 + rng.random(), lat=31.2 + rng.random())
+        devices.append(device)
+    targets = [
+        {
+            "id": f"tgt-{j}",
+            "name": rng.choice(_TARGET_NAMES),
+            "target_type": rng.choice(_TARGET_TYPES),
+            "hazard_level": rng.choice(_HAZARD_LEVELS),
+            "priority": round(rng.random() * 100, 1),
+            "lon": 103.3 + rng.random(),
+            "lat": 31.2 + rng.random(),
+        }
+        for j in range(target_count)
+    ]
+    return devices, targets
+
+
+@pytest.mark.parametrize("disaster_type", ["flood", "earthquake"])
+@pytest.mark.parametrize("command_center", [None, {"lon": 103.8, "lat": 31.7}])
+def test_score_matrix_matches_pairwise_rule(disaster_type, command_center) -> None:
+    devices, targets = _scenario(12, 40, seed=3, locate_devices=True)
+    devices[0].pop("lon")
+    devices[0].pop("lat")
+
+    matrix = build_score_matrix(devices, targets, disaster_type, command_center)
+    expected = np.array([
+        [MatchingRule.calculate_match_score(d, t, disaster_type, command_center) for t in targets]
+        for d in devices
+    ])
+
+    np.testing.assert_allclose(matrix, expected, atol=1e-9)
+
+
+def test_min_cost_assign_is_optimal_under_load_caps() -> None:
+    rng = np.random.default_rng(7)
+    capacity = np.array([2, 2, 3])
+    for _ in range(20):
+        cost = rng.random((6, 3)) * 10
+
+        assignment = min_cost_assign(cost, capacity)
+
+        def _total(choice) -> float:
+            return float(sum(cost[i, d] for i, d in enumerate(choice)))
+
+        feasible = [
+            choice for choice in itertools.product(range(3), repeat=6)
+            if set(choice) == {0, 1, 2} and all(choice.count(d) <= capacity[d] for d in range(3))
+        ]
+        assert all(np.bincount(assignment, minlength=3) <= capacity)
+        assert _total(assignment) == pytest.approx(min(_total(c) for c in feasible))
+
+
+def test_smart_allocate_covers_targets_and_balances_load() -> None:
+    devices, targets = _scenario(15, 70, seed=5)
+
+    allocation = smart_allocate(devices, targets, "earthquake", {"lon": 103.8, "lat": 31.7})
+
+    assigned = [tid for tids in allocation.values() for tid in tids]
+    assert sorted(assigned) == sorted(t["id"] for t in targets)
+    loads = [len(tids) for tids in allocation.values()]
+    assert min(loads) >= 1
+    assert max(loads) <= math.ceil(70 / 15 + 2)
+
+
+@pytest.mark.benchmark
+def test_smart_allocate_performance_200_devices_2000_targets() -> None:
+    """200设备 × 2000目标（大地震候选目标规模）"""
+    for locate_devices in (False, True):
+        devices, targets = _scenario(200, 2000, seed=2025, locate_devices=locate_devices)
+
+        started = time.perf_counter()
+        allocation = smart_allocate(devices, targets, "earthquake", {"lon": 103.8, "lat": 31.7})
+        elapsed = time.perf_counter() - started
+
+        print(f"\n设备定位={locate_devices} 分配耗时: {elapsed * 1000:.0f}ms")
+        assert sum(len(tids) for tids in allocation.values()) == 2000
+        assert min(len(tids) for tids in allocation.values()) >= 1
+        assert elapsed < 5.0
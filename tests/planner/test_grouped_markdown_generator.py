@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from emergency_agents.planner.grouped_markdown_generator import GroupedMarkdownGenerator
+
+DEVICES = [
+    {"id": "uav-1", "name": "扫图无人机", "device_type": "drone", "env_type": "air", "capabilities": ["热成像"]},
+    {"id": "ugv-1", "name": "地面机器人", "device_type": "ugv", "env_type": "land", "capabilities": ["GPS"]},
+    {"id": "usv-1", "name": "无人船", "device_type": "usv", "env_type": "water", "capabilities": ["声呐"]},
+]
+TARGETS = [
+    {"id": "t1", "name": "重灾区", "priority": 95, "hazard_level": "critical", "lon": 103.85, "lat": 31.68},
+    {"id": "t2", "name": "县道桥梁", "priority": 80, "hazard_level": "high", "lon": 103.86, "lat": 31.69},
+    {"id": "t3", "name": "堰塞湖", "priority": 70, "hazard_level": "high", "lon": 103.87, "lat": 31.70},
+]
+ALLOCATION = {"uav-1": ["t1"], "ugv-1": ["t2"], "usv-1": ["t3"]}
+DISASTER = {"disaster_type": "earthquake", "severity": "critical"}
+CENTER = {"lon": 103.85, "lat": 31.68}
+
+# 各章节模拟耗时（秒）；None 表示永不返回（触发章节超时）
+DELAYS = {"空中": 0.2, "地面": 0.05, "水上": None}
+
+
+def _section_of(kwargs: Dict[str, Any]) -> str:
+    prompt = kwargs["messages"][-1]["content"]
+    return next(name for name in DELAYS if f"{name}侦察方案" in prompt)
+
+
+def _response(name: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"## {name}章节正文\n"))])
+
+
+class _AsyncCompletions:
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        name = _section_of(kwargs)
+        delay = DELAYS[name]
+        await asyncio.sleep(3600 if delay is None else delay)
+        return _response(name)
+
+
+class _SyncCompletions:
+    def create(self, **kwargs: Any) -> SimpleNamespace:
+        name = _section_of(kwargs)
+        if DELAYS[name] is None:
+            raise ConnectionError("upstream unavailable")
+        return _response(name)
+
+
+def _client(completions: Any) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+@pytest.mark.asyncio
+async def test_agenerate_streams_sections_as_they_complete() -> None:
+    generator = GroupedMarkdownGenerator(
+        None, "glm-4-flash", async_llm_client=_client(_AsyncCompletions()), section_timeout_seconds=0.5
+    )
+    events: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def _sink(event: str, data: Dict[str, Any]) -> None:
+        events.append((event, data))
+
+    started = time.perf_counter()
+    markdown = await generator.agenerate(ALLOCATION, DEVICES, TARGETS, DISASTER, CENTER, event_sink=_sink)
+    elapsed = time.perf_counter() - started
+
+    assert [e for e, _ in events] == ["header", "section", "section", "section", "footer"]
+    sections = [data for event, data in events if event == "section"]
+    assert [s["env_type"] for s in sections] == ["land", "air", "sea"]  # 按完成顺序推送
+    assert [s["fallback"] for s in sections] == [False, False, True]
+    assert elapsed < 0.9  # 章节并发执行，总耗时约等于最慢章节的超时
+
+    # 完整报告仍按 空中/地面/水上 顺序拼接，超时章节为降级内容
+    assert markdown.index("空中章节正文") < markdown.index("地面章节正文") < markdown.index("三、水上侦察方案")
+    assert "生成超时" in markdown
+
+
+@pytest.mark.asyncio
+async def test_agenerate_matches_sync_report_layout() -> None:
+    sync_generator = GroupedMarkdownGenerator(_client(_SyncCompletions()), "glm-4-flash")
+    threaded_generator = GroupedMarkdownGenerator(_client(_SyncCompletions()), "glm-4-flash")
+
+    expected = sync_generator.generate(ALLOCATION, DEVICES, TARGETS, DISASTER, CENTER)
+    actual = await threaded_generator.agenerate(ALLOCATION, DEVICES, TARGETS, DISASTER, CENTER)
+
+    assert actual == expected
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+
+from emergency_agents.graph.scout_tactical_app import plan_recon_route_task
+from emergency_agents.planner.route_optimizer import (
+    RoadLeg,
+    haversine_matrix,
+    naive_order,
+    optimize_route,
+    solve_closed_tour,
+    tour_cost,
+)
+
+
+def _random_points(count: int, seed: int) -> List[Tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(103.6 + rng.random() * 0.6, 31.4 + rng.random() * 0.5) for _ in range(count)]
+
+
+def _brute_force(cost) -> float:
+    n = cost.shape[0]
+    return min(tour_cost([0, *perm], cost) for perm in itertools.permutations(range(1, n)))
+
+
+def test_solver_reaches_optimum_on_small_instances() -> None:
+    for seed in range(5):
+        cost = haversine_matrix(_random_points(8, seed))
+        order = solve_closed_tour(cost)
+        assert order[0] == 0 and sorted(order) == list(range(8))
+        assert tour_cost(order, cost) <= _brute_force(cost) * 1.02
+
+
+@pytest.mark.asyncio
+async def test_refinement_accepts_road_costs_only_when_faster() -> None:
+    # 起点位于正方形中心附近，四个目标在顶点上；1↔2 一段道路绕行严重，应改走其他边
+    points = [(103.805, 31.605), (103.80, 31.60), (103.80, 31.61), (103.81, 31.61), (103.81, 31.60)]
+    distance = haversine_matrix(points)
+    calls: List[Tuple[int, int]] = []
+
+    async def _fetch(i: int, j: int) -> RoadLeg:
+        calls.append((i, j))
+        seconds = distance[i, j] / 10.0
+        if {i, j} == {1, 2}:
+            seconds *= 20
+        return RoadLeg(distance_m=float(distance[i, j]), duration_s=seconds)
+
+    baseline = await optimize_route(points, _fetch, max_refinement_rounds=0)
+    refined = await optimize_route(points, _fetch)
+
+    assert refined.road_duration_s < baseline.road_duration_s
+    assert (1, 2) not in zip(refined.order, refined.order[1:] + refined.order[:1])
+    assert len(calls) == len(set(calls)) + len(baseline.legs)  # 每次优化内同一段只请求一次
+
+
+@pytest.mark.asyncio
+async def test_leg_requests_are_bounded_by_max_concurrency() -> None:
+    points = _random_points(12, seed=7)
+    distance = haversine_matrix(points)
+    in_flight = 0
+    peak = 0
+
+    async def _fetch(i: int, j: int) -> RoadLeg:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.005)
+            return RoadLeg(distance_m=float(distance[i, j]), duration_s=distance[i, j] / 10.0)
+        finally:
+            in_flight -= 1
+
+    route = await optimize_route(points, _fetch, max_concurrency=3)
+
+    assert sorted(route.order) == list(range(len(points)))
+    assert peak == 3
+
+
+class _StubAmap:
+    def __init__(self, *, fail_all: bool = False, delay: float = 0.0) -> None:
+        self.fail_all = fail_all
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def direction(self, *, origin, destination, mode) -> Dict[str, int]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_all:
+                raise ConnectionError("amap unavailable")
+            meters = float(
+                haversine_matrix([(origin["lng"], origin["lat"]), (destination["lng"], destination["lat"])])[0, 1]
+            )
+            return {"distance_meters": int(meters * 1.3), "duration_seconds": int(meters * 1.3 / 12)}
+        finally:
+            self.in_flight -= 1
+
+
+def _targets(points: List[Tuple[float, float]]):
+    return [(f"t{i}", {"lng": lng, "lat": lat}) for i, (lng, lat) in enumerate(points)]
+
+
+@pytest.mark.asyncio
+async def test_plan_recon_route_fetches_legs_concurrently_and_keeps_shape() -> None:
+    origin = {"lng": 103.85, "lat": 31.68}
+    targets = _targets(_random_points(6, seed=11))
+    amap = _StubAmap(delay=0.01)
+
+    route = await plan_recon_route_task.func(origin, targets, amap)
+
+    waypoints = route["waypoints"]
+    assert waypoints[0]["action"] == "depart" and waypoints[-1]["action"] == "return"
+    assert [w["sequence"] for w in waypoints] == list(range(len(targets) + 2))
+    assert sorted(w["target_id"] for w in waypoints[1:-1]) == sorted(t for t, _ in targets)
+    assert amap.max_in_flight > 1
+    assert route["total_duration_sec"] > 120 * len(targets)
+
+
+@pytest.mark.asyncio
+async def test_plan_recon_route_falls_back_to_straight_line() -> None:
+    origin = {"lng": 103.85, "lat": 31.68}
+    targets = _targets([(103.86, 31.68), (103.85, 31.69)])
+
+    route = await plan_recon_route_task.func(origin, targets, _StubAmap(fail_all=True))
+
+    assert len(route["waypoints"]) == 4
+    assert route["total_distance_m"] > 0
+    # 直线估算按 15m/s 计时，另加两个目标各 120 秒停留
+    assert abs(route["total_duration_sec"] - (route["total_distance_m"] / 15 + 240)) <= 3
+
+
+@pytest.mark.benchmark
+def test_route_optimizer_vs_input_order() -> None:
+    """30 个随机目标：优化回路相对输入顺序的里程与规划耗时"""
+    points = _random_points(31, seed=2025)
+    cost = haversine_matrix(points)
+
+    started = time.perf_counter()
+    order = solve_closed_tour(cost)
+    elapsed = time.perf_counter() - started
+
+    naive = tour_cost(naive_order(len(points)), cost)
+    optimized = tour_cost(order, cost)
+    print(f"\n输入顺序: {naive / 1000:.1f}km 优化后: {optimized / 1000:.1f}km 求解耗时: {elapsed * 1000:.1f}ms")
+
+    assert optimized < naive * 0.5
+    assert elapsed < 2.0
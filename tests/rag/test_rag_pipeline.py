@@ -0,0 +1,125 @@
+"""RagPipeline 客户端与检索器复用测试（不访问真实 Qdrant）。"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from emergency_agents.rag import pipe
+from emergency_agents.rag.pipe import RagChunk, RagPipeline, aquery_rag
+
+
+def _node(text: str, source: str) -> SimpleNamespace:
+    return SimpleNamespace(node=SimpleNamespace(metadata={"source": source, "page": 1}, get_content=lambda: text))
+
+
+class _FakeRetriever:
+    def __init__(self, top_k: int) -> None:
+        self.top_k = top_k
+        self.calls: List[str] = []
+
+    def retrieve(self, question: str) -> List[SimpleNamespace]:
+        self.calls.append(question)
+        return [_node(f"{question}-{idx}", f"doc-{idx}") for idx in range(self.top_k)]
+
+    async def aretrieve(self, question: str) -> List[SimpleNamespace]:
+        return self.retrieve(question)
+
+
+class _FakeIndex:
+    built: List[Any] = []
+
+    @classmethod
+    def from_vector_store(cls, vector_store: Any) -> "_FakeIndex":
+        instance = cls()
+        cls.built.append(vector_store)
+        return instance
+
+    def as_retriever(self, similarity_top_k: int) -> _FakeRetriever:
+        return _FakeRetriever(similarity_top_k)
+
+
+@pytest.fixture(name="counters")
+def counters_fixture(monkeypatch: pytest.MonkeyPatch) -> Dict[str, int]:
+    counters = {"client": 0, "aclient": 0, "store": 0}
+
+    class _FakeClient:
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            counters["client"] += 1
+
+        def close(self) -> None:
+            return None
+
+    class _FakeAsyncClient(_FakeClient):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            counters["aclient"] += 1
+
+        async def close(self) -> None:  # type: ignore[override]
+            return None
+
+    def _fake_store(**kwargs: Any) -> Dict[str, Any]:
+        counters["store"] += 1
+        return kwargs
+
+    import qdrant_client
+
+    _FakeIndex.built = []
+    monkeypatch.setattr(pipe, "QdrantClient", _FakeClient)
+    monkeypatch.setattr(qdrant_client, "AsyncQdrantClient", _FakeAsyncClient)
+    monkeypatch.setattr(pipe, "QdrantVectorStore", _fake_store)
+    monkeypatch.setattr(pipe, "VectorStoreIndex", _FakeIndex)
+    return counters
+
+
+def _pipeline() -> RagPipeline:
+    return RagPipeline(
+        qdrant_url="http://qdrant.test:6333",
+        qdrant_api_key=None,
+        embedding_model="embedding-3",
+        embedding_dim=1024,
+        openai_base_url="http://llm.test/v1",
+        openai_api_key="test",
+        llm_model="glm-4-flash",
+    )
+
+
+def test_query_reuses_client_index_and_retriever(counters: Dict[str, int]) -> None:
+    rag = _pipeline()
+    for _ in range(5):
+        chunks = rag.query("地震 次生灾害", domain="案例", top_k=2)
+    assert chunks == [
+        RagChunk(text="地震 次生灾害-0", source="doc-0", loc="1"),
+        RagChunk(text="地震 次生灾害-1", source="doc-1", loc="1"),
+    ]
+    assert counters["client"] == 1
+    assert counters["store"] == 1
+    assert len(_FakeIndex.built) == 1
+    assert len(rag._retrievers) == 1
+
+    rag.query("危化品泄漏", domain="规范", top_k=2)
+    assert len(_FakeIndex.built) == 2
+    assert counters["client"] == 1
+
+
+def test_aquery_uses_async_path(counters: Dict[str, int]) -> None:
+    rag = _pipeline()
+
+    async def _run() -> List[List[RagChunk]]:
+        return await asyncio.gather(*(rag.aquery("滑坡", domain="案例", top_k=3) for _ in range(4)))
+
+    results = asyncio.run(_run())
+    assert all(len(chunks) == 3 for chunks in results)
+    assert counters["aclient"] == 1
+    assert len(_FakeIndex.built) == 1
+
+
+def test_aquery_rag_falls_back_for_sync_only_pipelines() -> None:
+    class _SyncOnly:
+        def query(self, question: str, domain: str, top_k: int = 3) -> List[RagChunk]:
+            return [RagChunk(text=question, source=domain, loc=str(top_k))]
+
+    chunks = asyncio.run(aquery_rag(_SyncOnly(), question="q", domain="案例", top_k=2))
+    assert chunks == [RagChunk(text="q", source="案例", loc="2")]
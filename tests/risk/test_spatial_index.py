@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from emergency_agents.db.models import RiskZoneRecord
+from emergency_agents.graph.scout_tactical_app import risk_overlay_task
+from emergency_agents.risk.service import RiskCacheManager
+from emergency_agents.risk.spatial_index import RiskZoneSpatialIndex
+
+
+def _zone(zone_id: str, severity: int, geometry: Dict[str, Any], *, expired: bool = False) -> RiskZoneRecord:
+    now = datetime.now(timezone.utc)
+    return RiskZoneRecord(
+        zone_id=zone_id,
+        zone_name=f"zone-{zone_id}",
+        hazard_type="flood",
+        severity=severity,
+        description=None,
+        geometry_geojson=geometry,
+        properties={},
+        valid_from=now - timedelta(hours=1),
+        valid_until=now - timedelta(minutes=1) if expired else now + timedelta(hours=1),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _square(lng: float, lat: float, half: float) -> Dict[str, Any]:
+    ring = [
+        [lng - half, lat - half],
+        [lng + half, lat - half],
+        [lng + half, lat + half],
+        [lng - half, lat + half],
+        [lng - half, lat - half],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def test_index_matches_inside_near_and_far_points() -> None:
+    # 约 220m 见方的区域，中心 (103.85, 31.68)
+    flood = _zone("flood", 3, _square(103.85, 31.68, 0.001))
+    landslide = _zone("slide", 5, {"type": "Point", "coordinates": [103.853, 31.68]})
+    index = RiskZoneSpatialIndex([flood, landslide])
+
+    inside = index.query(103.85, 31.68, 500)
+    assert [z.zone_id for z in inside] == ["slide", "flood"]  # 严重度降序
+
+    # 东侧边界外约 300m：命中区域边界，点要素在约 140m 外
+    near = index.query(103.8543, 31.68, 500)
+    assert {z.zone_id for z in near} == {"flood", "slide"}
+
+    # 约 2km 外：无命中
+    assert index.query(103.87, 31.68, 500) == []
+
+
+def test_index_skips_expired_zones_and_handles_holes() -> None:
+    outer = _square(103.85, 31.68, 0.01)["coordinates"][0]
+    hole = _square(103.85, 31.68, 0.005)["coordinates"][0]
+    ring_zone = _zone("ring", 2, {"type": "Polygon", "coordinates": [outer, hole]})
+    expired = _zone("old", 5, _square(103.85, 31.68, 0.02), expired=True)
+    index = RiskZoneSpatialIndex([ring_zone, expired])
+
+    # 洞中心距内环约 470m
+    assert index.query(103.85, 31.68, 100) == []
+    assert [z.zone_id for z in index.query(103.85, 31.68, 600)] == ["ring"]
+    assert [z.zone_id for z in index.query(103.85, 31.688, 10)] == ["ring"]
+
+
+class _FailingRepository:
+    async def find_zones_near_points(self, points, *, radius_meters):
+        raise ConnectionError("database unavailable")
+
+
+class _StubIncidentDAO:
+    def __init__(self, zones: List[RiskZoneRecord]) -> None:
+        self._zones = zones
+
+    async def list_active_risk_zones(self, *, reference_time=None):
+        return list(self._zones)
+
+
+@pytest.mark.asyncio
+async def test_risk_overlay_falls_back_to_cached_index() -> None:
+    cache = RiskCacheManager(
+        incident_dao=_StubIncidentDAO([_zone("flood", 4, _square(103.85, 31.68, 0.001))]),
+        ttl_seconds=60,
+    )
+    await cache.prefetch()
+    waypoints = [
+        {"sequence": 1, "location": {"lng": 103.85, "lat": 31.68}},
+        {"sequence": 2, "location": {"lng": 103.90, "lat": 31.70}},
+    ]
+
+    risks = await risk_overlay_task.func(waypoints, _FailingRepository(), cache)
+
+    assert [(r["waypoint_sequence"], r["risk_level"]) for r in risks] == [(1, 4), (2, 0)]
+    assert cache.spatial_index() is cache.spatial_index()  # 同一刷新批次复用索引
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import List
+
+import pytest
+from websockets.asyncio.server import serve
+
+from emergency_agents.voice.asr.base import ASRConfig, ASRProvider, ASRResult, ASRStream
+from emergency_agents.voice.asr.local_provider import LocalFunASRProvider
+from emergency_agents.voice.asr.manager import ASRManager
+from emergency_agents.voice.asr.streaming import StreamingUtterance
+
+
+async def _fake_2pass_server(ws) -> None:
+    """模拟 FunASR 2pass：每收到 6400 字节推送一段在线文本，结束帧后推送离线修正结果。"""
+    received = 0
+    online_sent = 0
+    async for message in ws:
+        if isinstance(message, str):
+            payload = json.loads(message)
+            if payload.get("is_speaking") is False:
+                await asyncio.sleep(0.02)  # 最后一个分句的离线识别
+                await ws.send(json.dumps({"mode": "2pass-offline", "text": "前方道路塌方。", "is_final": True}))
+            continue
+        received += len(message)
+        while received >= (online_sent + 1) * 6400:
+            online_sent += 1
+            await ws.send(json.dumps({"mode": "2pass-online", "text": "前方道路塌方"[online_sent - 1 : online_sent]}))
+
+
+@pytest.mark.asyncio
+async def test_funasr_stream_emits_partials_and_finalizes_quickly() -> None:
+    async with serve(_fake_2pass_server, "127.0.0.1", 0, subprotocols=["binary"]) as server:
+        port = server.sockets[0].getsockname()[1]
+        provider = LocalFunASRProvider(asr_ws_url=f"ws://127.0.0.1:{port}")
+        partials: List[str] = []
+
+        async def _on_partial(result: ASRResult) -> None:
+            assert not result.is_final
+            partials.append(result.text)
+
+        stream = await provider.open_stream(ASRConfig(), _on_partial)
+        for _ in range(4):
+            await stream.send(b"\x01\x00" * 3200)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        result = await stream.finish()
+        finalize = time.perf_counter() - started
+
+    assert partials[:4] == ["前", "前方", "前方道", "前方道路"]
+    assert result.is_final and result.text == "前方道路塌方。"
+    assert result.metadata and result.metadata["streaming"] is True
+    assert finalize < 1.0
+
+
+class _FakeFunASRSocket:
+    """手动投递服务端消息的 WebSocket 桩。"""
+
+    def __init__(self) -> None:
+        self.sent: List[object] = []
+        self._inbox: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def send(self, message: object) -> None:
+        self.sent.append(message)
+
+    def push(self, payload: dict) -> None:
+        self._inbox.put_nowait(json.dumps(payload, ensure_ascii=False))
+
+    async def close(self) -> None:
+        self._inbox.put_nowait(None)
+
+    def __aiter__(self) -> "_FakeFunASRSocket":
+        return self
+
+    async def __anext__(self) -> str:
+        message = await self._inbox.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+async def _open_fake_stream(monkeypatch: pytest.MonkeyPatch) -> tuple[ASRStream, _FakeFunASRSocket]:
+    ws = _FakeFunASRSocket()
+    provider = LocalFunASRProvider(asr_ws_url="ws://fake")
+
+    async def _connect() -> _FakeFunASRSocket:
+        return ws
+
+    monkeypatch.setattr(provider, "_connect", _connect)
+    return await provider.open_stream(ASRConfig()), ws
+
+
+@pytest.mark.asyncio
+async def test_funasr_stream_waits_for_slow_final_without_online_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream, ws = await _open_fake_stream(monkeypatch)
+    # 短句：还没有任何在线结果就结束
+    await stream.send(b"\x01\x00" * 1600)
+
+    async def _late_final() -> None:
+        await asyncio.sleep(0.6)
+        ws.push({"mode": "2pass-offline", "text": "收到。", "is_final": True})
+
+    pusher = asyncio.create_task(_late_final())
+    result = await stream.finish()
+    await pusher
+
+    assert result.text == "收到。"
+
+
+@pytest.mark.asyncio
+async def test_funasr_stream_late_correction_does_not_end_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream, ws = await _open_fake_stream(monkeypatch)
+    await stream.send(b"\x01\x00" * 3200)
+    ws.push({"mode": "2pass-online", "text": "前方"})
+    await asyncio.sleep(0.01)
+    # 在线结果之后仍有音频发出，尚未修正
+    await stream.send(b"\x01\x00" * 3200)
+
+    async def _server() -> None:
+        await asyncio.sleep(0.05)
+        # 较早分句的迟到修正：不应结束等待
+        ws.push({"mode": "2pass-offline", "text": "前方道路", "is_final": False})
+        await asyncio.sleep(0.5)
+        ws.push({"mode": "2pass-offline", "text": "塌方。", "is_final": True})
+
+    server = asyncio.create_task(_server())
+    result = await stream.finish()
+    await server
+
+    assert result.text == "前方道路塌方。"
+
+
+@pytest.mark.asyncio
+async def test_funasr_stream_correction_keeps_next_segment_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream, ws = await _open_fake_stream(monkeypatch)
+    await stream.send(b"\x01\x00" * 3200)
+    ws.push({"mode": "2pass-online", "text": "前方道路"})
+    await asyncio.sleep(0.01)
+    # 分句 N+1 已在说，在线结果先于分句 N 的离线修正到达
+    await stream.send(b"\x01\x00" * 3200)
+    ws.push({"mode": "2pass-online", "text": "有塌"})
+    await asyncio.sleep(0.01)
+    ws.push({"mode": "2pass-offline", "text": "前方道路，", "is_final": False})
+    await asyncio.sleep(0.01)
+
+    # 只替换分句 N 的在线文本，分句 N+1 的在线文本与音频仍待修正
+    assert stream.text == "前方道路，有塌"
+    await stream.send(b"\x01\x00" * 1600)
+
+    async def _late_final() -> None:
+        await asyncio.sleep(0.6)
+        ws.push({"mode": "2pass-offline", "text": "有塌方。", "is_final": True})
+
+    pusher = asyncio.create_task(_late_final())
+    result = await stream.finish()
+    await pusher
+
+    assert result.text == "前方道路，有塌方。"
+
+
+class _StreamingDummy(ASRProvider):
+    def __init__(self, name: str, *, fail_open: bool = False, fail_send: bool = False) -> None:
+        self._name = name
+        self.fail_open = fail_open
+        self.fail_send = fail_send
+        self.recognized: List[bytes] = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def recognize(self, audio_data: bytes, config: ASRConfig | None = None) -> ASRResult:
+        self.recognized.append(audio_data)
+        return ASRResult(text=f"{self._name}:{len(audio_data)}", provider=self._name)
+
+    async def open_stream(self, config=None, on_partial=None) -> ASRStream:
+        if self.fail_open:
+            raise ConnectionError(f"{self._name} unavailable")
+        stream = await super().open_stream(config, on_partial)
+        if self.fail_send:
+            async def _broken_send(chunk: bytes) -> None:
+                raise ConnectionError("stream dropped")
+
+            stream.send = _broken_send  # type: ignore[method-assign]
+        return stream
+
+    async def health_check(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_manager_stream_falls_back_on_open_and_mid_stream_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ASR_PRIMARY_PROVIDER", "primary")
+    monkeypatch.setenv("ASR_FALLBACK_PROVIDER", "fallback")
+
+    primary = _StreamingDummy("primary", fail_open=True)
+    fallback = _StreamingDummy("fallback")
+    manager = ASRManager(providers=[primary, fallback])
+    stream = await manager.open_stream()
+    await stream.send(b"ab")
+    assert stream.provider == "fallback"
+    assert (await stream.finish()).text == "fallback:2"
+
+    primary = _StreamingDummy("primary", fail_send=True)
+    fallback = _StreamingDummy("fallback")
+    manager = ASRManager(providers=[primary, fallback])
+    stream = await manager.open_stream()
+    for chunk in (b"ab", b"cd", b"ef"):
+        await stream.send(chunk)
+    result = await stream.finish()
+    assert result.provider == "fallback"
+    assert fallback.recognized == [b"abcdef"]  # 用整句缓存音频降级
+    assert manager._provider_status["primary"].consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_utterance_forwards_in_order_and_abort_yields_none(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ASR_PRIMARY_PROVIDER", "primary")
+    primary = _StreamingDummy("primary")
+    manager = ASRManager(providers=[primary])
+
+    utterance = StreamingUtterance(manager)  # type: ignore[arg-type]
+    for chunk in (b"a", b"bc", b"def"):
+        utterance.feed(chunk)
+    utterance.end()
+    utterance.feed(b"ignored")
+    result = await utterance.result()
+    assert result is not None and result.text == "primary:6"
+    assert result.metadata and "finalize_ms" in result.metadata
+
+    aborted = StreamingUtterance(manager)  # type: ignore[arg-type]
+    aborted.feed(b"xyz")
+    aborted.abort()
+    assert await aborted.result() is None
+    assert primary.recognized == [b"abcdef"]
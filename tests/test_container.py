@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from emergency_agents.container import ServiceContainer
+
+
+@pytest.mark.asyncio
+async def test_factory_is_lazy_cached_and_closed_once() -> None:
+    container = ServiceContainer()
+    created: List[int] = []
+    closed: List[int] = []
+
+    def _factory() -> dict:
+        created.append(1)
+        return {"id": len(created)}
+
+    async def _closer(resource: dict) -> None:
+        closed.append(resource["id"])
+
+    container.register_factory("shared", _factory, closer=_closer)
+    assert created == []
+    assert container.get("shared") is container.get("shared")
+    assert created == [1]
+
+    await container.aclose()
+    await container.aclose()
+    assert closed == [1]
+
+
+@pytest.mark.asyncio
+async def test_openai_clients_share_http_pool_per_endpoint() -> None:
+    container = ServiceContainer()
+    first = container.openai_client(base_url="https://llm.local/v1", api_key="k1", timeout=30.0)
+    second = container.openai_client(base_url="https://llm.local/v1", api_key="k1", timeout=30.0)
+    other = container.openai_client(base_url="https://llm.local/v1", api_key="k2", timeout=30.0)
+
+    assert first is second
+    assert other is not first
+    assert first._client is other._client  # 同一超时配置共享 httpx 连接池
+
+    http_client = container.http_client(timeout=30.0)
+    await container.aclose()
+    assert http_client.is_closed
+
+
+def test_config_is_parsed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from emergency_agents.config import AppConfig
+
+    calls: List[int] = []
+    sentinel = object()
+
+    def _load() -> object:
+        calls.append(1)
+        return sentinel
+
+    monkeypatch.setattr(AppConfig, "load_from_env", staticmethod(_load))
+    container = ServiceContainer()
+
+    assert container.config is sentinel
+    assert container.config is sentinel
+    assert calls == [1]
@@ -10,7 +10,7 @@
 """
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -29,6 +29,7 @@ from emergency_agents.graph.sitrep_app import (
     finalize,
     ingest,
     llm_generate_summary,
+    merge_sitrep_delta,
 )
 from emergency_agents.risk.service import RiskZoneRecord
 
@@ -362,6 +363,315 @@ def test_finalize_node():
     assert "details" in report
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fetch_nodes_run_in_parallel_superstep(
+    initial_state,
+    mock_incident_dao,
+    mock_task_dao,
+    mock_llm_client,
+):
+    """测试四个采集节点并行执行：总耗时接近单个数据源，快照记录各数据源耗时，风险数据走缓存"""
+    import asyncio
+    import time
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from emergency_agents.graph.sitrep_app import build_sitrep_graph
+
+    def _slow(value: Any) -> Any:
+        async def _effect(*args: Any, **kwargs: Any) -> Any:
+            await asyncio.sleep(0.2)
+            return value
+
+        return _effect
+
+    mock_incident_dao.list_active_incidents.side_effect = _slow(
+        mock_incident_dao.list_active_incidents.return_value
+    )
+    mock_task_dao.list_recent_tasks.side_effect = _slow(mock_task_dao.list_recent_tasks.return_value)
+    risk_cache_manager = AsyncMock()
+    risk_cache_manager.get_active_zones.side_effect = _slow([])
+    rescue_dao = AsyncMock()
+    rescue_dao.list_available_rescuers.side_effect = _slow([])
+    snapshot_repo = AsyncMock()
+    snapshot_repo.create_snapshot.return_value = MagicMock(snapshot_id="snapshot-1")
+
+    app = await build_sitrep_graph(
+        incident_dao=mock_incident_dao,
+        task_dao=mock_task_dao,
+        risk_cache_manager=risk_cache_manager,
+        rescue_dao=rescue_dao,
+        snapshot_repo=snapshot_repo,
+        llm_client=mock_llm_client,
+        llm_model="test-model",
+        checkpointer=MemorySaver(),
+    )
+
+    started = time.perf_counter()
+    result = await app.ainvoke(
+        initial_state,
+        config={"configurable": {"thread_id": initial_state["thread_id"]}},
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6  # 串行需要 0.8s 以上
+    assert set(result["fetch_timings_ms"]) == {"incidents", "tasks", "risk_zones", "resources"}
+    assert result["metrics"]["completed_tasks_count"] == 1
+    risk_cache_manager.get_active_zones.assert_awaited_once_with()
+    payload = snapshot_repo.create_snapshot.call_args[0][0].payload
+    assert set(payload["fetch_timings_ms"]) == set(result["fetch_timings_ms"])
+
+
+def _previous_sitrep_snapshot(task_status: str = "pending") -> MagicMock:
+    """构造上一版SITREP快照（10分钟前采集）"""
+    data_as_of = datetime.now(timezone.utc) - timedelta(minutes=10)
+    return MagicMock(
+        snapshot_id="previous-snapshot",
+        generated_at=data_as_of,
+        payload={
+            "scope": "all",
+            "data_as_of": data_as_of.isoformat(),
+            "time_range_hours": 24,
+            "summary": "上一版摘要",
+            "metrics": {
+                "active_incidents_count": 1,
+                "completed_tasks_count": 0,
+                "in_progress_tasks_count": 0,
+                "pending_tasks_count": 1,
+                "active_risk_zones_count": 0,
+                "deployed_teams_count": 3,
+                "total_rescuers_count": 3,
+                "statistics_time_range_hours": 24,
+            },
+            "details": {
+                "incidents": [
+                    {"id": "evt-1", "title": "地震", "type": "earthquake", "priority": 1, "status": "active"}
+                ],
+                "tasks": [
+                    {
+                        "id": "task-1",
+                        "code": "T1",
+                        "status": task_status,
+                        "progress": 0,
+                        "created_at": (data_as_of - timedelta(hours=1)).isoformat(),
+                    }
+                ],
+                "risk_zones": [],
+                "resources": {"total_rescuers": 3, "deployed_teams": 3},
+            },
+        },
+    )
+
+
+async def _build_incremental_graph(previous: MagicMock, changed_tasks: List[TaskSummary], llm_client: Any):
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from emergency_agents.graph.sitrep_app import build_sitrep_graph
+
+    incident_dao = AsyncMock()
+    incident_dao.list_incidents_changed_since.return_value = []
+    task_dao = AsyncMock()
+    task_dao.list_tasks_changed_since.return_value = changed_tasks
+    risk_cache_manager = AsyncMock()
+    risk_cache_manager.get_active_zones.return_value = []
+    rescue_dao = AsyncMock()
+    rescue_dao.count_rescuers_changed_since.return_value = 0
+    snapshot_repo = AsyncMock()
+    snapshot_repo.get_latest_snapshot.return_value = previous
+    snapshot_repo.create_snapshot.return_value = MagicMock(snapshot_id="new-snapshot")
+
+    app = await build_sitrep_graph(
+        incident_dao=incident_dao,
+        task_dao=task_dao,
+        risk_cache_manager=risk_cache_manager,
+        rescue_dao=rescue_dao,
+        snapshot_repo=snapshot_repo,
+        llm_client=llm_client,
+        llm_model="test-model",
+        checkpointer=MemorySaver(),
+    )
+    return app, incident_dao, task_dao, snapshot_repo
+
+
+@pytest.mark.unit
+def test_merge_sitrep_delta_applies_changes_to_previous_details():
+    """测试增量合并：事件关闭/任务状态变化/任务删除/风险区域增减"""
+    previous = _previous_sitrep_snapshot().payload
+    previous["details"]["tasks"].append(
+        {"id": "task-2", "code": "T2", "status": "pending", "progress": 0, "created_at": previous["data_as_of"]}
+    )
+    previous["details"]["risk_zones"] = [{"zone_id": "zone-old"}]
+    now = datetime.now(timezone.utc)
+    closed = IncidentRecord(
+        id="evt-1", parent_event_id=None, event_code="E1", title="地震", type="earthquake", priority=1,
+        status="closed", description=None, created_by=None, updated_by=None,
+        created_at=now, updated_at=now, deleted_at=None,
+    )
+    delta = {
+        "incidents": [closed],
+        "tasks": [
+            TaskSummary(id="task-1", code="T1", description=None, status="completed", progress=100, updated_at=now),
+            TaskSummary(id="task-2", code="T2", description=None, status="deleted", progress=0, updated_at=now),
+        ],
+        "risk_zones": [MagicMock(zone_id="zone-new")],
+        "rescuers_changed": 0,
+        "resource_usage": None,
+        "timings": {"tasks": 1.0},
+    }
+
+    merged = merge_sitrep_delta(previous, delta)
+
+    assert merged["active_incidents"] == []
+    assert [(t.id, t.status) for t in merged["task_progress"]] == [("task-1", "completed")]
+    assert merged["resource_usage"] == {"total_rescuers": 3, "deployed_teams": 3}
+    summary = merged["sitrep_delta"]
+    assert summary["unchanged"] is False
+    assert summary["incidents_closed"] == ["evt-1"]
+    assert [c["status"] for c in summary["task_changes"]] == ["completed", "deleted"]
+    assert summary["risk_zones_added"] == ["zone-new"]
+    assert summary["risk_zones_removed"] == ["zone-old"]
+
+
+@pytest.mark.unit
+def test_incremental_metrics_match_full_mode_across_window_boundary():
+    """测试统计窗口滑动：上一版中已滑出窗口的任务被裁剪，增量指标与全量模式一致"""
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(hours=24)
+    previous = _previous_sitrep_snapshot().payload
+    # task-1 创建于窗口内；task-old 在上一版采集时仍在窗口内，本次已滑出
+    previous["details"]["tasks"].append(
+        {
+            "id": "task-old",
+            "code": "T0",
+            "status": "completed",
+            "progress": 100,
+            "created_at": (window_start - timedelta(minutes=5)).isoformat(),
+        }
+    )
+    delta = {
+        "incidents": [],
+        "tasks": [],
+        "risk_zones": [],
+        "rescuers_changed": 0,
+        "resource_usage": None,
+        "timings": {},
+    }
+
+    merged = merge_sitrep_delta(previous, delta, window_start=window_start)
+    incremental = aggregate_metrics({"report_id": "r", "time_range_hours": 24, **merged})["metrics"]
+
+    # 全量模式：list_recent_tasks 只返回 created_at 在窗口内的任务
+    in_window = [
+        TaskSummary(
+            id=item["id"], code=item["code"], description=None, status=item["status"],
+            progress=item["progress"], updated_at=now, created_at=datetime.fromisoformat(item["created_at"]),
+        )
+        for item in previous["details"]["tasks"]
+        if datetime.fromisoformat(item["created_at"]) >= window_start
+    ]
+    full = aggregate_metrics(
+        {
+            "report_id": "r",
+            "time_range_hours": 24,
+            "active_incidents": merged["active_incidents"],
+            "task_progress": in_window,
+            "risk_zones": [],
+            "resource_usage": merged["resource_usage"],
+        }
+    )["metrics"]
+
+    assert incremental == full
+    assert incremental["completed_tasks_count"] == 0
+    assert merged["sitrep_delta"]["tasks_expired"] == ["task-old"]
+    assert merged["sitrep_delta"]["unchanged"] is False
+
+
+@pytest.mark.unit
+def test_merge_sitrep_delta_counts_active_incident_updates():
+    """测试仍为活跃的事件信息变化（标题/优先级）计入变化，不复用旧摘要"""
+    previous = _previous_sitrep_snapshot().payload
+    previous["details"]["incidents"][0]["updated_at"] = previous["data_as_of"]
+    now = datetime.now(timezone.utc)
+    escalated = IncidentRecord(
+        id="evt-1", parent_event_id=None, event_code="E1", title="强震", type="earthquake", priority=3,
+        status="active", description=None, created_by=None, updated_by=None,
+        created_at=now, updated_at=now, deleted_at=None,
+    )
+    delta = {
+        "incidents": [escalated],
+        "tasks": [],
+        "risk_zones": [],
+        "rescuers_changed": 0,
+        "resource_usage": None,
+        "timings": {},
+    }
+
+    merged = merge_sitrep_delta(previous, delta)
+
+    assert merged["sitrep_delta"]["incidents_updated"] == ["evt-1"]
+    assert merged["sitrep_delta"]["unchanged"] is False
+    assert merged["active_incidents"][0].title == "强震"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_incremental_sitrep_reuses_previous_report_when_unchanged(initial_state, mock_llm_client):
+    """测试增量模式：无变化时不调用LLM、不写新快照，直接复用上一版"""
+    app, incident_dao, _, snapshot_repo = await _build_incremental_graph(
+        _previous_sitrep_snapshot(), [], mock_llm_client
+    )
+
+    result = await app.ainvoke(
+        initial_state | {"incremental": True},
+        config={"configurable": {"thread_id": initial_state["thread_id"]}},
+    )
+
+    assert result["sitrep_report"]["summary"] == "上一版摘要"
+    assert result["sitrep_report"]["snapshot_id"] == "previous-snapshot"
+    assert result["sitrep_report"]["details"]["incremental"]["unchanged"] is True
+    mock_llm_client.chat.completions.create.assert_not_called()
+    snapshot_repo.create_snapshot.assert_not_called()
+    incident_dao.list_active_incidents.assert_not_called()
+    snapshot_repo.get_latest_snapshot.assert_awaited_once_with(
+        snapshot_type="sitrep_report", payload_filter={"scope": "all"}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_incremental_sitrep_updates_previous_summary(initial_state, mock_llm_client):
+    """测试增量模式：有变化时合并指标，并让LLM基于上一版摘要更新"""
+    changed = [
+        TaskSummary(
+            id="task-1", code="T1", description=None, status="completed", progress=100,
+            updated_at=datetime.now(timezone.utc),
+        )
+    ]
+    app, incident_dao, task_dao, snapshot_repo = await _build_incremental_graph(
+        _previous_sitrep_snapshot(), changed, mock_llm_client
+    )
+
+    result = await app.ainvoke(
+        initial_state | {"incremental": True},
+        config={"configurable": {"thread_id": initial_state["thread_id"]}},
+    )
+
+    metrics = result["metrics"]
+    assert metrics["active_incidents_count"] == 1
+    assert metrics["completed_tasks_count"] == 1
+    assert metrics["pending_tasks_count"] == 0
+    assert metrics["total_rescuers_count"] == 3
+    task_dao.list_recent_tasks.assert_not_called()
+    prompt = mock_llm_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    assert "上一版摘要" in prompt
+    assert "任务T1：pending → completed" in prompt
+    payload = snapshot_repo.create_snapshot.call_args[0][0].payload
+    assert payload["scope"] == "all"
+    assert payload["incremental"]["base_snapshot_id"] == "previous-snapshot"
+    assert result["sitrep_report"]["snapshot_id"] == "new-snapshot"
+
+
 # ========== 集成测试（需要真实LLM） ==========
 
 
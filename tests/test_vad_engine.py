@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+import pytest
+
+from emergency_agents.voice.vad_engine import (
+    VAD_WINDOW_BYTES,
+    VAD_WINDOW_SAMPLES,
+    BatchedVADEngine,
+    PcmRingBuffer,
+)
+
+
+class _RecurrentModel:
+    """带循环状态的假模型：state' = 0.5 * state + mean(window)，输出 state'。"""
+
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.batch_sizes: List[int] = []
+        self.threads: set[str] = set()
+        self._delay = delay
+
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        self.batch_sizes.append(len(windows))
+        self.threads.add(threading.current_thread().name)
+        if self._delay:
+            threading.Event().wait(self._delay)
+        new_states = [0.5 * (state or 0.0) + float(window.mean()) for state, window in zip(states, windows)]
+        return np.asarray(new_states, dtype=np.float32), new_states
+
+
+def _reference(windows: np.ndarray) -> np.ndarray:
+    state = 0.0
+    out = []
+    for window in windows:
+        state = 0.5 * state + float(window.mean())
+        out.append(state)
+    return np.asarray(out, dtype=np.float32)
+
+
+def _windows(seed: int, count: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1, 1, size=(count, VAD_WINDOW_SAMPLES)).astype(np.float32)
+
+
+def test_ring_buffer_reads_whole_windows_across_wraparound_and_growth() -> None:
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-32768, 32767, size=VAD_WINDOW_SAMPLES * 7, dtype=np.int16)
+    raw = pcm.tobytes()
+    buffer = PcmRingBuffer(capacity=VAD_WINDOW_BYTES * 2)
+
+    windows: List[np.ndarray] = []
+    for offset in range(0, len(raw), 700):  # 非窗口对齐、奇数字节的分块
+        buffer.write(raw[offset : offset + 700])
+        windows.append(buffer.read_windows())
+    got = np.concatenate(windows)
+    assert got.shape == (7, VAD_WINDOW_SAMPLES)
+    np.testing.assert_allclose(got.reshape(-1), pcm.astype(np.float32) / 32768.0)
+    assert len(buffer) == 0
+
+    # 未读数据跨越缓冲尾部时扩容，顺序保持不变
+    buffer.write(raw[:1500])
+    buffer.read_windows()
+    buffer.write(raw[1500:4000])
+    assert buffer.capacity == VAD_WINDOW_BYTES * 4
+    tail = buffer.read_windows()
+    np.testing.assert_allclose(
+        tail.reshape(-1), pcm[VAD_WINDOW_SAMPLES : VAD_WINDOW_SAMPLES * 3].astype(np.float32) / 32768.0
+    )
+    assert len(buffer) == 4000 - 3 * VAD_WINDOW_BYTES
+
+
+@pytest.mark.asyncio
+async def test_engine_batches_sessions_off_loop_with_independent_state() -> None:
+    model = _RecurrentModel(delay=0.05)
+    engine = BatchedVADEngine(model, max_batch_size=4)
+    try:
+        inputs = {f"s{i}": _windows(i, 3 + i % 2) for i in range(6)}
+        # 先占住引擎线程，使后续各会话的请求在队列中汇聚成 batch
+        blocker = engine.submit("warmup", _windows(99, 1))
+        results = await asyncio.gather(*(engine.ainfer(sid, w) for sid, w in inputs.items()))
+        blocker.result(1.0)
+
+        for (sid, windows), probs in zip(inputs.items(), results):
+            np.testing.assert_allclose(probs, _reference(windows), rtol=1e-5)
+        assert max(model.batch_sizes) == 4
+        assert model.threads == {"vad-engine"}
+        assert engine.queue_depth == 0
+
+        # 续接：循环状态跨调用保持；reset 后从初始态重新开始
+        more = _windows(7, 2)
+        continued = await engine.ainfer("s0", more)
+        np.testing.assert_allclose(continued, _reference(np.concatenate([inputs["s0"], more]))[-2:], rtol=1e-5)
+        engine.reset("s0")
+        restarted = await engine.ainfer("s0", more)
+        np.testing.assert_allclose(restarted, _reference(more), rtol=1e-5)
+    finally:
+        engine.close()
+
+
+def test_engine_propagates_model_errors_and_rejects_after_close() -> None:
+    class _Broken:
+        def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+            raise RuntimeError("model crashed")
+
+    engine = BatchedVADEngine(_Broken())
+    with pytest.raises(RuntimeError, match="model crashed"):
+        engine.infer("s", _windows(1, 2), timeout=1.0)
+    assert engine.queue_depth == 0
+    engine.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        engine.infer("s", _windows(1, 1), timeout=1.0)
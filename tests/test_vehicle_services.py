@@ -466,3 +466,63 @@ def test_task_optimizer_performance():
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-m", "unit"])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_vision_batch_analysis_parses_array_and_falls_back():
+    """多图请求：解析等长 JSON 数组；长度不符时退回逐张分析"""
+    analyzer = VisionAnalyzer(vllm_url="http://test:8001/v1")
+    item = '{"danger_level": "%s", "persons": {"count": %d}}'
+    replies = [
+        "```json\n[" + item % ("L1", 1) + ", " + item % ("L3", 4) + "]\n```",
+        "[" + item % ("L2", 2) + "]",
+        item % ("L0", 0),
+        item % ("L2", 5),
+    ]
+    calls = []
+
+    async def _fake_chat(content, *, max_tokens):
+        calls.append(sum(1 for part in content if part["type"] == "image_url"))
+        return replies[len(calls) - 1]
+
+    analyzer._chat_completion = _fake_chat
+
+    results = await analyzer.analyze_image_batch(["a", "b"])
+    assert [r.danger_level for r in results] == [DangerLevel.L1, DangerLevel.L3]
+    assert [r.persons.count for r in results] == [1, 4]
+
+    fallback = await analyzer.analyze_image_batch(["a", "b"])
+    assert [r.persons.count for r in fallback] == [0, 5]
+    assert calls == [2, 2, 1, 1]
+
+    await analyzer.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_vision_batch_fallback_takes_one_slot_per_call():
+    """逐张退回时每次调用各占一个并发名额，端点在途请求数不超过信号量上限"""
+    analyzer = VisionAnalyzer(vllm_url="http://test:8001/v1")
+    in_flight = 0
+    peak = 0
+
+    async def _fake_chat(content, *, max_tokens):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if sum(1 for part in content if part["type"] == "image_url") > 1:
+                return "无法解析"
+            return '{"danger_level": "L1", "persons": {"count": 1}}'
+        finally:
+            in_flight -= 1
+
+    analyzer._chat_completion = _fake_chat
+
+    results = await analyzer.analyze_image_batch(["a", "b", "c", "d"], concurrency=asyncio.Semaphore(2))
+    assert [r.persons.count for r in results] == [1, 1, 1, 1]
+    assert peak == 2
+
+    await analyzer.close()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import base64
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from emergency_agents.video.frame_encoder import FrameEncoder, scaled_size
+
+
+def _frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, size=(height // 16, width // 16, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+def test_scaled_size_only_shrinks() -> None:
+    assert scaled_size(3840, 2160, 1280) == (1280, 720)
+    assert scaled_size(720, 1280, 1280) == (720, 1280)
+    assert scaled_size(640, 480, 1280) == (640, 480)
+    assert scaled_size(3840, 2160, None) == (3840, 2160)
+
+
+@pytest.mark.asyncio
+async def test_encode_downscales_and_decodes_back() -> None:
+    encoder = FrameEncoder(max_side=1280, jpeg_quality=80)
+    try:
+        encoded = await encoder.aencode(_frame(3840, 2160))
+    finally:
+        encoder.close()
+
+    assert encoded.source_size == (3840, 2160)
+    assert encoded.image_size == (1280, 720)
+    jpeg = base64.b64decode(encoded.image_base64)
+    assert len(jpeg) == encoded.jpeg_bytes
+    decoded = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (720, 1280, 3)
+
+
+def test_unchanged_frame_reuses_previous_encoding_per_key() -> None:
+    encoder = FrameEncoder(max_side=640)
+    try:
+        frame = _frame(1920, 1080, seed=1)
+        first = encoder.encode(frame, cache_key="dog-alpha")
+        again = encoder.encode(frame.copy(), cache_key="dog-alpha")
+        other_key = encoder.encode(frame, cache_key="uav-1")
+        changed = encoder.encode(_frame(1920, 1080, seed=2), cache_key="dog-alpha")
+    finally:
+        encoder.close()
+
+    assert not first.reused and again.reused and not other_key.reused and not changed.reused
+    assert again.image_base64 == first.image_base64
+    assert changed.digest != first.digest
+
+
+@pytest.mark.benchmark
+def test_frame_encoder_vs_full_resolution_pil() -> None:
+    """4K 帧：缩放后 imencode 相对原 PIL 全分辨率编码的体积与耗时"""
+    from io import BytesIO
+
+    from PIL import Image
+
+    frame = _frame(3840, 2160, seed=3)
+
+    started = time.perf_counter()
+    buffered = BytesIO()
+    Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).save(buffered, format="JPEG", quality=85)
+    legacy = base64.b64encode(buffered.getvalue()).decode("utf-8")
+    legacy_ms = (time.perf_counter() - started) * 1000
+
+    encoder = FrameEncoder(max_side=1280, jpeg_quality=85)
+    try:
+        started = time.perf_counter()
+        encoded = encoder.encode(frame)
+        encoder_ms = (time.perf_counter() - started) * 1000
+    finally:
+        encoder.close()
+
+    print(
+        f"\nPIL 全分辨率: {len(legacy) / 1024:.0f}KB {legacy_ms:.1f}ms "
+        f"缩放编码: {len(encoded.image_base64) / 1024:.0f}KB {encoder_ms:.1f}ms"
+    )
+    assert len(encoded.image_base64) < len(legacy) / 4
+    assert encoder_ms < legacy_ms
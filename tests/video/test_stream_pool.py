@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import List
+
+import numpy as np
+import pytest
+
+from emergency_agents.video import stream_pool
+from emergency_agents.video.stream_catalog import VideoStreamCatalog
+from emergency_agents.video.stream_pool import StreamUnavailableError, VideoStreamReaderPool
+
+
+def _catalog() -> VideoStreamCatalog:
+    return VideoStreamCatalog.from_raw_mapping(
+        {
+            "dog-alpha": {"display_name": "巡逻机器狗Alpha", "stream_url": "rtsp://alpha", "device_type": "robotdog"},
+            "uav-1": {"display_name": "无人机1号", "stream_url": "", "device_type": "uav"},
+        }
+    )
+
+
+def _textured_frame(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(30, 220, size=(48, 64, 3), dtype=np.uint8)
+
+
+class _FakeCapture:
+    """模拟视频流：按固定间隔产出帧，记录打开次数。"""
+
+    def __init__(self, frames: List[np.ndarray], *, interval: float = 0.01, opened: bool = True) -> None:
+        self._frames = frames
+        self._interval = interval
+        self._opened = opened
+        self._index = 0
+        self.released = threading.Event()
+
+    def isOpened(self) -> bool:  # noqa: N802 - 与 cv2.VideoCapture 接口一致
+        return self._opened
+
+    def read(self):
+        time.sleep(self._interval)
+        frame = self._frames[min(self._index, len(self._frames) - 1)]
+        self._index += 1
+        return True, frame
+
+    def release(self) -> None:
+        self.released.set()
+
+
+class _Factory:
+    def __init__(self, make) -> None:
+        self._make = make
+        self.captures: List[_FakeCapture] = []
+
+    def __call__(self, url: str) -> _FakeCapture:
+        capture = self._make()
+        self.captures.append(capture)
+        return capture
+
+
+@pytest.mark.asyncio
+async def test_warm_stream_returns_buffered_frame_without_reopening() -> None:
+    factory = _Factory(lambda: _FakeCapture([_textured_frame(i) for i in range(100)], interval=0.005))
+    pool = VideoStreamReaderPool(_catalog(), capture_factory=factory, open_timeout_seconds=2.0)
+    try:
+        first = await pool.get_latest_frame("dog-alpha")
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        second = await pool.get_latest_frame("dog-alpha")
+        elapsed = time.perf_counter() - started
+
+        assert second.sequence > first.sequence
+        assert elapsed < 0.01
+        assert len(factory.captures) == 1
+        assert pool.active_streams() == ["dog-alpha"]
+    finally:
+        pool.close()
+    assert factory.captures[0].released.wait(1.0)
+
+
+@pytest.mark.asyncio
+async def test_dark_frames_are_skipped() -> None:
+    dark = np.zeros((48, 64, 3), dtype=np.uint8)
+    frames = [dark, dark, _textured_frame(7)] + [dark] * 200
+    factory = _Factory(lambda: _FakeCapture(frames, interval=0.002))
+    pool = VideoStreamReaderPool(_catalog(), buffer_size=8, capture_factory=factory, open_timeout_seconds=2.0)
+    try:
+        latest = await pool.get_latest_frame("dog-alpha")
+        assert latest.valid
+        assert np.array_equal(latest.frame, frames[2])
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_frame_validity_is_checked_on_decode_thread(monkeypatch) -> None:
+    checked_on: List[str] = []
+    original = stream_pool.is_valid_frame
+
+    def _recording_is_valid_frame(frame: np.ndarray) -> bool:
+        checked_on.append(threading.current_thread().name)
+        return original(frame)
+
+    monkeypatch.setattr(stream_pool, "is_valid_frame", _recording_is_valid_frame)
+    dark = np.zeros((48, 64, 3), dtype=np.uint8)
+    factory = _Factory(lambda: _FakeCapture([dark, _textured_frame(3)], interval=0.002))
+    pool = VideoStreamReaderPool(_catalog(), capture_factory=factory, open_timeout_seconds=2.0)
+    try:
+        latest = await pool.get_latest_frame("dog-alpha")
+        assert latest.valid
+        assert checked_on and set(checked_on) == {"video-reader-dog-alpha"}
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_streams_raise() -> None:
+    factory = _Factory(lambda: _FakeCapture([_textured_frame(0)], opened=False))
+    pool = VideoStreamReaderPool(_catalog(), capture_factory=factory, reconnect_delay_seconds=0.05)
+    try:
+        with pytest.raises(StreamUnavailableError, match="未配置"):
+            await pool.get_latest_frame("uav-1")
+
+        started = time.perf_counter()
+        with pytest.raises(StreamUnavailableError, match="无法打开"):
+            await pool.get_latest_frame("dog-alpha", timeout=0.3)
+        assert 0.25 < time.perf_counter() - started < 1.0
+        assert len(factory.captures) >= 2  # 退避重连
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_is_closed_and_restarted_on_demand() -> None:
+    factory = _Factory(lambda: _FakeCapture([_textured_frame(1)], interval=0.005))
+    pool = VideoStreamReaderPool(
+        _catalog(), idle_timeout_seconds=0.1, capture_factory=factory, open_timeout_seconds=2.0
+    )
+    try:
+        await pool.get_latest_frame("dog-alpha")
+        assert factory.captures[0].released.wait(1.0)
+        await asyncio.sleep(0.05)
+        assert pool.active_streams() == []
+
+        await pool.get_latest_frame("dog-alpha")
+        assert len(factory.captures) == 2
+    finally:
+        pool.close()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+import pytest
+
+from emergency_agents.vehicle.vision import (
+    BuildingAssessment,
+    DangerLevel,
+    PersonDetection,
+    RoadStatus,
+    VehicleDetection,
+    VisionAnalysisResult,
+)
+from emergency_agents.video.frame_encoder import FrameEncoder
+from emergency_agents.video.stream_pool import LatestFrame, StreamUnavailableError
+from emergency_agents.video.vision_monitor import BatchVisionMonitor, dhash, hamming_distance
+
+
+def _scene(seed: int, *, noise: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frame = cv2.resize(
+        rng.integers(0, 255, size=(9, 16, 3), dtype=np.uint8), (640, 360), interpolation=cv2.INTER_CUBIC
+    )
+    if noise:
+        jitter = np.random.default_rng(seed + 1000).integers(-noise, noise + 1, size=frame.shape)
+        frame = np.clip(frame.astype(int) + jitter, 0, 255).astype(np.uint8)
+    return frame
+
+
+def _result(persons: int) -> VisionAnalysisResult:
+    return VisionAnalysisResult(
+        danger_level=DangerLevel.L1,
+        persons=PersonDetection(count=persons, positions=[], activities=[]),
+        vehicles=VehicleDetection(total_count=0, by_type={}, positions=[]),
+        buildings=BuildingAssessment(total_buildings=0, damaged_count=0, damage_levels={}, collapse_risk=False),
+        roads=RoadStatus(passable=True, blocked_sections=[], obstacles=[]),
+        hazards=[],
+        recommendations=[],
+        latency_ms=1.0,
+        model_name="stub",
+        confidence_score=0.9,
+    )
+
+
+class _StubPool:
+    def __init__(self) -> None:
+        self.frames: Dict[str, np.ndarray] = {}
+        self._sequence = 0
+
+    async def get_latest_frame(self, device_id: str, *, timeout: float | None = None) -> LatestFrame:
+        if device_id not in self.frames:
+            raise StreamUnavailableError(f"设备 {device_id} 未配置视频流地址")
+        self._sequence += 1
+        return LatestFrame(device_id, self.frames[device_id], time.time(), self._sequence)
+
+
+class _StubAnalyzer:
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.batches: List[int] = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def analyze_image_batch(self, images_base64, *, concurrency=None):
+        self.batches.append(len(images_base64))
+        async with concurrency if concurrency is not None else contextlib.nullcontext():
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+                return [_result(len(self.batches)) for _ in images_base64]
+            finally:
+                self.in_flight -= 1
+
+
+def test_dhash_tolerates_noise_but_separates_scenes() -> None:
+    base = dhash(_scene(1))
+    assert hamming_distance(base, dhash(_scene(1, noise=4))) <= 4
+    assert hamming_distance(base, dhash(_scene(2))) > 12
+
+
+@pytest.mark.asyncio
+async def test_unchanged_frames_skip_inference_and_batches_are_bounded() -> None:
+    pool = _StubPool()
+    pool.frames = {f"cam-{i}": _scene(i) for i in range(5)}
+    analyzer = _StubAnalyzer(delay=0.02)
+    encoder = FrameEncoder(max_side=320)
+    monitor = BatchVisionMonitor(pool, analyzer, encoder, batch_size=2, max_concurrency=2)
+    try:
+        first = await monitor.analyze_once([*pool.frames, "offline"])
+        assert [o.status for o in first] == ["analyzed"] * 5 + ["unavailable"]
+        assert sorted(analyzer.batches) == [1, 2, 2]
+        assert analyzer.max_in_flight == 2
+
+        # cam-0 轻微噪声（视为未变化），cam-1 切换到新场景
+        pool.frames["cam-0"] = _scene(0, noise=3)
+        pool.frames["cam-1"] = _scene(42)
+        second = await monitor.analyze_once(list(pool.frames))
+        assert [o.status for o in second] == ["unchanged", "analyzed", "unchanged", "unchanged", "unchanged"]
+        assert second[0].result is first[0].result
+        assert analyzer.batches[-1] == 1
+
+        # cam-1 回到原场景：命中 (device, hash) 缓存
+        pool.frames["cam-1"] = _scene(1)
+        third = await monitor.analyze_once(["cam-1"])
+        assert third[0].status == "cached"
+        assert third[0].result is first[1].result
+        assert len(analyzer.batches) == 4
+    finally:
+        encoder.close()
+
+
+@pytest.mark.asyncio
+async def test_run_emits_observations_until_stopped() -> None:
+    pool = _StubPool()
+    pool.frames = {"dog-alpha": _scene(7)}
+    encoder = FrameEncoder(max_side=320)
+    monitor = BatchVisionMonitor(pool, _StubAnalyzer(), encoder)
+    events: List[Dict[str, object]] = []
+    stop = asyncio.Event()
+
+    async def _sink(event: str, data: Dict[str, object]) -> None:
+        events.append(data)
+        if len(events) == 2:
+            stop.set()
+
+    try:
+        await asyncio.wait_for(monitor.run(["dog-alpha"], interval_seconds=0.01, stop=stop, sink=_sink), 2.0)
+    finally:
+        encoder.close()
+    assert [e["status"] for e in events] == ["analyzed", "unchanged"]
+    assert events[0]["danger_level"] == "L1"